@@ -1,12 +1,22 @@
 """Python bridge SDK skeleton aligned with the Elixir ServiceBridge helpers."""
 
+from .acks import AckLedger, AckRecord
 from .envelope import Envelope, build_envelope
 from .stonemq import StoneMQClient, topic_for
 from .telemetry import TelemetryRecorder, NoopTelemetry
 from .credentials import CredentialBootstrapper, EnvCredentialBootstrapper
+from .health import HealthCounters, HealthQuery, collect_health
+from .http import HttpClientPool, HttpPoolConfig, shared_http_pool
+from .inflight import InflightLedger, LatencyHistogram
 from .logging import OpenObserveLogger
+from .ownership import HashRing, LocalMembershipBus, SessionOwnership, SessionOwnershipError
+from .singleflight import SingleFlight
+from .streaming import DirectoryPage, DirectoryStreamer
+from .vault import SessionVault, SessionVaultError
 
 __all__ = [
+    "AckLedger",
+    "AckRecord",
     "Envelope",
     "build_envelope",
     "StoneMQClient",
@@ -16,4 +26,21 @@ __all__ = [
     "CredentialBootstrapper",
     "EnvCredentialBootstrapper",
     "OpenObserveLogger",
+    "HealthCounters",
+    "HealthQuery",
+    "collect_health",
+    "HttpClientPool",
+    "HttpPoolConfig",
+    "shared_http_pool",
+    "InflightLedger",
+    "LatencyHistogram",
+    "HashRing",
+    "LocalMembershipBus",
+    "SessionOwnership",
+    "SessionOwnershipError",
+    "SingleFlight",
+    "DirectoryPage",
+    "DirectoryStreamer",
+    "SessionVault",
+    "SessionVaultError",
 ]
@@ -0,0 +1,189 @@
+"""Bounded ledger of acknowledgements received from the core."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+# Payload fields retained per acknowledgement. Anything else (message bodies,
+# attachments, nested metadata) is dropped so each record stays small.
+ACK_RECORD_FIELDS: Sequence[str] = (
+    "event_id",
+    "update_id",
+    "status",
+    "message_id",
+    "chat_id",
+    "channel",
+    "conversation_id",
+    "reason",
+)
+
+_MAX_FIELD_LENGTH = 256
+_MAX_STATUSES = 32
+_OTHER_STATUS = "other"
+
+
+@dataclass(frozen=True)
+class AckRecord:
+    key: Hashable
+    sequence: int
+    acked_at: float
+    fields: Tuple[Tuple[str, object], ...]
+
+    def to_dict(self) -> Dict[str, object]:
+        return dict(self.fields)
+
+    @property
+    def status(self) -> Optional[str]:
+        for name, value in self.fields:
+            if name == "status" and isinstance(value, str):
+                return value
+        return None
+
+
+class AckLedger:
+    """Keeps the most recent acknowledgements, bounded by count and age.
+
+    Each acknowledgement is reduced to the scalar fields listed in
+    ``ACK_RECORD_FIELDS``. Records are kept in acknowledgement order, so
+    compaction only pops from the front, while aggregate counters (totals,
+    duplicates, per-status counts, expired and evicted records) survive
+    compaction and feed health summaries.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 10_000,
+        ttl: float = 24 * 3600.0,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self._entries: "OrderedDict[Hashable, AckRecord]" = OrderedDict()
+        self._max_entries = max(1, int(max_entries))
+        self._ttl = max(0.0, float(ttl))
+        self._clock = clock or time.time
+        self._sequence = itertools.count(1)
+        self._total = 0
+        self._duplicates = 0
+        self._expired = 0
+        self._evicted = 0
+        self._by_status: Dict[str, int] = {}
+        self._last_acked_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def record(self, key: Hashable, payload: Mapping[str, object]) -> AckRecord:
+        now = self._clock()
+        if key in self._entries:
+            self._duplicates += 1
+            del self._entries[key]
+        record = AckRecord(
+            key=key,
+            sequence=next(self._sequence),
+            acked_at=now,
+            fields=_compact(payload),
+        )
+        self._entries[key] = record
+        self._total += 1
+        self._last_acked_at = now
+        self._count_status(record.status)
+        self.compact(now)
+        return record
+
+    def get(self, key: Hashable) -> Optional[Mapping[str, object]]:
+        record = self._entries.get(key)
+        return record.to_dict() if record is not None else None
+
+    def as_dict(self) -> Dict[Any, Mapping[str, object]]:
+        return {key: record.to_dict() for key, record in self._entries.items()}
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Drop records older than ``ttl`` and any overflow beyond ``max_entries``."""
+
+        current = self._clock() if now is None else now
+        cutoff = current - self._ttl
+        removed = 0
+        while self._entries:
+            record = next(iter(self._entries.values()))
+            if record.acked_at > cutoff:
+                break
+            self._entries.popitem(last=False)
+            self._expired += 1
+            removed += 1
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evicted += 1
+            removed += 1
+        return removed
+
+    def summary(self) -> Mapping[str, object]:
+        self.compact()
+        oldest = next(iter(self._entries.values())).acked_at if self._entries else None
+        return {
+            "total": self._total,
+            "retained": len(self._entries),
+            "duplicates": self._duplicates,
+            "expired": self._expired,
+            "evicted": self._evicted,
+            "by_status": dict(sorted(self._by_status.items())),
+            "oldest_acked_at": oldest,
+            "last_acked_at": self._last_acked_at,
+        }
+
+    def page(
+        self, *, cursor: Optional[object] = None, limit: int = 100
+    ) -> Tuple[List[Mapping[str, object]], Optional[str]]:
+        """Return retained records after ``cursor`` and the cursor for the next page."""
+
+        self.compact()
+        after = _parse_cursor(cursor)
+        limit = max(1, int(limit))
+        items: List[Mapping[str, object]] = []
+        last_sequence: Optional[int] = None
+        has_more = False
+        for record in self._entries.values():
+            if record.sequence <= after:
+                continue
+            if len(items) >= limit:
+                has_more = True
+                break
+            entry = record.to_dict()
+            entry["acked_at"] = record.acked_at
+            items.append(entry)
+            last_sequence = record.sequence
+        next_cursor = str(last_sequence) if has_more and last_sequence is not None else None
+        return items, next_cursor
+
+    def _count_status(self, status: Optional[str]) -> None:
+        if status is None:
+            return
+        if status not in self._by_status and len(self._by_status) >= _MAX_STATUSES:
+            status = _OTHER_STATUS
+        self._by_status[status] = self._by_status.get(status, 0) + 1
+
+
+def _compact(payload: Mapping[str, object]) -> Tuple[Tuple[str, object], ...]:
+    fields: List[Tuple[str, object]] = []
+    for name in ACK_RECORD_FIELDS:
+        value = payload.get(name)
+        if isinstance(value, (bool, int, float)):
+            fields.append((name, value))
+        elif isinstance(value, str):
+            fields.append((name, value[:_MAX_FIELD_LENGTH]))
+    return tuple(fields)
+
+
+def _parse_cursor(cursor: Optional[object]) -> int:
+    if cursor is None:
+        return 0
+    try:
+        return max(0, int(str(cursor)))
+    except ValueError:
+        return 0
@@ -0,0 +1,184 @@
+"""Health snapshot helpers for daemons that manage many client sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+HealthProbe = Callable[[T], Awaitable[Mapping[str, object]]]
+
+DEFAULT_HEALTH_CONCURRENCY = 32
+MAX_HEALTH_PAGE = 1000
+
+
+@dataclass(frozen=True)
+class HealthQuery:
+    """Pagination and filter options accepted by ``health_snapshot`` requests."""
+
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
+    disconnected_only: bool = False
+    min_pending_events: Optional[int] = None
+    summary_only: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object]) -> "HealthQuery":
+        cursor = payload.get("cursor")
+        limit = _as_int(payload.get("limit"))
+        if limit is not None:
+            limit = min(max(1, limit), MAX_HEALTH_PAGE)
+        return cls(
+            cursor=str(cursor) if cursor not in (None, "") else None,
+            limit=limit,
+            disconnected_only=bool(payload.get("disconnected_only")),
+            min_pending_events=_as_int(payload.get("min_pending_events")),
+            summary_only=bool(payload.get("summary_only")),
+        )
+
+    @property
+    def filtered(self) -> bool:
+        return self.disconnected_only or self.min_pending_events is not None
+
+    def matches(self, entry: Mapping[str, object]) -> bool:
+        if self.disconnected_only and entry.get("connected"):
+            return False
+        if self.min_pending_events is not None:
+            pending = entry.get("pending_events")
+            if not isinstance(pending, int) or pending <= self.min_pending_events:
+                return False
+        return True
+
+
+class HealthCounters:
+    """Fleet-wide health aggregates kept up to date as clients are observed.
+
+    Every probe updates the per-client connected flag and pending-event count,
+    and daemons report clients being connected, replaced or removed as it
+    happens, adjusting the totals in O(1), so a summary-only health request can
+    answer without calling ``health()`` on every client. Figures are as fresh as
+    the last observation of each client; ``observed_at`` reports when that was.
+    """
+
+    def __init__(self, *, clock: Optional[Callable[[], float]] = None) -> None:
+        self._clock = clock or time.time
+        self._clients: Dict[str, Tuple[bool, int]] = {}
+        self._connected = 0
+        self._pending = 0
+        self._observed_at: Optional[float] = None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._clients
+
+    def observe(self, key: str, *, connected: bool, pending_events: int) -> None:
+        self.forget(key)
+        self._clients[key] = (connected, pending_events)
+        if connected:
+            self._connected += 1
+        self._pending += pending_events
+        self._observed_at = self._clock()
+
+    def set_connected(self, key: str, connected: bool) -> None:
+        """Record a connection change, keeping the last observed pending count."""
+
+        _, pending = self._clients.get(key, (False, 0))
+        self.observe(key, connected=connected, pending_events=pending)
+
+    def forget(self, key: str) -> None:
+        previous = self._clients.pop(key, None)
+        if previous is None:
+            return
+        was_connected, pending = previous
+        if was_connected:
+            self._connected -= 1
+        self._pending -= pending
+
+    def retain(self, keys: Iterable[str]) -> None:
+        """Forget clients that are no longer active."""
+
+        active = set(keys)
+        for key in [key for key in self._clients if key not in active]:
+            self.forget(key)
+
+    def summary(self, total_clients: Optional[int] = None) -> Dict[str, object]:
+        return {
+            "total_clients": len(self._clients) if total_clients is None else total_clients,
+            "observed_clients": len(self._clients),
+            "connected_clients": self._connected,
+            "pending_events": self._pending,
+            "observed_at": self._observed_at,
+        }
+
+
+async def collect_health(
+    candidates: Sequence[Tuple[str, T]],
+    probe: HealthProbe[T],
+    query: HealthQuery,
+    *,
+    concurrency: int = DEFAULT_HEALTH_CONCURRENCY,
+) -> Tuple[List[Mapping[str, object]], Optional[str]]:
+    """Probe ``candidates`` concurrently and return one page of matching entries.
+
+    Candidates are ordered by key and the cursor is the key of the last entry
+    returned, so pages stay stable while sessions come and go. When a filter is
+    active, probing continues in windows until the page is full or the
+    candidates run out.
+    """
+
+    ordered = sorted(candidates, key=lambda item: item[0])
+    if query.cursor is not None:
+        ordered = [item for item in ordered if item[0] > query.cursor]
+    limit = query.limit
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+
+    async def run(item: Tuple[str, T]) -> Mapping[str, object]:
+        async with semaphore:
+            return await probe(item[1])
+
+    entries: List[Mapping[str, object]] = []
+    last_key: Optional[str] = None
+    window = len(ordered) if limit is None else max(limit, min(concurrency, len(ordered)))
+    position = 0
+    while position < len(ordered):
+        batch = ordered[position : position + max(1, window)]
+        results = await asyncio.gather(*(run(item) for item in batch))
+        for (key, _), entry in zip(batch, results):
+            position += 1
+            last_key = key
+            if not query.matches(entry):
+                continue
+            entries.append(entry)
+            if limit is not None and len(entries) >= limit:
+                break
+        if limit is not None and len(entries) >= limit:
+            break
+
+    next_cursor = last_key if position < len(ordered) else None
+    return entries, next_cursor
+
+
+def _as_int(value: object) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
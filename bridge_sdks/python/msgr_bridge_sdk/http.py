@@ -0,0 +1,207 @@
+"""Process-wide pool of aiohttp sessions shared by bridge clients."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+try:  # pragma: no cover - optional runtime dependency
+    import aiohttp
+    from aiohttp import ClientSession
+except ImportError:  # pragma: no cover - aiohttp not installed during unit tests
+    aiohttp = None  # type: ignore
+    ClientSession = None  # type: ignore
+
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """Connector tuning applied to every pooled session.
+
+    ``limit_per_host`` caps concurrent connections to one host across every
+    client sharing the pool; ``host_limits`` overrides it for specific hosts
+    (for example a lower cap for an upload endpoint). Sessions only carry
+    ``connect_timeout`` and a per-read ``read_timeout``; the overall
+    ``request_timeout`` is applied per request to bounded API calls through
+    :meth:`HttpClientPool.request_timeout`, so streamed uploads are not cut off.
+    """
+
+    limit: int = 256
+    limit_per_host: int = 64
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+    request_timeout: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    host_limits: Mapping[str, int] = field(default_factory=dict)
+
+
+class HttpClientPool:
+    """Hands out one long-lived ``aiohttp.ClientSession`` per host.
+
+    Clients that talk to the same API host share a connector, so keep-alive
+    connections, TLS sessions and DNS lookups are reused across every linked
+    account instead of being created per client. Sessions are keyed by the host
+    the request actually goes to (use :meth:`session_for` with a URL). Sessions
+    are bound to the event loop that created them; a session requested from a
+    different loop is recreated. Pooled sessions belong to the pool: clients
+    must not close them.
+
+    Websockets hold their connection for their whole life, so they get a
+    separate session without connection limits (:meth:`websocket_session`);
+    otherwise a few dozen linked accounts would exhaust the request slots.
+    """
+
+    def __init__(
+        self,
+        config: Optional[HttpPoolConfig] = None,
+        *,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._config = config or HttpPoolConfig()
+        self._logger = logger or logging.getLogger(__name__)
+        self._sessions: Dict[str, Tuple[asyncio.AbstractEventLoop, "ClientSession"]] = {}
+        self._websockets: Optional[Tuple[asyncio.AbstractEventLoop, "ClientSession"]] = None
+        self._created = 0
+        self._reused = 0
+
+    @property
+    def config(self) -> HttpPoolConfig:
+        return self._config
+
+    async def session(self, host: str) -> "ClientSession":
+        if aiohttp is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to create pooled HTTP sessions")
+        host = host.lower()
+
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(host)
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            self._reused += 1
+            return entry[1]
+        # Session creation does not yield to the loop, so concurrent callers
+        # cannot race between the lookup above and the insert below.
+        session = self._create_session(host)
+        self._sessions[host] = (loop, session)
+        self._created += 1
+        return session
+
+    async def session_for(self, url: str) -> "ClientSession":
+        """Return the pooled session for the host ``url`` points at."""
+
+        return await self.session(urlparse(url).hostname or url)
+
+    async def websocket_session(self) -> "ClientSession":
+        """Return the session used for long-lived websockets.
+
+        Its connector has no connection limits and no timeouts beyond the
+        connect timeout, so open sockets never occupy pooled request slots.
+        """
+
+        if aiohttp is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to create pooled HTTP sessions")
+        loop = asyncio.get_running_loop()
+        entry = self._websockets
+        if entry is not None and entry[0] is loop and not entry[1].closed:
+            self._reused += 1
+            return entry[1]
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=0,
+            ttl_dns_cache=self._config.dns_cache_ttl,
+            use_dns_cache=True,
+            enable_cleanup_closed=True,
+        )
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self._config.connect_timeout)
+        session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._websockets = (loop, session)
+        self._created += 1
+        return session
+
+    def request_timeout(self) -> "aiohttp.ClientTimeout":
+        """Timeout for one bounded API request, passed as ``timeout=`` per call."""
+
+        if aiohttp is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to build request timeouts")
+        config = self._config
+        return aiohttp.ClientTimeout(
+            total=config.request_timeout,
+            sock_connect=config.connect_timeout,
+            sock_read=config.read_timeout,
+        )
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        if self._websockets is not None:
+            sessions.append(self._websockets)
+            self._websockets = None
+        for owner, session in sessions:
+            if owner is loop and not session.closed:
+                await session.close()
+
+    def stats(self) -> Mapping[str, object]:
+        hosts: Dict[str, object] = {}
+        for host, (_, session) in self._sessions.items():
+            connector = session.connector
+            hosts[host] = {
+                "closed": session.closed,
+                "limit": connector.limit if connector is not None else None,
+                "limit_per_host": connector.limit_per_host if connector is not None else None,
+            }
+        return {
+            "sessions": len(self._sessions),
+            "websockets": self._websockets is not None and not self._websockets[1].closed,
+            "created": self._created,
+            "reused": self._reused,
+            "hosts": hosts,
+        }
+
+    def _create_session(self, host: str) -> "ClientSession":
+        config = self._config
+        connector = aiohttp.TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.host_limits.get(host, config.limit_per_host),
+            keepalive_timeout=config.keepalive_timeout,
+            ttl_dns_cache=config.dns_cache_ttl,
+            use_dns_cache=True,
+            enable_cleanup_closed=True,
+        )
+        # No total timeout here: it would also cut off streamed uploads.
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=config.connect_timeout,
+            sock_read=config.read_timeout,
+        )
+        self._logger.debug("Creating pooled HTTP session", extra={"host": host})
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+_shared_pool: Optional[HttpClientPool] = None
+
+
+def shared_http_pool() -> HttpClientPool:
+    """Return the process-wide pool used by clients without an explicit session."""
+
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = HttpClientPool()
+    return _shared_pool
+
+
+def configure_http_pool(config: HttpPoolConfig) -> HttpClientPool:
+    """Replace the process-wide pool; call before any client opens a session."""
+
+    global _shared_pool
+    _shared_pool = HttpClientPool(config)
+    return _shared_pool
+
+
+async def close_shared_http_pool() -> None:
+    global _shared_pool
+    if _shared_pool is not None:
+        pool, _shared_pool = _shared_pool, None
+        await pool.close()
@@ -0,0 +1,160 @@
+"""In-flight event bookkeeping shared by bridge clients."""
+
+from __future__ import annotations
+
+import bisect
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+DEFAULT_LATENCY_BUCKETS: Sequence[float] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with bucket-resolution quantiles."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        bounds = sorted(float(bound) for bound in buckets)
+        if not bounds:
+            raise ValueError("buckets must not be empty")
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def observe(self, value: float) -> None:
+        value = max(0.0, float(value))
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+        self._max = max(self._max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the upper bound of the bucket holding the ``q`` quantile."""
+
+        if self._count == 0:
+            return None
+        rank = max(1, int(round(q * self._count)))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self._bounds[index] if index < len(self._bounds) else self._max
+        return self._max  # pragma: no cover - rank never exceeds count
+
+    def snapshot(self) -> Mapping[str, object]:
+        buckets: Dict[str, int] = {}
+        for bound, bucket_count in zip(self._bounds, self._counts):
+            buckets[f"le_{bound:g}"] = bucket_count
+        buckets["le_inf"] = self._counts[-1]
+        return {
+            "count": self._count,
+            "sum": self._sum,
+            "max": self._max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class InflightLedger:
+    """Insertion-ordered ledger of dispatched-but-unacknowledged events.
+
+    Events are recorded in dispatch order, so the oldest pending event is
+    always at the front: ``record``, ``ack``, ``oldest`` and each eviction are
+    O(1), and ``expire`` only touches entries it removes. Acknowledgements feed a
+    latency histogram.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1000,
+        max_age: float = 3600.0,
+        clock: Optional[Callable[[], float]] = None,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._max_entries = max(1, int(max_entries))
+        self._max_age = max(0.0, float(max_age))
+        self._clock = clock or time.time
+        self._latency = LatencyHistogram(buckets)
+        self._expired = 0
+        self._evicted = 0
+        self._last_latency: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, event_id: object) -> bool:
+        return event_id in self._entries
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        return self._latency
+
+    @property
+    def last_latency(self) -> Optional[float]:
+        return self._last_latency
+
+    def record(self, event_id: str, at: Optional[float] = None) -> None:
+        """Track ``event_id`` as dispatched; redeliveries keep their first timestamp."""
+
+        if event_id in self._entries:
+            return
+        now = self._clock() if at is None else at
+        self._entries[event_id] = now
+        self.expire(now)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evicted += 1
+
+    def ack(self, event_id: str, at: Optional[float] = None) -> Optional[float]:
+        """Remove ``event_id`` and return its ack latency when it was pending."""
+
+        dispatched_at = self._entries.pop(event_id, None)
+        if dispatched_at is None:
+            return None
+        now = self._clock() if at is None else at
+        latency = max(0.0, now - dispatched_at)
+        self._latency.observe(latency)
+        self._last_latency = latency
+        return latency
+
+    def oldest(self) -> Optional[float]:
+        """Return the dispatch timestamp of the oldest pending event."""
+
+        if not self._entries:
+            return None
+        return next(iter(self._entries.values()))
+
+    def expire(self, now: Optional[float] = None) -> int:
+        if not self._entries:
+            return 0
+        cutoff = (self._clock() if now is None else now) - self._max_age
+        removed = 0
+        while self._entries:
+            dispatched_at = next(iter(self._entries.values()))
+            if dispatched_at > cutoff:
+                break
+            self._entries.popitem(last=False)
+            removed += 1
+        self._expired += removed
+        return removed
+
+    def snapshot(self, now: Optional[float] = None) -> Mapping[str, object]:
+        current = self._clock() if now is None else now
+        oldest = self.oldest()
+        return {
+            "pending": len(self._entries),
+            "oldest_age": max(0.0, current - oldest) if oldest is not None else None,
+            "expired": self._expired,
+            "evicted": self._evicted,
+            "ack_latency": self._latency.snapshot(),
+        }
@@ -0,0 +1,333 @@
+"""Consistent-hash session ownership across bridge daemon replicas."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .envelope import Envelope, build_envelope
+from .stonemq import QueueTransport, topic_for
+
+ReleaseHandler = Callable[[str, str], Awaitable[Optional[Mapping[str, object]]]]
+AcquireHandler = Callable[[str, Mapping[str, object]], Awaitable[None]]
+
+
+class SessionOwnershipError(RuntimeError):
+    """Raised when a replica is asked to hold a session owned by another replica."""
+
+    def __init__(self, user_id: str, owner: Optional[str]) -> None:
+        super().__init__(f"session for {user_id} is owned by replica {owner}")
+        self.user_id = user_id
+        self.owner = owner
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Iterable[str] = (), *, vnodes: int = 64) -> None:
+        if vnodes < 1:
+            raise ValueError("vnodes must be positive")
+        self._vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: Set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> frozenset[str]:
+        return frozenset(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str) -> bool:
+        if not node:
+            raise ValueError("node must not be empty")
+        if node in self._nodes:
+            return False
+        self._nodes.add(node)
+        for replica in range(self._vnodes):
+            point = _hash(f"{node}#{replica}")
+            index = bisect.bisect_left(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+        return True
+
+    def remove(self, node: str) -> bool:
+        if node not in self._nodes:
+            return False
+        self._nodes.discard(node)
+        retained = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in retained]
+        self._owners = [owner for _, owner in retained]
+        return True
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect.bisect_right(self._points, _hash(key))
+        if index == len(self._points):
+            index = 0
+        return self._owners[index]
+
+
+class LocalMembershipBus:
+    """In-process fan-out transport standing in for StoneMQ in tests."""
+
+    def __init__(self) -> None:
+        self.subscriptions: Dict[str, List[Callable[[bytes], Awaitable[None]]]] = {}
+        self.published: List[Tuple[str, bytes]] = []
+
+    async def subscribe(self, topic: str, handler: Callable[[bytes], Awaitable[None]]) -> None:
+        self.subscriptions.setdefault(topic, []).append(handler)
+
+    async def publish(self, topic: str, body: bytes) -> None:
+        self.published.append((topic, body))
+        for handler in list(self.subscriptions.get(topic, [])):
+            await handler(body)
+
+    def detach(self, topic: str, handler: Callable[[bytes], Awaitable[None]]) -> None:
+        handlers = self.subscriptions.get(topic)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+
+class SessionOwnership:
+    """Assigns user sessions to daemon replicas and hands them off on membership changes.
+
+    Replicas advertise themselves on ``bridge/<service>/membership`` and receive
+    handoffs on ``bridge/<service>/<replica>/session_handoff``. Only sessions that
+    were claimed locally and whose ring position moved to another replica are
+    released, so scaling the fleet reconnects a ``1/N`` slice of accounts rather
+    than all of them.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        replica_id: str,
+        transport: QueueTransport,
+        *,
+        vnodes: int = 64,
+        heartbeat_interval: float = 5.0,
+        member_ttl: float = 15.0,
+        clock: Optional[Callable[[], float]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if not service:
+            raise ValueError("service must not be empty")
+        replica = (replica_id or "").strip()
+        if not replica:
+            raise ValueError("replica_id must not be empty")
+        if "/" in replica:
+            raise ValueError("replica_id must not contain '/' characters")
+
+        self._service = service
+        self._replica_id = replica
+        self._transport = transport
+        self._ring = HashRing(vnodes=vnodes)
+        self._heartbeat_interval = max(0.1, float(heartbeat_interval))
+        self._member_ttl = max(self._heartbeat_interval, float(member_ttl))
+        self._clock = clock or time.monotonic
+        self._logger = logger or logging.getLogger(__name__)
+        self._last_seen: Dict[str, float] = {}
+        self._claimed: Set[str] = set()
+        self._on_release: Optional[ReleaseHandler] = None
+        self._on_acquire: Optional[AcquireHandler] = None
+        self._heartbeat_task: Optional[asyncio.Task[None]] = None
+        self._rebalance_lock = asyncio.Lock()
+        self._started = False
+        self._handoffs_sent = 0
+        self._handoffs_received = 0
+
+    @property
+    def replica_id(self) -> str:
+        return self._replica_id
+
+    @property
+    def members(self) -> frozenset[str]:
+        return self._ring.nodes
+
+    @property
+    def claimed(self) -> frozenset[str]:
+        return frozenset(self._claimed)
+
+    def set_handlers(self, *, on_release: ReleaseHandler, on_acquire: AcquireHandler) -> None:
+        """Register callbacks that drop a local session and adopt a handed-off one."""
+
+        self._on_release = on_release
+        self._on_acquire = on_acquire
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        await self._transport.subscribe(self._membership_topic(), self._handle_membership)
+        await self._transport.subscribe(
+            topic_for(self._service, "session_handoff", self._replica_id),
+            self._handle_handoff,
+        )
+        self._ring.add(self._replica_id)
+        self._last_seen[self._replica_id] = self._clock()
+        self._started = True
+        await self._announce("join")
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(), name="bridge-membership")
+
+    async def stop(self) -> None:
+        if not self._started:
+            return
+        self._started = False
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._heartbeat_task
+            self._heartbeat_task = None
+        self._ring.remove(self._replica_id)
+        self._last_seen.pop(self._replica_id, None)
+        await self._announce("leave")
+        await self._rebalance()
+
+    def owner_for(self, user_id: str) -> Optional[str]:
+        return self._ring.owner(user_id)
+
+    def owns(self, user_id: str) -> bool:
+        if not self._started:
+            return True
+        return self._ring.owner(user_id) == self._replica_id
+
+    def ensure_owned(self, user_id: str) -> None:
+        if not self.owns(user_id):
+            raise SessionOwnershipError(user_id, self.owner_for(user_id))
+
+    def claim(self, user_id: str) -> None:
+        self._claimed.add(user_id)
+
+    def forget(self, user_id: str) -> None:
+        self._claimed.discard(user_id)
+
+    def snapshot(self) -> Mapping[str, object]:
+        return {
+            "replica_id": self._replica_id,
+            "members": sorted(self._ring.nodes),
+            "claimed_sessions": len(self._claimed),
+            "handoffs_sent": self._handoffs_sent,
+            "handoffs_received": self._handoffs_received,
+        }
+
+    async def expire_members(self) -> None:
+        now = self._clock()
+        expired = [
+            member
+            for member, seen in self._last_seen.items()
+            if member != self._replica_id and now - seen > self._member_ttl
+        ]
+        if not expired:
+            return
+        for member in expired:
+            self._last_seen.pop(member, None)
+            self._ring.remove(member)
+            self._logger.info("Bridge replica expired", extra={"replica": member})
+        await self._rebalance()
+
+    async def _heartbeat_loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self._heartbeat_interval)
+                self._last_seen[self._replica_id] = self._clock()
+                await self._announce("heartbeat")
+                await self.expire_members()
+        except asyncio.CancelledError:  # pragma: no cover - cancellation path
+            pass
+
+    async def _handle_membership(self, body: bytes) -> None:
+        envelope = Envelope.from_dict(json.loads(body.decode("utf-8")))
+        replica = envelope.payload.get("replica")
+        status = envelope.payload.get("status")
+        if not isinstance(replica, str) or not replica or replica == self._replica_id:
+            return
+        if not self._started:
+            return
+
+        if status == "leave":
+            self._last_seen.pop(replica, None)
+            if self._ring.remove(replica):
+                self._logger.info("Bridge replica left", extra={"replica": replica})
+                await self._rebalance()
+            return
+
+        self._last_seen[replica] = self._clock()
+        if self._ring.add(replica):
+            self._logger.info("Bridge replica joined", extra={"replica": replica})
+            if status == "join":
+                await self._announce("heartbeat")
+            await self._rebalance()
+
+    async def _handle_handoff(self, body: bytes) -> None:
+        envelope = Envelope.from_dict(json.loads(body.decode("utf-8")))
+        user_id = envelope.payload.get("user_id")
+        if not isinstance(user_id, str) or not user_id:
+            return
+        state = envelope.payload.get("state")
+        self._handoffs_received += 1
+        self._claimed.add(user_id)
+        if self._on_acquire is not None:
+            try:
+                await self._on_acquire(user_id, state if isinstance(state, Mapping) else {})
+            except Exception:  # pragma: no cover - handler failures logged for ops
+                self._logger.exception("Session handoff acquire failed", extra={"user_id": user_id})
+
+    async def _rebalance(self) -> None:
+        async with self._rebalance_lock:
+            for user_id in sorted(self._claimed):
+                owner = self._ring.owner(user_id)
+                if owner is None or owner == self._replica_id:
+                    continue
+                await self._handoff(user_id, owner)
+
+    async def _handoff(self, user_id: str, owner: str) -> None:
+        state: Optional[Mapping[str, object]] = None
+        if self._on_release is not None:
+            try:
+                state = await self._on_release(user_id, owner)
+            except Exception:  # pragma: no cover - handler failures logged for ops
+                self._logger.exception("Session handoff release failed", extra={"user_id": user_id})
+                return
+        self._claimed.discard(user_id)
+        payload: Dict[str, object] = {"user_id": user_id, "from": self._replica_id}
+        if state:
+            payload["state"] = dict(state)
+        envelope = build_envelope(self._service, "session_handoff", payload)
+        await self._transport.publish(
+            topic_for(self._service, "session_handoff", owner),
+            envelope.to_json().encode("utf-8"),
+        )
+        self._handoffs_sent += 1
+        self._logger.info(
+            "Session handed off",
+            extra={"user_id": user_id, "from": self._replica_id, "to": owner},
+        )
+
+    async def _announce(self, status: str) -> None:
+        envelope = build_envelope(
+            self._service,
+            "membership",
+            {"replica": self._replica_id, "status": status},
+        )
+        await self._transport.publish(self._membership_topic(), envelope.to_json().encode("utf-8"))
+
+    def _membership_topic(self) -> str:
+        return topic_for(self._service, "membership")
+
+
+def _hash(value: str) -> int:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
@@ -0,0 +1,94 @@
+"""Single-flight call coalescing with a short-lived result cache."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Shares one in-flight call between concurrent callers using the same key.
+
+    Successful results are kept for ``ttl`` seconds so bursts that arrive just
+    after a call finished (for example, a reconnect storm replaying ``link_account``)
+    reuse the result instead of hitting the platform API again. Failures are
+    never cached; every waiter of a failed flight receives the same exception.
+    A waiter being cancelled does not cancel the shared call.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 30.0,
+        max_entries: int = 1024,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self._ttl = max(0.0, float(ttl))
+        self._max_entries = max(0, int(max_entries))
+        self._clock = clock or time.monotonic
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+        self._calls = 0
+        self._shared = 0
+        self._cache_hits = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        ttl: Optional[float] = None,
+    ) -> T:
+        cached = self._results.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > self._clock():
+                self._results.move_to_end(key)
+                self._cache_hits += 1
+                return value  # type: ignore[return-value]
+            del self._results[key]
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self._shared += 1
+            return await asyncio.shield(flight)
+
+        self._calls += 1
+        flight = asyncio.ensure_future(fn())
+        self._inflight[key] = flight
+        flight.add_done_callback(lambda done: self._complete(key, done, ttl))
+        return await asyncio.shield(flight)
+
+    def forget(self, key: Optional[Hashable] = None) -> None:
+        """Drop a cached result (or all of them) so the next call refetches."""
+
+        if key is None:
+            self._results.clear()
+            return
+        self._results.pop(key, None)
+
+    def stats(self) -> Mapping[str, int]:
+        return {
+            "calls": self._calls,
+            "shared": self._shared,
+            "cache_hits": self._cache_hits,
+            "inflight": len(self._inflight),
+            "cached": len(self._results),
+        }
+
+    def _complete(self, key: Hashable, flight: asyncio.Future, ttl: Optional[float]) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if flight.cancelled() or flight.exception() is not None:
+            return
+        lifetime = self._ttl if ttl is None else max(0.0, float(ttl))
+        if lifetime <= 0 or self._max_entries == 0:
+            return
+        self._results[key] = (self._clock() + lifetime, flight.result())
+        self._results.move_to_end(key)
+        while len(self._results) > self._max_entries:
+            self._results.popitem(last=False)
@@ -0,0 +1,183 @@
+"""Streams paginated directory crawls as sequenced StoneMQ chunk envelopes."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Mapping, Optional, Sequence
+
+from .envelope import build_envelope
+from .stonemq import StoneMQClient
+
+PageSource = Callable[[], AsyncIterator["DirectoryPage"]]
+
+DIRECTORY_CHUNK_ACTION = "directory_chunk"
+
+
+@dataclass(frozen=True)
+class DirectoryPage:
+    """One page of a directory listing and the cursor that resumes after it."""
+
+    items: Sequence[Mapping[str, object]]
+    cursor: Optional[str] = None
+
+
+class DirectoryStreamer:
+    """Publishes directory pages as ``directory_chunk`` envelopes while they are fetched.
+
+    Every chunk carries the ``stream_id``, the directory ``kind`` (``members``,
+    ``conversations``), a per-stream ``sequence`` number and the platform cursor
+    for the next page. A page without a cursor is the last one of its kind and
+    is flagged ``final``; the last chunk of the whole stream also has
+    ``complete`` set. Only the page being published is held in memory.
+    """
+
+    def __init__(
+        self,
+        mq_client: StoneMQClient,
+        service: str,
+        *,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._client = mq_client
+        self._service = service
+        self._logger = logger or logging.getLogger(__name__)
+        self._streams: Dict[str, asyncio.Task[None]] = {}
+
+    @property
+    def active(self) -> int:
+        return len(self._streams)
+
+    def open(
+        self,
+        sources: Mapping[str, PageSource],
+        *,
+        instance: Optional[str] = None,
+        context: Optional[Mapping[str, object]] = None,
+    ) -> Mapping[str, object]:
+        """Start streaming ``sources`` in the background and return the stream handle."""
+
+        stream_id = uuid.uuid4().hex
+        kinds = list(sources)
+        task = asyncio.create_task(
+            self._run(stream_id, sources, instance, dict(context or {})),
+            name=f"{self._service}-directory-{stream_id}",
+        )
+        self._streams[stream_id] = task
+        task.add_done_callback(lambda _: self._streams.pop(stream_id, None))
+        return {"stream_id": stream_id, "action": DIRECTORY_CHUNK_ACTION, "kinds": kinds}
+
+    async def wait(self, stream_id: str) -> None:
+        task = self._streams.get(stream_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def close(self) -> None:
+        tasks = list(self._streams.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._streams.clear()
+
+    async def _run(
+        self,
+        stream_id: str,
+        sources: Mapping[str, PageSource],
+        instance: Optional[str],
+        context: Mapping[str, object],
+    ) -> None:
+        sequence = 0
+        kinds = list(sources)
+        for index, kind in enumerate(kinds):
+            last_kind = index == len(kinds) - 1
+            try:
+                finished = False
+                pages = sources[kind]()
+                try:
+                    async for page in pages:
+                        finished = page.cursor is None
+                        await self._publish(
+                            stream_id,
+                            kind,
+                            sequence,
+                            page,
+                            context,
+                            instance,
+                            final=finished,
+                            complete=finished and last_kind,
+                        )
+                        sequence += 1
+                        if finished:
+                            break
+                finally:
+                    # Sources may hold a crawl lock between pages; release it
+                    # now rather than whenever the generator is collected.
+                    aclose = getattr(pages, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+                if not finished:
+                    await self._publish(
+                        stream_id,
+                        kind,
+                        sequence,
+                        DirectoryPage(items=[]),
+                        context,
+                        instance,
+                        final=True,
+                        complete=last_kind,
+                    )
+                    sequence += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - crawl failures surfaced to consumers
+                self._logger.exception(
+                    "Directory stream failed",
+                    extra={"stream_id": stream_id, "kind": kind},
+                )
+                await self._publish(
+                    stream_id,
+                    kind,
+                    sequence,
+                    DirectoryPage(items=[]),
+                    context,
+                    instance,
+                    final=True,
+                    complete=last_kind,
+                    error=str(exc) or exc.__class__.__name__,
+                )
+                sequence += 1
+
+    async def _publish(
+        self,
+        stream_id: str,
+        kind: str,
+        sequence: int,
+        page: DirectoryPage,
+        context: Mapping[str, object],
+        instance: Optional[str],
+        *,
+        final: bool = False,
+        complete: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        payload: Dict[str, object] = dict(context)
+        payload.update(
+            {
+                "stream_id": stream_id,
+                "kind": kind,
+                "sequence": sequence,
+                "cursor": page.cursor,
+                "items": list(page.items),
+                "final": final,
+                "complete": complete,
+            }
+        )
+        if error is not None:
+            payload["error"] = error
+        envelope = build_envelope(self._service, DIRECTORY_CHUNK_ACTION, payload)
+        await self._client.publish(DIRECTORY_CHUNK_ACTION, envelope, instance=instance)
@@ -0,0 +1,324 @@
+"""Envelope-encrypted session storage for bridge daemons."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+try:  # pragma: no cover - optional dependency
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # pragma: no cover - cryptography not installed during unit tests
+    AESGCM = None  # type: ignore
+    InvalidTag = Exception  # type: ignore
+
+from .credentials import CredentialBootstrapper
+
+_MAGIC = b"MSV1"
+_NONCE_SIZE = 12
+_KEY_SIZE = 32
+_WRAPPED_KEY_SIZE = _KEY_SIZE + 16
+
+
+class SessionVaultError(RuntimeError):
+    """Raised when a vault file cannot be decrypted or the master key is unusable."""
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    mtime_ns: int
+    size: int
+    plaintext: bytes
+
+
+class SessionVault:
+    """Encrypts session files at rest with per-file data keys.
+
+    Each write generates a fresh AES-256-GCM data key, encrypts the session with
+    it and stores the data key wrapped by the master key next to the ciphertext.
+    The master key is raw key material loaded once at startup, so loads only pay
+    for two AES-GCM operations and never a password KDF. Decrypted sessions are
+    kept in a bounded LRU cache validated against the file's ``mtime``/size, so
+    repeated ``load``/``export_base64`` calls skip disk reads and decryption.
+    """
+
+    def __init__(
+        self,
+        master_key: bytes,
+        *,
+        key_id: str = "primary",
+        retired_keys: Optional[Mapping[str, bytes]] = None,
+        cache_entries: int = 256,
+        cache_bytes: int = 16 * 1024 * 1024,
+        allow_plaintext: bool = True,
+    ) -> None:
+        if AESGCM is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("cryptography is required to encrypt bridge sessions")
+        encoded_id = key_id.encode("utf-8")
+        if not encoded_id or len(encoded_id) > 255:
+            raise ValueError("key_id must be between 1 and 255 bytes")
+
+        self._key_id = key_id
+        self._wrappers: Dict[str, AESGCM] = {}
+        for retired_id, retired_key in (retired_keys or {}).items():
+            self._wrappers[retired_id] = AESGCM(_validate_key(retired_key))
+        self._wrappers[key_id] = AESGCM(_validate_key(master_key))
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._cache_entries = max(0, int(cache_entries))
+        self._cache_bytes = max(0, int(cache_bytes))
+        self._cached_bytes = 0
+        self._allow_plaintext = allow_plaintext
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "encrypts": 0,
+            "decrypts": 0,
+            "plaintext_reads": 0,
+            "encrypt_seconds": 0.0,
+            "decrypt_seconds": 0.0,
+        }
+
+    @classmethod
+    async def from_bootstrapper(
+        cls,
+        bootstrapper: CredentialBootstrapper,
+        service: str,
+        **options: object,
+    ) -> "SessionVault":
+        """Build a vault from ``session_master_key`` in the service credentials.
+
+        The key must be 32 bytes encoded as base64. ``session_master_key_id`` names
+        the key so it can later be rotated, and ``session_retired_keys`` maps old
+        key ids to their base64 material so existing files stay readable.
+        """
+
+        credentials = await bootstrapper.bootstrap(service)
+        encoded = credentials.get("session_master_key")
+        if not isinstance(encoded, str) or not encoded:
+            raise SessionVaultError(f"credentials for {service} are missing session_master_key")
+        key_id = credentials.get("session_master_key_id")
+        retired: Dict[str, bytes] = {}
+        retired_payload = credentials.get("session_retired_keys")
+        if isinstance(retired_payload, Mapping):
+            for retired_id, retired_key in retired_payload.items():
+                if isinstance(retired_key, str):
+                    retired[str(retired_id)] = _decode_key(retired_key)
+        return cls(
+            _decode_key(encoded),
+            key_id=key_id if isinstance(key_id, str) and key_id else "primary",
+            retired_keys=retired,
+            **options,  # type: ignore[arg-type]
+        )
+
+    @property
+    def key_id(self) -> str:
+        return self._key_id
+
+    async def write(self, path: Path, plaintext: bytes) -> Path:
+        path = Path(path)
+        started = time.perf_counter()
+        sealed = self.seal(plaintext, associated=path.name)
+        self._stats["encrypt_seconds"] += time.perf_counter() - started
+        self._stats["encrypts"] += 1
+
+        tmp = path.with_suffix(".tmp")
+        await asyncio.to_thread(tmp.write_bytes, sealed)
+        await asyncio.to_thread(tmp.replace, path)
+        self._remember(path, bytes(plaintext))
+        return path
+
+    async def read(self, path: Path) -> Optional[bytes]:
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._forget(str(path))
+            return None
+
+        key = str(path)
+        entry = self._cache.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.plaintext
+
+        self._stats["misses"] += 1
+        raw = await asyncio.to_thread(path.read_bytes)
+        if raw.startswith(_MAGIC):
+            started = time.perf_counter()
+            plaintext = self.open(raw, associated=path.name)
+            self._stats["decrypt_seconds"] += time.perf_counter() - started
+            self._stats["decrypts"] += 1
+        elif self._allow_plaintext:
+            self._stats["plaintext_reads"] += 1
+            plaintext = raw
+        else:
+            raise SessionVaultError(f"{path.name} is not an encrypted session file")
+        self._remember(path, plaintext, stat.st_mtime_ns, stat.st_size)
+        return plaintext
+
+    async def checkout(self, sealed: Path, working: Path) -> Path:
+        """Decrypt ``sealed`` into the plaintext ``working`` file and return it.
+
+        Native clients (Telethon's SQLite session, libsignal stores) open their
+        session file themselves, so they get this owner-only working copy in a
+        private scratch directory instead of the ciphertext. When ``sealed``
+        does not exist yet the client starts from an empty working file path.
+        """
+
+        working = Path(working)
+        plaintext = await self.read(sealed)
+        if plaintext is not None:
+            await asyncio.to_thread(_write_private, working, plaintext)
+        return working
+
+    async def checkin(self, working: Path, sealed: Path) -> Optional[Path]:
+        """Seal the working copy back into ``sealed`` and remove the plaintext."""
+
+        working = Path(working)
+        if not working.exists():
+            return None
+        plaintext = await asyncio.to_thread(working.read_bytes)
+        path = await self.write(sealed, plaintext)
+        await asyncio.to_thread(_discard_working, working)
+        return path
+
+    async def delete(self, path: Path) -> None:
+        path = Path(path)
+        self._forget(str(path))
+        if path.exists():
+            await asyncio.to_thread(path.unlink)
+
+    def seal(self, plaintext: bytes, *, associated: str = "") -> bytes:
+        """Encrypt ``plaintext`` under a fresh data key wrapped by the active master key."""
+
+        aad = _MAGIC + associated.encode("utf-8")
+        data_key = AESGCM.generate_key(bit_length=_KEY_SIZE * 8)
+        key_nonce = os.urandom(_NONCE_SIZE)
+        data_nonce = os.urandom(_NONCE_SIZE)
+        wrapped = self._wrappers[self._key_id].encrypt(key_nonce, data_key, aad)
+        ciphertext = AESGCM(data_key).encrypt(data_nonce, bytes(plaintext), aad)
+        encoded_id = self._key_id.encode("utf-8")
+        return b"".join(
+            (_MAGIC, bytes([len(encoded_id)]), encoded_id, key_nonce, wrapped, data_nonce, ciphertext)
+        )
+
+    def open(self, sealed: bytes, *, associated: str = "") -> bytes:
+        """Unwrap the data key and decrypt a payload produced by :meth:`seal`."""
+
+        key_id, key_nonce, wrapped, data_nonce, ciphertext = _split(sealed)
+        wrapper = self._wrappers.get(key_id)
+        if wrapper is None:
+            raise SessionVaultError(f"unknown session master key {key_id!r}")
+        aad = _MAGIC + associated.encode("utf-8")
+        try:
+            data_key = wrapper.decrypt(key_nonce, wrapped, aad)
+            return AESGCM(data_key).decrypt(data_nonce, ciphertext, aad)
+        except InvalidTag as exc:
+            raise SessionVaultError("session file failed authentication") from exc
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        if path is None:
+            self._cache.clear()
+            self._cached_bytes = 0
+            return
+        self._forget(str(Path(path)))
+
+    def stats(self) -> Mapping[str, object]:
+        decrypts = self._stats["decrypts"]
+        encrypts = self._stats["encrypts"]
+        return {
+            "cache_entries": len(self._cache),
+            "cache_bytes": self._cached_bytes,
+            "hits": int(self._stats["hits"]),
+            "misses": int(self._stats["misses"]),
+            "evictions": int(self._stats["evictions"]),
+            "encrypts": int(encrypts),
+            "decrypts": int(decrypts),
+            "plaintext_reads": int(self._stats["plaintext_reads"]),
+            "avg_encrypt_us": (self._stats["encrypt_seconds"] / encrypts * 1e6) if encrypts else None,
+            "avg_decrypt_us": (self._stats["decrypt_seconds"] / decrypts * 1e6) if decrypts else None,
+        }
+
+    def _remember(
+        self,
+        path: Path,
+        plaintext: bytes,
+        mtime_ns: Optional[int] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        key = str(path)
+        self._forget(key)
+        if self._cache_entries == 0 or len(plaintext) > self._cache_bytes:
+            return
+        if mtime_ns is None or size is None:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # pragma: no cover - raced with a delete
+                return
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        self._cache[key] = _CacheEntry(mtime_ns=mtime_ns, size=size, plaintext=plaintext)
+        self._cached_bytes += len(plaintext)
+        while len(self._cache) > self._cache_entries or self._cached_bytes > self._cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted.plaintext)
+            self._stats["evictions"] += 1
+
+    def _forget(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._cached_bytes -= len(entry.plaintext)
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(data)
+
+
+def _discard_working(path: Path) -> None:
+    # SQLite-backed sessions may leave journal files next to the database.
+    for candidate in (path, *(path.with_name(path.name + suffix) for suffix in ("-journal", "-wal", "-shm"))):
+        if candidate.exists():
+            candidate.unlink()
+
+
+def _split(sealed: bytes) -> Tuple[str, bytes, bytes, bytes, bytes]:
+    if not sealed.startswith(_MAGIC) or len(sealed) < len(_MAGIC) + 1:
+        raise SessionVaultError("payload is not an encrypted session")
+    offset = len(_MAGIC)
+    id_length = sealed[offset]
+    offset += 1
+    header_end = offset + id_length + _NONCE_SIZE + _WRAPPED_KEY_SIZE + _NONCE_SIZE
+    if len(sealed) < header_end:
+        raise SessionVaultError("encrypted session header is truncated")
+    key_id = sealed[offset : offset + id_length].decode("utf-8", errors="replace")
+    offset += id_length
+    key_nonce = sealed[offset : offset + _NONCE_SIZE]
+    offset += _NONCE_SIZE
+    wrapped = sealed[offset : offset + _WRAPPED_KEY_SIZE]
+    offset += _WRAPPED_KEY_SIZE
+    data_nonce = sealed[offset : offset + _NONCE_SIZE]
+    offset += _NONCE_SIZE
+    return key_id, key_nonce, wrapped, data_nonce, sealed[offset:]
+
+
+def _decode_key(encoded: str) -> bytes:
+    try:
+        return _validate_key(base64.b64decode(encoded.strip(), altchars=b"-_", validate=False))
+    except (binascii.Error, ValueError) as exc:
+        raise SessionVaultError("session master key must be 32 bytes of base64") from exc
+
+
+def _validate_key(key: bytes) -> bytes:
+    if len(key) != _KEY_SIZE:
+        raise ValueError("session master key must be 32 bytes")
+    return bytes(key)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Awaitable, Callable, Dict, Mapping, Optional, Tuple
 
 from msgr_bridge_sdk import Envelope, StoneMQClient, build_envelope
+from msgr_bridge_sdk.acks import AckLedger
 
 from .client import (
     AuthenticationError,
@@ -26,13 +27,14 @@ class MatrixBridgeDaemon:
         *,
         default_user_id: Optional[str] = None,
         default_homeserver: Optional[str] = None,
+        ack_ledger: Optional[AckLedger] = None,
     ) -> None:
         self._client = mq_client
         self._sessions = sessions
         self._default_user_id = default_user_id
         self._default_homeserver = default_homeserver
         self._update_handlers: Dict[Tuple[str, str], Callable[[MatrixEvent], Awaitable[None]]] = {}
-        self._ack_state: Dict[str, Mapping[str, object]] = {}
+        self._ack_state = ack_ledger if ack_ledger is not None else AckLedger()
 
         self._client.register("outbound_message", self._handle_outbound_message)
         self._client.register("ack_update", self._handle_ack_update)
@@ -149,7 +151,7 @@ class MatrixBridgeDaemon:
             return
 
         await client.acknowledge(event_id)
-        self._ack_state[event_id] = dict(payload)
+        self._ack_state.record(event_id, payload)
 
     async def _register_update_handler(
         self,
@@ -184,7 +186,7 @@ class MatrixBridgeDaemon:
 
     @property
     def acked_updates(self) -> Dict[str, Mapping[str, object]]:
-        return dict(self._ack_state)
+        return self._ack_state.as_dict()
 
     def _parse_session(
         self, session_info: object, homeserver: str
@@ -7,6 +7,7 @@ import inspect
 from typing import Awaitable, Callable, Dict, Mapping, Optional, Sequence
 
 from msgr_bridge_sdk import Envelope, StoneMQClient, build_envelope
+from msgr_bridge_sdk.acks import AckLedger
 
 from .client import SignalClientProtocol, decode_session_blob
 from .session import SessionManager
@@ -31,12 +32,13 @@ class SignalBridgeDaemon:
         sessions: SessionManager,
         *,
         default_user_id: Optional[str] = None,
+        ack_ledger: Optional[AckLedger] = None,
     ) -> None:
         self._client = mq_client
         self._sessions = sessions
         self._default_user_id = default_user_id
         self._event_handlers: Dict[str, Callable[[Mapping[str, object]], Awaitable[None]]] = {}
-        self._ack_state: Dict[str, Mapping[str, object]] = {}
+        self._ack_state = ack_ledger if ack_ledger is not None else AckLedger()
 
         self._client.register("outbound_message", self._handle_outbound_message)
         self._client.register("ack_event", self._handle_ack_event)
@@ -119,7 +121,7 @@ class SignalBridgeDaemon:
 
         event_key = str(event_id)
         await client.acknowledge_event(event_key)
-        self._ack_state[event_key] = dict(payload)
+        self._ack_state.record(event_key, payload)
 
     async def _register_event_handler(
         self, user_id: str, client: SignalClientProtocol
@@ -152,7 +154,7 @@ class SignalBridgeDaemon:
 
     @property
     def acked_events(self) -> Dict[str, Mapping[str, object]]:
-        return dict(self._ack_state)
+        return self._ack_state.as_dict()
 
     async def _build_linked_response(
         self, user_id: str, client: SignalClientProtocol, profile
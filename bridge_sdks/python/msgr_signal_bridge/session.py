@@ -4,24 +4,47 @@ from __future__ import annotations
 
 import asyncio
 import re
+import tempfile
 from pathlib import Path
 from typing import Callable, Dict, Optional
 
+from msgr_bridge_sdk.vault import SessionVault
+
 from .client import SignalClientProtocol, encode_session_blob
 
 
 class SessionStore:
-    """Persists Signal session state blobs on disk."""
-
-    def __init__(self, base_path: Path) -> None:
+    """Persists Signal session state blobs on disk.
+
+    With a vault the session is kept sealed in ``<user>.sealed``. The native
+    client never sees the ciphertext: :meth:`checkout` decrypts it into an
+    owner-only working copy under ``work_path`` (a private temp directory by
+    default) and :meth:`checkin` seals that copy back once the client is gone.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        *,
+        vault: Optional[SessionVault] = None,
+        work_path: Optional[Path] = None,
+    ) -> None:
         self._base = Path(base_path)
         self._base.mkdir(parents=True, exist_ok=True)
+        self._vault = vault
+        self._work_path = Path(work_path) if work_path is not None else None
+        self._checked_out: Dict[str, Path] = {}
 
     def path_for(self, user_id: str) -> Path:
         safe = _slugify(user_id)
         return self._base / f"{safe}.state"
 
+    def sealed_path_for(self, user_id: str) -> Path:
+        return self._base / f"{_slugify(user_id)}.sealed"
+
     async def persist(self, user_id: str, blob: bytes) -> Path:
+        if self._vault is not None:
+            return await self._vault.write(self.sealed_path_for(user_id), blob)
         path = self.path_for(user_id)
         tmp = path.with_suffix(".tmp")
         await asyncio.to_thread(tmp.write_bytes, blob)
@@ -29,6 +52,12 @@ class SessionStore:
         return path
 
     async def load(self, user_id: str) -> Optional[bytes]:
+        if self._vault is not None:
+            working = self._checked_out.get(user_id)
+            if working is not None and working.exists():
+                # The live client writes to its working copy; that is newest.
+                return await asyncio.to_thread(working.read_bytes)
+            return await self._vault.read(self._sealed_source(user_id))
         path = self.path_for(user_id)
         if not path.exists():
             return None
@@ -40,6 +69,41 @@ class SessionStore:
             return None
         return encode_session_blob(data)
 
+    async def checkout(self, user_id: str) -> Path:
+        """Return the session file path to hand to the platform client."""
+
+        if self._vault is None:
+            return self.path_for(user_id)
+        working = self._working_dir() / self.path_for(user_id).name
+        await self._vault.checkout(self._sealed_source(user_id), working)
+        self._checked_out[user_id] = working
+        return working
+
+    async def checkin(self, user_id: str) -> None:
+        """Seal the working copy of a released client back into the vault."""
+
+        working = self._checked_out.pop(user_id, None)
+        if self._vault is None or working is None:
+            return
+        if await self._vault.checkin(working, self.sealed_path_for(user_id)) is not None:
+            legacy = self.path_for(user_id)
+            if legacy.exists():
+                await asyncio.to_thread(legacy.unlink)
+
+    def _sealed_source(self, user_id: str) -> Path:
+        # Plaintext files from before the vault was enabled are read once and
+        # sealed on the next checkin.
+        sealed = self.sealed_path_for(user_id)
+        legacy = self.path_for(user_id)
+        return legacy if not sealed.exists() and legacy.exists() else sealed
+
+    def _working_dir(self) -> Path:
+        if self._work_path is None:
+            self._work_path = Path(tempfile.mkdtemp(prefix="msgr-signal-"))
+        else:
+            self._work_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return self._work_path
+
 
 class SessionManager:
     """Coordinates Signal client instances and shared session state."""
@@ -62,9 +126,13 @@ class SessionManager:
             if session_blob is not None:
                 await self._store.persist(user_id, session_blob)
 
-            path = self._store.path_for(user_id)
+            path = await self._store.checkout(user_id)
             client = self._factory(path)
-            await client.connect()
+            try:
+                await client.connect()
+            except BaseException:
+                await self._store.checkin(user_id)
+                raise
             self._clients[user_id] = client
             return client
 
@@ -78,6 +146,7 @@ class SessionManager:
         client = self._clients.pop(user_id, None)
         if client is not None and disconnect:
             await client.disconnect()
+        await self._store.checkin(user_id)
 
     async def export_session(self, user_id: str) -> Optional[str]:
         return await self._store.export_base64(user_id)
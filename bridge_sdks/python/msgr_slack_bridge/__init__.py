@@ -11,6 +11,9 @@ from .client import (
     SlackWorkspace,
 )
 from .daemon import SlackBridgeDaemon
+from .directory import SlackDirectoryCache
+from .events import SlackEventsReceiver
+from .outbound import CoalescePolicy, OutboundMessage, OutboundResult, SlackOutboundSender
 from .session import SessionData, SessionManager, SessionStore
 
 __all__ = [
@@ -23,6 +26,12 @@ __all__ = [
     "SlackUser",
     "SlackWorkspace",
     "SlackBridgeDaemon",
+    "SlackDirectoryCache",
+    "SlackEventsReceiver",
+    "CoalescePolicy",
+    "OutboundMessage",
+    "OutboundResult",
+    "SlackOutboundSender",
     "SessionData",
     "SessionManager",
     "SessionStore",
@@ -4,11 +4,17 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import hashlib
 import json
 import logging
+import random
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from pathlib import Path
 from typing import (
+    AsyncIterable,
+    AsyncIterator,
     Awaitable,
     Callable,
     Dict,
@@ -21,6 +27,15 @@ from typing import (
     Union,
 )
 
+from msgr_bridge_sdk.http import HttpClientPool, shared_http_pool
+from msgr_bridge_sdk.inflight import InflightLedger
+from msgr_bridge_sdk.singleflight import SingleFlight
+from msgr_bridge_sdk.streaming import DirectoryPage
+
+from .directory import SlackDirectoryCache
+from .events import SlackEventsReceiver
+from .ratelimit import PRIORITY_BULK, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, SlackRateLimiter, parse_retry_after
+
 try:  # pragma: no cover - optional runtime dependency
     import aiohttp
     from aiohttp import ClientSession, ClientWebSocketResponse, WSMessage, WSMsgType
@@ -33,6 +48,12 @@ except ImportError:  # pragma: no cover - aiohttp not installed during unit test
 
 UpdateHandler = Callable[[Mapping[str, object]], Awaitable[None]]
 
+OVERFLOW_POLICIES = frozenset({"block", "drop_oldest", "drop_newest"})
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+SlackUploadContent = Union[bytes, Path, AsyncIterable[bytes]]
+
 
 @dataclass(frozen=True)
 class SlackWorkspace:
@@ -122,17 +143,54 @@ class SlackFileReference:
 
 @dataclass(frozen=True)
 class SlackFileUpload:
-    """Represents a new file that should be uploaded to Slack."""
+    """Represents a new file that should be uploaded to Slack.
+
+    ``content`` may be in-memory bytes, a :class:`~pathlib.Path` that is read in
+    chunks while uploading, or an async iterator of byte chunks. Slack needs the
+    size up front, so iterator sources must also set ``length``; they can only be
+    consumed once.
+    """
 
     filename: str
-    content: bytes
+    content: SlackUploadContent
     content_type: str = "application/octet-stream"
     title: Optional[str] = None
     alt_text: Optional[str] = None
     snippet_type: Optional[str] = None
+    length: Optional[int] = None
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path], **kwargs: object) -> "SlackFileUpload":
+        file_path = Path(path)
+        kwargs.setdefault("filename", file_path.name)
+        return cls(content=file_path, **kwargs)  # type: ignore[arg-type]
 
     def content_length(self) -> int:
-        return len(self.content)
+        if self.length is not None:
+            return self.length
+        if isinstance(self.content, (bytes, bytearray, memoryview)):
+            return len(self.content)
+        if isinstance(self.content, Path):
+            return self.content.stat().st_size
+        raise ValueError("length is required for streamed Slack uploads")
+
+    async def iter_chunks(self, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        content = self.content
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            yield bytes(content)
+        elif isinstance(content, Path):
+            handle = await asyncio.to_thread(content.open, "rb")
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(handle.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                await asyncio.to_thread(handle.close)
+        else:
+            async for chunk in content:
+                yield chunk
 
 
 @dataclass(frozen=True)
@@ -166,7 +224,7 @@ class SlackClientProtocol(Protocol):
         """Gracefully close the websocket connection."""
 
     async def is_connected(self) -> bool:
-        """Return ``True`` when an RTM connection is active."""
+        """Return ``True`` when an RTM connection is active or being re-established."""
 
     async def fetch_identity(self) -> SlackIdentity:
         """Return the workspace and user identity bound to the current token."""
@@ -180,6 +238,12 @@ class SlackClientProtocol(Protocol):
     async def list_conversations(self) -> Sequence[Mapping[str, object]]:
         """Return a snapshot of available channels, groups and DMs."""
 
+    def stream_members(self) -> AsyncIterator[DirectoryPage]:
+        """Yield workspace members page by page as they are fetched."""
+
+    def stream_conversations(self) -> AsyncIterator[DirectoryPage]:
+        """Yield channels, groups and DMs page by page as they are fetched."""
+
     async def post_message(
         self,
         channel: str,
@@ -231,20 +295,42 @@ class SlackRTMClient(SlackClientProtocol):
         *,
         session: Optional[ClientSession] = None,
         logger: Optional[logging.Logger] = None,
+        http_pool: Optional[HttpClientPool] = None,
+        singleflight: Optional[SingleFlight] = None,
+        directory: Optional[SlackDirectoryCache] = None,
+        rate_limiter: Optional[SlackRateLimiter] = None,
+        max_rate_limit_retries: int = 5,
+        reconnect_backoff: float = 1.0,
+        max_reconnect_backoff: float = 60.0,
+        backfill_channels: int = 50,
+        backfill_pages: int = 5,
+        dispatch_workers: int = 4,
+        dispatch_queue_size: int = 1000,
+        overflow_policy: str = "block",
+        upload_concurrency: int = 4,
+        upload_read_timeout: float = 120.0,
+        events_receiver: Optional[SlackEventsReceiver] = None,
     ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {sorted(OVERFLOW_POLICIES)}")
         if session is not None and ClientSession is not None and not isinstance(session, ClientSession):
             raise RuntimeError("session must be an aiohttp.ClientSession instance")
 
         self._session = session
-        self._owns_session = session is None
+        self._pooled_session = False
+        self._http_pool = http_pool
         self._logger = logger or logging.getLogger(__name__)
+        self._flights = singleflight or SingleFlight()
+        self._directory = directory
+        self._rate_limiter = rate_limiter or SlackRateLimiter()
+        self._max_rate_limit_retries = max(0, int(max_rate_limit_retries))
         self._token: Optional[SlackToken] = None
         self._websocket: Optional[ClientWebSocketResponse] = None
         self._reader_task: Optional[asyncio.Task[None]] = None
         self._handlers: list[UpdateHandler] = []
         self._identity: Optional[SlackIdentity] = None
         self._capabilities: Optional[Mapping[str, object]] = None
-        self._inflight: Dict[str, float] = {}
+        self._inflight = InflightLedger()
         self._last_event_at: Optional[float] = None
         self._last_event_id: Optional[str] = None
         self._last_ack_at: Optional[float] = None
@@ -252,13 +338,62 @@ class SlackRTMClient(SlackClientProtocol):
         self._last_ack_event_id: Optional[str] = None
         self._last_connect_at: Optional[float] = None
         self._last_disconnect_at: Optional[float] = None
+        self._reconnect_backoff = max(0.0, float(reconnect_backoff))
+        self._max_reconnect_backoff = max(self._reconnect_backoff, float(max_reconnect_backoff))
+        self._backfill_channels = max(0, int(backfill_channels))
+        self._backfill_pages = max(1, int(backfill_pages))
+        self._last_seen_ts: "OrderedDict[str, str]" = OrderedDict()
+        self._closing = False
+        self._reconnecting = False
+        self._reconnects = 0
+        self._down_since: Optional[float] = None
+        self._last_downtime: Optional[float] = None
+        self._total_downtime = 0.0
+        self._backfilled_messages = 0
+        workers = max(1, int(dispatch_workers))
+        shard_size = max(1, int(dispatch_queue_size) // workers)
+        self._dispatch_queues: list[asyncio.Queue[tuple[float, Mapping[str, object]]]] = [
+            asyncio.Queue(maxsize=shard_size) for _ in range(workers)
+        ]
+        self._dispatch_tasks: list[asyncio.Task[None]] = []
+        self._overflow_policy = overflow_policy
+        self._dropped_events = 0
+        self._last_dispatch_lag: Optional[float] = None
+        self._max_dispatch_lag = 0.0
+        self._upload_concurrency = max(1, int(upload_concurrency))
+        self._upload_read_timeout = max(1.0, float(upload_read_timeout))
+        self._events_receiver = events_receiver
+        self._events_route: Optional[tuple[str, str]] = None
 
     async def connect(self, token: SlackToken) -> None:
-        if aiohttp is None:  # pragma: no cover - exercised in integration tests
-            raise RuntimeError("aiohttp is required to establish Slack RTM sessions")
-
         await self._ensure_session()
         self._token = token
+        self._closing = False
+        if self._events_receiver is not None:
+            await self._register_events_route()
+            self._start_dispatchers()
+            return
+        await self._open_rtm()
+        self._start_dispatchers()
+        self._reader_task = asyncio.create_task(self._supervise(), name="slack-rtm")
+
+    async def _register_events_route(self) -> None:
+        # Events API mode: Slack pushes to the shared receiver, so no websocket
+        # is opened; deliveries enter the same normalise/dispatch path as RTM.
+        assert self._events_receiver is not None
+        identity = await self.fetch_identity()
+        route = (identity.workspace.id, identity.user.id)
+        self._events_receiver.register(route[0], self.ingest_event, user_id=route[1])
+        self._events_route = route
+        self._last_connect_at = time.time()
+        self._logger.info(
+            "Slack Events API route registered",
+            extra={"workspace": route[0], "user": route[1]},
+        )
+
+    async def _open_rtm(self) -> None:
+        if aiohttp is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to establish Slack RTM sessions")
 
         handshake = await self._api_call("rtm.connect")
         url = str(handshake.get("url"))
@@ -279,24 +414,33 @@ class SlackRTMClient(SlackClientProtocol):
         )
 
         assert self._session is not None
-        self._websocket = await self._session.ws_connect(url, heartbeat=20)
-        self._reader_task = asyncio.create_task(self._consume_events(), name="slack-rtm")
+        # Sockets stay open for the client's lifetime, so pooled clients open
+        # them on the pool's unlimited websocket session, not the API one.
+        session = await self._pool().websocket_session() if self._pooled_session else self._session
+        self._websocket = await session.ws_connect(url, heartbeat=20)
         self._last_connect_at = time.time()
 
     async def disconnect(self) -> None:
+        self._closing = True
         if self._reader_task is not None:
             self._reader_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._reader_task
             self._reader_task = None
+        await self._stop_dispatchers()
+
+        if self._events_route is not None and self._events_receiver is not None:
+            self._events_receiver.unregister(self._events_route[0], user_id=self._events_route[1])
+            self._events_route = None
 
         if self._websocket is not None:
             await self._websocket.close()
             self._websocket = None
 
-        if self._owns_session and self._session is not None:
-            await self._session.close()
+        if self._pooled_session:
+            # Pooled sessions are shared with other clients; only drop the reference.
             self._session = None
+            self._pooled_session = False
 
         self._last_disconnect_at = time.time()
         identity = self._identity
@@ -309,21 +453,22 @@ class SlackRTMClient(SlackClientProtocol):
         )
 
     async def is_connected(self) -> bool:
+        if self._events_receiver is not None:
+            return self._events_route is not None
+        if self._reconnecting and not self._closing:
+            # The supervisor owns the socket and will backfill the gap; callers
+            # must not tear the client down and lose its resume cursor.
+            return True
         return bool(self._websocket is not None and not self._websocket.closed)
 
     async def fetch_identity(self) -> SlackIdentity:
         if self._identity is None:
-            auth = await self._api_call("auth.test")
-            user_id = str(auth.get("user_id"))
-            team_id = str(auth.get("team_id"))
-            user_info = await self._api_call("users.info", params={"user": user_id})
-            team_info = await self._api_call("team.info", params={"team": team_id})
-            self._identity = _build_identity_from_payload(team_info, user_info)
+            self._identity = await self._flights.do(self._flight_key("identity"), self._load_identity)
         return self._identity
 
     async def describe_capabilities(self) -> Mapping[str, object]:
         if self._capabilities is None:
-            auth = await self._api_call("auth.test")
+            auth = await self._auth_test()
             capabilities: Dict[str, object] = {
                 "messaging": {
                     "text": True,
@@ -339,17 +484,58 @@ class SlackRTMClient(SlackClientProtocol):
         return self._capabilities
 
     async def list_members(self) -> Sequence[Mapping[str, object]]:
-        members: list[Mapping[str, object]] = []
-        async for page in self._paginate("users.list", "members", params={"limit": 200}):
-            members.extend(page)
-        return members
+        if self._directory is not None:
+            identity = await self.fetch_identity()
+            return await self._directory.members(identity.workspace.id, self._load_members)
+        return list(await self._flights.do(self._flight_key("users.list"), self._load_members))
 
     async def list_conversations(self) -> Sequence[Mapping[str, object]]:
-        conversations: list[Mapping[str, object]] = []
-        params = {"types": "public_channel,private_channel,mpim,im", "limit": 200}
-        async for page in self._paginate("conversations.list", "channels", params=params):
-            conversations.extend(page)
-        return conversations
+        if self._directory is not None:
+            identity = await self.fetch_identity()
+            public = await self._directory.channels(
+                identity.workspace.id, lambda: self._load_conversations("public_channel")
+            )
+            private = await self._flights.do(
+                self._flight_key("conversations.list:private"),
+                lambda: self._load_conversations("private_channel,mpim,im"),
+            )
+            # A channel can come back from both listings (e.g. one converted
+            # to private since the shared crawl); keep one entry per id.
+            merged: Dict[str, Mapping[str, object]] = {}
+            for channel in (*public, *private):
+                merged.setdefault(str(channel.get("id")), channel)
+            return list(merged.values())
+        return list(await self._flights.do(self._flight_key("conversations.list"), self._load_conversations))
+
+    async def stream_members(self) -> AsyncIterator[DirectoryPage]:
+        if self._directory is None:
+            async for page in self._member_pages():
+                yield page
+            return
+        identity = await self.fetch_identity()
+        async for page in self._directory.stream_members(identity.workspace.id, self._member_pages):
+            yield page
+
+    async def stream_conversations(self) -> AsyncIterator[DirectoryPage]:
+        if self._directory is None:
+            params = {"types": "public_channel,private_channel,mpim,im", "limit": 200}
+            async for page in self._paginate_pages("conversations.list", "channels", params=params):
+                yield page
+            return
+        identity = await self.fetch_identity()
+        public = {"types": "public_channel", "limit": 200}
+        seen: set[str] = set()
+        async for page in self._directory.stream_channels(
+            identity.workspace.id, lambda: self._paginate_pages("conversations.list", "channels", params=public)
+        ):
+            seen.update(str(channel.get("id")) for channel in page.items)
+            # An empty cursor ends the shared public listing; the per-token
+            # private listing follows in the same stream.
+            yield DirectoryPage(items=page.items, cursor=page.cursor or "")
+        private = {"types": "private_channel,mpim,im", "limit": 200}
+        async for page in self._paginate_pages("conversations.list", "channels", params=private):
+            items = [channel for channel in page.items if str(channel.get("id")) not in seen]
+            yield DirectoryPage(items=items, cursor=page.cursor)
 
     async def post_message(
         self,
@@ -381,12 +567,13 @@ class SlackRTMClient(SlackClientProtocol):
 
         uploads: list[SlackUploadedFile] = []
         if file_uploads:
-            for upload_candidate in file_uploads:
-                upload = _coerce_file_upload(upload_candidate)
-                if upload is None:
-                    continue
-                uploaded_file = await self._upload_file(channel, upload, thread_ts=thread_ts)
-                uploads.append(uploaded_file)
+            pending_uploads = [
+                upload
+                for upload in (_coerce_file_upload(candidate) for candidate in file_uploads)
+                if upload is not None
+            ]
+            if pending_uploads:
+                uploads = await self._upload_files(channel, pending_uploads, thread_ts=thread_ts)
 
         references: list[SlackFileReference] = []
         if file_references:
@@ -403,7 +590,9 @@ class SlackRTMClient(SlackClientProtocol):
         if message_blocks:
             payload["blocks"] = message_blocks
 
-        response = await self._api_call("chat.postMessage", http_method="POST", payload=payload)
+        response = await self._api_call(
+            "chat.postMessage", http_method="POST", payload=payload, priority=PRIORITY_INTERACTIVE
+        )
         if uploads:
             response = dict(response)
             response["uploaded_files"] = [upload.to_dict() for upload in uploads]
@@ -413,9 +602,9 @@ class SlackRTMClient(SlackClientProtocol):
         if not event_id:
             return
         now = time.time()
-        dispatched_at = self._inflight.pop(event_id, None)
-        if dispatched_at is not None:
-            self._last_ack_latency = max(0.0, now - dispatched_at)
+        latency = self._inflight.ack(event_id, now)
+        if latency is not None:
+            self._last_ack_latency = latency
         self._last_ack_at = now
         self._last_ack_event_id = event_id
         if self._websocket is not None and not self._websocket.closed:
@@ -436,8 +625,111 @@ class SlackRTMClient(SlackClientProtocol):
         if self._session is None:
             if aiohttp is None:  # pragma: no cover
                 raise RuntimeError("aiohttp is required to create a Slack HTTP session")
-            timeout = aiohttp.ClientTimeout(total=60)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            self._session = await self._pool().session("slack.com")
+            self._pooled_session = True
+
+    def _pool(self) -> HttpClientPool:
+        return self._http_pool or shared_http_pool()
+
+    def _request_options(self) -> Dict[str, object]:
+        # Pooled sessions have no total timeout; bounded API calls add it here.
+        return {"timeout": self._pool().request_timeout()} if self._pooled_session else {}
+
+    async def _supervise(self) -> None:
+        try:
+            while not self._closing:
+                await self._consume_events()
+                if self._closing:
+                    return
+                await self._reconnect()
+        except asyncio.CancelledError:  # pragma: no cover - cancellation path
+            pass
+
+    async def _reconnect(self) -> None:
+        self._down_since = time.time()
+        self._last_disconnect_at = self._down_since
+        self._reconnecting = True
+        self._logger.warning("Slack RTM connection lost; reconnecting")
+        attempt = 0
+        try:
+            while not self._closing:
+                delay = min(self._max_reconnect_backoff, self._reconnect_backoff * (2**attempt))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                if self._websocket is not None:
+                    with contextlib.suppress(Exception):
+                        await self._websocket.close()
+                    self._websocket = None
+                try:
+                    await self._open_rtm()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:  # pragma: no cover - network failures logged for ops
+                    attempt += 1
+                    self._logger.exception("Slack RTM reconnect failed", extra={"attempt": attempt})
+                    continue
+                break
+        finally:
+            self._reconnecting = False
+
+        if self._closing:
+            return
+        downtime = max(0.0, time.time() - self._down_since)
+        self._down_since = None
+        self._reconnects += 1
+        self._last_downtime = downtime
+        self._total_downtime += downtime
+        self._logger.info("Slack RTM reconnected", extra={"downtime": downtime, "attempts": attempt + 1})
+        await self._backfill_gap()
+
+    async def _backfill_gap(self) -> None:
+        """Replay messages posted while disconnected for recently active channels."""
+
+        for channel, oldest in list(self._last_seen_ts.items()):
+            try:
+                messages = await self._history_since(channel, oldest)
+            except Exception:  # pragma: no cover - backfill failures logged for ops
+                self._logger.exception("Slack backfill failed", extra={"channel": channel})
+                continue
+            for message in messages:
+                event = _normalise_event({"type": "message", "channel": channel, **dict(message)})
+                if event is None:
+                    continue
+                event["backfilled"] = True
+                self._backfilled_messages += 1
+                await self._enqueue_event(event)
+
+    async def _history_since(self, channel: str, oldest: str) -> list[Mapping[str, object]]:
+        collected: list[Mapping[str, object]] = []
+        cursor: Optional[str] = None
+        for _ in range(self._backfill_pages):
+            # ``oldest`` is exclusive by default; GET params must stay str/int
+            # for yarl, so ``inclusive`` is left unset rather than sent as False.
+            params: Dict[str, object] = {"channel": channel, "oldest": oldest, "limit": 200}
+            if cursor:
+                params["cursor"] = cursor
+            data = await self._api_call("conversations.history", params=params)
+            messages = data.get("messages")
+            if isinstance(messages, list):
+                collected.extend(message for message in messages if isinstance(message, Mapping))
+            cursor = _extract_cursor(data)
+            if not cursor or not data.get("has_more", True):
+                break
+        collected.sort(key=lambda message: _ts_key(message.get("ts")))
+        return collected
+
+    def _remember_ts(self, event: Mapping[str, object]) -> None:
+        if self._backfill_channels == 0:
+            return
+        channel = _ensure_str(event.get("channel_id"))
+        ts = _ensure_str(event.get("ts"))
+        if channel is None or ts is None:
+            return
+        previous = self._last_seen_ts.get(channel)
+        if previous is None or _ts_key(ts) > _ts_key(previous):
+            self._last_seen_ts[channel] = ts
+        self._last_seen_ts.move_to_end(channel)
+        while len(self._last_seen_ts) > self._backfill_channels:
+            self._last_seen_ts.popitem(last=False)
 
     async def _consume_events(self) -> None:
         if self._websocket is None:
@@ -446,7 +738,7 @@ class SlackRTMClient(SlackClientProtocol):
             async for message in self._websocket:  # type: ignore[union-attr]
                 await self._handle_ws_message(message)
         except asyncio.CancelledError:  # pragma: no cover - cancellation path
-            pass
+            raise
         except Exception:  # pragma: no cover - network failures logged for ops
             self._logger.exception("Slack websocket consumer crashed")
 
@@ -455,27 +747,106 @@ class SlackRTMClient(SlackClientProtocol):
             return
         if message.type == WSMsgType.TEXT:
             payload = json.loads(message.data)
-            event = _normalise_event(payload)
-            if event is not None:
-                event_type = event.get("type") or event.get("callback_type")
-                event_id = event.get("event_id")
-                self._logger.debug(
-                    "Slack event received",
-                    extra={"event_type": event_type, "event_id": event_id},
-                )
-                await self._dispatch_event(event)
+            if isinstance(payload, Mapping) and payload.get("type") == "goodbye":
+                self._logger.info("Slack RTM server requested reconnect")
+                if self._websocket is not None:
+                    await self._websocket.close()
+                return
+            await self.ingest_event(payload)
         elif message.type in (WSMsgType.CLOSE, WSMsgType.CLOSED, WSMsgType.ERROR):
             self._logger.debug("Slack websocket closed: %s", message.type)
 
+    async def ingest_event(self, payload: Mapping[str, object]) -> None:
+        """Normalise a raw RTM frame or Events API payload and queue it for handlers."""
+
+        await self._observe_directory(payload)
+        event = _normalise_event(payload)
+        if event is not None:
+            event_type = event.get("type") or event.get("callback_type")
+            event_id = event.get("event_id")
+            self._logger.debug(
+                "Slack event received",
+                extra={"event_type": event_type, "event_id": event_id},
+            )
+            await self._enqueue_event(event)
+
+    async def _observe_directory(self, payload: object) -> None:
+        if self._directory is None or not isinstance(payload, Mapping):
+            return
+        team_id = self._identity.workspace.id if self._identity is not None else None
+        try:
+            await self._directory.apply_event(payload, team_id=team_id)
+        except Exception:  # pragma: no cover - directory failures must not drop events
+            self._logger.exception("Slack directory update failed")
+
+    def _start_dispatchers(self) -> None:
+        if any(not task.done() for task in self._dispatch_tasks):
+            return
+        self._dispatch_tasks = [
+            asyncio.create_task(self._dispatch_worker(queue), name=f"slack-dispatch-{index}")
+            for index, queue in enumerate(self._dispatch_queues)
+        ]
+
+    async def _stop_dispatchers(self) -> None:
+        for task in self._dispatch_tasks:
+            task.cancel()
+        for task in self._dispatch_tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._dispatch_tasks = []
+
+    async def _enqueue_event(self, event: Mapping[str, object]) -> None:
+        """Hand an event to the worker owning its channel without blocking the reader.
+
+        Events for one channel always land on the same worker so their order is
+        preserved while different channels are dispatched in parallel.
+        """
+
+        if not self._dispatch_tasks:
+            await self._dispatch_event(event)
+            return
+        channel = _ensure_str(event.get("channel_id")) or ""
+        queue = self._dispatch_queues[hash(channel) % len(self._dispatch_queues)]
+        item = (time.monotonic(), event)
+        if not queue.full():
+            queue.put_nowait(item)
+            return
+        if self._overflow_policy == "drop_newest":
+            self._dropped_events += 1
+            self._logger.warning("Slack dispatch queue full; dropping event", extra={"channel": channel})
+            return
+        if self._overflow_policy == "drop_oldest":
+            with contextlib.suppress(asyncio.QueueEmpty):
+                queue.get_nowait()
+                queue.task_done()
+                self._dropped_events += 1
+            self._logger.warning("Slack dispatch queue full; dropping oldest event", extra={"channel": channel})
+            queue.put_nowait(item)
+            return
+        await queue.put(item)
+
+    async def _dispatch_worker(self, queue: "asyncio.Queue[tuple[float, Mapping[str, object]]]") -> None:
+        while True:
+            enqueued_at, event = await queue.get()
+            try:
+                lag = time.monotonic() - enqueued_at
+                self._last_dispatch_lag = lag
+                self._max_dispatch_lag = max(self._max_dispatch_lag, lag)
+                await self._dispatch_event(event)
+            except Exception:  # pragma: no cover - handler failures logged for ops
+                self._logger.exception("Slack dispatch worker failed")
+            finally:
+                queue.task_done()
+
     async def _dispatch_event(self, event: Mapping[str, object]) -> None:
         now = time.time()
         event_id = event.get("event_id")
         if isinstance(event_id, (str, int)):
             event_id_str = str(event_id)
-            self._inflight.setdefault(event_id_str, now)
+            self._inflight.record(event_id_str, now)
             self._last_event_id = event_id_str
-            self._trim_inflight()
         self._last_event_at = now
+        self._remember_ts(event)
         for handler in list(self._handlers):
             try:
                 await handler(event)
@@ -485,9 +856,7 @@ class SlackRTMClient(SlackClientProtocol):
     async def health(self) -> Mapping[str, object]:
         connected = await self.is_connected()
         now = time.time()
-        oldest_inflight: Optional[float] = None
-        if self._inflight:
-            oldest_inflight = min(self._inflight.values())
+        oldest_inflight = self._inflight.oldest()
         health = _compact(
             {
                 "connected": connected,
@@ -503,8 +872,26 @@ class SlackRTMClient(SlackClientProtocol):
                 "last_ack_at": self._last_ack_at,
                 "last_ack_event_id": self._last_ack_event_id,
                 "last_ack_latency": self._last_ack_latency,
+                "ack_latency": self._inflight.latency.snapshot(),
                 "last_connect_at": self._last_connect_at,
                 "last_disconnect_at": self._last_disconnect_at,
+                "reconnecting": self._reconnecting,
+                "reconnects": self._reconnects,
+                "down_since": self._down_since,
+                "last_downtime": self._last_downtime,
+                "total_downtime": self._total_downtime,
+                "backfilled_messages": self._backfilled_messages,
+                "dispatch": {
+                    "workers": len(self._dispatch_tasks),
+                    "queue_depth": sum(queue.qsize() for queue in self._dispatch_queues),
+                    "queue_capacity": sum(queue.maxsize for queue in self._dispatch_queues),
+                    "overflow_policy": self._overflow_policy,
+                    "dropped_events": self._dropped_events,
+                    "last_lag": self._last_dispatch_lag,
+                    "max_lag": self._max_dispatch_lag,
+                },
+                "rate_limits": self._rate_limiter.snapshot(),
+                "ingestion": "events_api" if self._events_receiver is not None else "rtm",
             }
         )
         return health
@@ -516,10 +903,44 @@ class SlackRTMClient(SlackClientProtocol):
         params: Optional[Mapping[str, object]] = None,
         payload: Optional[Mapping[str, object]] = None,
         http_method: str = "GET",
+        priority: int = PRIORITY_NORMAL,
     ) -> Mapping[str, object]:
         if self._session is None or self._token is None:
             raise RuntimeError("Slack client is not connected")
 
+        workspace = self._rate_limit_scope()
+        channel = _ensure_str((payload or {}).get("channel")) if method == "chat.postMessage" else None
+        attempts = 0
+        while True:
+            await self._rate_limiter.acquire(workspace, method, channel=channel, priority=priority)
+            status, retry_after, data = await self._request(method, params, payload, http_method)
+            rate_limited = status == 429 or (isinstance(data, Mapping) and data.get("error") == "ratelimited")
+            if not rate_limited:
+                break
+            delay = parse_retry_after(retry_after)
+            self._rate_limiter.pause(workspace, method, delay, channel=channel)
+            attempts += 1
+            self._logger.warning(
+                "Slack API rate limited",
+                extra={"method": method, "retry_after": delay, "attempt": attempts},
+            )
+            if attempts > self._max_rate_limit_retries:
+                raise RuntimeError(f"Slack API {method} still rate limited after {attempts} attempts")
+
+        if not isinstance(data, Mapping):
+            raise RuntimeError(f"Slack API {method} returned non-mapping payload")
+        if not data.get("ok", True):
+            raise RuntimeError(f"Slack API error for {method}: {data.get('error')}")
+        return data
+
+    async def _request(
+        self,
+        method: str,
+        params: Optional[Mapping[str, object]],
+        payload: Optional[Mapping[str, object]],
+        http_method: str,
+    ) -> tuple[int, Optional[str], object]:
+        assert self._session is not None and self._token is not None
         url = f"{self._API_BASE}/{method}"
         headers = {"Authorization": f"Bearer {self._token.value}", "Content-Type": "application/json; charset=utf-8"}
 
@@ -531,107 +952,182 @@ class SlackRTMClient(SlackClientProtocol):
             params=request_params if http_method.upper() == "GET" else None,
             json=request_json if http_method.upper() != "GET" else None,
             headers=headers,
+            **self._request_options(),
         ) as response:
+            if response.status == 429:
+                return response.status, response.headers.get("Retry-After"), None
             response.raise_for_status()
-            data = await response.json()
+            return response.status, response.headers.get("Retry-After"), await response.json()
 
-        if not isinstance(data, Mapping):
-            raise RuntimeError(f"Slack API {method} returned non-mapping payload")
-        if not data.get("ok", True):
-            raise RuntimeError(f"Slack API error for {method}: {data.get('error')}")
-        return data
+    def _rate_limit_scope(self) -> str:
+        if self._identity is not None:
+            return self._identity.workspace.id
+        return self._flight_key("rate_limit")[1]
 
-    async def _upload_file(
-        self, channel: str, upload: SlackFileUpload, *, thread_ts: Optional[str] = None
-    ) -> SlackUploadedFile:
-        params: Dict[str, object] = {"filename": upload.filename, "length": upload.content_length()}
-        if upload.snippet_type:
-            params["snippet_type"] = upload.snippet_type
+    async def _auth_test(self) -> Mapping[str, object]:
+        return await self._flights.do(self._flight_key("auth.test"), lambda: self._api_call("auth.test"))
 
-        response = await self._api_call("files.getUploadURLExternal", params=params)
-        upload_url = response.get("upload_url")
-        file_id = response.get("file_id")
-        if not isinstance(upload_url, str) or not isinstance(file_id, str):
-            raise RuntimeError("Slack did not return upload metadata")
+    async def _load_identity(self) -> SlackIdentity:
+        auth = await self._auth_test()
+        user_id = str(auth.get("user_id"))
+        team_id = str(auth.get("team_id"))
+        user_info = await self._api_call("users.info", params={"user": user_id})
+        team_info = await self._api_call("team.info", params={"team": team_id})
+        return _build_identity_from_payload(team_info, user_info)
 
-        await self._upload_external_file(upload_url, upload)
+    async def _load_members(self) -> Sequence[Mapping[str, object]]:
+        members: list[Mapping[str, object]] = []
+        async for page in self._paginate("users.list", "members", params={"limit": 200}):
+            members.extend(page)
+        return members
 
-        file_payload: Dict[str, object] = {
-            "id": file_id,
-            "title": upload.title or upload.filename,
-            "alt_text": upload.alt_text or upload.filename,
-            "mimetype": upload.content_type,
-        }
-        complete_payload: Dict[str, object] = {"files": [file_payload], "channel_id": channel}
+    def _member_pages(self) -> AsyncIterator[DirectoryPage]:
+        return self._paginate_pages("users.list", "members", params={"limit": 200})
+
+    async def _load_conversations(
+        self, types: str = "public_channel,private_channel,mpim,im"
+    ) -> Sequence[Mapping[str, object]]:
+        conversations: list[Mapping[str, object]] = []
+        params = {"types": types, "limit": 200}
+        async for page in self._paginate("conversations.list", "channels", params=params):
+            conversations.extend(page)
+        return conversations
+
+    def _flight_key(self, operation: str) -> tuple[str, str, str]:
+        # Results are scoped to the token because Slack visibility (private
+        # channels, DMs) differs per user even inside one workspace.
+        token = self._token.value if self._token is not None else ""
+        fingerprint = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        return ("slack", fingerprint, operation)
+
+    async def _upload_files(
+        self,
+        channel: str,
+        uploads: Sequence[SlackFileUpload],
+        *,
+        thread_ts: Optional[str] = None,
+    ) -> list[SlackUploadedFile]:
+        """Upload ``uploads`` concurrently and share them with one completion call."""
+
+        semaphore = asyncio.Semaphore(self._upload_concurrency)
+
+        async def transfer(upload: SlackFileUpload) -> str:
+            async with semaphore:
+                return await self._transfer_upload(upload)
+
+        tasks = [asyncio.create_task(transfer(upload)) for upload in uploads]
+        try:
+            file_ids = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        files_payload = [
+            {
+                "id": file_id,
+                "title": upload.title or upload.filename,
+                "alt_text": upload.alt_text or upload.filename,
+                "mimetype": upload.content_type,
+            }
+            for file_id, upload in zip(file_ids, uploads)
+        ]
+        complete_payload: Dict[str, object] = {"files": files_payload, "channel_id": channel}
         if thread_ts:
             complete_payload["thread_ts"] = thread_ts
         completion = await self._api_call(
             "files.completeUploadExternal",
             http_method="POST",
             payload=complete_payload,
+            priority=PRIORITY_INTERACTIVE,
         )
 
-        file_info: Optional[Mapping[str, object]] = None
+        file_info: Dict[str, Mapping[str, object]] = {}
         files_data = completion.get("files")
         if isinstance(files_data, list):
             for entry in files_data:
-                if isinstance(entry, Mapping):
-                    file_info = entry
-                    break
-
-        title = upload.title or upload.filename
-        permalink: Optional[str] = None
-        if file_info is not None:
-            info_title = file_info.get("title")
-            if isinstance(info_title, str):
-                title = info_title
-            info_link = file_info.get("permalink")
-            if isinstance(info_link, str):
-                permalink = info_link
-
-        return SlackUploadedFile(file_id=file_id, title=title, permalink=permalink)
+                if isinstance(entry, Mapping) and isinstance(entry.get("id"), str):
+                    file_info[str(entry["id"])] = entry
+
+        uploaded: list[SlackUploadedFile] = []
+        for file_id, upload in zip(file_ids, uploads):
+            title = upload.title or upload.filename
+            permalink: Optional[str] = None
+            info = file_info.get(file_id)
+            if info is not None:
+                info_title = info.get("title")
+                if isinstance(info_title, str):
+                    title = info_title
+                info_link = info.get("permalink")
+                if isinstance(info_link, str):
+                    permalink = info_link
+            uploaded.append(SlackUploadedFile(file_id=file_id, title=title, permalink=permalink))
+        return uploaded
+
+    async def _transfer_upload(self, upload: SlackFileUpload) -> str:
+        params: Dict[str, object] = {"filename": upload.filename, "length": upload.content_length()}
+        if upload.snippet_type:
+            params["snippet_type"] = upload.snippet_type
+
+        response = await self._api_call(
+            "files.getUploadURLExternal", params=params, priority=PRIORITY_INTERACTIVE
+        )
+        upload_url = response.get("upload_url")
+        file_id = response.get("file_id")
+        if not isinstance(upload_url, str) or not isinstance(file_id, str):
+            raise RuntimeError("Slack did not return upload metadata")
+
+        await self._upload_external_file(upload_url, upload)
+        return file_id
 
     async def _upload_external_file(self, upload_url: str, upload: SlackFileUpload) -> None:
         await self._ensure_session()
         if self._session is None:
             raise RuntimeError("Slack HTTP session not initialised")
-        headers = {"Content-Type": upload.content_type or "application/octet-stream"}
-        async with self._session.put(upload_url, data=upload.content, headers=headers) as response:
+        headers = {
+            "Content-Type": upload.content_type or "application/octet-stream",
+            "Content-Length": str(upload.content_length()),
+        }
+        data: object = upload.content
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = upload.iter_chunks()
+        session = await self._pool().session_for(upload_url) if self._pooled_session else self._session
+        # Large files take as long as they take: no total deadline, only a
+        # stall timeout between reads, whatever the session's default is.
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30.0, sock_read=self._upload_read_timeout)
+        async with session.put(upload_url, data=data, headers=headers, timeout=timeout) as response:
             response.raise_for_status()
 
-    def _trim_inflight(self, *, max_entries: int = 1000, max_age: float = 3600.0) -> None:
-        if not self._inflight:
-            return
-        now = time.time()
-        stale_keys = [
-            event_id
-            for event_id, dispatched_at in self._inflight.items()
-            if now - dispatched_at > max_age
-        ]
-        for event_id in stale_keys:
-            self._inflight.pop(event_id, None)
-        if len(self._inflight) > max_entries:
-            overflow = len(self._inflight) - max_entries
-            for event_id in sorted(self._inflight, key=self._inflight.get)[:overflow]:
-                self._inflight.pop(event_id, None)
-
     async def _paginate(
         self,
         method: str,
         key: str,
         *,
         params: Optional[Mapping[str, object]] = None,
-    ) -> Iterable[Sequence[Mapping[str, object]]]:
+    ) -> AsyncIterator[Sequence[Mapping[str, object]]]:
+        async for page in self._paginate_pages(method, key, params=params):
+            yield page.items
+
+    async def _paginate_pages(
+        self,
+        method: str,
+        key: str,
+        *,
+        params: Optional[Mapping[str, object]] = None,
+    ) -> AsyncIterator[DirectoryPage]:
         cursor: Optional[str] = None
         while True:
             merged = dict(params or {})
             if cursor:
                 merged["cursor"] = cursor
-            data = await self._api_call(method, params=merged)
+            data = await self._api_call(method, params=merged, priority=PRIORITY_BULK)
             items = data.get(key)
-            if isinstance(items, list):
-                yield [item for item in items if isinstance(item, Mapping)]
             cursor = _extract_cursor(data)
+            yield DirectoryPage(
+                items=[item for item in items if isinstance(item, Mapping)] if isinstance(items, list) else [],
+                cursor=cursor,
+            )
             if not cursor:
                 break
 
@@ -648,6 +1144,7 @@ class SlackOAuthClient(SlackOAuthClientProtocol):
         client_secret: Optional[str] = None,
         session: Optional[ClientSession] = None,
         logger: Optional[logging.Logger] = None,
+        http_pool: Optional[HttpClientPool] = None,
     ) -> None:
         if session is not None and ClientSession is not None and not isinstance(session, ClientSession):
             raise RuntimeError("session must be an aiohttp.ClientSession instance")
@@ -655,7 +1152,8 @@ class SlackOAuthClient(SlackOAuthClientProtocol):
         self._client_id = client_id
         self._client_secret = client_secret
         self._session = session
-        self._owns_session = session is None
+        self._pooled_session = False
+        self._http_pool = http_pool
         self._logger = logger or logging.getLogger(__name__)
 
     async def exchange_code(
@@ -682,23 +1180,31 @@ class SlackOAuthClient(SlackOAuthClientProtocol):
         return data
 
     async def close(self) -> None:
-        if self._owns_session and self._session is not None:
-            await self._session.close()
+        if self._pooled_session:
+            # Pooled sessions are shared with other clients; only drop the reference.
             self._session = None
+            self._pooled_session = False
 
     async def _ensure_session(self) -> None:
         if self._session is None:
             if aiohttp is None:  # pragma: no cover
                 raise RuntimeError("aiohttp is required to initialise the Slack OAuth client")
-            timeout = aiohttp.ClientTimeout(total=60)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            self._session = await self._pool().session("slack.com")
+            self._pooled_session = True
+
+    def _pool(self) -> HttpClientPool:
+        return self._http_pool or shared_http_pool()
+
+    def _request_options(self) -> Dict[str, object]:
+        # Pooled sessions have no total timeout; bounded API calls add it here.
+        return {"timeout": self._pool().request_timeout()} if self._pooled_session else {}
 
     async def _post(self, method: str, payload: Mapping[str, object]) -> Mapping[str, object]:
         if self._session is None:
             raise RuntimeError("OAuth session is not initialised")
 
         url = f"{self._API_BASE}/{method}"
-        async with self._session.post(url, data=payload) as response:
+        async with self._session.post(url, data=payload, **self._request_options()) as response:
             response.raise_for_status()
             data = await response.json()
 
@@ -709,6 +1215,15 @@ class SlackOAuthClient(SlackOAuthClientProtocol):
         return data
 
 
+def _ts_key(value: object) -> tuple[int, int]:
+    text = _ensure_str(value) or "0"
+    seconds, _, micros = text.partition(".")
+    try:
+        return int(seconds), int(micros.ljust(6, "0")[:6] or 0)
+    except ValueError:
+        return 0, 0
+
+
 def _extract_cursor(payload: Mapping[str, object]) -> Optional[str]:
     metadata = payload.get("response_metadata")
     if isinstance(metadata, Mapping):
@@ -1057,17 +1572,29 @@ def _coerce_file_upload(
     if not isinstance(upload, Mapping):
         return None
 
+    path_value = upload.get("path")
     filename = upload.get("filename") or upload.get("name")
+    if not filename and isinstance(path_value, (str, Path)) and path_value:
+        filename = Path(path_value).name
     if not isinstance(filename, str) or not filename:
         return None
 
     content_value = upload.get("content")
     if content_value is None:
         content_value = upload.get("data")
+    length_value = upload.get("length") or upload.get("size")
+    length = int(length_value) if isinstance(length_value, int) and not isinstance(length_value, bool) else None
+    content: SlackUploadContent
     if isinstance(content_value, memoryview):
-        content_bytes = content_value.tobytes()
+        content = content_value.tobytes()
     elif isinstance(content_value, (bytes, bytearray)):
-        content_bytes = bytes(content_value)
+        content = bytes(content_value)
+    elif isinstance(content_value, Path):
+        content = content_value
+    elif isinstance(path_value, (str, Path)) and path_value:
+        content = Path(path_value)
+    elif isinstance(content_value, AsyncIterable) and length is not None:
+        content = content_value
     else:
         return None
 
@@ -1087,11 +1614,12 @@ def _coerce_file_upload(
 
     return SlackFileUpload(
         filename=filename,
-        content=content_bytes,
+        content=content,
         content_type=content_type_str,
         title=title,
         alt_text=alt_text,
         snippet_type=snippet_type,
+        length=length,
     )
 
 
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import copy
 import logging
-from typing import Dict, Mapping, MutableMapping, Optional
+from typing import Dict, Mapping, MutableMapping, Optional, Tuple
 
 from msgr_bridge_sdk import Envelope, StoneMQClient, build_envelope
+from msgr_bridge_sdk.acks import AckLedger
+from msgr_bridge_sdk.health import (
+    DEFAULT_HEALTH_CONCURRENCY,
+    HealthCounters,
+    HealthQuery,
+    collect_health,
+)
+from msgr_bridge_sdk.streaming import DirectoryStreamer
 
 from .client import SlackClientProtocol, SlackIdentity, SlackOAuthClientProtocol, SlackToken
+from .outbound import CoalescePolicy, OutboundMessage, OutboundResult, SlackOutboundSender
 from .session import SessionData, SessionManager
 
 _DEFAULT_CAPABILITIES: Mapping[str, object] = {
@@ -33,6 +43,11 @@ class SlackBridgeDaemon:
         default_user_id: Optional[str] = None,
         oauth: Optional[SlackOAuthClientProtocol] = None,
         instance: Optional[str] = None,
+        ack_ledger: Optional[AckLedger] = None,
+        health_concurrency: int = DEFAULT_HEALTH_CONCURRENCY,
+        outbound_policy: Optional[CoalescePolicy] = None,
+        outbound_lane_depth: int = 500,
+        outbound_drain_timeout: float = 10.0,
     ) -> None:
         self._client = mq_client
         self._sessions = sessions
@@ -40,9 +55,17 @@ class SlackBridgeDaemon:
         self._oauth = oauth
         self._instance = instance
         self._event_handlers: Dict[str, object] = {}
-        self._ack_state: Dict[str, Mapping[str, object]] = {}
+        self._ack_state = ack_ledger if ack_ledger is not None else AckLedger()
+        self._health = HealthCounters()
+        self._health_concurrency = max(1, int(health_concurrency))
+        self._outbound_policy = outbound_policy or CoalescePolicy()
+        self._outbound_lane_depth = max(1, int(outbound_lane_depth))
+        self._outbound_drain_timeout = max(0.0, float(outbound_drain_timeout))
+        self._outbound: Dict[str, SlackOutboundSender] = {}
         self._logger = logging.getLogger(__name__)
+        self._directory_streams = DirectoryStreamer(mq_client, "slack", logger=self._logger)
 
+        sessions.set_state_listener(self._handle_client_state)
         self._client.register("outbound_message", self._handle_outbound_message)
         self._client.register("ack_event", self._handle_ack_event)
         self._client.register_request("link_account", self._handle_link_account)
@@ -61,11 +84,17 @@ class SlackBridgeDaemon:
                 continue
             client.remove_event_handler(handler)  # type: ignore[arg-type]
             self._event_handlers.pop(key, None)
+        await self._directory_streams.close()
+        for sender in list(self._outbound.values()):
+            # Lanes stuck behind a rate-limit pause are dropped after the timeout.
+            await sender.drain(timeout=self._outbound_drain_timeout)
+            await sender.close()
+        self._outbound.clear()
         await self._sessions.shutdown()
 
     @property
     def acked_events(self) -> Mapping[str, Mapping[str, object]]:
-        return copy.deepcopy(self._ack_state)
+        return self._ack_state.as_dict()
 
     async def _handle_link_account(self, envelope: Envelope) -> Mapping[str, object]:
         payload = dict(envelope.payload)
@@ -112,6 +141,14 @@ class SlackBridgeDaemon:
         await self._register_event_handler(user_id, instance, identity, client)
 
         capabilities = await client.describe_capabilities()
+        if payload.get("stream_directory"):
+            handle = self._directory_streams.open(
+                {"members": client.stream_members, "conversations": client.stream_conversations},
+                instance=instance,
+                context={"user_id": user_id, "workspace_id": identity.workspace.id},
+            )
+            return self._build_linked_response(identity, session, capabilities, directory=handle)
+
         members = await client.list_members()
         channels = await client.list_conversations()
 
@@ -125,25 +162,63 @@ class SlackBridgeDaemon:
         if user_id is None:
             raise RuntimeError("user_id metadata required for outbound Slack messages")
 
-        client, _ = await self._sessions.ensure_client(str(user_id), instance)
-
-        channel = str(payload["channel"])
-        text = str(payload.get("text", ""))
-        blocks = payload.get("blocks") if isinstance(payload.get("blocks"), list) else None
-        attachments = payload.get("attachments") if isinstance(payload.get("attachments"), list) else None
         thread_ts = payload.get("thread_ts")
-        reply_broadcast = bool(payload.get("reply_broadcast", False))
-        metadata_payload = payload.get("metadata") if isinstance(payload.get("metadata"), Mapping) else None
-
-        await client.post_message(
-            channel,
-            text,
-            blocks=blocks,  # type: ignore[arg-type]
-            attachments=attachments,  # type: ignore[arg-type]
+        message_id = payload.get("message_id")
+        message = OutboundMessage(
+            channel=str(payload["channel"]),
+            text=str(payload.get("text", "")),
+            message_id=str(message_id) if message_id is not None else envelope.trace_id,
+            blocks=payload.get("blocks") if isinstance(payload.get("blocks"), list) else None,
+            attachments=payload.get("attachments") if isinstance(payload.get("attachments"), list) else None,
             thread_ts=str(thread_ts) if isinstance(thread_ts, str) else None,
-            reply_broadcast=reply_broadcast,
-            metadata=metadata_payload,
+            reply_broadcast=bool(payload.get("reply_broadcast", False)),
+            metadata=payload.get("metadata") if isinstance(payload.get("metadata"), Mapping) else None,
+        )
+        sender = await self._outbound_sender(str(user_id), instance)
+        sender.submit(message)
+
+    async def drain_outbound(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued outbound message has been posted.
+
+        Returns ``False`` if ``timeout`` seconds pass before all users' lanes drain.
+        """
+
+        senders = list(self._outbound.values())
+        if not senders:
+            return True
+        results = await asyncio.gather(*(sender.drain(timeout=timeout) for sender in senders))
+        return all(results)
+
+    async def _outbound_sender(self, user_id: str, instance: Optional[str]) -> SlackOutboundSender:
+        key = f"{user_id}::{instance or 'workspace'}"
+        sender = self._outbound.get(key)
+        if sender is not None:
+            return sender
+
+        # Fail fast for unknown accounts instead of reporting every message.
+        await self._sessions.ensure_client(user_id, instance)
+
+        async def resolve_client() -> SlackClientProtocol:
+            client, _ = await self._sessions.ensure_client(user_id, instance)
+            return client
+
+        async def report(result: OutboundResult) -> None:
+            result_payload = result.to_payload()
+            result_payload["user_id"] = user_id
+            envelope = build_envelope(
+                "slack", "outbound_result", result_payload, metadata={"user_id": user_id, "instance": instance}
+            )
+            await self._client.publish("outbound_result", envelope, instance=instance)
+
+        sender = SlackOutboundSender(
+            resolve_client,
+            report,
+            policy=self._outbound_policy,
+            max_lane_depth=self._outbound_lane_depth,
+            logger=self._logger,
         )
+        self._outbound[key] = sender
+        return sender
 
     async def _handle_ack_event(self, envelope: Envelope) -> None:
         metadata = envelope.metadata
@@ -160,71 +235,101 @@ class SlackBridgeDaemon:
             return
 
         await client.acknowledge_event(str(event_id))
-        self._ack_state[str(event_id)] = dict(payload)
+        self._ack_state.record(str(event_id), payload)
 
     async def _handle_health_snapshot(self, envelope: Envelope) -> Mapping[str, object]:
         payload = envelope.payload
         filter_user = payload.get("user_id")
         filter_instance = payload.get("instance")
+        query = HealthQuery.from_payload(payload)
 
         entries: list[Mapping[str, object]] = []
-        connected = 0
-        pending_events = 0
-
-        for user_id, instance, client, session in self._sessions.active_entries():
-            if filter_user and str(filter_user) != user_id:
-                continue
-            if filter_instance is not None:
-                instance_token = instance or "workspace"
-                if str(filter_instance) != instance_token:
+        next_cursor: Optional[str] = None
+        if not query.summary_only:
+            candidates = []
+            for user_id, instance, client, session in self._sessions.active_entries():
+                if filter_user and str(filter_user) != user_id:
                     continue
+                if filter_instance is not None:
+                    instance_token = instance or "workspace"
+                    if str(filter_instance) != instance_token:
+                        continue
+                key = f"{user_id}::{instance or 'workspace'}"
+                candidates.append((key, (key, user_id, instance, client, session)))
+
+            entries, next_cursor = await collect_health(
+                candidates, self._probe_health, query, concurrency=self._health_concurrency
+            )
+            if not (filter_user or filter_instance is not None or query.filtered or query.limit or query.cursor):
+                self._health.retain(key for key, _ in candidates)
 
-            try:
-                runtime = await client.health()
-            except Exception:  # pragma: no cover - defensive logging for ops
-                self._logger.exception(
-                    "Slack health snapshot failed",
-                    extra={"user_id": user_id, "instance": instance},
-                )
-                runtime = {"status": "error"}
-
-            client_connected = bool(runtime.get("connected"))
-            if client_connected:
-                connected += 1
-
-            client_pending = _coerce_int(runtime.get("pending_events"))
-            pending_events += client_pending
-
-            entry: Dict[str, object] = {
-                "user_id": user_id,
-                "instance": instance,
-                "connected": client_connected,
-                "pending_events": client_pending,
-                "runtime": dict(runtime),
-            }
-            session_payload = session.to_dict() if session is not None else None
-            if session_payload is not None:
-                entry["session"] = session_payload
-                workspace_id = session_payload.get("workspace_id")
-                if workspace_id is not None:
-                    entry["workspace_id"] = workspace_id
-
-            entries.append(_compact_snapshot(entry))
-
-        acked_events = [dict(value) for value in self._ack_state.values()]
-        summary = {
-            "total_clients": len(entries),
-            "connected_clients": connected,
-            "pending_events": pending_events,
-            "acked_events": len(acked_events),
-        }
+        acks = self._ack_state.summary()
+        summary = self._health.summary(self._sessions.active_count())
+        summary["acked_events"] = acks["total"]
 
-        return {
+        response: Dict[str, object] = {
             "status": "ok",
             "summary": summary,
             "clients": entries,
-            "acked_events": acked_events,
+            "next_cursor": next_cursor,
+            "acks": acks,
         }
+        if payload.get("ack_limit") is not None or payload.get("ack_cursor") is not None:
+            acked_events, ack_cursor = self._ack_state.page(
+                cursor=payload.get("ack_cursor"),
+                limit=_coerce_int(payload.get("ack_limit")) or 100,
+            )
+            response["acked_events"] = acked_events
+            response["ack_cursor"] = ack_cursor
+        return response
+
+    async def _probe_health(
+        self,
+        target: Tuple[str, str, Optional[str], SlackClientProtocol, Optional[SessionData]],
+    ) -> Mapping[str, object]:
+        key, user_id, instance, client, session = target
+        try:
+            runtime = await client.health()
+        except Exception:  # pragma: no cover - defensive logging for ops
+            self._logger.exception(
+                "Slack health snapshot failed",
+                extra={"user_id": user_id, "instance": instance},
+            )
+            runtime = {"status": "error"}
+
+        client_connected = bool(runtime.get("connected"))
+        client_pending = _coerce_int(runtime.get("pending_events"))
+        self._health.observe(key, connected=client_connected, pending_events=client_pending)
+
+        entry: Dict[str, object] = {
+            "user_id": user_id,
+            "instance": instance,
+            "connected": client_connected,
+            "pending_events": client_pending,
+            "runtime": dict(runtime),
+        }
+        session_payload = session.to_dict() if session is not None else None
+        if session_payload is not None:
+            entry["session"] = session_payload
+            workspace_id = session_payload.get("workspace_id")
+            if workspace_id is not None:
+                entry["workspace_id"] = workspace_id
+        return _compact_snapshot(entry)
+
+    async def _handle_client_state(self, key: str, client: Optional[SlackClientProtocol]) -> None:
+        if client is None:
+            # The account was removed: drop everything the daemon kept for it.
+            self._health.forget(key)
+            self._event_handlers.pop(key, None)
+            sender = self._outbound.pop(key, None)
+            if sender is not None:
+                await sender.close()
+            return
+        handler = self._event_handlers.get(key)
+        if handler is not None:
+            # A replacement client inherits the inbound handler of the one it replaced.
+            client.add_event_handler(handler)  # type: ignore[arg-type]
+        self._health.set_connected(key, await client.is_connected())
 
     async def _register_event_handler(
         self,
@@ -267,8 +372,10 @@ class SlackBridgeDaemon:
         identity: SlackIdentity,
         session: SessionData,
         capabilities: Mapping[str, object],
-        members: Mapping[str, object] | list[Mapping[str, object]],
-        channels: Mapping[str, object] | list[Mapping[str, object]],
+        members: Optional[Mapping[str, object] | list[Mapping[str, object]]] = None,
+        channels: Optional[Mapping[str, object] | list[Mapping[str, object]]] = None,
+        *,
+        directory: Optional[Mapping[str, object]] = None,
     ) -> Mapping[str, object]:
         response: Dict[str, object] = {
             "status": "linked",
@@ -276,9 +383,12 @@ class SlackBridgeDaemon:
             "user": identity.user.to_dict(),
             "session": _session_payload(session),
             "capabilities": copy.deepcopy(_DEFAULT_CAPABILITIES),
-            "members": _ensure_list(members),
-            "conversations": _ensure_list(channels),
         }
+        if directory is not None:
+            response["directory"] = dict(directory)
+        else:
+            response["members"] = _ensure_list(members or [])
+            response["conversations"] = _ensure_list(channels or [])
         response["capabilities"].update(copy.deepcopy(capabilities))
         return response
 
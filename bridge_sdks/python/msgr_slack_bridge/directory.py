@@ -0,0 +1,390 @@
+"""Workspace-scoped Slack directory cache shared by clients of one team."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence
+
+from msgr_bridge_sdk.streaming import DirectoryPage
+from msgr_bridge_sdk.vault import SessionVault
+
+DirectoryLoader = Callable[[], Awaitable[Sequence[Mapping[str, object]]]]
+DirectoryPager = Callable[[], AsyncIterator[DirectoryPage]]
+
+DIRECTORY_EVENTS = frozenset(
+    {
+        "team_join",
+        "user_change",
+        "channel_created",
+        "channel_rename",
+        "member_joined_channel",
+        "member_left_channel",
+    }
+)
+
+
+@dataclass
+class _WorkspaceDirectory:
+    members: Dict[str, Mapping[str, object]] = field(default_factory=dict)
+    channels: Dict[str, Mapping[str, object]] = field(default_factory=dict)
+    # The last membership change applied per channel and user since the last
+    # crawl (True for a join); Slack delivers the same change once per linked
+    # client, and again on retries or backfill.
+    membership: Dict[str, Dict[str, bool]] = field(default_factory=dict)
+    members_loaded_at: Optional[float] = None
+    channels_loaded_at: Optional[float] = None
+    restored: bool = False
+    restore_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    members_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    channels_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    flush_task: Optional["asyncio.Task[None]"] = None
+
+    def to_dict(self) -> Mapping[str, object]:
+        return {
+            "members": list(self.members.values()),
+            "channels": list(self.channels.values()),
+            "members_loaded_at": self.members_loaded_at,
+            "channels_loaded_at": self.channels_loaded_at,
+        }
+
+
+class SlackDirectoryCache:
+    """Caches ``users.list`` and public ``conversations.list`` per ``team_id``.
+
+    The first client of a workspace pages the directory; every other client of
+    the same team reuses it. RTM events keep entries fresh without re-paging, and
+    snapshots are written behind to ``base_path`` so a restart only re-crawls
+    once ``max_age`` has passed. Only public channels are shared: private
+    channels, MPIMs and IMs depend on the caller's token and stay per-client.
+    """
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        *,
+        max_age: float = 24 * 3600.0,
+        flush_delay: float = 5.0,
+        vault: Optional[SessionVault] = None,
+        clock: Optional[Callable[[], float]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._base = Path(base_path) if base_path is not None else None
+        if self._base is not None:
+            self._base.mkdir(parents=True, exist_ok=True)
+        self._max_age = max(0.0, float(max_age))
+        self._flush_delay = max(0.0, float(flush_delay))
+        self._vault = vault
+        self._clock = clock or time.time
+        self._logger = logger or logging.getLogger(__name__)
+        self._workspaces: Dict[str, _WorkspaceDirectory] = {}
+        self._crawls = 0
+        self._events_applied = 0
+
+    def path_for(self, team_id: str) -> Optional[Path]:
+        if self._base is None:
+            return None
+        return self._base / f"{_slugify(team_id)}.json"
+
+    async def members(self, team_id: str, loader: DirectoryLoader) -> Sequence[Mapping[str, object]]:
+        workspace = await self._workspace(team_id)
+        async with workspace.members_lock:
+            if not self._is_fresh(workspace.members_loaded_at):
+                await self._store_members(team_id, workspace, await loader())
+        return list(workspace.members.values())
+
+    async def channels(self, team_id: str, loader: DirectoryLoader) -> Sequence[Mapping[str, object]]:
+        workspace = await self._workspace(team_id)
+        async with workspace.channels_lock:
+            if not self._is_fresh(workspace.channels_loaded_at):
+                await self._store_channels(team_id, workspace, await loader())
+        return list(workspace.channels.values())
+
+    async def stream_members(self, team_id: str, pager: DirectoryPager) -> AsyncIterator[DirectoryPage]:
+        """Yield members page by page, crawling through ``pager`` only when the cache is stale.
+
+        A cold crawl hands each page on as it arrives and fills the cache once
+        the last page is in, so concurrent :meth:`members` lookups wait for it
+        rather than starting a crawl of their own.
+        """
+
+        workspace = await self._workspace(team_id)
+        async for page in self._stream(
+            workspace.members_lock,
+            lambda: workspace.members_loaded_at,
+            lambda: workspace.members,
+            pager,
+            lambda items: self._store_members(team_id, workspace, items),
+        ):
+            yield page
+
+    async def stream_channels(self, team_id: str, pager: DirectoryPager) -> AsyncIterator[DirectoryPage]:
+        """Yield public channels page by page; see :meth:`stream_members`."""
+
+        workspace = await self._workspace(team_id)
+        async for page in self._stream(
+            workspace.channels_lock,
+            lambda: workspace.channels_loaded_at,
+            lambda: workspace.channels,
+            pager,
+            lambda items: self._store_channels(team_id, workspace, items),
+        ):
+            yield page
+
+    async def apply_event(self, payload: Mapping[str, object], *, team_id: Optional[str] = None) -> bool:
+        """Fold a raw RTM/Events API payload into the cached directory.
+
+        Returns ``True`` when the payload changed a cached entry.
+        """
+
+        event = payload.get("event") if isinstance(payload.get("event"), Mapping) else payload
+        if not isinstance(event, Mapping):
+            return False
+        event_type = event.get("type")
+        if event_type not in DIRECTORY_EVENTS:
+            return False
+        team = _event_team_id(payload, event) or team_id
+        if not team:
+            return False
+
+        workspace = await self._workspace(team)
+        changed = False
+        if event_type in {"team_join", "user_change"}:
+            user = event.get("user")
+            if isinstance(user, Mapping) and isinstance(user.get("id"), str):
+                workspace.members[str(user["id"])] = dict(user)
+                changed = True
+        elif event_type == "channel_created":
+            channel = event.get("channel")
+            if isinstance(channel, Mapping) and isinstance(channel.get("id"), str):
+                entry = {"is_channel": True, "is_private": False, **dict(channel)}
+                workspace.channels[str(channel["id"])] = entry
+                changed = True
+        elif event_type == "channel_rename":
+            channel = event.get("channel")
+            if isinstance(channel, Mapping) and isinstance(channel.get("id"), str):
+                channel_id = str(channel["id"])
+                current = workspace.channels.get(channel_id)
+                if current is not None:
+                    workspace.channels[channel_id] = {**dict(current), **dict(channel)}
+                    changed = True
+        elif event_type in {"member_joined_channel", "member_left_channel"}:
+            changed = self._apply_membership(workspace, event, joined=event_type == "member_joined_channel")
+
+        if changed:
+            self._events_applied += 1
+            self._schedule_flush(team, workspace)
+        return changed
+
+    def _apply_membership(self, workspace: _WorkspaceDirectory, event: Mapping[str, object], *, joined: bool) -> bool:
+        channel_id = event.get("channel")
+        user_id = event.get("user")
+        if not isinstance(channel_id, str) or not isinstance(user_id, str):
+            return False
+        current = workspace.channels.get(channel_id)
+        if current is None or not isinstance(current.get("num_members"), int):
+            return False
+        applied = workspace.membership.setdefault(channel_id, {})
+        if applied.get(user_id) == joined:
+            return False  # a duplicate delivery of a change already counted
+        applied[user_id] = joined
+        updated = dict(current)
+        updated["num_members"] = max(0, int(current["num_members"]) + (1 if joined else -1))  # type: ignore[arg-type]
+        workspace.channels[channel_id] = updated
+        return True
+
+    def invalidate(self, team_id: str) -> None:
+        """Force the next lookup for ``team_id`` to re-page the directory."""
+
+        workspace = self._workspaces.get(team_id)
+        if workspace is not None:
+            workspace.members_loaded_at = None
+            workspace.channels_loaded_at = None
+
+    async def close(self) -> None:
+        for team_id, workspace in list(self._workspaces.items()):
+            task = workspace.flush_task
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+                workspace.flush_task = None
+                await self._flush(team_id, workspace)
+
+    def snapshot(self) -> Mapping[str, object]:
+        return {
+            "workspaces": {
+                team_id: {
+                    "members": len(workspace.members),
+                    "channels": len(workspace.channels),
+                    "members_loaded_at": workspace.members_loaded_at,
+                    "channels_loaded_at": workspace.channels_loaded_at,
+                }
+                for team_id, workspace in self._workspaces.items()
+            },
+            "crawls": self._crawls,
+            "events_applied": self._events_applied,
+        }
+
+    async def _stream(
+        self,
+        lock: asyncio.Lock,
+        loaded_at: Callable[[], Optional[float]],
+        cached: Callable[[], Mapping[str, Mapping[str, object]]],
+        pager: DirectoryPager,
+        store: Callable[[Sequence[Mapping[str, object]]], Awaitable[None]],
+    ) -> AsyncIterator[DirectoryPage]:
+        last: Optional[DirectoryPage] = None
+        async with lock:
+            if not self._is_fresh(loaded_at()):
+                items: List[Mapping[str, object]] = []
+                async for page in pager():
+                    items.extend(page.items)
+                    if page.cursor is None:
+                        last = page
+                        break
+                    yield page
+                # The final page is held back until the cache is filled, so a
+                # consumer that stops after it never leaves the lock held.
+                await store(items)
+                last = last or DirectoryPage(items=[])
+        if last is not None:
+            yield last
+            return
+        async for page in _slice_pages(list(cached().values())):
+            yield page
+
+    async def _store_members(
+        self, team_id: str, workspace: _WorkspaceDirectory, items: Sequence[Mapping[str, object]]
+    ) -> None:
+        workspace.members = _index(items)
+        workspace.members_loaded_at = self._clock()
+        self._crawls += 1
+        await self._flush(team_id, workspace)
+
+    async def _store_channels(
+        self, team_id: str, workspace: _WorkspaceDirectory, items: Sequence[Mapping[str, object]]
+    ) -> None:
+        workspace.channels = _index(items)
+        workspace.membership.clear()
+        workspace.channels_loaded_at = self._clock()
+        self._crawls += 1
+        await self._flush(team_id, workspace)
+
+    async def _workspace(self, team_id: str) -> _WorkspaceDirectory:
+        workspace = self._workspaces.get(team_id)
+        if workspace is None:
+            workspace = _WorkspaceDirectory()
+            self._workspaces[team_id] = workspace
+        if not workspace.restored:
+            async with workspace.restore_lock:
+                if not workspace.restored:
+                    await self._restore(team_id, workspace)
+                    workspace.restored = True
+        return workspace
+
+    async def _restore(self, team_id: str, workspace: _WorkspaceDirectory) -> None:
+        path = self.path_for(team_id)
+        if path is None:
+            return
+        try:
+            if self._vault is not None:
+                blob = await self._vault.read(path)
+                raw = blob.decode("utf-8") if blob is not None else None
+            elif path.exists():
+                raw = await asyncio.to_thread(path.read_text, encoding="utf-8")
+            else:
+                raw = None
+            if raw is None:
+                return
+            data = json.loads(raw)
+        except Exception:  # pragma: no cover - corrupt snapshots are re-crawled
+            self._logger.exception("Failed to restore Slack directory", extra={"team_id": team_id})
+            return
+        if not isinstance(data, Mapping):
+            return
+        workspace.members = _index(data.get("members"))
+        workspace.channels = _index(data.get("channels"))
+        workspace.members_loaded_at = _as_float(data.get("members_loaded_at"))
+        workspace.channels_loaded_at = _as_float(data.get("channels_loaded_at"))
+
+    def _schedule_flush(self, team_id: str, workspace: _WorkspaceDirectory) -> None:
+        if self._base is None:
+            return
+        if workspace.flush_task is not None and not workspace.flush_task.done():
+            return
+        workspace.flush_task = asyncio.create_task(
+            self._delayed_flush(team_id, workspace), name=f"slack-directory-{team_id}"
+        )
+
+    async def _delayed_flush(self, team_id: str, workspace: _WorkspaceDirectory) -> None:
+        await asyncio.sleep(self._flush_delay)
+        workspace.flush_task = None
+        await self._flush(team_id, workspace)
+
+    async def _flush(self, team_id: str, workspace: _WorkspaceDirectory) -> None:
+        path = self.path_for(team_id)
+        if path is None:
+            return
+        payload = json.dumps(workspace.to_dict(), sort_keys=True)
+        try:
+            if self._vault is not None:
+                await self._vault.write(path, payload.encode("utf-8"))
+                return
+            tmp = path.with_suffix(".tmp")
+            await asyncio.to_thread(tmp.write_text, payload, encoding="utf-8")
+            await asyncio.to_thread(tmp.replace, path)
+        except Exception:  # pragma: no cover - persistence failures logged for ops
+            self._logger.exception("Failed to persist Slack directory", extra={"team_id": team_id})
+
+    def _is_fresh(self, loaded_at: Optional[float]) -> bool:
+        if loaded_at is None:
+            return False
+        return self._clock() - loaded_at < self._max_age
+
+
+async def _slice_pages(
+    items: Sequence[Mapping[str, object]], size: int = 200
+) -> AsyncIterator[DirectoryPage]:
+    for offset in range(0, len(items), size):
+        end = offset + size
+        yield DirectoryPage(items=items[offset:end], cursor=str(end) if end < len(items) else None)
+    if not items:
+        yield DirectoryPage(items=[])
+
+
+def _index(items: object) -> Dict[str, Mapping[str, object]]:
+    indexed: Dict[str, Mapping[str, object]] = {}
+    if not isinstance(items, (list, tuple)):
+        return indexed
+    for item in items:
+        if isinstance(item, Mapping) and isinstance(item.get("id"), str):
+            indexed[str(item["id"])] = dict(item)
+    return indexed
+
+
+def _event_team_id(payload: Mapping[str, object], event: Mapping[str, object]) -> Optional[str]:
+    candidates: List[object] = [payload.get("team_id"), event.get("team"), event.get("team_id")]
+    user = event.get("user")
+    if isinstance(user, Mapping):
+        candidates.append(user.get("team_id"))
+    for candidate in candidates:
+        if isinstance(candidate, str) and candidate:
+            return candidate
+    return None
+
+
+def _as_float(value: object) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def _slugify(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value)
@@ -0,0 +1,321 @@
+"""Slack Events API receiver shared by every linked workspace."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from msgr_bridge_sdk.http import HttpClientPool, shared_http_pool
+
+try:  # pragma: no cover - optional runtime dependency
+    from aiohttp import web
+except ImportError:  # pragma: no cover - aiohttp not installed during unit tests
+    web = None  # type: ignore
+
+EventHandler = Callable[[Mapping[str, object]], Awaitable[None]]
+
+SIGNATURE_VERSION = "v0"
+
+
+class SlackEventsReceiver:
+    """Accepts Slack Events API deliveries on one HTTP endpoint.
+
+    Requests are verified with the app signing secret, ``url_verification``
+    challenges are answered inline and every ``event_callback`` is acknowledged
+    before it is processed, so Slack's three second deadline is met regardless
+    of handler latency. Deliveries are routed only to the handlers registered for
+    the payload's ``authorizations`` or to a workspace handler registered without
+    a ``user_id``; anything else is counted as unrouted rather than fanned out,
+    since private channels and DMs must never reach other linked users. Retries
+    (``X-Slack-Retry-Num``) of an ``event_id`` that was already accepted are
+    acknowledged without being dispatched again.
+
+    Slack lists only one authorization per delivery. With an app-level
+    ``app_token`` (``authorizations:read``) the receiver asks
+    ``apps.event.authorizations.list`` for the rest whenever other users of the
+    workspace are linked, so everyone who can see the channel gets the event.
+    Without it, other linked users only see events addressed to them.
+    """
+
+    _API_BASE = "https://slack.com/api"
+
+    def __init__(
+        self,
+        signing_secret: str,
+        *,
+        host: str = "0.0.0.0",
+        port: int = 3000,
+        path: str = "/slack/events",
+        tolerance: float = 300.0,
+        dedup_entries: int = 10_000,
+        dedup_ttl: float = 3600.0,
+        app_token: Optional[str] = None,
+        http_pool: Optional[HttpClientPool] = None,
+        clock: Optional[Callable[[], float]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if not signing_secret:
+            raise ValueError("signing_secret is required")
+        self._secret = signing_secret.encode("utf-8")
+        self._host = host
+        self._port = port
+        self._path = path
+        self._tolerance = max(0.0, float(tolerance))
+        self._dedup_entries = max(1, int(dedup_entries))
+        self._dedup_ttl = max(0.0, float(dedup_ttl))
+        self._app_token = app_token
+        self._http_pool = http_pool
+        self._clock = clock or time.time
+        self._logger = logger or logging.getLogger(__name__)
+        self._handlers: Dict[str, Dict[Optional[str], EventHandler]] = {}
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._runner: Optional["web.AppRunner"] = None
+        self._received = 0
+        self._duplicates = 0
+        self._rejected = 0
+        self._unrouted = 0
+        self._failures = 0
+        self._resolved = 0
+
+    def register(self, team_id: str, handler: EventHandler, *, user_id: Optional[str] = None) -> None:
+        self._handlers.setdefault(team_id, {})[user_id] = handler
+
+    def unregister(self, team_id: str, *, user_id: Optional[str] = None) -> None:
+        handlers = self._handlers.get(team_id)
+        if handlers is None:
+            return
+        handlers.pop(user_id, None)
+        if not handlers:
+            self._handlers.pop(team_id, None)
+
+    async def start(self) -> None:
+        if web is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to run the Slack Events API receiver")
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_post(self._path, self._handle_http)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, self._host, self._port)
+        await site.start()
+        self._runner = runner
+        self._logger.info(
+            "Slack Events API receiver listening",
+            extra={"host": self._host, "port": self._port, "path": self._path},
+        )
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        tasks = list(self._tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def handle_request(
+        self, headers: Mapping[str, str], body: bytes
+    ) -> Tuple[int, Mapping[str, object]]:
+        """Verify and accept one delivery, returning the HTTP status and JSON body."""
+
+        if not self.verify(headers, body):
+            self._rejected += 1
+            return 401, {"ok": False, "error": "invalid_signature"}
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            self._rejected += 1
+            return 400, {"ok": False, "error": "invalid_payload"}
+        if not isinstance(payload, Mapping):
+            self._rejected += 1
+            return 400, {"ok": False, "error": "invalid_payload"}
+
+        payload_type = payload.get("type")
+        if payload_type == "url_verification":
+            return 200, {"challenge": payload.get("challenge")}
+        if payload_type != "event_callback":
+            return 200, {"ok": True}
+
+        self._received += 1
+        event_id = payload.get("event_id")
+        if isinstance(event_id, str) and self._is_duplicate(event_id):
+            self._duplicates += 1
+            self._logger.debug(
+                "Dropping Slack event retry",
+                extra={"event_id": event_id, "retry_num": _header(headers, "X-Slack-Retry-Num")},
+            )
+            return 200, {"ok": True}
+
+        if self._needs_authorizations(payload):
+            # Resolving the other recipients is a Web API call; do it after the ack.
+            dispatch = self._resolve_and_process(payload)
+        else:
+            handlers = self._route(payload)
+            if not handlers:
+                self._unrouted += 1
+                return 200, {"ok": True}
+            dispatch = self._process(payload, handlers)
+        task = asyncio.create_task(dispatch, name="slack-events-dispatch")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return 200, {"ok": True}
+
+    def verify(self, headers: Mapping[str, str], body: bytes) -> bool:
+        timestamp = _header(headers, "X-Slack-Request-Timestamp")
+        signature = _header(headers, "X-Slack-Signature")
+        if not timestamp or not signature:
+            return False
+        try:
+            sent_at = float(timestamp)
+        except ValueError:
+            return False
+        if abs(self._clock() - sent_at) > self._tolerance:
+            return False
+        base = f"{SIGNATURE_VERSION}:{timestamp}:".encode("utf-8") + body
+        expected = f"{SIGNATURE_VERSION}=" + hmac.new(self._secret, base, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "teams": len(self._handlers),
+            "handlers": sum(len(handlers) for handlers in self._handlers.values()),
+            "received": self._received,
+            "duplicates": self._duplicates,
+            "rejected": self._rejected,
+            "unrouted": self._unrouted,
+            "failures": self._failures,
+            "resolved": self._resolved,
+            "processing": len(self._tasks),
+        }
+
+    async def _handle_http(self, request: "web.Request") -> "web.Response":
+        body = await request.read()
+        status, payload = await self.handle_request(request.headers, body)
+        return web.json_response(payload, status=status)
+
+    def _needs_authorizations(self, payload: Mapping[str, object]) -> bool:
+        if not self._app_token or not isinstance(payload.get("event_context"), str):
+            return False
+        authorizations = payload.get("authorizations")
+        if not isinstance(authorizations, list):
+            return False
+        listed = {
+            (str(item.get("team_id") or payload.get("team_id")), _as_optional_str(item.get("user_id")))
+            for item in authorizations
+            if isinstance(item, Mapping)
+        }
+        teams = {team for team, _ in listed}
+        return any(
+            user_id is not None and (team, user_id) not in listed
+            for team in teams
+            for user_id in self._handlers.get(team, {})
+        )
+
+    async def _resolve_and_process(self, payload: Mapping[str, object]) -> None:
+        try:
+            authorizations = await self._list_authorizations(str(payload["event_context"]))
+        except Exception:  # pragma: no cover - falls back to the delivered authorization
+            self._logger.exception(
+                "Failed to list Slack event authorizations", extra={"event_id": payload.get("event_id")}
+            )
+        else:
+            self._resolved += 1
+            delivered = list(payload.get("authorizations") or [])  # type: ignore[call-overload]
+            payload = {**dict(payload), "authorizations": [*delivered, *authorizations]}
+        handlers = self._route(payload)
+        if not handlers:
+            self._unrouted += 1
+            return
+        await self._process(payload, handlers)
+
+    async def _list_authorizations(self, event_context: str) -> Sequence[Mapping[str, object]]:
+        url = f"{self._API_BASE}/apps.event.authorizations.list"
+        pool = self._http_pool or shared_http_pool()
+        session = await pool.session_for(url)
+        headers = {"Authorization": f"Bearer {self._app_token}"}
+        collected: List[Mapping[str, object]] = []
+        cursor: Optional[str] = None
+        while True:
+            form = {"event_context": event_context, "limit": "200"}
+            if cursor:
+                form["cursor"] = cursor
+            async with session.post(url, data=form, headers=headers, timeout=pool.request_timeout()) as response:
+                response.raise_for_status()
+                data = await response.json()
+            if not isinstance(data, Mapping) or not data.get("ok", False):
+                error = data.get("error") if isinstance(data, Mapping) else data
+                raise RuntimeError(f"Slack API error for apps.event.authorizations.list: {error}")
+            items = data.get("authorizations")
+            if isinstance(items, list):
+                collected.extend(item for item in items if isinstance(item, Mapping))
+            metadata = data.get("response_metadata")
+            cursor = metadata.get("next_cursor") if isinstance(metadata, Mapping) else None
+            if not cursor:
+                return collected
+
+    def _route(self, payload: Mapping[str, object]) -> List[EventHandler]:
+        team_id = payload.get("team_id")
+        selected: List[EventHandler] = []
+        authorizations = payload.get("authorizations")
+        if isinstance(authorizations, list):
+            for authorization in authorizations:
+                if not isinstance(authorization, Mapping):
+                    continue
+                auth_team = authorization.get("team_id") or team_id
+                handlers = self._handlers.get(str(auth_team)) if auth_team else None
+                if not handlers:
+                    continue
+                handler = handlers.get(_as_optional_str(authorization.get("user_id")))
+                if handler is None:
+                    handler = handlers.get(None)
+                if handler is not None and handler not in selected:
+                    selected.append(handler)
+        elif isinstance(team_id, str):
+            workspace = self._handlers.get(team_id, {}).get(None)
+            if workspace is not None:
+                selected.append(workspace)
+        return selected
+
+    async def _process(self, payload: Mapping[str, object], handlers: List[EventHandler]) -> None:
+        for handler in handlers:
+            try:
+                await handler(payload)
+            except Exception:  # pragma: no cover - handler failures logged for ops
+                self._failures += 1
+                self._logger.exception(
+                    "Slack Events API handler failed",
+                    extra={"event_id": payload.get("event_id"), "team_id": payload.get("team_id")},
+                )
+
+    def _is_duplicate(self, event_id: str) -> bool:
+        now = self._clock()
+        cutoff = now - self._dedup_ttl
+        while self._seen:
+            oldest = next(iter(self._seen.values()))
+            if oldest > cutoff:
+                break
+            self._seen.popitem(last=False)
+        if event_id in self._seen:
+            return True
+        self._seen[event_id] = now
+        while len(self._seen) > self._dedup_entries:
+            self._seen.popitem(last=False)
+        return False
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+def _as_optional_str(value: object) -> Optional[str]:
+    return value if isinstance(value, str) and value else None
@@ -0,0 +1,315 @@
+"""Per-user Slack outbound pipeline with one ordered lane per channel."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set
+
+from .client import SlackClientProtocol
+
+ClientResolver = Callable[[], Awaitable[SlackClientProtocol]]
+
+
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """Controls merging of consecutive plain-text posts to one channel/thread.
+
+    Only messages without blocks, attachments, files or metadata are merged.
+    ``window`` is how long a lane waits for follow-up messages after the first
+    one; with the default of ``0`` only messages that queued up while the
+    previous post was in flight are merged, so a lone message is never delayed.
+    """
+
+    enabled: bool = False
+    window: float = 0.0
+    max_messages: int = 10
+    max_chars: int = 3000
+    separator: str = "\n"
+
+
+@dataclass
+class OutboundMessage:
+    channel: str
+    text: str
+    message_id: Optional[str] = None
+    blocks: Optional[Sequence[Mapping[str, object]]] = None
+    attachments: Optional[Sequence[Mapping[str, object]]] = None
+    thread_ts: Optional[str] = None
+    reply_broadcast: bool = False
+    metadata: Optional[Mapping[str, object]] = None
+    file_uploads: Optional[Sequence[object]] = None
+    file_references: Optional[Sequence[object]] = None
+
+    @property
+    def plain_text(self) -> bool:
+        return not (
+            self.blocks
+            or self.attachments
+            or self.metadata
+            or self.file_uploads
+            or self.file_references
+            or self.reply_broadcast
+        )
+
+    def can_join(self, other: "OutboundMessage") -> bool:
+        return self.plain_text and other.plain_text and self.thread_ts == other.thread_ts
+
+
+@dataclass
+class OutboundResult:
+    """Outcome of one ``chat.postMessage`` call covering one or more messages."""
+
+    channel: str
+    thread_ts: Optional[str]
+    message_ids: List[Optional[str]]
+    response: Optional[Mapping[str, object]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_payload(self) -> Dict[str, object]:
+        payload: Dict[str, object] = {
+            "status": "sent" if self.ok else "failed",
+            "channel": self.channel,
+            "message_ids": [message_id for message_id in self.message_ids if message_id is not None],
+            "coalesced": len(self.message_ids),
+        }
+        if self.thread_ts is not None:
+            payload["thread_ts"] = self.thread_ts
+        if self.response is not None:
+            ts = self.response.get("ts")
+            if isinstance(ts, str):
+                payload["ts"] = ts
+        if self.error is not None:
+            payload["error"] = self.error
+        return payload
+
+
+ResultReporter = Callable[[OutboundResult], Awaitable[None]]
+
+
+@dataclass
+class _Lane:
+    queue: "asyncio.Queue[OutboundMessage]" = field(default_factory=asyncio.Queue)
+    task: Optional["asyncio.Task[None]"] = None
+    held: Optional[OutboundMessage] = None
+
+
+class SlackOutboundSender:
+    """Sends one user's outbound messages with per-channel ordering.
+
+    Every channel gets its own FIFO lane drained by a worker task, so messages
+    to one channel keep their order (and respect Slack's per-channel posting
+    rate through the client's limiter) while different channels post in
+    parallel. Lanes whose worker has been idle for ``idle_timeout`` seconds are
+    retired. Each post is reported through ``report`` once it completes.
+
+    A lane holds at most ``max_lane_depth`` messages. When a channel is stuck
+    (for example behind a long rate-limit pause) further messages for it are
+    rejected straight away and reported as failed with ``channel_queue_full``,
+    so one channel cannot grow memory without bound or hold up the others.
+    """
+
+    def __init__(
+        self,
+        resolve_client: ClientResolver,
+        report: ResultReporter,
+        *,
+        policy: Optional[CoalescePolicy] = None,
+        idle_timeout: float = 30.0,
+        max_lane_depth: int = 500,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._resolve_client = resolve_client
+        self._report = report
+        self._policy = policy or CoalescePolicy()
+        self._idle_timeout = max(0.0, float(idle_timeout))
+        self._max_lane_depth = max(1, int(max_lane_depth))
+        self._logger = logger or logging.getLogger(__name__)
+        self._lanes: Dict[str, _Lane] = {}
+        self._rejections: Set["asyncio.Task[None]"] = set()
+        self._submitted = 0
+        self._posts = 0
+        self._coalesced = 0
+        self._failed = 0
+        self._rejected = 0
+
+    def submit(self, message: OutboundMessage) -> bool:
+        """Queue ``message`` on its channel lane; return ``False`` if the lane is full."""
+
+        lane = self._lanes.get(message.channel)
+        if lane is None:
+            lane = _Lane(queue=asyncio.Queue(maxsize=self._max_lane_depth))
+            self._lanes[message.channel] = lane
+        try:
+            lane.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._reject(message)
+            return False
+        self._submitted += 1
+        if lane.task is None or lane.task.done():
+            lane.task = asyncio.create_task(
+                self._run_lane(message.channel, lane), name=f"slack-outbound-{message.channel}"
+            )
+        return True
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been posted and reported.
+
+        Returns ``False`` if ``timeout`` seconds pass first, e.g. because a lane
+        is waiting out a rate-limit pause; the messages stay queued.
+        """
+
+        waiters = [lane.queue.join() for lane in list(self._lanes.values())]
+        waiters.extend(asyncio.shield(task) for task in list(self._rejections))
+        if not waiters:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waiters), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                "Timed out draining Slack outbound lanes",
+                extra={"queued": sum(lane.queue.qsize() for lane in self._lanes.values())},
+            )
+            return False
+        return True
+
+    async def close(self) -> None:
+        lanes = list(self._lanes.values())
+        self._lanes.clear()
+        for lane in lanes:
+            if lane.task is not None:
+                lane.task.cancel()
+        for lane in lanes:
+            if lane.task is not None:
+                with contextlib.suppress(asyncio.CancelledError):
+                    await lane.task
+        rejections = list(self._rejections)
+        if rejections:
+            await asyncio.gather(*rejections, return_exceptions=True)
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "channels": len(self._lanes),
+            "queued": sum(lane.queue.qsize() for lane in self._lanes.values()),
+            "submitted": self._submitted,
+            "posts": self._posts,
+            "coalesced": self._coalesced,
+            "failed": self._failed,
+            "rejected": self._rejected,
+        }
+
+    def _reject(self, message: OutboundMessage) -> None:
+        self._rejected += 1
+        self._logger.warning(
+            "Slack outbound lane full; rejecting message",
+            extra={"channel": message.channel, "depth": self._max_lane_depth},
+        )
+        result = OutboundResult(
+            channel=message.channel,
+            thread_ts=message.thread_ts,
+            message_ids=[message.message_id],
+            error="channel_queue_full",
+        )
+        task = asyncio.create_task(self._publish(result), name=f"slack-outbound-reject-{message.channel}")
+        self._rejections.add(task)
+        task.add_done_callback(self._rejections.discard)
+
+    async def _run_lane(self, channel: str, lane: _Lane) -> None:
+        while True:
+            if lane.held is not None:
+                first, lane.held = lane.held, None
+            else:
+                try:
+                    first = await asyncio.wait_for(lane.queue.get(), timeout=self._idle_timeout or None)
+                except asyncio.TimeoutError:
+                    if not lane.queue.empty():
+                        continue
+                    if self._lanes.get(channel) is lane:
+                        del self._lanes[channel]
+                    return
+            batch = await self._collect(first, lane)
+            try:
+                await self._send(channel, batch)
+            finally:
+                for _ in batch:
+                    lane.queue.task_done()
+
+    async def _collect(self, first: OutboundMessage, lane: _Lane) -> List[OutboundMessage]:
+        batch = [first]
+        policy = self._policy
+        if not policy.enabled or not first.plain_text:
+            return batch
+        length = len(first.text)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(0.0, policy.window)
+        while len(batch) < policy.max_messages:
+            if lane.queue.empty():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    candidate = await asyncio.wait_for(lane.queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                candidate = lane.queue.get_nowait()
+            joined = length + len(policy.separator) + len(candidate.text)
+            if not first.can_join(candidate) or joined > policy.max_chars:
+                # Keep ordering: the candidate becomes the head of the next post.
+                lane.held = candidate
+                break
+            batch.append(candidate)
+            length = joined
+        return batch
+
+    async def _send(self, channel: str, batch: List[OutboundMessage]) -> None:
+        first = batch[0]
+        text = first.text
+        if len(batch) > 1:
+            text = self._policy.separator.join(message.text for message in batch)
+            self._coalesced += len(batch) - 1
+        result = OutboundResult(
+            channel=channel,
+            thread_ts=first.thread_ts,
+            message_ids=[message.message_id for message in batch],
+        )
+        try:
+            client = await self._resolve_client()
+            extra: Dict[str, object] = {}
+            if first.file_uploads:
+                extra["file_uploads"] = first.file_uploads
+            if first.file_references:
+                extra["file_references"] = first.file_references
+            result.response = await client.post_message(
+                channel,
+                text,
+                blocks=first.blocks,
+                attachments=first.attachments,
+                thread_ts=first.thread_ts,
+                reply_broadcast=first.reply_broadcast,
+                metadata=first.metadata,
+                **extra,  # type: ignore[arg-type]
+            )
+            self._posts += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._failed += 1
+            result.error = str(exc) or exc.__class__.__name__
+            self._logger.exception(
+                "Slack outbound message failed",
+                extra={"channel": channel, "messages": len(batch)},
+            )
+        await self._publish(result)
+
+    async def _publish(self, result: OutboundResult) -> None:
+        try:
+            await self._report(result)
+        except Exception:  # pragma: no cover - reporting failures logged for ops
+            self._logger.exception("Failed to report Slack outbound result", extra={"channel": result.channel})
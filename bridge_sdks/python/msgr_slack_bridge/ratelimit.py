@@ -0,0 +1,223 @@
+"""Tier-aware scheduling for Slack Web API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 5
+PRIORITY_BULK = 10
+
+# Requests per minute and burst size for Slack's published rate-limit tiers.
+TIER_LIMITS: Mapping[str, Tuple[float, int]] = {
+    "tier1": (1.0, 1),
+    "tier2": (20.0, 3),
+    "tier3": (50.0, 5),
+    "tier4": (100.0, 10),
+    "post_message": (60.0, 1),
+}
+
+METHOD_TIERS: Mapping[str, str] = {
+    "rtm.connect": "tier1",
+    "users.list": "tier2",
+    "conversations.list": "tier2",
+    "conversations.history": "tier3",
+    "conversations.replies": "tier3",
+    "team.info": "tier3",
+    "users.info": "tier4",
+    "auth.test": "tier4",
+    "files.getUploadURLExternal": "tier4",
+    "files.completeUploadExternal": "tier4",
+    "chat.postMessage": "post_message",
+}
+
+DEFAULT_TIER = "tier3"
+
+_PRIORITY_CLASSES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_NORMAL: "normal", PRIORITY_BULK: "bulk"}
+
+
+@dataclass
+class _Bucket:
+    rate: float
+    capacity: int
+    tokens: float
+    updated_at: float
+    paused_until: float = 0.0
+    waiters: List[Tuple[int, int, asyncio.Future]] = field(default_factory=list)
+    drainer: Optional["asyncio.Task[None]"] = None
+
+    def refill(self, now: float) -> None:
+        if now > self.updated_at:
+            self.tokens = min(float(self.capacity), self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def delay(self, now: float) -> float:
+        self.refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def observe(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        self.max = max(self.max, waited)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "avg_wait": self.total / self.count if self.count else 0.0,
+            "max_wait": self.max,
+        }
+
+
+class SlackRateLimiter:
+    """Token buckets per workspace and method tier with prioritised waiters.
+
+    Slack limits are applied per app, per workspace and per method tier, with
+    ``chat.postMessage`` further limited to roughly one message per second per
+    channel. Each bucket releases queued calls in priority order, so interactive
+    sends overtake directory crawls waiting on the same bucket. ``pause`` freezes
+    a bucket for the ``Retry-After`` period reported by a 429 response.
+    """
+
+    def __init__(
+        self,
+        *,
+        tiers: Optional[Mapping[str, Tuple[float, int]]] = None,
+        method_tiers: Optional[Mapping[str, str]] = None,
+        clock: Optional[Callable[[], float]] = None,
+        max_buckets: int = 4096,
+    ) -> None:
+        self._tiers = dict(TIER_LIMITS)
+        if tiers:
+            self._tiers.update(tiers)
+        self._method_tiers = dict(METHOD_TIERS)
+        if method_tiers:
+            self._method_tiers.update(method_tiers)
+        self._clock = clock or time.monotonic
+        self._max_buckets = max(1, int(max_buckets))
+        self._buckets: Dict[Tuple[str, ...], _Bucket] = {}
+        self._sequence = itertools.count()
+        self._waits: Dict[str, _WaitStats] = {}
+        self._rate_limited = 0
+
+    def tier_for(self, method: str) -> str:
+        return self._method_tiers.get(method, DEFAULT_TIER)
+
+    def bucket_key(self, workspace: str, method: str, channel: Optional[str] = None) -> Tuple[str, ...]:
+        tier = self.tier_for(method)
+        if tier == "post_message":
+            return (workspace, tier, channel or "")
+        return (workspace, tier)
+
+    async def acquire(
+        self,
+        workspace: str,
+        method: str,
+        *,
+        channel: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> float:
+        """Wait for a call slot and return the seconds spent queued."""
+
+        key = self.bucket_key(workspace, method, channel)
+        bucket = self._bucket(key)
+        started = self._clock()
+        if not bucket.waiters and bucket.delay(started) == 0.0:
+            bucket.tokens -= 1.0
+            self._observe(priority, 0.0)
+            return 0.0
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(bucket.waiters, (priority, next(self._sequence), future))
+        if bucket.drainer is None or bucket.drainer.done():
+            bucket.drainer = asyncio.create_task(self._drain(bucket), name="slack-rate-limit")
+        await future
+        waited = self._clock() - started
+        self._observe(priority, waited)
+        return waited
+
+    def pause(self, workspace: str, method: str, retry_after: float, *, channel: Optional[str] = None) -> None:
+        """Stop releasing calls from a bucket until ``retry_after`` seconds have passed."""
+
+        bucket = self._bucket(self.bucket_key(workspace, method, channel))
+        bucket.paused_until = max(bucket.paused_until, self._clock() + max(0.0, retry_after))
+        # Slack's Retry-After is authoritative: allow exactly one call when the
+        # pause ends and refill normally from there.
+        bucket.tokens = 1.0
+        bucket.updated_at = bucket.paused_until
+        self._rate_limited += 1
+
+    def snapshot(self) -> Mapping[str, object]:
+        now = self._clock()
+        queued = sum(len(bucket.waiters) for bucket in self._buckets.values())
+        paused = sum(1 for bucket in self._buckets.values() if bucket.paused_until > now)
+        return {
+            "queued": queued,
+            "paused_buckets": paused,
+            "rate_limited": self._rate_limited,
+            "queue_wait": {name: stats.to_dict() for name, stats in sorted(self._waits.items())},
+        }
+
+    def _bucket(self, key: Tuple[str, ...]) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._max_buckets:
+                self._prune()
+            per_minute, burst = self._tiers.get(key[1], self._tiers[DEFAULT_TIER])
+            bucket = _Bucket(
+                rate=per_minute / 60.0,
+                capacity=max(1, burst),
+                tokens=float(max(1, burst)),
+                updated_at=self._clock(),
+            )
+            self._buckets[key] = bucket
+        return bucket
+
+    def _prune(self) -> None:
+        # Per-channel postMessage buckets accumulate; drop the ones that are
+        # idle and fully refilled since recreating them is equivalent.
+        now = self._clock()
+        for key, bucket in list(self._buckets.items()):
+            bucket.refill(now)
+            if not bucket.waiters and bucket.paused_until <= now and bucket.tokens >= bucket.capacity:
+                del self._buckets[key]
+
+    async def _drain(self, bucket: _Bucket) -> None:
+        while bucket.waiters:
+            delay = bucket.delay(self._clock())
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            _, _, future = heapq.heappop(bucket.waiters)
+            if future.done():
+                continue
+            bucket.tokens -= 1.0
+            future.set_result(None)
+
+    def _observe(self, priority: int, waited: float) -> None:
+        name = _PRIORITY_CLASSES.get(priority, f"p{priority}")
+        self._waits.setdefault(name, _WaitStats()).observe(waited)
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
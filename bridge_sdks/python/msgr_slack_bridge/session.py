@@ -7,10 +7,14 @@ import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from msgr_bridge_sdk.vault import SessionVault
 
 from .client import SlackClientProtocol, SlackToken
 
+ClientStateListener = Callable[[str, Optional[SlackClientProtocol]], Awaitable[None]]
+
 
 @dataclass(frozen=True)
 class SessionData:
@@ -60,9 +64,10 @@ class SessionData:
 class SessionStore:
     """Persists Slack session blobs to disk."""
 
-    def __init__(self, base_path: Path) -> None:
+    def __init__(self, base_path: Path, *, vault: Optional[SessionVault] = None) -> None:
         self._base = Path(base_path)
         self._base.mkdir(parents=True, exist_ok=True)
+        self._vault = vault
 
     def path_for(self, user_id: str, instance: Optional[str]) -> Path:
         safe_user = _slugify(user_id)
@@ -71,17 +76,25 @@ class SessionStore:
 
     async def persist(self, user_id: str, instance: Optional[str], data: SessionData) -> Path:
         path = self.path_for(user_id, instance)
-        tmp = path.with_suffix(".tmp")
         payload = json.dumps(data.to_dict(), indent=2, sort_keys=True)
+        if self._vault is not None:
+            return await self._vault.write(path, payload.encode("utf-8"))
+        tmp = path.with_suffix(".tmp")
         await asyncio.to_thread(tmp.write_text, payload, encoding="utf-8")
         await asyncio.to_thread(tmp.replace, path)
         return path
 
     async def load(self, user_id: str, instance: Optional[str]) -> Optional[SessionData]:
         path = self.path_for(user_id, instance)
-        if not path.exists():
+        if self._vault is not None:
+            blob = await self._vault.read(path)
+            if blob is None:
+                return None
+            raw = blob.decode("utf-8")
+        elif not path.exists():
             return None
-        raw = await asyncio.to_thread(path.read_text, encoding="utf-8")
+        else:
+            raw = await asyncio.to_thread(path.read_text, encoding="utf-8")
         data = json.loads(raw)
         if not isinstance(data, Mapping):
             raise ValueError("stored session is not a mapping")
@@ -89,6 +102,9 @@ class SessionStore:
 
     async def delete(self, user_id: str, instance: Optional[str]) -> None:
         path = self.path_for(user_id, instance)
+        if self._vault is not None:
+            await self._vault.delete(path)
+            return
         if path.exists():
             await asyncio.to_thread(path.unlink)
 
@@ -102,6 +118,16 @@ class SessionManager:
         self._clients: Dict[str, SlackClientProtocol] = {}
         self._sessions: Dict[str, SessionData] = {}
         self._locks: Dict[str, asyncio.Lock] = {}
+        self._state_listener: Optional[ClientStateListener] = None
+
+    def set_state_listener(self, listener: ClientStateListener) -> None:
+        """Register a callback told when a client is connected (or replaced) and when it is removed.
+
+        The callback receives the ``user::instance`` key and the new client, or
+        ``None`` once the client is gone.
+        """
+
+        self._state_listener = listener
 
     async def ensure_client(
         self,
@@ -125,19 +151,27 @@ class SessionManager:
                 raise ValueError("no session available for Slack client")
 
             client = self._clients.get(key)
+            connected = False
             if client is None or not await client.is_connected():
+                if client is not None:
+                    # Stop the stale client's reconnect supervisor before replacing it.
+                    await client.disconnect()
                 client = self._factory(instance)
                 await client.connect(session.token)
                 self._clients[key] = client
+                connected = True
             elif token is not None and session.token.value != token.value:
                 await client.disconnect()
                 client = self._factory(instance)
                 session = SessionData(token=token, workspace_id=instance, user_id=user_id)
                 await client.connect(session.token)
                 self._clients[key] = client
+                connected = True
 
             self._sessions[key] = session
             await self._store.persist(user_id, instance, session)
+            if connected:
+                await self._notify_state(key, client)
             return client, session
 
     def get_client(self, user_id: str, instance: Optional[str]) -> SlackClientProtocol:
@@ -151,6 +185,9 @@ class SessionManager:
         key = self._key(user_id, instance)
         return self._sessions.get(key)
 
+    def active_count(self) -> int:
+        return len(self._clients)
+
     def active_entries(self) -> List[Tuple[str, Optional[str], SlackClientProtocol, Optional[SessionData]]]:
         """Return a snapshot of active Slack clients and their sessions."""
 
@@ -174,6 +211,8 @@ class SessionManager:
         self._sessions.pop(key, None)
         if client is not None and disconnect:
             await client.disconnect()
+        if client is not None:
+            await self._notify_state(key, None)
 
     async def shutdown(self) -> None:
         for key, client in list(self._clients.items()):
@@ -181,6 +220,11 @@ class SessionManager:
                 await client.disconnect()
             self._clients.pop(key, None)
             self._sessions.pop(key, None)
+            await self._notify_state(key, None)
+
+    async def _notify_state(self, key: str, client: Optional[SlackClientProtocol]) -> None:
+        if self._state_listener is not None:
+            await self._state_listener(key, client)
 
     @staticmethod
     def _key(user_id: str, instance: Optional[str]) -> str:
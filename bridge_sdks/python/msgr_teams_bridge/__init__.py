@@ -1,5 +1,6 @@
 """Microsoft Teams bridge daemon implementation using the StoneMQ SDK."""
 
+from .batching import GraphBatcher, GraphRequestError
 from .client import (
     TeamsClientProtocol,
     TeamsFileUpload,
@@ -13,13 +14,27 @@ from .client import (
     TeamsUser,
     UpdateHandler,
 )
+from .coalescing import NotificationCoalescer
 from .daemon import TeamsBridgeDaemon
+from .encryption import NotificationDecryptionError, NotificationDecryptor
 from .notifications import (
     MemoryNotificationTransport,
     TeamsNotificationSource,
     TeamsWebhookNotificationSource,
 )
+from .polling import (
+    ChatCursor,
+    ChatCursorStore,
+    ChatCursorWriter,
+    ChatPollScheduler,
+    ChatPollState,
+    TenantPollBudget,
+)
+from .refresh import TokenRefreshScheduler
 from .session import SessionData, SessionManager, SessionStore
+from .throttling import GraphThrottleConfig, GraphThrottleRegistry, RequestPriority, TenantThrottle
+from .uploads import ChunkedUploader, UploadSessionError
+from .webhook import GraphWebhookTransport
 
 __all__ = [
     "TeamsClientProtocol",
@@ -32,6 +47,22 @@ __all__ = [
     "TeamsNotificationSource",
     "TeamsWebhookNotificationSource",
     "MemoryNotificationTransport",
+    "GraphWebhookTransport",
+    "NotificationCoalescer",
+    "NotificationDecryptor",
+    "NotificationDecryptionError",
+    "ChatCursor",
+    "ChatCursorStore",
+    "ChatCursorWriter",
+    "GraphBatcher",
+    "GraphRequestError",
+    "ChatPollScheduler",
+    "ChatPollState",
+    "TenantPollBudget",
+    "GraphThrottleConfig",
+    "GraphThrottleRegistry",
+    "RequestPriority",
+    "TenantThrottle",
     "TeamsTenant",
     "TeamsToken",
     "TeamsUser",
@@ -40,4 +71,7 @@ __all__ = [
     "SessionData",
     "SessionManager",
     "SessionStore",
+    "TokenRefreshScheduler",
+    "ChunkedUploader",
+    "UploadSessionError",
 ]
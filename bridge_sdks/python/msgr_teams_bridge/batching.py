@@ -0,0 +1,271 @@
+"""Coalesces concurrent Microsoft Graph GETs into ``$batch`` requests."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Set
+from urllib.parse import quote, urlencode
+
+GRAPH_BATCH_LIMIT = 20
+
+_THROTTLE_STATUSES = frozenset({429, 503})
+
+
+@dataclass(frozen=True)
+class GraphRequest:
+    """One request inside a ``$batch`` envelope."""
+
+    path: str
+    params: Optional[Mapping[str, object]] = None
+    method: str = "GET"
+
+    def url(self) -> str:
+        if not self.params:
+            return self.path
+        query = urlencode(
+            [(key, str(value)) for key, value in self.params.items()],
+            safe="$:',/",
+            quote_via=quote,
+        )
+        separator = "&" if "?" in self.path else "?"
+        return f"{self.path}{separator}{query}"
+
+
+@dataclass(frozen=True)
+class GraphResponse:
+    """One demultiplexed ``$batch`` response."""
+
+    status: int
+    body: Mapping[str, object] = field(default_factory=dict)
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object]) -> "GraphResponse":
+        status = payload.get("status")
+        body = payload.get("body")
+        headers = payload.get("headers")
+        return cls(
+            status=status if isinstance(status, int) else 502,
+            body=body if isinstance(body, Mapping) else {},
+            headers={str(key): str(value) for key, value in headers.items()}
+            if isinstance(headers, Mapping)
+            else {},
+        )
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        for key, value in self.headers.items():
+            if key.lower() == "retry-after":
+                try:
+                    return max(0.0, float(value))
+                except ValueError:
+                    return None
+        return None
+
+
+class GraphRequestError(RuntimeError):
+    """Raised to a caller whose batched request returned a non-success status."""
+
+    def __init__(self, status: int, body: Optional[Mapping[str, object]] = None) -> None:
+        self.status = status
+        self.body = dict(body or {})
+        error = self.body.get("error")
+        message = error.get("message") if isinstance(error, Mapping) else None
+        super().__init__(f"Graph request failed with status {status}: {message or 'no details'}")
+
+
+BatchSender = Callable[[Sequence[GraphRequest]], Awaitable[Sequence[GraphResponse]]]
+SingleSender = Callable[[str, Optional[Mapping[str, object]]], Awaitable[Mapping[str, object]]]
+
+
+@dataclass
+class _Pending:
+    request: GraphRequest
+    future: "asyncio.Future[Mapping[str, object]]"
+    attempts: int = 0
+
+
+class GraphBatcher:
+    """Collects GETs issued within ``linger`` seconds and sends them as one ``$batch``.
+
+    Up to ``max_batch`` requests (Graph's limit is 20) share one round trip and
+    each caller receives its own response. A flush holding a single request is
+    sent directly through ``send_single``. Items throttled inside a batch (429
+    or 503) are re-queued after their ``Retry-After`` delay, up to
+    ``max_retries`` times, without failing the rest of the batch;
+    ``on_throttle`` is told about each such delay.
+    """
+
+    def __init__(
+        self,
+        send_batch: BatchSender,
+        send_single: SingleSender,
+        *,
+        linger: float = 0.005,
+        max_batch: int = GRAPH_BATCH_LIMIT,
+        max_inflight: int = 4,
+        max_retries: int = 3,
+        retry_cap: float = 60.0,
+        on_throttle: Optional[Callable[[str, Optional[float]], None]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._send_batch = send_batch
+        self._send_single = send_single
+        self._linger = max(0.0, float(linger))
+        self._max_batch = min(max(1, int(max_batch)), GRAPH_BATCH_LIMIT)
+        self._semaphore = asyncio.Semaphore(max(1, int(max_inflight)))
+        self._max_retries = max(0, int(max_retries))
+        self._retry_cap = max(0.0, float(retry_cap))
+        self._on_throttle = on_throttle
+        self._logger = logger or logging.getLogger(__name__)
+        self._queue: List[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._requests = 0
+        self._batches = 0
+        self._batched_requests = 0
+        self._singles = 0
+        self._throttled = 0
+        self._failures = 0
+
+    async def get(self, path: str, params: Optional[Mapping[str, object]] = None) -> Mapping[str, object]:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Mapping[str, object]]" = loop.create_future()
+        self._requests += 1
+        self._enqueue(_Pending(GraphRequest(path, dict(params) if params else None), future))
+        return await future
+
+    async def close(self) -> None:
+        """Fail queued requests and wait for in-flight batches; the batcher stays usable."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queued, self._queue = self._queue, []
+        for pending in queued:
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Graph batcher closed"))
+        tasks = list(self._tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "batched_requests": self._batched_requests,
+            "single_requests": self._singles,
+            "throttled": self._throttled,
+            "failures": self._failures,
+            "queued": len(self._queue),
+            "inflight": len(self._tasks),
+        }
+
+    def _enqueue(self, pending: _Pending) -> None:
+        if pending.future.done():
+            return
+        self._queue.append(pending)
+        if len(self._queue) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._linger, self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch = [pending for pending in self._queue[: self._max_batch] if not pending.future.done()]
+            self._queue = self._queue[self._max_batch :]
+            if not batch:
+                continue
+            task = asyncio.create_task(self._run(batch), name="teams-graph-batch")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Pending]) -> None:
+        async with self._semaphore:
+            if len(batch) == 1:
+                await self._run_single(batch[0])
+                return
+            self._batches += 1
+            self._batched_requests += len(batch)
+            try:
+                responses = await self._send_batch([pending.request for pending in batch])
+            except Exception as exc:
+                self._failures += len(batch)
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(exc)
+                return
+        for pending, response in zip(batch, responses):
+            self._resolve(pending, response)
+        for pending in batch[len(responses) :]:
+            self._resolve(pending, GraphResponse(status=502))
+
+    async def _run_single(self, pending: _Pending) -> None:
+        self._singles += 1
+        try:
+            body = await self._send_single(pending.request.path, pending.request.params)
+        except Exception as exc:
+            self._failures += 1
+            if not pending.future.done():
+                pending.future.set_exception(exc)
+            return
+        if not pending.future.done():
+            pending.future.set_result(body)
+
+    def _resolve(self, pending: _Pending, response: GraphResponse) -> None:
+        if pending.future.done():
+            return
+        if response.ok:
+            pending.future.set_result(response.body)
+            return
+        if response.status in _THROTTLE_STATUSES and pending.attempts < self._max_retries:
+            pending.attempts += 1
+            self._throttled += 1
+            delay = response.retry_after
+            if self._on_throttle is not None:
+                self._on_throttle(pending.request.path, delay)
+            if delay is None:
+                delay = float(2 ** pending.attempts)
+            delay = min(delay, self._retry_cap)
+            self._logger.debug(
+                "Graph batch item throttled; retrying",
+                extra={"path": pending.request.path, "status": response.status, "delay": delay},
+            )
+            asyncio.get_running_loop().call_later(delay, self._enqueue, pending)
+            return
+        self._failures += 1
+        pending.future.set_exception(GraphRequestError(response.status, response.body))
+
+
+def batch_payload(requests: Sequence[GraphRequest]) -> Dict[str, object]:
+    """Build the ``$batch`` body; request ids are the positions in ``requests``."""
+
+    return {
+        "requests": [
+            {"id": str(index), "method": request.method, "url": request.url()}
+            for index, request in enumerate(requests)
+        ]
+    }
+
+
+def demultiplex(
+    requests: Sequence[GraphRequest], payload: Mapping[str, object]
+) -> List[GraphResponse]:
+    """Order ``$batch`` responses to match ``requests``."""
+
+    by_id: Dict[str, GraphResponse] = {}
+    responses = payload.get("responses")
+    if isinstance(responses, list):
+        for item in responses:
+            if isinstance(item, Mapping):
+                by_id[str(item.get("id"))] = GraphResponse.from_payload(item)
+    return [by_id.get(str(index), GraphResponse(status=502)) for index in range(len(requests))]
@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 import base64
 import contextlib
-import datetime as dt
+import hashlib
 import html
 import json
 import logging
@@ -13,7 +13,10 @@ import re
 import time
 from dataclasses import dataclass
 from html.parser import HTMLParser
+from pathlib import Path
 from typing import (
+    AsyncIterable,
+    AsyncIterator,
     Awaitable,
     Callable,
     Dict,
@@ -26,7 +29,12 @@ from typing import (
     Tuple,
     Union,
 )
-from urllib.parse import urlparse
+from urllib.parse import quote, urlparse
+
+from msgr_bridge_sdk.http import HttpClientPool, shared_http_pool
+from msgr_bridge_sdk.inflight import InflightLedger
+from msgr_bridge_sdk.singleflight import SingleFlight
+from msgr_bridge_sdk.streaming import DirectoryPage
 
 try:  # pragma: no cover - optional dependency exercised in integration tests
     import aiohttp
@@ -37,7 +45,53 @@ except ImportError:  # pragma: no cover - aiohttp not available during unit test
 
 UpdateHandler = Callable[[Mapping[str, object]], Awaitable[None]]
 
+from .batching import (
+    GRAPH_BATCH_LIMIT,
+    GraphBatcher,
+    GraphRequest,
+    GraphResponse,
+    batch_payload,
+    demultiplex,
+)
+from .coalescing import NotificationCoalescer
+from .encryption import NotificationDecryptionError, NotificationDecryptor
 from .notifications import TeamsNotificationSource
+from .polling import (
+    CHAT_ACTIVITY_PATH,
+    DELTA_PAGE_SIZE,
+    ChatCursorStore,
+    ChatCursorWriter,
+    ChatPollScheduler,
+    ChatPollState,
+    TenantPollBudget,
+    isoformat_us,
+    shared_poll_budget,
+    timestamp_us,
+)
+from .throttling import (
+    THROTTLE_STATUSES,
+    GraphThrottleRegistry,
+    TenantThrottle,
+    graph_resource,
+    request_priority,
+    shared_graph_throttle,
+)
+from .uploads import (
+    INLINE_UPLOAD_LIMIT,
+    TEAMS_CHAT_FILES_FOLDER,
+    UPLOAD_CHUNK_SIZE,
+    ChunkedUploader,
+    drive_item_attachment_id,
+)
+
+TeamsUploadContent = Union[bytes, Path, AsyncIterable[bytes]]
+
+# Graph statuses that mean a stored deltaLink can no longer be replayed, and
+# statuses that mean the chat does not support delta queries at all.
+_DELTA_RESET_STATUSES = frozenset({400, 404, 410})
+_DELTA_UNSUPPORTED_STATUSES = frozenset({400, 404, 405, 501})
+# Lifecycle events after which Graph may have dropped change notifications.
+_CATCH_UP_LIFECYCLE_EVENTS = frozenset({"missed", "subscriptionRemoved"})
 
 
 @dataclass(frozen=True)
@@ -122,6 +176,8 @@ class TeamsUploadedFile:
     size: Optional[int] = None
     content_id: Optional[str] = None
     inline: bool = False
+    item_id: Optional[str] = None
+    web_url: Optional[str] = None
 
     def to_dict(self) -> MutableMapping[str, object]:
         payload: Dict[str, object] = {"name": self.name, "inline": self.inline}
@@ -131,24 +187,72 @@ class TeamsUploadedFile:
             payload["size"] = int(self.size)
         if self.content_id:
             payload["content_id"] = self.content_id
+        if self.item_id:
+            payload["item_id"] = self.item_id
+        if self.web_url:
+            payload["web_url"] = self.web_url
         return payload
 
 
 @dataclass(frozen=True)
 class TeamsFileUpload:
-    """Represents an outbound file that should be attached to a Teams message."""
+    """Represents an outbound file that should be attached to a Teams message.
+
+    ``content`` may be in-memory bytes, a :class:`~pathlib.Path` that is read in
+    chunks while uploading, or an async iterator of byte chunks. Graph needs the
+    size up front, so iterator sources must also set ``length``; they can only be
+    consumed once. Anything that is not small in-memory bytes is uploaded to
+    OneDrive through an upload session rather than inlined into the message.
+    """
 
     filename: str
-    content: bytes
+    content: TeamsUploadContent
     content_type: Optional[str] = None
     inline: bool = False
     content_id: Optional[str] = None
     description: Optional[str] = None
+    length: Optional[int] = None
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path], **kwargs: object) -> "TeamsFileUpload":
+        file_path = Path(path)
+        kwargs.setdefault("filename", file_path.name)
+        return cls(content=file_path, **kwargs)  # type: ignore[arg-type]
+
+    @property
+    def in_memory(self) -> bool:
+        return isinstance(self.content, (bytes, bytearray, memoryview))
 
     def content_length(self) -> int:
-        return len(self.content)
+        if self.length is not None:
+            return self.length
+        if isinstance(self.content, (bytes, bytearray, memoryview)):
+            return len(self.content)
+        if isinstance(self.content, Path):
+            return self.content.stat().st_size
+        raise ValueError("length is required for streamed Teams uploads")
+
+    async def iter_chunks(self, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        content = self.content
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            yield bytes(content)
+        elif isinstance(content, Path):
+            handle = await asyncio.to_thread(content.open, "rb")
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(handle.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                await asyncio.to_thread(handle.close)
+        else:
+            async for chunk in content:
+                yield chunk
 
     def to_attachment(self) -> Tuple[Dict[str, object], TeamsUploadedFile]:
+        if not isinstance(self.content, (bytes, bytearray, memoryview)):
+            raise ValueError("only in-memory Teams uploads can be inlined; use an upload session")
         encoded = base64.b64encode(self.content).decode("ascii")
         attachment = _compact_dict(
             {
@@ -195,6 +299,12 @@ class TeamsClientProtocol(Protocol):
     async def list_conversations(self) -> Sequence[Mapping[str, object]]:
         """Return a snapshot of chats/teams available to the user."""
 
+    def stream_members(self) -> AsyncIterator[DirectoryPage]:
+        """Yield the user's contacts page by page as they are fetched."""
+
+    def stream_conversations(self) -> AsyncIterator[DirectoryPage]:
+        """Yield chats page by page as they are fetched."""
+
     async def send_message(
         self,
         conversation_id: str,
@@ -241,7 +351,31 @@ class TeamsOAuthClientProtocol(Protocol):
 
 
 class TeamsGraphClient(TeamsClientProtocol):
-    """Microsoft Graph implementation that polls chats for new messages."""
+    """Microsoft Graph implementation that polls chats for new messages.
+
+    By default polling is driven by delta queries: each pass lists chats by
+    recent activity (stopping at the first unchanged chat) and replays only the
+    chats that changed through their stored ``deltaLink``. Passing
+    ``delta_polling=False`` restores the legacy catalogue that re-lists every
+    chat and fetches its latest messages. Either way chats are polled on their
+    own schedule: active chats every ``hot_poll_interval`` seconds, idle chats
+    backing off exponentially up to ``idle_poll_interval``, with concurrent
+    polls capped per tenant by ``poll_budget``. With a ``cursor_store`` the
+    per-chat cursors (newest message timestamp, delta link) are restored on
+    connect and written back every ``cursor_flush_interval`` seconds, so a
+    restart neither replays nor skips messages. Every Graph request passes
+    through the tenant's ``TenantThrottle`` (shared by all users of the tenant),
+    which honours ``Retry-After`` and admits sends ahead of polling. Message fetches issued concurrently
+    (chat syncs within a pass, notification lookups) are coalesced into Graph
+    ``$batch`` calls after ``batch_linger`` seconds; ``batch_linger=None``
+    sends every request on its own. With a ``notification_decryptor``, change
+    notifications carrying encrypted resource data are dispatched without a
+    Graph round trip; they fall back to fetching the message if decryption
+    fails. Repeat notifications for one message arriving within
+    ``notification_window`` seconds are merged into a single fetch and
+    redelivered notification ids are dropped; ``notification_window=None``
+    handles every notification as it arrives.
+    """
 
     _GRAPH_BASE = "https://graph.microsoft.com/v1.0"
 
@@ -250,17 +384,82 @@ class TeamsGraphClient(TeamsClientProtocol):
         *,
         session: Optional[ClientSession] = None,
         logger: Optional[logging.Logger] = None,
+        http_pool: Optional[HttpClientPool] = None,
         poll_interval: float = 15.0,
         token_refresh_margin: float = 120.0,
         notification_source: Optional[TeamsNotificationSource] = None,
+        singleflight: Optional[SingleFlight] = None,
+        delta_polling: bool = True,
+        chat_refresh_interval: float = 300.0,
+        batch_linger: Optional[float] = 0.005,
+        batch_size: int = GRAPH_BATCH_LIMIT,
+        hot_poll_interval: float = 2.0,
+        idle_poll_interval: float = 300.0,
+        poll_budget: Optional[TenantPollBudget] = None,
+        throttle: Optional[GraphThrottleRegistry] = None,
+        throttle_retries: int = 2,
+        notification_decryptor: Optional[NotificationDecryptor] = None,
+        notification_window: Optional[float] = 0.25,
+        notification_dedup_entries: int = 10_000,
+        cursor_store: Optional[ChatCursorStore] = None,
+        cursor_flush_interval: float = 5.0,
+        inline_upload_limit: int = INLINE_UPLOAD_LIMIT,
+        upload_chunk_size: int = UPLOAD_CHUNK_SIZE,
+        upload_concurrency: int = 4,
+        upload_retries: int = 3,
     ) -> None:
         if session is not None and ClientSession is not None and not isinstance(session, ClientSession):
             raise RuntimeError("session must be an aiohttp.ClientSession instance")
 
         self._session = session
-        self._owns_session = session is None
+        self._pooled_session = False
+        self._http_pool = http_pool
         self._logger = logger or logging.getLogger(__name__)
-        self._poll_interval = max(5.0, poll_interval)
+        self._flights = singleflight or SingleFlight()
+        # Delta passes cost one request when nothing changed, so they may run
+        # far more often than full re-listing passes.
+        self._delta_polling = delta_polling
+        self._poll_interval = max(1.0 if delta_polling else 5.0, poll_interval)
+        self._poll_state = ChatPollState(refresh_interval=chat_refresh_interval)
+        self._cursor_writer = (
+            ChatCursorWriter(cursor_store, self._poll_state, interval=cursor_flush_interval, logger=self._logger)
+            if cursor_store is not None
+            else None
+        )
+        # In delta mode the catalogue reports new activity, so chats that stay
+        # idle at the backoff cap are dropped from the schedule until woken.
+        self._scheduler = ChatPollScheduler(
+            hot_interval=hot_poll_interval,
+            idle_interval=idle_poll_interval,
+            retire_idle=delta_polling,
+        )
+        self._poll_budget = poll_budget or shared_poll_budget()
+        self._poll_wakeup = asyncio.Event()
+        self._throttles = throttle or shared_graph_throttle()
+        self._throttle_retries = max(0, int(throttle_retries))
+        self._batcher = (
+            GraphBatcher(
+                self._send_batch,
+                lambda path, params: self._get(path, params=params),
+                linger=batch_linger,
+                max_batch=batch_size,
+                on_throttle=lambda path, delay: self._throttle().penalise(delay, graph_resource(path)),
+                logger=self._logger,
+            )
+            if batch_linger is not None
+            else None
+        )
+        self._inline_upload_limit = max(0, int(inline_upload_limit))
+        self._upload_concurrency = max(1, int(upload_concurrency))
+        self._uploader = ChunkedUploader(
+            self._create_upload_session,
+            self._put_upload_range,
+            self._get_upload_status,
+            self._cancel_upload_session,
+            chunk_size=upload_chunk_size,
+            max_retries=upload_retries,
+            logger=self._logger,
+        )
         self._refresh_margin = max(30.0, float(token_refresh_margin))
         self._token: Optional[TeamsToken] = None
         self._tenant: Optional[TeamsTenant] = None
@@ -270,8 +469,27 @@ class TeamsGraphClient(TeamsClientProtocol):
         self._poll_task: Optional[asyncio.Task[None]] = None
         self._notification_source = notification_source
         self._notifications_active = False
-        self._last_message_ts: Dict[str, str] = {}
-        self._inflight: Dict[str, float] = {}
+        self._decryptor = notification_decryptor
+        self._notification_counts: Dict[str, int] = {
+            "decrypted": 0,
+            "decrypt_failures": 0,
+            "fetched": 0,
+            "catch_ups": 0,
+        }
+        self._catch_up_task: Optional[asyncio.Task[None]] = None
+        self._catch_up_pending = False
+        self._coalescer = (
+            NotificationCoalescer(
+                self._process_change_notification,
+                _notification_key,
+                window=notification_window,
+                dedup_entries=notification_dedup_entries,
+                logger=self._logger,
+            )
+            if notification_window is not None
+            else None
+        )
+        self._inflight = InflightLedger()
         self._last_event_at: Optional[float] = None
         self._last_event_id: Optional[str] = None
         self._last_ack_at: Optional[float] = None
@@ -283,6 +501,7 @@ class TeamsGraphClient(TeamsClientProtocol):
         self._token_refresher: Optional[Callable[[TeamsToken], Awaitable[TeamsToken]]] = None
         self._token_update_handler: Optional[Callable[[TeamsToken], Awaitable[None]]] = None
         self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task[None]] = None
 
     async def connect(self, tenant: TeamsTenant, token: TeamsToken) -> None:
         if aiohttp is None:  # pragma: no cover - exercised in integration tests
@@ -292,7 +511,7 @@ class TeamsGraphClient(TeamsClientProtocol):
         self._token = token
         self._tenant = tenant
 
-        me = await self._get("/me")
+        me = await self._flights.do(self._flight_key("me"), lambda: self._get("/me"))
         self._identity = _build_identity(me, tenant)
 
         identity = self._identity
@@ -305,10 +524,14 @@ class TeamsGraphClient(TeamsClientProtocol):
         )
 
         if self._notification_source is not None:
+            # Pin the catch-up window to now: a later missed-notification poll
+            # only replays what arrived after the subscription was started.
+            _ = self._poll_state.since_us
             await self._notification_source.start(tenant, token, self._handle_change_notification)
             self._notifications_active = True
             self._poll_task = None
         elif self._poll_task is None or self._poll_task.done():
+            await self._restore_cursors()
             self._poll_task = asyncio.create_task(self._poll_loop(), name="teams-graph-poller")
         self._last_connect_at = time.time()
         self._consecutive_errors = 0
@@ -317,6 +540,19 @@ class TeamsGraphClient(TeamsClientProtocol):
         if self._notification_source is not None and self._notifications_active:
             await self._notification_source.stop()
             self._notifications_active = False
+        await self.drain_notifications()
+
+        if self._catch_up_task is not None:
+            self._catch_up_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._catch_up_task
+            self._catch_up_task = None
+
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
 
         if self._poll_task is not None:
             self._poll_task.cancel()
@@ -324,9 +560,16 @@ class TeamsGraphClient(TeamsClientProtocol):
                 await self._poll_task
             self._poll_task = None
 
-        if self._owns_session and self._session is not None:
-            await self._session.close()
+        if self._cursor_writer is not None:
+            await self._cursor_writer.close()
+
+        if self._batcher is not None:
+            await self._batcher.close()
+
+        if self._pooled_session:
+            # Pooled sessions are shared with other clients; only drop the reference.
             self._session = None
+            self._pooled_session = False
 
         self._last_disconnect_at = time.time()
         identity = self._identity
@@ -362,16 +605,16 @@ class TeamsGraphClient(TeamsClientProtocol):
         return self._capabilities
 
     async def list_members(self) -> Sequence[Mapping[str, object]]:
-        members: list[Mapping[str, object]] = []
-        async for item in self._paged_get("/me/people"):
-            members.append(item)
-        return members
+        return list(await self._flights.do(self._flight_key("/me/people"), lambda: self._collect("/me/people")))
 
     async def list_conversations(self) -> Sequence[Mapping[str, object]]:
-        conversations: list[Mapping[str, object]] = []
-        async for item in self._paged_get("/me/chats"):
-            conversations.append(item)
-        return conversations
+        return list(await self._flights.do(self._flight_key("/me/chats"), lambda: self._collect("/me/chats")))
+
+    def stream_members(self) -> AsyncIterator[DirectoryPage]:
+        return self._paged_get_pages("/me/people")
+
+    def stream_conversations(self) -> AsyncIterator[DirectoryPage]:
+        return self._paged_get_pages("/me/chats")
 
     async def send_message(
         self,
@@ -382,12 +625,20 @@ class TeamsGraphClient(TeamsClientProtocol):
         metadata: Optional[Mapping[str, object]] = None,
         file_uploads: Optional[Sequence[Union[TeamsFileUpload, Mapping[str, object]]]] = None,
     ) -> Mapping[str, object]:
-        payload, uploads = _prepare_outbound_message(message, file_uploads=file_uploads)
+        inline_uploads, session_uploads = self._partition_uploads(file_uploads)
+        payload, uploads = _prepare_outbound_message(message, file_uploads=inline_uploads)
+        if session_uploads:
+            items = await self._upload_to_drive(session_uploads)
+            uploads.extend(_attach_drive_items(payload, session_uploads, items))
         if metadata is not None:
             payload.setdefault("metadata", dict(metadata))
         if reply_to_id is not None:
             payload.setdefault("replyToId", reply_to_id)
         response = await self._post(f"/chats/{conversation_id}/messages", payload)
+        if self._notification_source is None:
+            # A reply is likely soon after we post; poll the chat hot again.
+            self._scheduler.wake(conversation_id)
+            self._poll_wakeup.set()
         if uploads:
             response = dict(response)
             response["uploaded_files"] = [upload.to_dict() for upload in uploads]
@@ -397,9 +648,9 @@ class TeamsGraphClient(TeamsClientProtocol):
         if not event_id:
             return
         now = time.time()
-        dispatched_at = self._inflight.pop(event_id, None)
-        if dispatched_at is not None:
-            self._last_ack_latency = max(0.0, now - dispatched_at)
+        latency = self._inflight.ack(event_id, now)
+        if latency is not None:
+            self._last_ack_latency = latency
         self._last_ack_at = now
         if self._notification_source is not None:
             await self._notification_source.acknowledge(event_id)
@@ -430,8 +681,24 @@ class TeamsGraphClient(TeamsClientProtocol):
         if self._session is None:
             if aiohttp is None:  # pragma: no cover
                 raise RuntimeError("aiohttp is required to create a Teams HTTP session")
-            timeout = aiohttp.ClientTimeout(total=60)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            self._session = await self._pool().session("graph.microsoft.com")
+            self._pooled_session = True
+
+    def _pool(self) -> HttpClientPool:
+        return self._http_pool or shared_http_pool()
+
+    def _request_options(self) -> Dict[str, object]:
+        # Pooled sessions have no total timeout; bounded API calls add it here.
+        return {"timeout": self._pool().request_timeout()} if self._pooled_session else {}
+
+    async def refresh_access_token(self) -> Optional[TeamsToken]:
+        """Refresh the OAuth token now, off the request path, and return it."""
+
+        token = self._token
+        if token is None or token.refresh_token is None or self._token_refresher is None:
+            return None
+        await self._refresh_token(token)
+        return self._token
 
     async def _ensure_valid_token(self) -> None:
         token = self._token
@@ -446,16 +713,33 @@ class TeamsGraphClient(TeamsClientProtocol):
         if expires_at - now > self._refresh_margin:
             return
 
+        if self._token_refresher is None:
+            return
+
+        if expires_at > now:
+            # Still usable: refresh off the request path so a slow or failing
+            # token endpoint never holds up sends. Only an expired token waits.
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(
+                    self._refresh_in_background(token), name="teams-token-refresh"
+                )
+            return
+
+        await self._refresh_token(token)
+
+    async def _refresh_in_background(self, token: TeamsToken) -> None:
+        with contextlib.suppress(Exception):  # logged by _refresh_token; retried on the next request
+            await self._refresh_token(token)
+
+    async def _refresh_token(self, stale: TeamsToken) -> None:
         refresher = self._token_refresher
         if refresher is None:
             return
 
         async with self._refresh_lock:
             latest = self._token
-            if latest is None:
-                return
-            expires_at = latest.expires_at
-            if expires_at is not None and expires_at - time.time() > self._refresh_margin:
+            if latest is None or latest is not stale:
+                # Refreshed (or replaced) while waiting for the lock.
                 return
 
             try:
@@ -483,16 +767,30 @@ class TeamsGraphClient(TeamsClientProtocol):
             if self._token_update_handler is not None:
                 await self._token_update_handler(refreshed)
 
+    async def _restore_cursors(self) -> None:
+        writer = self._cursor_writer
+        identity = self._identity
+        if writer is None or identity is None:
+            return
+        try:
+            restored = await writer.start(identity.tenant.id, identity.user.id)
+        except Exception:  # pragma: no cover - storage failures logged for ops
+            self._logger.exception("Failed to restore Teams chat cursors")
+            return
+        if restored:
+            self._logger.info("Restored Teams chat cursors", extra={"chats": restored})
+
     async def _poll_loop(self) -> None:
+        next_catalogue = 0.0
         try:
             while True:
+                self._poll_wakeup.clear()
                 try:
                     self._logger.debug("Teams poll iteration starting")
-                    chats = await self.list_conversations()
-                    for chat in chats:
-                        chat_id = str(chat.get("id"))
-                        if chat_id:
-                            await self._poll_chat(chat_id)
+                    if time.time() >= next_catalogue:
+                        next_catalogue = time.time() + self._poll_interval
+                        await self._refresh_catalogue()
+                    await self._poll_due_chats()
                     self._consecutive_errors = 0
                 except asyncio.CancelledError:
                     raise
@@ -501,24 +799,174 @@ class TeamsGraphClient(TeamsClientProtocol):
                     self._logger.exception("Teams polling iteration failed")
                 finally:
                     self._last_poll_at = time.time()
-                await asyncio.sleep(self._poll_interval)
+                await self._wait_for_due(next_catalogue)
         except asyncio.CancelledError:  # pragma: no cover - cancellation path
             pass
 
-    async def _poll_chat(self, chat_id: str) -> None:
+    async def _poll_once(self) -> None:
+        await self._refresh_catalogue()
+        await self._poll_due_chats()
+
+    async def _wait_for_due(self, next_catalogue: float) -> None:
+        wake_at = next_catalogue
+        next_due = self._scheduler.next_due()
+        if next_due is not None:
+            wake_at = min(wake_at, next_due)
+        delay = max(0.0, wake_at - time.time())
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._poll_wakeup.wait(), timeout=delay)
+
+    async def _refresh_catalogue(self) -> None:
+        if self._delta_polling:
+            for chat_id in await self._refresh_chats():
+                self._scheduler.wake(chat_id)
+            return
+        chats = await self.list_conversations()
+        chat_ids = [str(chat.get("id")) for chat in chats if chat.get("id")]
+        self._scheduler.retain(chat_ids)
+        for chat_id in chat_ids:
+            self._scheduler.add(chat_id)
+
+    async def _poll_due_chats(self) -> None:
+        chat_ids = self._scheduler.pop_due()
+        if not chat_ids:
+            return
+        poll = self._sync_chat if self._delta_polling else self._poll_chat
+
+        # Due chats are polled concurrently so their fetches share $batch
+        # calls; messages within one chat are still dispatched in order.
+        results = await asyncio.gather(
+            *(self._poll_scheduled(poll, chat_id) for chat_id in chat_ids),
+            return_exceptions=True,
+        )
+        first_failure: Optional[BaseException] = None
+        for chat_id, result in zip(chat_ids, results):
+            if not isinstance(result, BaseException):
+                continue
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if first_failure is None:
+                first_failure = result
+            else:
+                self._logger.warning("Teams chat poll failed", exc_info=result, extra={"chat_id": chat_id})
+        if first_failure is not None:
+            raise first_failure
+
+    async def _poll_scheduled(self, poll: Callable[[str], Awaitable[int]], chat_id: str) -> None:
+        tenant_id = self._tenant.id if self._tenant is not None else ""
+        active = False
+        try:
+            async with self._poll_budget.slot(tenant_id):
+                active = await poll(chat_id) > 0
+        finally:
+            self._scheduler.record(chat_id, active=active)
+
+    async def _refresh_chats(self) -> list[str]:
+        """Update the cached chat catalogue and return chats with new activity."""
+
+        state = self._poll_state
+        full = state.begin_pass()
+        changed: list[str] = []
+        seen: list[str] = []
+        stopped = False
+        async for page in self._paged_get_pages(CHAT_ACTIVITY_PATH):
+            for chat in page.items:
+                outcome = state.observe(chat)
+                if outcome is None:
+                    continue
+                chat_id = str(chat.get("id"))
+                seen.append(chat_id)
+                if outcome:
+                    changed.append(chat_id)
+                elif not full and state.cursor(chat_id).activity is not None:
+                    # Everything after an unchanged chat is older still.
+                    stopped = True
+                    break
+            if stopped:
+                break
+        if full:
+            for chat_id in state.complete_full_refresh(seen):
+                self._scheduler.forget(chat_id)
+        return changed
+
+    async def _sync_chat(self, chat_id: str) -> int:
+        state = self._poll_state
+        cursor = state.cursor(chat_id)
+        if not cursor.delta_supported:
+            dispatched = await self._poll_chat(chat_id)
+            state.record_fallback(chat_id)
+            return dispatched
+
+        if cursor.delta_link is not None:
+            try:
+                return await self._walk_delta(chat_id, cursor.delta_link)
+            except Exception as exc:
+                if _http_status(exc) not in _DELTA_RESET_STATUSES:
+                    raise
+                self._logger.info("Teams delta link expired; resyncing chat", extra={"chat_id": chat_id})
+                state.reset_delta(chat_id)
+
+        since = isoformat_us(cursor.last_message_us) if cursor.last_message_us else state.since
+        params = {"$top": DELTA_PAGE_SIZE, "$filter": f"lastModifiedDateTime gt {since}"}
+        try:
+            return await self._walk_delta(chat_id, f"/chats/{chat_id}/messages/delta", params)
+        except Exception as exc:
+            if _http_status(exc) not in _DELTA_UNSUPPORTED_STATUSES:
+                raise
+            self._logger.warning(
+                "Teams chat does not support delta queries; polling it directly",
+                extra={"chat_id": chat_id},
+            )
+            state.disable_delta(chat_id)
+            dispatched = await self._poll_chat(chat_id)
+            state.record_fallback(chat_id)
+            return dispatched
+
+    async def _walk_delta(
+        self,
+        chat_id: str,
+        path: str,
+        params: Optional[Mapping[str, object]] = None,
+    ) -> int:
+        threshold = self._poll_state.cursor(chat_id).last_message_us or self._poll_state.since_us
+        next_path: Optional[str] = path
+        delta_link: Optional[str] = None
+        dispatched = 0
+        while next_path:
+            data = await self._batched_get(next_path, params=params)
+            params = None
+            values = data.get("value")
+            for message in values if isinstance(values, list) else []:
+                if isinstance(message, Mapping) and "@removed" not in message:
+                    dispatched += await self._dispatch_polled(chat_id, message, threshold)
+            next_link = data.get("@odata.nextLink")
+            next_path = next_link.replace(self._GRAPH_BASE, "") if isinstance(next_link, str) else None
+            link = data.get("@odata.deltaLink")
+            if isinstance(link, str):
+                delta_link = link.replace(self._GRAPH_BASE, "")
+        self._poll_state.record_sync(chat_id, delta_link)
+        return dispatched
+
+    async def _poll_chat(self, chat_id: str) -> int:
         params = {"$top": 20, "$orderby": "lastModifiedDateTime asc"}
-        data = await self._get(f"/chats/{chat_id}/messages", params=params)
+        data = await self._batched_get(f"/chats/{chat_id}/messages", params=params)
         messages = data.get("value") if isinstance(data.get("value"), list) else []
-        last_seen = self._last_message_ts.get(chat_id)
+        last_seen = self._poll_state.cursor(chat_id).last_message_us
+        dispatched = 0
         for message in messages:
-            if not isinstance(message, Mapping):
-                continue
-            timestamp = message.get("lastModifiedDateTime") or message.get("createdDateTime")
-            if last_seen and _compare_timestamp(timestamp, last_seen) <= 0:
-                continue
-            await self._dispatch_event(chat_id, message)
-            if isinstance(timestamp, str):
-                self._last_message_ts[chat_id] = timestamp
+            if isinstance(message, Mapping):
+                dispatched += await self._dispatch_polled(chat_id, message, last_seen)
+        return dispatched
+
+    async def _dispatch_polled(
+        self, chat_id: str, message: Mapping[str, object], threshold: Optional[int]
+    ) -> bool:
+        stamp = timestamp_us(message.get("lastModifiedDateTime") or message.get("createdDateTime"))
+        if threshold and stamp is not None and stamp <= threshold:
+            return False
+        await self._dispatch_event(chat_id, message)
+        self._poll_state.record_message(chat_id, stamp)
+        return True
 
     async def _dispatch_event(self, chat_id: str, message: Mapping[str, object]) -> None:
         event = _normalise_chat_event(self._tenant, chat_id, message)
@@ -528,9 +976,8 @@ class TeamsGraphClient(TeamsClientProtocol):
         event_id = event.get("event_id")
         if isinstance(event_id, (str, int)):
             event_id_str = str(event_id)
-            self._inflight.setdefault(event_id_str, now)
+            self._inflight.record(event_id_str, now)
             self._last_event_id = event_id_str
-            self._trim_inflight()
         self._last_event_at = now
         self._logger.debug(
             "Teams event received",
@@ -542,17 +989,89 @@ class TeamsGraphClient(TeamsClientProtocol):
             except Exception:  # pragma: no cover - handler failures logged for ops
                 self._logger.exception("Teams handler raised")
 
+    async def drain_notifications(self) -> None:
+        """Handle change notifications still held in the coalescing window."""
+
+        if self._coalescer is not None:
+            await self._coalescer.drain()
+
     async def _handle_change_notification(self, payload: Mapping[str, object]) -> None:
-        try:
-            chat_id, message = await self._fetch_notification_message(payload)
-        except Exception:  # pragma: no cover - defensive logging for ops
-            self._logger.exception("Failed to process Teams change notification")
+        if payload.get("lifecycleEvent") in _CATCH_UP_LIFECYCLE_EVENTS:
+            self._request_catch_up()
             return
+        if self._coalescer is not None:
+            await self._coalescer.submit(payload)
+        else:
+            await self._process_change_notification(payload)
+
+    async def _process_change_notification(self, payload: Mapping[str, object]) -> None:
+        chat_id: Optional[str] = None
+        message: Optional[Mapping[str, object]] = None
+        encrypted = payload.get("encryptedContent")
+        if self._decryptor is not None and isinstance(encrypted, Mapping):
+            chat_id, message = self._decrypt_notification(payload, encrypted)
+
+        if message is None:
+            try:
+                chat_id, message = await self._fetch_notification_message(payload)
+            except Exception:  # pragma: no cover - defensive logging for ops
+                self._logger.exception("Failed to process Teams change notification")
+                return
+            if message is not None:
+                self._notification_counts["fetched"] += 1
 
         if chat_id is None or message is None:
             return
 
         await self._dispatch_event(chat_id, message)
+        self._poll_state.record_message(
+            chat_id, timestamp_us(message.get("lastModifiedDateTime") or message.get("createdDateTime"))
+        )
+
+    def _request_catch_up(self) -> None:
+        """Poll for messages Graph dropped while the subscription was impaired."""
+
+        if self._catch_up_task is not None and not self._catch_up_task.done():
+            self._catch_up_pending = True
+            return
+        self._catch_up_task = asyncio.create_task(self._catch_up_loop(), name="teams-notification-catch-up")
+
+    async def _catch_up_loop(self) -> None:
+        self._catch_up_pending = True
+        while self._catch_up_pending:
+            self._catch_up_pending = False
+            self._notification_counts["catch_ups"] += 1
+            try:
+                # Only chats with activity past their cursor (or past connect
+                # time) are synced, so delivered messages are not replayed.
+                for chat_id in await self._refresh_chats():
+                    await self._sync_chat(chat_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # pragma: no cover - network errors logged for ops
+                self._logger.exception("Teams notification catch-up poll failed")
+
+    def _decrypt_notification(
+        self, payload: Mapping[str, object], encrypted: Mapping[str, object]
+    ) -> Tuple[Optional[str], Optional[Mapping[str, object]]]:
+        assert self._decryptor is not None
+        try:
+            message = self._decryptor.decrypt(encrypted)
+        except NotificationDecryptionError:
+            self._notification_counts["decrypt_failures"] += 1
+            self._logger.warning(
+                "Failed to decrypt Teams notification; fetching the message instead",
+                exc_info=True,
+            )
+            return None, None
+
+        context = _extract_notification_context(payload)
+        chat_id = context.get("chat_id") or context.get("channel_id") or _extract_chat_id_from_message(message)
+        if chat_id is None:
+            self._notification_counts["decrypt_failures"] += 1
+            return None, None
+        self._notification_counts["decrypted"] += 1
+        return chat_id, message
 
     async def _fetch_notification_message(
         self, payload: Mapping[str, object]
@@ -578,7 +1097,7 @@ class TeamsGraphClient(TeamsClientProtocol):
         if path is None:
             return None, None
 
-        message = await self._get(path)
+        message = await self._batched_get(path)
         if not isinstance(message, Mapping):
             return None, None
 
@@ -593,11 +1112,15 @@ class TeamsGraphClient(TeamsClientProtocol):
     async def health(self) -> Mapping[str, object]:
         connected = await self.is_connected()
         now = time.time()
-        oldest_inflight: Optional[float] = None
-        if self._inflight:
-            oldest_inflight = min(self._inflight.values())
+        oldest_inflight = self._inflight.oldest()
         delivery_mode = "change_notifications" if self._notification_source is not None else "polling"
         poll_interval = self._poll_interval if self._notification_source is None else None
+        polling: Optional[Dict[str, object]] = None
+        if self._notification_source is None:
+            polling = dict(self._poll_state.stats()) if self._delta_polling else {}
+            polling["schedule"] = self._scheduler.stats()
+            if self._cursor_writer is not None:
+                polling["cursor_store"] = self._cursor_writer.stats()
         subscription_id = (
             self._notification_source.subscription_id
             if self._notification_source is not None
@@ -609,6 +1132,7 @@ class TeamsGraphClient(TeamsClientProtocol):
                 "delivery_mode": delivery_mode,
                 "subscription_id": subscription_id,
                 "poll_interval": poll_interval,
+                "polling": polling,
                 "handler_count": len(self._handlers),
                 "pending_events": len(self._inflight),
                 "oldest_pending_age": max(0.0, now - oldest_inflight)
@@ -620,10 +1144,20 @@ class TeamsGraphClient(TeamsClientProtocol):
                 else None,
                 "last_ack_at": self._last_ack_at,
                 "last_ack_latency": self._last_ack_latency,
+                "ack_latency": self._inflight.latency.snapshot(),
                 "last_connect_at": self._last_connect_at,
                 "last_disconnect_at": self._last_disconnect_at,
                 "last_poll_at": self._last_poll_at,
                 "consecutive_errors": self._consecutive_errors,
+                "batching": self._batcher.stats() if self._batcher is not None else None,
+                "uploads": self._uploader.stats(),
+                "throttle": self._throttle().stats() if self._tenant is not None else None,
+                "notifications": dict(
+                    self._notification_counts,
+                    coalescing=self._coalescer.stats() if self._coalescer is not None else None,
+                )
+                if self._notification_source is not None
+                else None,
             }
         )
         return health
@@ -632,70 +1166,184 @@ class TeamsGraphClient(TeamsClientProtocol):
         self,
         path: str,
         params: Optional[Mapping[str, object]] = None,
+    ) -> Mapping[str, object]:
+        return await self._request("GET", path, params=params)
+
+    async def _post(self, path: str, payload: Mapping[str, object]) -> Mapping[str, object]:
+        return await self._request("POST", path, payload=payload)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Mapping[str, object]] = None,
+        payload: Optional[Mapping[str, object]] = None,
     ) -> Mapping[str, object]:
         if self._session is None or self._token is None:
             raise RuntimeError("Teams client is not connected")
 
-        await self._ensure_valid_token()
-
+        throttle = self._throttle()
+        resource = graph_resource(path)
+        priority = request_priority(method, path)
         url = f"{self._GRAPH_BASE}{path}"
-        headers = {
-            "Authorization": f"Bearer {self._token.access_token}",
-            "Content-Type": "application/json",
-        }
-        async with self._session.get(url, params=params, headers=headers) as response:
-            response.raise_for_status()
-            text = await response.text()
-            data = json.loads(text)
-        if not isinstance(data, Mapping):
-            raise RuntimeError("Teams Graph returned non-mapping payload")
-        return data
+        attempt = 0
+        while True:
+            await self._ensure_valid_token()
+            headers = {
+                "Authorization": f"Bearer {self._token.access_token}",
+                "Content-Type": "application/json",
+            }
+            async with throttle.slot(resource, priority):
+                if method == "GET":
+                    request = self._session.get(url, params=params, headers=headers, **self._request_options())
+                else:
+                    request = self._session.post(url, json=payload, headers=headers, **self._request_options())
+                async with request as response:
+                    if response.status in THROTTLE_STATUSES and attempt < self._throttle_retries:
+                        delay = throttle.penalise(response.headers.get("Retry-After"), resource)
+                        self._logger.warning(
+                            "Teams Graph request throttled",
+                            extra={"path": path, "status": response.status, "retry_after": delay},
+                        )
+                        attempt += 1
+                        continue
+                    if response.status in THROTTLE_STATUSES:
+                        throttle.penalise(response.headers.get("Retry-After"), resource)
+                    response.raise_for_status()
+                    if method == "GET":
+                        data = json.loads(await response.text())
+                    else:
+                        data = await response.json()
+            if not isinstance(data, Mapping):
+                raise RuntimeError("Teams Graph returned non-mapping payload")
+            return data
+
+    def _throttle(self) -> TenantThrottle:
+        return self._throttles.tenant(self._tenant.id if self._tenant is not None else "")
+
+    async def _batched_get(
+        self,
+        path: str,
+        params: Optional[Mapping[str, object]] = None,
+    ) -> Mapping[str, object]:
+        if self._batcher is None:
+            return await self._get(path, params=params)
+        return await self._batcher.get(path, params)
 
-    async def _post(self, path: str, payload: Mapping[str, object]) -> Mapping[str, object]:
-        if self._session is None or self._token is None:
-            raise RuntimeError("Teams client is not connected")
+    async def _send_batch(self, requests: Sequence[GraphRequest]) -> Sequence[GraphResponse]:
+        data = await self._post("/$batch", batch_payload(requests))
+        return demultiplex(requests, data)
 
-        await self._ensure_valid_token()
+    def _partition_uploads(
+        self,
+        file_uploads: Optional[Sequence[Union[TeamsFileUpload, Mapping[str, object]]]],
+    ) -> Tuple[list[TeamsFileUpload], list[TeamsFileUpload]]:
+        """Split uploads into ones inlined in the message and ones sent via upload sessions."""
 
-        url = f"{self._GRAPH_BASE}{path}"
+        inline: list[TeamsFileUpload] = []
+        sessions: list[TeamsFileUpload] = []
+        for candidate in file_uploads or ():
+            upload = _coerce_file_upload(candidate)
+            if upload is None:
+                continue
+            if upload.in_memory and upload.content_length() <= self._inline_upload_limit:
+                inline.append(upload)
+            else:
+                sessions.append(upload)
+        return inline, sessions
+
+    async def _upload_to_drive(self, uploads: Sequence[TeamsFileUpload]) -> list[Mapping[str, object]]:
+        """Upload ``uploads`` concurrently and return their drive items in order."""
+
+        semaphore = asyncio.Semaphore(self._upload_concurrency)
+
+        async def transfer(upload: TeamsFileUpload) -> Mapping[str, object]:
+            async with semaphore:
+                return await self._uploader.upload(
+                    upload.filename,
+                    upload.content_length(),
+                    upload.iter_chunks(self._uploader.chunk_size),
+                )
+
+        tasks = [asyncio.create_task(transfer(upload)) for upload in uploads]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _create_upload_session(self, filename: str) -> Mapping[str, object]:
+        folder = quote(TEAMS_CHAT_FILES_FOLDER)
+        path = f"/me/drive/root:/{folder}/{quote(filename)}:/createUploadSession"
+        return await self._post(path, {"item": {"@microsoft.graph.conflictBehavior": "rename"}})
+
+    async def _put_upload_range(
+        self, url: str, data: bytes, start: int, total: int
+    ) -> Tuple[int, Mapping[str, object]]:
+        # Upload URLs are pre-authenticated; sending the Graph bearer token
+        # to them is rejected.
+        session = await self._upload_http_session(url)
         headers = {
-            "Authorization": f"Bearer {self._token.access_token}",
-            "Content-Type": "application/json",
+            "Content-Length": str(len(data)),
+            "Content-Range": f"bytes {start}-{start + len(data) - 1}/{total}",
         }
-        async with self._session.post(url, json=payload, headers=headers) as response:
+        async with session.put(url, data=data, headers=headers) as response:
+            return response.status, await _json_body(response)
+
+    async def _get_upload_status(self, url: str) -> Mapping[str, object]:
+        session = await self._upload_http_session(url)
+        async with session.get(url) as response:
             response.raise_for_status()
-            data = await response.json()
-        if not isinstance(data, Mapping):
-            raise RuntimeError("Teams Graph returned non-mapping payload")
-        return data
+            return await _json_body(response)
 
-    def _trim_inflight(self, *, max_entries: int = 1000, max_age: float = 3600.0) -> None:
-        if not self._inflight:
-            return
-        now = time.time()
-        stale_keys = [
-            event_id
-            for event_id, dispatched_at in self._inflight.items()
-            if now - dispatched_at > max_age
-        ]
-        for event_id in stale_keys:
-            self._inflight.pop(event_id, None)
-        if len(self._inflight) > max_entries:
-            overflow = len(self._inflight) - max_entries
-            for event_id in sorted(self._inflight, key=self._inflight.get)[:overflow]:
-                self._inflight.pop(event_id, None)
-
-    async def _paged_get(self, path: str) -> Iterable[Mapping[str, object]]:
-        url = f"{self._GRAPH_BASE}{path}"
-        next_link: Optional[str] = url
+    async def _cancel_upload_session(self, url: str) -> None:
+        session = await self._upload_http_session(url)
+        async with session.delete(url):
+            pass
+
+    async def _upload_http_session(self, url: str) -> ClientSession:
+        # Upload URLs live on the SharePoint host, not graph.microsoft.com, so
+        # pooled clients use that host's session (and its connection limits);
+        # ranges also bypass the Graph throttle.
+        if self._session is None:
+            raise RuntimeError("Teams client is not connected")
+        if self._pooled_session:
+            return await self._pool().session_for(url)
+        return self._session
+
+    async def _collect(self, path: str) -> Sequence[Mapping[str, object]]:
+        items: list[Mapping[str, object]] = []
+        async for item in self._paged_get(path):
+            items.append(item)
+        return items
+
+    def _flight_key(self, operation: str) -> tuple[str, str, str, str]:
+        tenant_id = self._tenant.id if self._tenant is not None else ""
+        if self._identity is not None:
+            principal = self._identity.user.id
+        else:
+            token = self._token.access_token if self._token is not None else ""
+            principal = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        return ("teams", tenant_id, principal, operation)
+
+    async def _paged_get(self, path: str) -> AsyncIterator[Mapping[str, object]]:
+        async for page in self._paged_get_pages(path):
+            for item in page.items:
+                yield item
+
+    async def _paged_get_pages(self, path: str) -> AsyncIterator[DirectoryPage]:
+        next_link: Optional[str] = f"{self._GRAPH_BASE}{path}"
         while next_link:
             data = await self._get(next_link.replace(self._GRAPH_BASE, ""))
             values = data.get("value")
-            if isinstance(values, list):
-                for item in values:
-                    if isinstance(item, Mapping):
-                        yield item
             next_link = data.get("@odata.nextLink") if isinstance(data.get("@odata.nextLink"), str) else None
+            yield DirectoryPage(
+                items=[item for item in values if isinstance(item, Mapping)] if isinstance(values, list) else [],
+                cursor=next_link,
+            )
 
 
 _CHAT_RESOURCE_PATTERN = re.compile(r"/chats\(([\"'])([^\"']+)\1\)/messages\(([\"'])([^\"']+)\3\)", re.IGNORECASE)
@@ -705,6 +1353,15 @@ _CHANNEL_RESOURCE_PATTERN = re.compile(
 )
 
 
+def _notification_key(payload: Mapping[str, object]) -> Optional[Tuple[str, str]]:
+    context = _extract_notification_context(payload)
+    chat_id = context.get("chat_id") or context.get("channel_id")
+    message_id = context.get("message_id")
+    if not chat_id or not message_id:
+        return None
+    return chat_id, message_id
+
+
 def _extract_notification_context(payload: Mapping[str, object]) -> Dict[str, Optional[str]]:
     context: Dict[str, Optional[str]] = {
         "chat_id": None,
@@ -1305,6 +1962,56 @@ def _sanitise_outbound_attachment(attachment: Mapping[str, object]) -> Optional[
     return _compact_dict(cleaned)
 
 
+def _attach_drive_items(
+    payload: Dict[str, object],
+    uploads: Sequence[TeamsFileUpload],
+    items: Sequence[Mapping[str, object]],
+) -> list[TeamsUploadedFile]:
+    """Reference uploaded drive items from ``payload`` as file attachments.
+
+    Teams renders a ``reference`` attachment only when the message body holds
+    a matching ``<attachment id="...">`` tag.
+    """
+
+    attachments = payload.setdefault("attachments", [])
+    tags: list[str] = []
+    uploaded: list[TeamsUploadedFile] = []
+    for upload, item in zip(uploads, items):
+        attachment_id = drive_item_attachment_id(item)
+        if attachment_id is None:
+            raise RuntimeError("Teams drive upload returned an item without an id")
+        name = item.get("name") if isinstance(item.get("name"), str) else upload.filename
+        web_url = item.get("webUrl") if isinstance(item.get("webUrl"), str) else None
+        attachments.append(  # type: ignore[union-attr]
+            _compact_dict(
+                {"id": attachment_id, "contentType": "reference", "contentUrl": web_url, "name": name}
+            )
+        )
+        tags.append(f'<attachment id="{html.escape(attachment_id)}"></attachment>')
+        size = item.get("size")
+        uploaded.append(
+            TeamsUploadedFile(
+                name=str(name),
+                content_type=upload.content_type,
+                size=size if isinstance(size, int) else upload.content_length(),
+                item_id=item.get("id") if isinstance(item.get("id"), str) else None,  # type: ignore[arg-type]
+                web_url=web_url,  # type: ignore[arg-type]
+            )
+        )
+    body = payload["body"]
+    if isinstance(body, MutableMapping):
+        body["content"] = str(body.get("content") or "") + "".join(tags)
+    return uploaded
+
+
+async def _json_body(response: object) -> Mapping[str, object]:
+    try:
+        data = await response.json(content_type=None)  # type: ignore[attr-defined]
+    except ValueError:
+        return {}
+    return data if isinstance(data, Mapping) else {}
+
+
 def _coerce_file_upload(
     upload: Union[TeamsFileUpload, Mapping[str, object]],
 ) -> Optional[TeamsFileUpload]:
@@ -1313,7 +2020,10 @@ def _coerce_file_upload(
     if not isinstance(upload, Mapping):
         return None
 
+    path_value = upload.get("path")
     filename_value = upload.get("filename") or upload.get("name")
+    if not filename_value and isinstance(path_value, (str, Path)) and path_value:
+        filename_value = Path(path_value).name
     if not isinstance(filename_value, str) or not filename_value.strip():
         return None
     filename = filename_value.strip()
@@ -1324,8 +2034,16 @@ def _coerce_file_upload(
         or upload.get("bytes")
         or upload.get("body")
     )
-    content_bytes: Optional[bytes]
-    if hasattr(content_value, "read"):
+    length_value = upload.get("length") or upload.get("size")
+    length = int(length_value) if isinstance(length_value, int) and not isinstance(length_value, bool) else None
+    content_bytes: Optional[TeamsUploadContent]
+    if isinstance(content_value, Path):
+        content_bytes = content_value
+    elif content_value is None and isinstance(path_value, (str, Path)) and path_value:
+        content_bytes = Path(path_value)
+    elif isinstance(content_value, AsyncIterable):
+        content_bytes = content_value if length is not None else None
+    elif hasattr(content_value, "read"):
         try:
             read_result = content_value.read()  # type: ignore[call-arg]
         except Exception:  # pragma: no cover - defensive
@@ -1377,6 +2095,7 @@ def _coerce_file_upload(
         inline=inline,
         content_id=content_id,
         description=description,
+        length=length if not isinstance(content_bytes, bytes) else None,
     )
 
 
@@ -1612,6 +2331,7 @@ class TeamsOAuthClient(TeamsOAuthClientProtocol):
         scope: Optional[Sequence[str]] = None,
         session: Optional[ClientSession] = None,
         logger: Optional[logging.Logger] = None,
+        http_pool: Optional[HttpClientPool] = None,
     ) -> None:
         if session is not None and ClientSession is not None and not isinstance(session, ClientSession):
             raise RuntimeError("session must be an aiohttp.ClientSession instance")
@@ -1621,7 +2341,8 @@ class TeamsOAuthClient(TeamsOAuthClientProtocol):
         self._tenant = tenant
         self._scope = " ".join(scope) if scope else "https://graph.microsoft.com/.default"
         self._session = session
-        self._owns_session = session is None
+        self._pooled_session = False
+        self._http_pool = http_pool
         self._logger = logger or logging.getLogger(__name__)
 
     async def exchange_code(
@@ -1680,22 +2401,29 @@ class TeamsOAuthClient(TeamsOAuthClientProtocol):
         return data
 
     async def close(self) -> None:
-        if self._owns_session and self._session is not None:
-            await self._session.close()
+        if self._pooled_session:
+            # Pooled sessions are shared with other clients; only drop the reference.
             self._session = None
+            self._pooled_session = False
 
     async def _ensure_session(self) -> None:
         if self._session is None:
             if aiohttp is None:  # pragma: no cover
                 raise RuntimeError("aiohttp is required to initialise the Teams OAuth client")
-            timeout = aiohttp.ClientTimeout(total=60)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            self._session = await self._pool().session("login.microsoftonline.com")
+            self._pooled_session = True
+
+    def _pool(self) -> HttpClientPool:
+        return self._http_pool or shared_http_pool()
+
+    def _request_options(self) -> Dict[str, object]:
+        return {"timeout": self._pool().request_timeout()} if self._pooled_session else {}
 
     async def _post(self, url: str, payload: Mapping[str, object]) -> Mapping[str, object]:
         if self._session is None:
             raise RuntimeError("OAuth session is not initialised")
 
-        async with self._session.post(url, data=payload) as response:
+        async with self._session.post(url, data=payload, **self._request_options()) as response:
             response.raise_for_status()
             data = await response.json()
 
@@ -1706,6 +2434,11 @@ class TeamsOAuthClient(TeamsOAuthClientProtocol):
         return data
 
 
+def _http_status(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status", None)
+    return status if isinstance(status, int) else None
+
+
 def _build_identity(me_payload: Mapping[str, object], tenant: TeamsTenant) -> TeamsIdentity:
     user = TeamsUser(
         id=str(me_payload.get("id")),
@@ -1714,28 +2447,3 @@ def _build_identity(me_payload: Mapping[str, object], tenant: TeamsTenant) -> Te
         mail=me_payload.get("mail"),
     )
     return TeamsIdentity(tenant=tenant, user=user)
-
-
-def _compare_timestamp(current: Optional[object], previous: Optional[str]) -> int:
-    if not isinstance(previous, str):
-        return 1
-    current_dt = _parse_datetime(current)
-    previous_dt = _parse_datetime(previous)
-    if current_dt is None or previous_dt is None:
-        return 1
-    if current_dt > previous_dt:
-        return 1
-    if current_dt == previous_dt:
-        return 0
-    return -1
-
-
-def _parse_datetime(value: Optional[object]) -> Optional[dt.datetime]:
-    if not isinstance(value, str):
-        return None
-    try:
-        if value.endswith("Z"):
-            value = value[:-1] + "+00:00"
-        return dt.datetime.fromisoformat(value)
-    except ValueError:
-        return None
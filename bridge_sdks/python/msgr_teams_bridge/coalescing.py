@@ -0,0 +1,140 @@
+"""Coalesces bursts of Graph change notifications for the same message."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Set
+
+from .notifications import NotificationHandler
+
+NotificationKey = Callable[[Mapping[str, object]], Optional[Hashable]]
+
+
+@dataclass
+class _Burst:
+    payload: Mapping[str, object]
+    change_types: List[str] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class NotificationCoalescer:
+    """Merges repeat change notifications for one message into a single flush.
+
+    The first notification for a key opens a ``window``-second burst. Later
+    notifications for the same key replace its payload, since the newest one
+    describes the current state, and append their change types in arrival
+    order: ``created`` followed by two ``updated`` is flushed once with
+    ``changeType`` ``created,updated``. Notifications whose ``id`` is among
+    the last ``dedup_entries`` seen are dropped as redeliveries, and
+    notifications without a key are flushed straight away.
+    """
+
+    def __init__(
+        self,
+        flush: NotificationHandler,
+        key: NotificationKey,
+        *,
+        window: float = 0.25,
+        dedup_entries: int = 10_000,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._flush = flush
+        self._key = key
+        self._window = max(0.0, float(window))
+        self._dedup_entries = max(1, int(dedup_entries))
+        self._logger = logger or logging.getLogger(__name__)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._bursts: Dict[Hashable, _Burst] = {}
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._received = 0
+        self._duplicates = 0
+        self._merged = 0
+        self._flushed = 0
+        self._failures = 0
+
+    async def submit(self, payload: Mapping[str, object]) -> None:
+        if self._is_duplicate(payload):
+            self._duplicates += 1
+            return
+        self._received += 1
+        key = self._key(payload)
+        if key is None or self._window <= 0:
+            await self._deliver(_Burst(payload, _change_types(payload)))
+            return
+
+        burst = self._bursts.get(key)
+        if burst is None:
+            burst = _Burst(payload)
+            burst.timer = asyncio.get_running_loop().call_later(self._window, self._release, key)
+            self._bursts[key] = burst
+        else:
+            burst.payload = payload
+            self._merged += 1
+        for change_type in _change_types(payload):
+            if change_type not in burst.change_types:
+                burst.change_types.append(change_type)
+
+    async def drain(self) -> None:
+        """Flush every open burst now and wait for the deliveries to finish."""
+
+        for key in list(self._bursts):
+            self._release(key)
+        tasks = list(self._tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "received": self._received,
+            "duplicates": self._duplicates,
+            "merged": self._merged,
+            "flushed": self._flushed,
+            "failures": self._failures,
+            "pending": len(self._bursts),
+        }
+
+    def _is_duplicate(self, payload: Mapping[str, object]) -> bool:
+        change_id = payload.get("id")
+        if not isinstance(change_id, str) or not change_id:
+            return False
+        if change_id in self._seen:
+            self._seen.move_to_end(change_id)
+            return True
+        self._seen[change_id] = None
+        while len(self._seen) > self._dedup_entries:
+            self._seen.popitem(last=False)
+        return False
+
+    def _release(self, key: Hashable) -> None:
+        burst = self._bursts.pop(key, None)
+        if burst is None:
+            return
+        if burst.timer is not None:
+            burst.timer.cancel()
+        task = asyncio.create_task(self._deliver(burst), name="teams-notification-flush")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, burst: _Burst) -> None:
+        payload = dict(burst.payload)
+        if burst.change_types:
+            payload["changeType"] = ",".join(burst.change_types)
+        self._flushed += 1
+        try:
+            await self._flush(payload)
+        except Exception:  # pragma: no cover - flush failures logged for ops
+            self._failures += 1
+            self._logger.exception(
+                "Teams change notification flush failed",
+                extra={"resource": payload.get("resource")},
+            )
+
+
+def _change_types(payload: Mapping[str, object]) -> List[str]:
+    value = payload.get("changeType")
+    if not isinstance(value, str):
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
@@ -5,9 +5,17 @@ from __future__ import annotations
 import copy
 import logging
 import time
-from typing import Dict, Mapping, MutableMapping, Optional
+from typing import Dict, Mapping, MutableMapping, Optional, Tuple
 
 from msgr_bridge_sdk import Envelope, StoneMQClient, build_envelope
+from msgr_bridge_sdk.acks import AckLedger
+from msgr_bridge_sdk.health import (
+    DEFAULT_HEALTH_CONCURRENCY,
+    HealthCounters,
+    HealthQuery,
+    collect_health,
+)
+from msgr_bridge_sdk.streaming import DirectoryStreamer
 
 from .client import TeamsClientProtocol, TeamsIdentity, TeamsOAuthClientProtocol, TeamsTenant, TeamsToken
 from .session import SessionData, SessionManager
@@ -34,6 +42,8 @@ class TeamsBridgeDaemon:
         default_user_id: Optional[str] = None,
         oauth: Optional[TeamsOAuthClientProtocol] = None,
         instance: Optional[str] = None,
+        ack_ledger: Optional[AckLedger] = None,
+        health_concurrency: int = DEFAULT_HEALTH_CONCURRENCY,
     ) -> None:
         self._client = mq_client
         self._sessions = sessions
@@ -41,11 +51,15 @@ class TeamsBridgeDaemon:
         self._oauth = oauth
         self._instance = instance
         self._event_handlers: Dict[str, object] = {}
-        self._ack_state: Dict[str, Mapping[str, object]] = {}
+        self._ack_state = ack_ledger if ack_ledger is not None else AckLedger()
+        self._health = HealthCounters()
+        self._health_concurrency = max(1, int(health_concurrency))
         self._logger = logging.getLogger(__name__)
+        self._directory_streams = DirectoryStreamer(mq_client, "teams", logger=self._logger)
 
         if oauth is not None:
             sessions.set_token_refresher(self._refresh_session_token)
+        sessions.set_state_listener(self._handle_client_state)
 
         self._client.register("outbound_message", self._handle_outbound_message)
         self._client.register("ack_event", self._handle_ack_event)
@@ -65,11 +79,12 @@ class TeamsBridgeDaemon:
                 continue
             client.remove_event_handler(handler)  # type: ignore[arg-type]
             self._event_handlers.pop(key, None)
+        await self._directory_streams.close()
         await self._sessions.shutdown()
 
     @property
     def acked_events(self) -> Mapping[str, Mapping[str, object]]:
-        return copy.deepcopy(self._ack_state)
+        return self._ack_state.as_dict()
 
     async def _handle_link_account(self, envelope: Envelope) -> Mapping[str, object]:
         payload = dict(envelope.payload)
@@ -120,6 +135,14 @@ class TeamsBridgeDaemon:
         await self._register_event_handler(identity, client, user_id)
 
         capabilities = await client.describe_capabilities()
+        if payload.get("stream_directory"):
+            handle = self._directory_streams.open(
+                {"members": client.stream_members, "conversations": client.stream_conversations},
+                instance=identity.tenant.id,
+                context={"user_id": user_id, "tenant_id": identity.tenant.id},
+            )
+            return self._build_linked_response(identity, session, capabilities, directory=handle)
+
         members = await client.list_members()
         conversations = await client.list_conversations()
 
@@ -227,66 +250,94 @@ class TeamsBridgeDaemon:
             return
 
         await client.acknowledge_event(str(event_id))
-        self._ack_state[str(event_id)] = dict(payload)
+        self._ack_state.record(str(event_id), payload)
 
     async def _handle_health_snapshot(self, envelope: Envelope) -> Mapping[str, object]:
         payload = envelope.payload
         filter_tenant = payload.get("tenant_id") or payload.get("instance")
         filter_user = payload.get("user_id")
+        query = HealthQuery.from_payload(payload)
 
         entries: list[Mapping[str, object]] = []
-        connected = 0
-        pending_events = 0
+        next_cursor: Optional[str] = None
+        if not query.summary_only:
+            candidates = []
+            for tenant_id, user_id, client, session in self._sessions.active_entries():
+                if filter_tenant is not None and str(filter_tenant) != tenant_id:
+                    continue
+                if filter_user and str(filter_user) != (user_id or ""):
+                    continue
+                key = f"{tenant_id}::{user_id or 'user'}"
+                candidates.append((key, (key, tenant_id, user_id, client, session)))
+
+            entries, next_cursor = await collect_health(
+                candidates, self._probe_health, query, concurrency=self._health_concurrency
+            )
+            if not (filter_tenant is not None or filter_user or query.filtered or query.limit or query.cursor):
+                self._health.retain(key for key, _ in candidates)
 
-        for tenant_id, user_id, client, session in self._sessions.active_entries():
-            if filter_tenant is not None and str(filter_tenant) != tenant_id:
-                continue
-            if filter_user and str(filter_user) != (user_id or ""):
-                continue
+        acks = self._ack_state.summary()
+        summary = self._health.summary(self._sessions.active_count())
+        summary["acked_events"] = acks["total"]
+        summary["token_refresh"] = self._sessions.refresh_stats()
 
-            try:
-                runtime = await client.health()
-            except Exception:  # pragma: no cover - defensive logging for ops
-                self._logger.exception(
-                    "Teams health snapshot failed",
-                    extra={"tenant_id": tenant_id, "user_id": user_id},
-                )
-                runtime = {"status": "error"}
-
-            client_connected = bool(runtime.get("connected"))
-            if client_connected:
-                connected += 1
-
-            client_pending = _coerce_int(runtime.get("pending_events"))
-            pending_events += client_pending
-
-            entry: Dict[str, object] = {
-                "tenant_id": tenant_id,
-                "user_id": user_id,
-                "connected": client_connected,
-                "pending_events": client_pending,
-                "runtime": dict(runtime),
-            }
-            session_payload = session.to_dict() if session is not None else None
-            if session_payload is not None:
-                entry["session"] = session_payload
-
-            entries.append(_compact_snapshot(entry))
-
-        acked_events = [dict(value) for value in self._ack_state.values()]
-        summary = {
-            "total_clients": len(entries),
-            "connected_clients": connected,
-            "pending_events": pending_events,
-            "acked_events": len(acked_events),
-        }
-
-        return {
+        response: Dict[str, object] = {
             "status": "ok",
             "summary": summary,
             "clients": entries,
-            "acked_events": acked_events,
+            "next_cursor": next_cursor,
+            "acks": acks,
         }
+        if payload.get("ack_limit") is not None or payload.get("ack_cursor") is not None:
+            acked_events, ack_cursor = self._ack_state.page(
+                cursor=payload.get("ack_cursor"),
+                limit=_coerce_int(payload.get("ack_limit")) or 100,
+            )
+            response["acked_events"] = acked_events
+            response["ack_cursor"] = ack_cursor
+        return response
+
+    async def _probe_health(
+        self,
+        target: Tuple[str, str, Optional[str], TeamsClientProtocol, Optional[SessionData]],
+    ) -> Mapping[str, object]:
+        key, tenant_id, user_id, client, session = target
+        try:
+            runtime = await client.health()
+        except Exception:  # pragma: no cover - defensive logging for ops
+            self._logger.exception(
+                "Teams health snapshot failed",
+                extra={"tenant_id": tenant_id, "user_id": user_id},
+            )
+            runtime = {"status": "error"}
+
+        client_connected = bool(runtime.get("connected"))
+        client_pending = _coerce_int(runtime.get("pending_events"))
+        self._health.observe(key, connected=client_connected, pending_events=client_pending)
+
+        entry: Dict[str, object] = {
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "connected": client_connected,
+            "pending_events": client_pending,
+            "runtime": dict(runtime),
+        }
+        session_payload = session.to_dict() if session is not None else None
+        if session_payload is not None:
+            entry["session"] = session_payload
+        return _compact_snapshot(entry)
+
+    async def _handle_client_state(self, key: str, client: Optional[TeamsClientProtocol]) -> None:
+        if client is None:
+            # The account was removed: drop everything the daemon kept for it.
+            self._health.forget(key)
+            self._event_handlers.pop(key, None)
+            return
+        handler = self._event_handlers.get(key)
+        if handler is not None:
+            # A replacement client inherits the inbound handler of the one it replaced.
+            client.add_event_handler(handler)  # type: ignore[arg-type]
+        self._health.set_connected(key, await client.is_connected())
 
     async def _register_event_handler(
         self,
@@ -323,8 +374,10 @@ class TeamsBridgeDaemon:
         identity: TeamsIdentity,
         session: SessionData,
         capabilities: Mapping[str, object],
-        members: Mapping[str, object] | list[Mapping[str, object]],
-        conversations: Mapping[str, object] | list[Mapping[str, object]],
+        members: Optional[Mapping[str, object] | list[Mapping[str, object]]] = None,
+        conversations: Optional[Mapping[str, object] | list[Mapping[str, object]]] = None,
+        *,
+        directory: Optional[Mapping[str, object]] = None,
     ) -> Mapping[str, object]:
         response: Dict[str, object] = {
             "status": "linked",
@@ -332,9 +385,12 @@ class TeamsBridgeDaemon:
             "user": identity.user.to_dict(),
             "session": _session_payload(session),
             "capabilities": copy.deepcopy(_DEFAULT_CAPABILITIES),
-            "members": _ensure_list(members),
-            "conversations": _ensure_list(conversations),
         }
+        if directory is not None:
+            response["directory"] = dict(directory)
+        else:
+            response["members"] = _ensure_list(members or [])
+            response["conversations"] = _ensure_list(conversations or [])
         response["capabilities"].update(copy.deepcopy(capabilities))
         return response
 
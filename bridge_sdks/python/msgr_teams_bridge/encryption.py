@@ -0,0 +1,135 @@
+"""Decryption of Graph change notifications that carry encrypted resource data."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+try:  # pragma: no cover - optional dependency
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, padding, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding as asymmetric_padding
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:  # pragma: no cover - cryptography not installed during unit tests
+    x509 = None  # type: ignore
+    RSAPrivateKey = None  # type: ignore
+
+PemSource = Union[bytes, str, Path]
+
+
+class NotificationDecryptionError(RuntimeError):
+    """Raised when encrypted notification content cannot be verified or decrypted."""
+
+
+class NotificationDecryptor:
+    """Decrypts ``encryptedContent`` of Graph rich notifications.
+
+    Graph encrypts each payload with a random AES key, signs the ciphertext
+    with HMAC-SHA256 under that key and wraps the key with the subscription's
+    RSA certificate (OAEP). ``subscription_fields`` returns the properties to
+    add to a subscription so Graph includes resource data; keys for retired
+    certificates can be kept in ``retired_keys`` until their subscriptions
+    have been renewed with the current certificate.
+    """
+
+    def __init__(
+        self,
+        private_key: PemSource,
+        certificate: PemSource,
+        *,
+        certificate_id: str = "primary",
+        password: Optional[bytes] = None,
+        retired_keys: Optional[Mapping[str, PemSource]] = None,
+    ) -> None:
+        if x509 is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("cryptography is required to decrypt Teams notifications")
+        if not certificate_id:
+            raise ValueError("certificate_id is required")
+        cert = x509.load_pem_x509_certificate(_read_pem(certificate))
+        self._certificate_id = certificate_id
+        self._certificate_der = cert.public_bytes(serialization.Encoding.DER)
+        self._keys: Dict[str, "RSAPrivateKey"] = {}
+        for retired_id, retired_key in (retired_keys or {}).items():
+            self._keys[retired_id] = _load_private_key(retired_key, password)
+        self._keys[certificate_id] = _load_private_key(private_key, password)
+
+    @property
+    def certificate_id(self) -> str:
+        return self._certificate_id
+
+    def subscription_fields(self) -> Dict[str, object]:
+        return {
+            "includeResourceData": True,
+            "encryptionCertificate": base64.b64encode(self._certificate_der).decode("ascii"),
+            "encryptionCertificateId": self._certificate_id,
+        }
+
+    def decrypt(self, encrypted_content: Mapping[str, object]) -> Mapping[str, object]:
+        """Verify and decrypt one ``encryptedContent`` object into the resource JSON."""
+
+        certificate_id = encrypted_content.get("encryptionCertificateId")
+        key = self._keys.get(certificate_id) if isinstance(certificate_id, str) else None
+        if key is None:
+            raise NotificationDecryptionError(f"unknown encryption certificate {certificate_id!r}")
+        data, signature, wrapped_key = _decode_fields(encrypted_content)
+        try:
+            symmetric_key = key.decrypt(
+                wrapped_key,
+                asymmetric_padding.OAEP(
+                    mgf=asymmetric_padding.MGF1(algorithm=hashes.SHA1()),
+                    algorithm=hashes.SHA1(),
+                    label=None,
+                ),
+            )
+        except ValueError as exc:
+            raise NotificationDecryptionError("unable to unwrap notification data key") from exc
+
+        expected = hmac.new(symmetric_key, data, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, signature):
+            raise NotificationDecryptionError("notification data signature mismatch")
+
+        decryptor = Cipher(algorithms.AES(symmetric_key), modes.CBC(symmetric_key[:16])).decryptor()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        try:
+            padded = decryptor.update(data) + decryptor.finalize()
+            plaintext = unpadder.update(padded) + unpadder.finalize()
+            resource = json.loads(plaintext.decode("utf-8"))
+        except ValueError as exc:
+            raise NotificationDecryptionError("notification data is not valid JSON") from exc
+        if not isinstance(resource, Mapping):
+            raise NotificationDecryptionError("notification data is not a JSON object")
+        return resource
+
+
+def _decode_fields(encrypted_content: Mapping[str, object]) -> Tuple[bytes, bytes, bytes]:
+    decoded = []
+    for name in ("data", "dataSignature", "dataKey"):
+        value = encrypted_content.get(name)
+        if not isinstance(value, str) or not value:
+            raise NotificationDecryptionError(f"encrypted content missing {name}")
+        try:
+            decoded.append(base64.b64decode(value, validate=True))
+        except (binascii.Error, ValueError) as exc:
+            raise NotificationDecryptionError(f"encrypted content {name} is not base64") from exc
+    return decoded[0], decoded[1], decoded[2]
+
+
+def _read_pem(source: PemSource) -> bytes:
+    if isinstance(source, Path):
+        return source.read_bytes()
+    if isinstance(source, str):
+        return source.encode("ascii")
+    return source
+
+
+def _load_private_key(source: PemSource, password: Optional[bytes]) -> "RSAPrivateKey":
+    key = serialization.load_pem_private_key(_read_pem(source), password=password)
+    if not isinstance(key, RSAPrivateKey):
+        raise ValueError("Teams notification decryption requires an RSA private key")
+    return key
@@ -6,11 +6,16 @@ import asyncio
 import contextlib
 import datetime as dt
 import logging
+import time
 from dataclasses import dataclass
 from typing import Awaitable, Callable, Dict, Mapping, Optional, Protocol
 
 NotificationHandler = Callable[[Mapping[str, object]], Awaitable[None]]
 
+# Lower bound between renewal attempts, so a failing PATCH is retried without
+# spinning but still lands before the subscription lapses.
+MIN_RENEWAL_DELAY = 5.0
+
 
 class TeamsNotificationSource(Protocol):
     """Protocol implemented by change-notification providers."""
@@ -80,7 +85,14 @@ class NotificationTransport(Protocol):
 
 @dataclass
 class TeamsWebhookNotificationSource(TeamsNotificationSource):
-    """Manages Microsoft Graph webhook subscriptions for chat messages."""
+    """Manages Microsoft Graph webhook subscriptions for chat messages.
+
+    The subscription is renewed ``renewal_window`` seconds before the expiry
+    Graph reported last. ``subscriptionRemoved`` lifecycle notifications (or a
+    subscription that lapsed because renewals kept failing) start a fresh
+    subscription; ``missed`` and ``subscriptionRemoved`` are forwarded to the
+    dispatcher so the client can poll for what Graph dropped.
+    """
 
     transport: NotificationTransport
     resource: str = "/chats/getAllMessages"
@@ -93,6 +105,8 @@ class TeamsWebhookNotificationSource(TeamsNotificationSource):
         self._token: Optional["TeamsToken"] = None
         self._dispatch: Optional[NotificationHandler] = None
         self._renew_task: Optional[asyncio.Task[None]] = None
+        self._expiration: Optional[float] = None
+        self._resubscribe_lock = asyncio.Lock()
         self._shutdown = asyncio.Event()
 
     async def start(
@@ -119,11 +133,8 @@ class TeamsWebhookNotificationSource(TeamsNotificationSource):
         self._subscription_id = subscription_id
         self.transport.register(subscription_id, self._handle_notification)
         self._shutdown.clear()
-        expiration = _extract_expiration(response)
-        self._renew_task = asyncio.create_task(
-            self._renewal_loop(expiration),
-            name="teams-webhook-renewal",
-        )
+        self._expiration = _extract_expiration(response)
+        self._renew_task = asyncio.create_task(self._renewal_loop(), name="teams-webhook-renewal")
         self._logger.info(
             "Teams webhook subscription started",
             extra={"subscription_id": subscription_id, "resource": self.resource},
@@ -147,6 +158,7 @@ class TeamsWebhookNotificationSource(TeamsNotificationSource):
             )
 
         self._subscription_id = None
+        self._expiration = None
         self._tenant = None
         self._token = None
         self._dispatch = None
@@ -169,6 +181,9 @@ class TeamsWebhookNotificationSource(TeamsNotificationSource):
         return self._subscription_id
 
     async def _handle_notification(self, payload: Mapping[str, object]) -> None:
+        if payload.get("lifecycleEvent") == "subscriptionRemoved":
+            subscription_id = payload.get("subscriptionId")
+            await self._resubscribe(subscription_id if isinstance(subscription_id, str) else None)
         dispatch = self._dispatch
         if dispatch is None:
             return
@@ -177,26 +192,34 @@ class TeamsWebhookNotificationSource(TeamsNotificationSource):
             enriched["tenant_id"] = self._tenant.id
         await dispatch(enriched)
 
-    async def _renewal_loop(self, expiration: Optional[float]) -> None:
+    async def _renewal_loop(self) -> None:
         try:
             while not self._shutdown.is_set():
-                wait_for = _compute_renewal_delay(expiration, self.renewal_window)
+                wait_for = _compute_renewal_delay(self._expiration, self.renewal_window)
                 try:
                     await asyncio.wait_for(self._shutdown.wait(), timeout=wait_for)
                 except asyncio.TimeoutError:
                     pass
                 if self._shutdown.is_set():
                     break
-                await self._renew_subscription()
+                expiration = await self._renew_subscription()
+                if expiration is not None:
+                    self._expiration = expiration
+                elif self._expiration is not None and self._expiration <= time.time():
+                    # Renewals failed until the subscription lapsed; Graph has
+                    # dropped it, so start over.
+                    await self._resubscribe(self._subscription_id)
         except asyncio.CancelledError:  # pragma: no cover - cancellation is expected on shutdown
             pass
 
-    async def _renew_subscription(self) -> None:
+    async def _renew_subscription(self) -> Optional[float]:
+        """Extend the subscription and return its new expiry, or ``None`` on failure."""
+
         subscription_id = self._subscription_id
         tenant = self._tenant
         token = self._token
         if subscription_id is None or tenant is None or token is None:
-            return
+            return None
         try:
             response = await self.transport.renew(
                 subscription_id,
@@ -213,11 +236,48 @@ class TeamsWebhookNotificationSource(TeamsNotificationSource):
                         "next_expiration": expiration,
                     },
                 )
+            return expiration
         except Exception:  # pragma: no cover - defensive logging for ops
             self._logger.exception(
                 "Failed to renew Teams webhook subscription",
                 extra={"subscription_id": subscription_id},
             )
+            return None
+
+    async def _resubscribe(self, stale_id: Optional[str]) -> None:
+        """Replace a subscription Graph removed with a new one."""
+
+        async with self._resubscribe_lock:
+            tenant = self._tenant
+            token = self._token
+            if self._shutdown.is_set() or tenant is None or token is None:
+                return
+            if stale_id is not None and stale_id != self._subscription_id:
+                return  # already replaced
+            if self._subscription_id is not None:
+                self.transport.unregister(self._subscription_id)
+            try:
+                response = await self.transport.subscribe(tenant, token, resource=self.resource)
+            except Exception:  # pragma: no cover - defensive logging for ops
+                self._logger.exception(
+                    "Failed to recreate Teams webhook subscription",
+                    extra={"subscription_id": stale_id},
+                )
+                # Let the renewal loop retry soon instead of waiting out the old expiry.
+                self._expiration = time.time()
+                return
+            subscription_id = _extract_subscription_id(response)
+            if subscription_id is None:
+                self._logger.error("Recreated Teams subscription response missing identifier")
+                self._expiration = time.time()
+                return
+            self._subscription_id = subscription_id
+            self._expiration = _extract_expiration(response)
+            self.transport.register(subscription_id, self._handle_notification)
+            self._logger.info(
+                "Teams webhook subscription recreated",
+                extra={"subscription_id": subscription_id, "previous": stale_id},
+            )
 
 
 class MemoryNotificationTransport(NotificationTransport):
@@ -317,7 +377,7 @@ def _compute_renewal_delay(expiration: Optional[float], renewal_window: float) -
     if expiration is None:
         return max(renewal_window, 60.0)
     now = dt.datetime.now(dt.timezone.utc).timestamp()
-    delay = max(5.0, expiration - now - renewal_window)
+    delay = max(MIN_RENEWAL_DELAY, expiration - now - renewal_window)
     return delay
 
 
@@ -0,0 +1,553 @@
+"""Chat catalogue, delta cursors and poll scheduling for the Teams Graph poller."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Protocol, Set, Tuple
+
+# Chats ordered by most recent activity, so a refresh can stop paging at the
+# first chat whose activity marker has not changed since the previous pass.
+CHAT_ACTIVITY_PATH = (
+    "/me/chats?$expand=lastMessagePreview"
+    "&$orderby=lastMessagePreview/createdDateTime%20desc&$top=50"
+)
+DELTA_PAGE_SIZE = 50
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+
+@dataclass
+class ChatCursor:
+    """Polling position of one chat."""
+
+    chat_id: str
+    activity: Optional[str] = None
+    activity_at: Optional[str] = None
+    delta_link: Optional[str] = None
+    delta_supported: bool = True
+    synced_at: Optional[float] = None
+    # Newest dispatched message, as epoch microseconds.
+    last_message_us: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        record: Dict[str, object] = {"delta_supported": self.delta_supported}
+        for name in ("activity", "activity_at", "delta_link", "last_message_us"):
+            value = getattr(self, name)
+            if value is not None:
+                record[name] = value
+        return record
+
+    @staticmethod
+    def from_dict(chat_id: str, data: Mapping[str, object]) -> "ChatCursor":
+        def text(name: str) -> Optional[str]:
+            value = data.get(name)
+            return value if isinstance(value, str) else None
+
+        last_message_us = data.get("last_message_us")
+        return ChatCursor(
+            chat_id=chat_id,
+            activity=text("activity"),
+            activity_at=text("activity_at"),
+            delta_link=text("delta_link"),
+            delta_supported=data.get("delta_supported") is not False,
+            last_message_us=last_message_us if isinstance(last_message_us, int) else None,
+        )
+
+
+class ChatCursorStore(Protocol):
+    """Persistence for the chat cursors of one Teams user."""
+
+    async def load_cursors(self, tenant_id: str, user_id: Optional[str]) -> Optional[Mapping[str, object]]:
+        """Return the payload saved by :meth:`persist_cursors`, if any."""
+
+    async def persist_cursors(
+        self, tenant_id: str, user_id: Optional[str], cursors: Mapping[str, object]
+    ) -> None:
+        """Replace the stored cursors for ``tenant_id``/``user_id``."""
+
+
+class ChatPollState:
+    """Cached chat catalogue plus per-chat delta links for one Teams user.
+
+    The catalogue is refreshed incrementally: each pass lists chats by most
+    recent activity and stops at the first chat whose activity marker is
+    unchanged, so an idle account costs a single request per pass. Every
+    ``refresh_interval`` seconds the full listing is walked to forget chats the
+    user has left. Chats with new activity are synced through their stored
+    ``deltaLink``. ``version`` changes whenever a cursor worth persisting does,
+    and ``export``/``restore`` carry the cursors across restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_interval: float = 300.0,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self._refresh_interval = max(0.0, float(refresh_interval))
+        self._clock = clock or time.time
+        self._cursors: Dict[str, ChatCursor] = {}
+        self._since_us: Optional[int] = None
+        self._version = 0
+        self._last_full_refresh: Optional[float] = None
+        self._passes = 0
+        self._full_refreshes = 0
+        self._delta_syncs = 0
+        self._delta_resets = 0
+        self._fallback_polls = 0
+
+    def __contains__(self, chat_id: object) -> bool:
+        return chat_id in self._cursors
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    @property
+    def since(self) -> str:
+        """ISO timestamp of the first pass; older messages are never replayed."""
+
+        return isoformat_us(self.since_us)
+
+    @property
+    def since_us(self) -> int:
+        if self._since_us is None:
+            self._since_us = int(self._clock()) * 1_000_000
+        return self._since_us
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def cursor(self, chat_id: str) -> ChatCursor:
+        cursor = self._cursors.get(chat_id)
+        if cursor is None:
+            cursor = ChatCursor(chat_id=chat_id)
+            self._cursors[chat_id] = cursor
+        return cursor
+
+    def cursors(self) -> List[ChatCursor]:
+        return list(self._cursors.values())
+
+    def begin_pass(self) -> bool:
+        """Start a polling pass and report whether it must walk the full catalogue."""
+
+        self._passes += 1
+        now = self._clock()
+        if self._last_full_refresh is None or now - self._last_full_refresh >= self._refresh_interval:
+            return True
+        return False
+
+    def observe(self, chat: Mapping[str, object]) -> Optional[bool]:
+        """Record one catalogue entry.
+
+        Returns ``None`` for entries without an id, ``True`` when the chat has
+        activity the poller has not synced yet and ``False`` when its activity
+        marker is unchanged.
+        """
+
+        chat_id = chat.get("id")
+        if not isinstance(chat_id, str) or not chat_id:
+            return None
+        activity, activity_at = chat_activity(chat)
+        known = chat_id in self._cursors
+        cursor = self.cursor(chat_id)
+        if known and cursor.activity == activity:
+            return False
+        cursor.activity = activity
+        cursor.activity_at = activity_at
+        self._version += 1
+        if activity is None:
+            return False
+        activity_us = timestamp_us(activity_at)
+        if not known and cursor.delta_link is None and activity_us is not None and activity_us <= self.since_us:
+            # Seen for the first time with activity that predates the poller;
+            # the first sync happens once something new arrives.
+            return False
+        return True
+
+    def complete_full_refresh(self, seen: Iterable[str]) -> List[str]:
+        """Forget chats missing from a full listing and return their ids."""
+
+        active = set(seen)
+        removed = [chat_id for chat_id in self._cursors if chat_id not in active]
+        for chat_id in removed:
+            del self._cursors[chat_id]
+        if removed:
+            self._version += 1
+        self._last_full_refresh = self._clock()
+        self._full_refreshes += 1
+        return removed
+
+    def record_sync(self, chat_id: str, delta_link: Optional[str]) -> None:
+        cursor = self.cursor(chat_id)
+        if delta_link is not None and delta_link != cursor.delta_link:
+            cursor.delta_link = delta_link
+            self._version += 1
+        cursor.synced_at = self._clock()
+        self._delta_syncs += 1
+
+    def reset_delta(self, chat_id: str) -> None:
+        cursor = self._cursors.get(chat_id)
+        if cursor is not None:
+            cursor.delta_link = None
+            self._delta_resets += 1
+            self._version += 1
+
+    def disable_delta(self, chat_id: str) -> None:
+        self.cursor(chat_id).delta_supported = False
+        self._version += 1
+
+    def record_message(self, chat_id: str, stamp_us: Optional[int]) -> None:
+        """Advance the chat's newest-dispatched timestamp."""
+
+        if stamp_us is None:
+            return
+        cursor = self.cursor(chat_id)
+        if cursor.last_message_us is None or stamp_us > cursor.last_message_us:
+            cursor.last_message_us = stamp_us
+            self._version += 1
+
+    def export(self) -> Dict[str, object]:
+        return {
+            "since_us": self.since_us,
+            "chats": {chat_id: cursor.to_dict() for chat_id, cursor in self._cursors.items()},
+        }
+
+    def restore(self, payload: Mapping[str, object]) -> int:
+        """Load cursors saved by :meth:`export` for chats not already tracked."""
+
+        since_us = payload.get("since_us")
+        if self._since_us is None and isinstance(since_us, int):
+            self._since_us = since_us
+        chats = payload.get("chats")
+        restored = 0
+        for chat_id, record in chats.items() if isinstance(chats, Mapping) else ():
+            if not isinstance(chat_id, str) or not isinstance(record, Mapping) or chat_id in self._cursors:
+                continue
+            self._cursors[chat_id] = ChatCursor.from_dict(chat_id, record)
+            restored += 1
+        return restored
+
+    def record_fallback(self, chat_id: str) -> None:
+        self.cursor(chat_id).synced_at = self._clock()
+        self._fallback_polls += 1
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "chats": len(self._cursors),
+            "delta_links": sum(1 for cursor in self._cursors.values() if cursor.delta_link),
+            "fallback_chats": sum(1 for cursor in self._cursors.values() if not cursor.delta_supported),
+            "passes": self._passes,
+            "full_refreshes": self._full_refreshes,
+            "last_full_refresh_at": self._last_full_refresh,
+            "delta_syncs": self._delta_syncs,
+            "delta_resets": self._delta_resets,
+            "fallback_polls": self._fallback_polls,
+        }
+
+
+class ChatCursorWriter:
+    """Write-behind persistence of a :class:`ChatPollState`.
+
+    Cursor changes are written at most once every ``interval`` seconds, so a
+    busy chat costs one write per interval rather than one per message;
+    ``close`` writes whatever is still pending.
+    """
+
+    def __init__(
+        self,
+        store: ChatCursorStore,
+        state: ChatPollState,
+        *,
+        interval: float = 5.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._store = store
+        self._state = state
+        self._interval = max(0.1, float(interval))
+        self._logger = logger or logging.getLogger(__name__)
+        self._owner: Optional[Tuple[str, Optional[str]]] = None
+        self._persisted_version: Optional[int] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._restored = 0
+        self._writes = 0
+        self._failures = 0
+        self._last_write_at: Optional[float] = None
+
+    async def start(self, tenant_id: str, user_id: Optional[str]) -> int:
+        """Restore stored cursors for the user and begin writing changes back."""
+
+        if self._owner != (tenant_id, user_id):
+            self._owner = (tenant_id, user_id)
+            payload = await self._store.load_cursors(tenant_id, user_id)
+            if payload:
+                self._restored = self._state.restore(payload)
+            self._persisted_version = self._state.version
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="teams-cursor-writer")
+        return self._restored
+
+    async def flush(self) -> bool:
+        owner = self._owner
+        version = self._state.version
+        if owner is None or version == self._persisted_version:
+            return False
+        await self._store.persist_cursors(owner[0], owner[1], self._state.export())
+        self._persisted_version = version
+        self._writes += 1
+        self._last_write_at = time.time()
+        return True
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self._flush_logged()
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "restored": self._restored,
+            "writes": self._writes,
+            "failures": self._failures,
+            "pending": self._owner is not None and self._state.version != self._persisted_version,
+            "last_write_at": self._last_write_at,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self._flush_logged()
+
+    async def _flush_logged(self) -> None:
+        try:
+            await self.flush()
+        except Exception:  # pragma: no cover - storage failures logged for ops
+            self._failures += 1
+            self._logger.exception("Failed to persist Teams chat cursors")
+
+
+@dataclass
+class _ChatSchedule:
+    interval: float
+    due: float
+    woken: bool = False
+
+
+class ChatPollScheduler:
+    """Per-chat next-due times with exponential backoff for idle chats.
+
+    A chat that yielded messages (or was woken by an outbound send or a
+    catalogue change) is polled again after ``hot_interval``; each idle poll
+    multiplies its interval by ``backoff`` up to ``idle_interval``. With
+    ``retire_idle`` a chat that stays idle at the cap is dropped from the
+    schedule entirely, for pollers that learn about new activity another way.
+    """
+
+    def __init__(
+        self,
+        *,
+        hot_interval: float = 2.0,
+        idle_interval: float = 300.0,
+        backoff: float = 2.0,
+        retire_idle: bool = False,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self._hot = max(0.1, float(hot_interval))
+        self._idle = max(self._hot, float(idle_interval))
+        self._backoff = max(1.0, float(backoff))
+        self._retire_idle = retire_idle
+        self._clock = clock or time.time
+        self._entries: Dict[str, _ChatSchedule] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._order = itertools.count()
+        self._running: Set[str] = set()
+        self._polls = 0
+        self._active_polls = 0
+        self._retired = 0
+
+    def __contains__(self, chat_id: object) -> bool:
+        return chat_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, chat_id: str) -> None:
+        """Schedule a newly discovered chat for an immediate first poll."""
+
+        if chat_id not in self._entries:
+            self.wake(chat_id)
+
+    def wake(self, chat_id: str) -> None:
+        """Mark a chat hot and due now."""
+
+        entry = self._entries.get(chat_id)
+        if chat_id in self._running and entry is not None:
+            entry.woken = True
+            return
+        now = self._clock()
+        if entry is None:
+            entry = _ChatSchedule(interval=self._hot, due=now)
+            self._entries[chat_id] = entry
+        else:
+            entry.interval = self._hot
+            entry.due = now
+        self._push(chat_id, entry)
+
+    def pop_due(self, limit: Optional[int] = None) -> List[str]:
+        """Return chats whose poll is due; they stay unscheduled until ``record``."""
+
+        now = self._clock()
+        due: List[str] = []
+        while self._heap and (limit is None or len(due) < limit):
+            when, _, chat_id = self._heap[0]
+            entry = self._entries.get(chat_id)
+            if entry is None or entry.due != when or chat_id in self._running:
+                heapq.heappop(self._heap)
+                continue
+            if when > now:
+                break
+            heapq.heappop(self._heap)
+            self._running.add(chat_id)
+            due.append(chat_id)
+        return due
+
+    def record(self, chat_id: str, *, active: bool) -> None:
+        """Reschedule a chat after a poll that did (or did not) yield messages."""
+
+        self._running.discard(chat_id)
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            return
+        self._polls += 1
+        if active or entry.woken:
+            self._active_polls += 1
+            entry.interval = self._hot
+        elif self._retire_idle and entry.interval >= self._idle:
+            del self._entries[chat_id]
+            self._retired += 1
+            return
+        else:
+            entry.interval = min(entry.interval * self._backoff, self._idle)
+        entry.woken = False
+        entry.due = self._clock() + entry.interval
+        self._push(chat_id, entry)
+
+    def forget(self, chat_id: str) -> None:
+        self._entries.pop(chat_id, None)
+
+    def retain(self, chat_ids: Iterable[str]) -> None:
+        active = set(chat_ids)
+        for chat_id in [chat_id for chat_id in self._entries if chat_id not in active]:
+            del self._entries[chat_id]
+
+    def next_due(self) -> Optional[float]:
+        while self._heap:
+            when, _, chat_id = self._heap[0]
+            entry = self._entries.get(chat_id)
+            if entry is None or entry.due != when or chat_id in self._running:
+                heapq.heappop(self._heap)
+                continue
+            return when
+        return None
+
+    def stats(self) -> Mapping[str, object]:
+        next_due = self.next_due()
+        return {
+            "scheduled": len(self._entries),
+            "hot": sum(1 for entry in self._entries.values() if entry.interval <= self._hot),
+            "running": len(self._running),
+            "polls": self._polls,
+            "active_polls": self._active_polls,
+            "retired": self._retired,
+            "next_due_in": max(0.0, next_due - self._clock()) if next_due is not None else None,
+        }
+
+    def _push(self, chat_id: str, entry: _ChatSchedule) -> None:
+        heapq.heappush(self._heap, (entry.due, next(self._order), chat_id))
+
+
+class TenantPollBudget:
+    """Caps concurrent chat polls per tenant across every client sharing it."""
+
+    def __init__(self, limit: int = 8) -> None:
+        self._limit = max(1, int(limit))
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def slot(self, tenant_id: str) -> asyncio.Semaphore:
+        semaphore = self._slots.get(tenant_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._limit)
+            self._slots[tenant_id] = semaphore
+        return semaphore
+
+
+_shared_budget: Optional[TenantPollBudget] = None
+
+
+def shared_poll_budget() -> TenantPollBudget:
+    """Return the process-wide budget used by clients without an explicit one."""
+
+    global _shared_budget
+    if _shared_budget is None:
+        _shared_budget = TenantPollBudget()
+    return _shared_budget
+
+
+def chat_activity(chat: Mapping[str, object]) -> tuple[Optional[str], Optional[str]]:
+    """Return an activity marker and timestamp for a ``/me/chats`` entry."""
+
+    preview = chat.get("lastMessagePreview")
+    if isinstance(preview, Mapping):
+        created = preview.get("createdDateTime")
+        message_id = preview.get("id")
+        if isinstance(created, str) or isinstance(message_id, str):
+            marker = f"{message_id or ''}@{created or ''}"
+            return marker, created if isinstance(created, str) else None
+    updated = chat.get("lastUpdatedDateTime")
+    if isinstance(updated, str) and updated:
+        return updated, updated
+    return None, None
+
+
+def timestamp_us(value: object) -> Optional[int]:
+    """Convert a Graph ISO timestamp to epoch microseconds."""
+
+    parsed = _parse(value)
+    if parsed is None:
+        return None
+    delta = parsed - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def isoformat_us(value: int) -> str:
+    stamp = _EPOCH + dt.timedelta(microseconds=value)
+    if stamp.microsecond:
+        return stamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return stamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse(value: object) -> Optional[dt.datetime]:
+    if not isinstance(value, str):
+        return None
+    try:
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        parsed = dt.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt.timezone.utc)
+    return parsed
@@ -0,0 +1,193 @@
+"""Background refresh of Teams OAuth tokens ahead of their expiry."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+# Refreshes ``key`` and returns the new token's expiry (epoch seconds), if known.
+RefreshCallback = Callable[[str], Awaitable[Optional[float]]]
+
+
+@dataclass
+class _Entry:
+    deadline: float
+    expires_at: float
+    seq: int
+    failures: int = 0
+
+
+class TokenRefreshScheduler:
+    """Refreshes tokens in the background so requests never wait on OAuth.
+
+    Sessions sit in a min-heap ordered by refresh deadline: ``lead`` seconds
+    before expiry, pulled earlier by a random share of up to ``jitter`` of the
+    lead so tokens issued together do not all refresh in the same second. At
+    most ``concurrency`` refreshes run at once. A failed refresh is retried
+    with exponential backoff from ``retry_base`` up to ``retry_cap`` seconds.
+    Lag is how long a refresh started after its deadline.
+    """
+
+    def __init__(
+        self,
+        refresh: RefreshCallback,
+        *,
+        lead: float = 600.0,
+        jitter: float = 0.25,
+        concurrency: int = 4,
+        retry_base: float = 5.0,
+        retry_cap: float = 300.0,
+        clock: Optional[Callable[[], float]] = None,
+        rng: Optional[random.Random] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._refresh = refresh
+        self._lead = max(0.0, float(lead))
+        self._jitter = min(max(0.0, float(jitter)), 1.0)
+        self._concurrency = max(1, int(concurrency))
+        self._retry_base = max(0.1, float(retry_base))
+        self._retry_cap = max(self._retry_base, float(retry_cap))
+        self._clock = clock or time.time
+        self._rng = rng or random.Random()
+        self._logger = logger or logging.getLogger(__name__)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, _Entry] = {}
+        self._active: Set[str] = set()
+        self._in_flight: Set[str] = set()
+        self._order = itertools.count()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._refreshes = 0
+        self._failures = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._last_lag: Optional[float] = None
+        self._last_failure_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._semaphore = self._semaphore or asyncio.Semaphore(self._concurrency)
+        self._wakeup = self._wakeup or asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="teams-token-refresh")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        tasks = list(self._tasks)
+        for pending in tasks:
+            pending.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def schedule(self, key: str, expires_at: float) -> None:
+        """(Re)schedule ``key`` for a token expiring at ``expires_at``."""
+
+        window = self._lead * (1.0 + self._jitter * self._rng.random())
+        self._active.add(key)
+        self._push(key, _Entry(deadline=expires_at - window, expires_at=expires_at, seq=next(self._order)))
+
+    def cancel(self, key: str) -> None:
+        self._active.discard(key)
+        self._entries.pop(key, None)
+
+    def stats(self) -> Mapping[str, object]:
+        next_due = self._next_deadline()
+        return {
+            "scheduled": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "refreshes": self._refreshes,
+            "failures": self._failures,
+            "retrying": sum(1 for entry in self._entries.values() if entry.failures),
+            "lag_last": self._last_lag,
+            "lag_max": self._lag_max,
+            "lag_avg": self._lag_total / self._refreshes if self._refreshes else None,
+            "next_refresh_in": max(0.0, next_due - self._clock()) if next_due is not None else None,
+            "last_failure_at": self._last_failure_at,
+        }
+
+    def _push(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        heapq.heappush(self._heap, (entry.deadline, entry.seq, key))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._heap:
+            deadline, seq, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry.seq == seq:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            now = self._clock()
+            next_due = self._next_deadline()
+            while next_due is not None and next_due <= now:
+                _, _, key = heapq.heappop(self._heap)
+                entry = self._entries.pop(key)
+                task = asyncio.create_task(self._refresh_one(key, entry), name="teams-token-refresh-one")
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                next_due = self._next_deadline()
+            timeout = None if next_due is None else max(0.0, next_due - now)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+
+    async def _refresh_one(self, key: str, entry: _Entry) -> None:
+        assert self._semaphore is not None
+        async with self._semaphore:
+            if key not in self._active:
+                return
+            started = self._clock()
+            lag = max(0.0, started - entry.deadline)
+            self._last_lag = lag
+            self._lag_max = max(self._lag_max, lag)
+            self._in_flight.add(key)
+            try:
+                expires_at = await self._refresh(key)
+            except Exception:
+                self._failures += 1
+                self._last_failure_at = time.time()
+                failures = entry.failures + 1
+                retry_in = min(self._retry_cap, self._retry_base * 2 ** (failures - 1))
+                self._logger.warning(
+                    "Background Teams token refresh failed",
+                    extra={"session": key, "failures": failures, "retry_in": retry_in},
+                    exc_info=True,
+                )
+                if key in self._active and key not in self._entries:
+                    self._push(
+                        key,
+                        _Entry(
+                            deadline=self._clock() + retry_in,
+                            expires_at=entry.expires_at,
+                            seq=next(self._order),
+                            failures=failures,
+                        ),
+                    )
+                return
+            finally:
+                self._in_flight.discard(key)
+            self._refreshes += 1
+            self._lag_total += lag
+            # The refresh usually reschedules itself through the session's
+            # update callback; only fill in when it did not.
+            if key in self._active and key not in self._entries and expires_at is not None:
+                self.schedule(key, expires_at)
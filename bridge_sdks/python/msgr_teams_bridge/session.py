@@ -4,12 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from msgr_bridge_sdk.vault import SessionVault
 
 from .client import TeamsClientProtocol, TeamsTenant, TeamsToken
+from .refresh import TokenRefreshScheduler
+
+ClientStateListener = Callable[[str, Optional[TeamsClientProtocol]], Awaitable[None]]
 
 
 @dataclass(frozen=True)
@@ -64,45 +70,99 @@ class SessionData:
 
 
 class SessionStore:
-    """Persists Teams session blobs to disk."""
+    """Persists Teams session blobs to disk.
+
+    Also implements :class:`ChatCursorStore`, keeping each user's chat cursors
+    in a file next to the session so they can be written far more often than
+    the session itself.
+    """
 
-    def __init__(self, base_path: Path) -> None:
+    def __init__(self, base_path: Path, *, vault: Optional[SessionVault] = None) -> None:
         self._base = Path(base_path)
         self._base.mkdir(parents=True, exist_ok=True)
+        self._vault = vault
 
     def path_for(self, tenant_id: str, user_id: Optional[str]) -> Path:
         safe_tenant = _slugify(tenant_id)
         safe_user = _slugify(user_id or "user")
         return self._base / f"{safe_tenant}__{safe_user}.json"
 
+    def cursor_path_for(self, tenant_id: str, user_id: Optional[str]) -> Path:
+        return self.path_for(tenant_id, user_id).with_suffix(".cursors.json")
+
     async def persist(self, tenant_id: str, user_id: Optional[str], data: SessionData) -> Path:
-        path = self.path_for(tenant_id, user_id)
-        tmp = path.with_suffix(".tmp")
         payload = json.dumps(data.to_dict(), indent=2, sort_keys=True)
-        await asyncio.to_thread(tmp.write_text, payload, encoding="utf-8")
-        await asyncio.to_thread(tmp.replace, path)
-        return path
+        return await self._write(self.path_for(tenant_id, user_id), payload)
 
     async def load(self, tenant_id: str, user_id: Optional[str]) -> Optional[SessionData]:
-        path = self.path_for(tenant_id, user_id)
-        if not path.exists():
+        raw = await self._read(self.path_for(tenant_id, user_id))
+        if raw is None:
             return None
-        raw = await asyncio.to_thread(path.read_text, encoding="utf-8")
         data = json.loads(raw)
         if not isinstance(data, Mapping):
             raise ValueError("stored session is not a mapping")
         return SessionData.from_dict(data)
 
     async def delete(self, tenant_id: str, user_id: Optional[str]) -> None:
-        path = self.path_for(tenant_id, user_id)
+        await self._delete(self.path_for(tenant_id, user_id))
+        await self._delete(self.cursor_path_for(tenant_id, user_id))
+
+    async def persist_cursors(
+        self, tenant_id: str, user_id: Optional[str], cursors: Mapping[str, object]
+    ) -> None:
+        await self._write(self.cursor_path_for(tenant_id, user_id), json.dumps(cursors, separators=(",", ":")))
+
+    async def load_cursors(self, tenant_id: str, user_id: Optional[str]) -> Optional[Mapping[str, object]]:
+        raw = await self._read(self.cursor_path_for(tenant_id, user_id))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        if not isinstance(data, Mapping):
+            raise ValueError("stored chat cursors are not a mapping")
+        return data
+
+    async def _write(self, path: Path, payload: str) -> Path:
+        if self._vault is not None:
+            return await self._vault.write(path, payload.encode("utf-8"))
+        tmp = path.with_suffix(".tmp")
+        await asyncio.to_thread(tmp.write_text, payload, encoding="utf-8")
+        await asyncio.to_thread(tmp.replace, path)
+        return path
+
+    async def _read(self, path: Path) -> Optional[str]:
+        if self._vault is not None:
+            blob = await self._vault.read(path)
+            return blob.decode("utf-8") if blob is not None else None
+        if not path.exists():
+            return None
+        return await asyncio.to_thread(path.read_text, encoding="utf-8")
+
+    async def _delete(self, path: Path) -> None:
+        if self._vault is not None:
+            await self._vault.delete(path)
+            return
         if path.exists():
             await asyncio.to_thread(path.unlink)
 
 
 class SessionManager:
-    """Coordinates Teams client instances and persisted session state."""
+    """Coordinates Teams client instances and persisted session state.
+
+    Once a token refresher is set, tokens are refreshed in the background by a
+    :class:`TokenRefreshScheduler` ``refresh_lead`` seconds (plus jitter)
+    before they expire, so sends never wait on the OAuth round trip; refreshed
+    sessions are written to the store behind the refresh.
+    """
 
-    def __init__(self, store: SessionStore, factory: Callable[[TeamsTenant], TeamsClientProtocol]) -> None:
+    def __init__(
+        self,
+        store: SessionStore,
+        factory: Callable[[TeamsTenant], TeamsClientProtocol],
+        *,
+        refresh_lead: float = 600.0,
+        refresh_jitter: float = 0.25,
+        refresh_concurrency: int = 4,
+    ) -> None:
         self._store = store
         self._factory = factory
         self._clients: Dict[str, TeamsClientProtocol] = {}
@@ -113,6 +173,27 @@ class SessionManager:
         ] = None
         self._refresh_margin: float = 120.0
         self._configured_refresh: Dict[str, bool] = {}
+        self._logger = logging.getLogger(__name__)
+        self._refresh_scheduler = TokenRefreshScheduler(
+            self._refresh_in_background,
+            lead=refresh_lead,
+            jitter=refresh_jitter,
+            concurrency=refresh_concurrency,
+            logger=self._logger,
+        )
+        self._dirty: Set[str] = set()
+        self._persist_task: Optional[asyncio.Task[None]] = None
+        self._persist_failures = 0
+        self._state_listener: Optional[ClientStateListener] = None
+
+    def set_state_listener(self, listener: ClientStateListener) -> None:
+        """Register a callback told when a client is connected (or replaced) and when it is removed.
+
+        The callback receives the ``tenant::user`` key and the new client, or
+        ``None`` once the client is gone.
+        """
+
+        self._state_listener = listener
 
     def set_token_refresher(
         self,
@@ -152,12 +233,14 @@ class SessionManager:
                 session_to_use = SessionData(tenant=tenant, token=token, user_id=user_id or session_to_use.user_id)
 
             client = self._clients.get(key)
+            connected = False
             if client is None or not await client.is_connected():
                 client = self._factory(session_to_use.tenant)
                 self._configured_refresh.pop(key, None)
                 self._configure_token_refresh(key, client, session_to_use)
                 await client.connect(session_to_use.tenant, session_to_use.token)
                 self._clients[key] = client
+                connected = True
             elif token is not None and session_to_use.token.access_token == token.access_token:
                 # Session already reflects the updated token and connection remains valid.
                 self._configure_token_refresh(key, client, session_to_use)
@@ -168,11 +251,15 @@ class SessionManager:
                 self._configure_token_refresh(key, client, session_to_use)
                 await client.connect(session_to_use.tenant, session_to_use.token)
                 self._clients[key] = client
+                connected = True
             else:
                 self._configure_token_refresh(key, client, session_to_use)
 
             self._sessions[key] = session_to_use
             await self._store.persist(session_to_use.tenant.id, session_to_use.user_id, session_to_use)
+            self._schedule_refresh(key, session_to_use)
+            if connected:
+                await self._notify_state(key, client)
             return client, session_to_use
 
     def get_client(self, tenant_id: str, user_id: Optional[str]) -> TeamsClientProtocol:
@@ -208,7 +295,8 @@ class SessionManager:
             user_id = existing.user_id if existing is not None else session.user_id
             refreshed_session = SessionData(tenant=tenant, token=updated, user_id=user_id)
             self._sessions[key] = refreshed_session
-            await self._store.persist(tenant.id, user_id, refreshed_session)
+            self._schedule_refresh(key, refreshed_session)
+            self._persist_later(key)
 
         try:
             configure(refresher, on_update, margin=self._refresh_margin)
@@ -216,10 +304,59 @@ class SessionManager:
             configure(refresher, on_update)
         self._configured_refresh[key] = True
 
+    def refresh_stats(self) -> Mapping[str, object]:
+        stats = dict(self._refresh_scheduler.stats())
+        stats["unsaved_sessions"] = len(self._dirty)
+        stats["persist_failures"] = self._persist_failures
+        return stats
+
+    async def flush_sessions(self) -> None:
+        """Wait until refreshed sessions have been written to the store."""
+
+        task = self._persist_task
+        if task is not None:
+            await asyncio.shield(task)
+
+    def _schedule_refresh(self, key: str, session: SessionData) -> None:
+        token = session.token
+        if self._token_refresher is None or token.refresh_token is None or token.expires_at is None:
+            return
+        self._refresh_scheduler.start()
+        self._refresh_scheduler.schedule(key, token.expires_at)
+
+    async def _refresh_in_background(self, key: str) -> Optional[float]:
+        client = self._clients.get(key)
+        refresh = getattr(client, "refresh_access_token", None)
+        if not callable(refresh):
+            self._refresh_scheduler.cancel(key)
+            return None
+        token = await refresh()
+        return token.expires_at if isinstance(token, TeamsToken) else None
+
+    def _persist_later(self, key: str) -> None:
+        self._dirty.add(key)
+        if self._persist_task is None or self._persist_task.done():
+            self._persist_task = asyncio.create_task(self._write_sessions(), name="teams-session-writer")
+
+    async def _write_sessions(self) -> None:
+        while self._dirty:
+            key = self._dirty.pop()
+            session = self._sessions.get(key)
+            if session is None:
+                continue
+            try:
+                await self._store.persist(session.tenant.id, session.user_id, session)
+            except Exception:  # pragma: no cover - storage failures logged for ops
+                self._persist_failures += 1
+                self._logger.exception("Failed to persist refreshed Teams session", extra={"session": key})
+
     def get_session(self, tenant_id: str, user_id: Optional[str]) -> Optional[SessionData]:
         key = self._key(tenant_id, user_id)
         return self._sessions.get(key)
 
+    def active_count(self) -> int:
+        return len(self._clients)
+
     def active_entries(self) -> List[Tuple[str, Optional[str], TeamsClientProtocol, Optional[SessionData]]]:
         """Return a snapshot of active Teams clients and their sessions."""
 
@@ -242,16 +379,26 @@ class SessionManager:
         client = self._clients.pop(key, None)
         self._sessions.pop(key, None)
         self._configured_refresh.pop(key, None)
+        self._refresh_scheduler.cancel(key)
         if client is not None and disconnect:
             await client.disconnect()
+        if client is not None:
+            await self._notify_state(key, None)
 
     async def shutdown(self) -> None:
+        await self._refresh_scheduler.stop()
+        await self.flush_sessions()
         for key, client in list(self._clients.items()):
             if client is not None:
                 await client.disconnect()
             self._clients.pop(key, None)
             self._sessions.pop(key, None)
             self._configured_refresh.pop(key, None)
+            await self._notify_state(key, None)
+
+    async def _notify_state(self, key: str, client: Optional[TeamsClientProtocol]) -> None:
+        if self._state_listener is not None:
+            await self._state_listener(key, client)
 
     @staticmethod
     def _key(tenant_id: str, user_id: Optional[str]) -> str:
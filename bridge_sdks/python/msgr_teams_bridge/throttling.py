@@ -0,0 +1,233 @@
+"""Tenant-scoped request gate that honours Microsoft Graph throttling."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Callable, Dict, List, Mapping, Optional, Tuple
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class RequestPriority(IntEnum):
+    """Lower values are admitted first when a resource is saturated."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass(frozen=True)
+class GraphThrottleConfig:
+    """Concurrency limits per Graph resource type and ``Retry-After`` bounds.
+
+    ``resource_limits`` caps in-flight requests per resource type for a whole
+    tenant; resource types missing from the mapping use ``default_limit``.
+    """
+
+    resource_limits: Mapping[str, int] = field(
+        default_factory=lambda: {"messages": 8, "chats": 4, "$batch": 4, "subscriptions": 2}
+    )
+    default_limit: int = 8
+    default_retry_after: float = 5.0
+    max_retry_after: float = 120.0
+
+
+def graph_resource(path: str) -> str:
+    """Classify a Graph path (``/chats/1/messages`` -> ``messages``)."""
+
+    segments = [segment for segment in path.split("?", 1)[0].split("/") if segment]
+    if not segments:
+        return "root"
+    if "messages" in segments:
+        return "messages"
+    if segments[0] == "me" and len(segments) > 1:
+        return segments[1]
+    return segments[0]
+
+
+def request_priority(method: str, path: str) -> RequestPriority:
+    """Writes (sends) are interactive; reads and ``$batch`` polls are background."""
+
+    if method.upper() == "GET" or graph_resource(path) == "$batch":
+        return RequestPriority.BACKGROUND
+    return RequestPriority.INTERACTIVE
+
+
+class _PriorityGate:
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, int(limit))
+        self.active = 0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._order = itertools.count()
+
+    def queued(self, priority: RequestPriority) -> int:
+        return sum(1 for level, _, future in self._waiters if level == priority and not future.done())
+
+    async def acquire(self, priority: RequestPriority) -> bool:
+        """Take a slot, returning ``True`` when the caller had to queue."""
+
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return False
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._order), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        while self._waiters and self.active < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.active += 1
+            future.set_result(None)
+
+
+class TenantThrottle:
+    """Admission control shared by every client of one tenant.
+
+    Graph throttles per application and tenant, so all linked users of a
+    tenant draw from the same per-resource concurrency limits. A 429/503
+    ``Retry-After`` pauses new requests for the whole tenant until it elapses;
+    while a resource is saturated, interactive requests are admitted before
+    background polling.
+    """
+
+    def __init__(
+        self,
+        tenant_id: str,
+        config: Optional[GraphThrottleConfig] = None,
+        *,
+        clock: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.tenant_id = tenant_id
+        self._config = config or GraphThrottleConfig()
+        self._clock = clock or time.monotonic
+        self._gates: Dict[str, _PriorityGate] = {}
+        self._blocked_until = 0.0
+        self._throttled = 0
+        self._throttled_by_resource: Dict[str, int] = {}
+        self._retry_after_total = 0.0
+        self._queued_waits = 0
+        self._blocked_waits = 0
+        self._last_throttled_at: Optional[float] = None
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, resource: str, priority: RequestPriority = RequestPriority.BACKGROUND
+    ) -> AsyncIterator[None]:
+        await self._wait_unblocked()
+        gate = self._gate(resource)
+        if await gate.acquire(priority):
+            self._queued_waits += 1
+        try:
+            yield
+        finally:
+            gate.release()
+
+    def penalise(self, retry_after: Optional[object], resource: str = "default") -> float:
+        """Record a throttling response and block the tenant for ``Retry-After``."""
+
+        delay = _parse_retry_after(retry_after)
+        if delay is None:
+            delay = self._config.default_retry_after
+        delay = min(max(0.0, delay), self._config.max_retry_after)
+        now = self._clock()
+        self._blocked_until = max(self._blocked_until, now + delay)
+        self._throttled += 1
+        self._throttled_by_resource[resource] = self._throttled_by_resource.get(resource, 0) + 1
+        self._retry_after_total += delay
+        self._last_throttled_at = time.time()
+        return delay
+
+    @property
+    def blocked_for(self) -> float:
+        return max(0.0, self._blocked_until - self._clock())
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "tenant_id": self.tenant_id,
+            "throttled": self._throttled,
+            "throttled_by_resource": dict(sorted(self._throttled_by_resource.items())),
+            "retry_after_total": self._retry_after_total,
+            "blocked_for": self.blocked_for,
+            "last_throttled_at": self._last_throttled_at,
+            "blocked_waits": self._blocked_waits,
+            "queued_waits": self._queued_waits,
+            "active": {resource: gate.active for resource, gate in sorted(self._gates.items()) if gate.active},
+            "queued": {
+                priority.name.lower(): sum(gate.queued(priority) for gate in self._gates.values())
+                for priority in RequestPriority
+            },
+        }
+
+    async def _wait_unblocked(self) -> None:
+        waited = False
+        while True:
+            delay = self._blocked_until - self._clock()
+            if delay <= 0:
+                break
+            waited = True
+            await asyncio.sleep(delay)
+        if waited:
+            self._blocked_waits += 1
+
+    def _gate(self, resource: str) -> _PriorityGate:
+        gate = self._gates.get(resource)
+        if gate is None:
+            limit = self._config.resource_limits.get(resource, self._config.default_limit)
+            gate = _PriorityGate(limit)
+            self._gates[resource] = gate
+        return gate
+
+
+class GraphThrottleRegistry:
+    """Hands out one ``TenantThrottle`` per tenant id."""
+
+    def __init__(self, config: Optional[GraphThrottleConfig] = None) -> None:
+        self._config = config or GraphThrottleConfig()
+        self._tenants: Dict[str, TenantThrottle] = {}
+
+    def tenant(self, tenant_id: str) -> TenantThrottle:
+        throttle = self._tenants.get(tenant_id)
+        if throttle is None:
+            throttle = TenantThrottle(tenant_id, self._config)
+            self._tenants[tenant_id] = throttle
+        return throttle
+
+    def stats(self) -> Mapping[str, object]:
+        return {tenant_id: throttle.stats() for tenant_id, throttle in sorted(self._tenants.items())}
+
+
+_shared_registry: Optional[GraphThrottleRegistry] = None
+
+
+def shared_graph_throttle() -> GraphThrottleRegistry:
+    """Return the process-wide registry used by clients without an explicit one."""
+
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = GraphThrottleRegistry()
+    return _shared_registry
+
+
+def _parse_retry_after(value: Optional[object]) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
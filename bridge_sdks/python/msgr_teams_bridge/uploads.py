@@ -0,0 +1,207 @@
+"""Chunked Graph drive upload sessions for large Teams attachments."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Mapping, Optional, Tuple
+
+# Graph requires every range except the last to be a multiple of 320 KiB.
+UPLOAD_CHUNK_MULTIPLE = 320 * 1024
+UPLOAD_CHUNK_SIZE = 10 * UPLOAD_CHUNK_MULTIPLE
+
+# Uploads above this size (or without bytes in memory) use an upload session
+# instead of being inlined into the message payload.
+INLINE_UPLOAD_LIMIT = 4 * 1024 * 1024
+
+TEAMS_CHAT_FILES_FOLDER = "Microsoft Teams Chat Files"
+
+_RETRY_STATUSES = frozenset({408, 416, 429, 500, 502, 503, 504})
+
+SessionCreator = Callable[[str], Awaitable[Mapping[str, object]]]
+RangeSender = Callable[[str, bytes, int, int], Awaitable[Tuple[int, Mapping[str, object]]]]
+StatusFetcher = Callable[[str], Awaitable[Mapping[str, object]]]
+SessionCanceller = Callable[[str], Awaitable[None]]
+
+
+class UploadSessionError(RuntimeError):
+    """Raised when a drive upload session cannot be completed."""
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        self.status = status
+        super().__init__(message)
+
+
+class ChunkedUploader:
+    """Streams files into Graph drive upload sessions in fixed-size ranges.
+
+    Each file gets its own upload session and is sent as ``chunk_size``
+    ranges (rounded down to a multiple of 320 KiB), so memory per upload is
+    bounded by one chunk whatever the file size. A range that fails with a
+    network error or a retryable status is retried up to ``max_retries``
+    times with backoff, resuming from the session's ``nextExpectedRanges``
+    rather than from the start of the file. Sessions that cannot be finished
+    are cancelled.
+    """
+
+    def __init__(
+        self,
+        create_session: SessionCreator,
+        send_range: RangeSender,
+        fetch_status: StatusFetcher,
+        cancel_session: SessionCanceller,
+        *,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._create_session = create_session
+        self._send_range = send_range
+        self._fetch_status = fetch_status
+        self._cancel_session = cancel_session
+        self._chunk_size = max(1, int(chunk_size) // UPLOAD_CHUNK_MULTIPLE) * UPLOAD_CHUNK_MULTIPLE
+        self._max_retries = max(0, int(max_retries))
+        self._retry_backoff = max(0.0, float(retry_backoff))
+        self._logger = logger or logging.getLogger(__name__)
+        self._uploads = 0
+        self._failures = 0
+        self._ranges = 0
+        self._bytes = 0
+        self._retries = 0
+        self._resumes = 0
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    async def upload(self, filename: str, total: int, chunks: AsyncIterable[bytes]) -> Mapping[str, object]:
+        """Upload ``total`` bytes from ``chunks`` and return the created drive item."""
+
+        session = await self._create_session(filename)
+        upload_url = session.get("uploadUrl")
+        if not isinstance(upload_url, str) or not upload_url:
+            raise UploadSessionError("Graph did not return an upload URL")
+        try:
+            item = await self._send(upload_url, total, chunks)
+        except BaseException:
+            self._failures += 1
+            with contextlib.suppress(Exception):
+                await self._cancel_session(upload_url)
+            raise
+        self._uploads += 1
+        return item
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "uploads": self._uploads,
+            "failures": self._failures,
+            "ranges": self._ranges,
+            "bytes": self._bytes,
+            "retries": self._retries,
+            "resumes": self._resumes,
+            "chunk_size": self._chunk_size,
+        }
+
+    async def _send(self, url: str, total: int, chunks: AsyncIterable[bytes]) -> Mapping[str, object]:
+        offset = 0
+        item: Optional[Mapping[str, object]] = None
+        async for chunk in fixed_chunks(chunks, self._chunk_size):
+            end = offset + len(chunk)
+            if end > total:
+                raise UploadSessionError("upload source is longer than its declared length")
+            item = await self._send_chunk(url, chunk, offset, total)
+            offset = end
+        if offset != total:
+            raise UploadSessionError("upload source ended before its declared length")
+        if item is None:
+            raise UploadSessionError("Graph did not return the uploaded drive item")
+        return item
+
+    async def _send_chunk(
+        self, url: str, chunk: bytes, start: int, total: int
+    ) -> Optional[Mapping[str, object]]:
+        end = start + len(chunk)
+        position = start
+        attempts = 0
+        while position < end:
+            data = chunk if position == start else chunk[position - start :]
+            error: Optional[Exception] = None
+            try:
+                status, body = await self._send_range(url, data, position, total)
+            except Exception as exc:
+                status, body, error = 0, {}, exc
+            if 200 <= status < 300:
+                self._ranges += 1
+                self._bytes += len(data)
+                # 202 acknowledges a range; 200/201 carry the finished item.
+                return body if status in (200, 201) else None
+            if status and status not in _RETRY_STATUSES:
+                raise UploadSessionError(f"upload range rejected with status {status}", status)
+            attempts += 1
+            if attempts > self._max_retries:
+                raise UploadSessionError("upload range failed after retries", status or None) from error
+            self._retries += 1
+            self._logger.debug(
+                "Teams upload range failed; resuming",
+                extra={"offset": position, "status": status or None, "attempt": attempts},
+            )
+            await asyncio.sleep(min(self._retry_backoff * 2 ** (attempts - 1), 30.0))
+            expected = await self._expected_offset(url)
+            if expected is None:
+                continue
+            if expected < start:
+                raise UploadSessionError("upload session lost ranges that were already acknowledged")
+            if expected != position:
+                self._resumes += 1
+            position = min(expected, end)
+        return None
+
+    async def _expected_offset(self, url: str) -> Optional[int]:
+        try:
+            status = await self._fetch_status(url)
+        except Exception:
+            return None
+        ranges = status.get("nextExpectedRanges")
+        if not isinstance(ranges, list) or not ranges or not isinstance(ranges[0], str):
+            return None
+        try:
+            return int(ranges[0].split("-", 1)[0])
+        except ValueError:
+            return None
+
+
+async def fixed_chunks(source: AsyncIterable[bytes], size: int) -> AsyncIterator[bytes]:
+    """Re-slice ``source`` into ``size``-byte chunks; only the last may be shorter."""
+
+    buffer = bytearray()
+    async for piece in source:
+        view = memoryview(piece)
+        while view:
+            if not buffer and len(view) >= size:
+                yield bytes(view[:size])
+                view = view[size:]
+                continue
+            take = size - len(buffer)
+            buffer += view[:take]
+            view = view[take:]
+            if len(buffer) == size:
+                yield bytes(buffer)
+                buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def drive_item_attachment_id(item: Mapping[str, object]) -> Optional[str]:
+    """Return the id a chat message uses to reference ``item``.
+
+    Teams expects the GUID embedded in the drive item's ``eTag``
+    (``"{GUID},1"``); the item id is used when the eTag is missing.
+    """
+
+    etag = item.get("eTag")
+    if isinstance(etag, str) and "{" in etag and "}" in etag:
+        return etag[etag.index("{") + 1 : etag.index("}")]
+    item_id = item.get("id")
+    return str(item_id) if isinstance(item_id, str) and item_id else None
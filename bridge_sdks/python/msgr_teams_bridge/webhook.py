@@ -0,0 +1,370 @@
+"""aiohttp receiver for Microsoft Graph change notifications."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import hmac
+import json
+import logging
+import secrets
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from msgr_bridge_sdk.http import HttpClientPool, shared_http_pool
+
+from .encryption import NotificationDecryptor
+from .notifications import NotificationHandler, NotificationTransport
+
+try:  # pragma: no cover - optional runtime dependency
+    import aiohttp
+    from aiohttp import web
+except ImportError:  # pragma: no cover - aiohttp not installed during unit tests
+    aiohttp = None  # type: ignore
+    web = None  # type: ignore
+
+GRAPH_BASE = "https://graph.microsoft.com/v1.0"
+
+# Chat message subscriptions may live for at most one hour.
+DEFAULT_SUBSCRIPTION_LIFETIME = 55 * 60.0
+
+
+class GraphWebhookTransport(NotificationTransport):
+    """Receives Graph change notifications over HTTP and manages subscriptions.
+
+    The endpoint answers the ``validationToken`` handshake, checks each
+    notification's ``clientState`` and replies ``202 Accepted`` as soon as a
+    delivery is queued; handlers run on a pool of ``workers`` tasks draining a
+    queue bounded by ``queue_size``. When the queue cannot take a delivery the
+    endpoint answers ``503`` so Graph redelivers later. Subscriptions are
+    created, renewed and deleted through Graph ``/subscriptions`` with the
+    token of the user that owns them. With a ``decryptor`` the subscriptions
+    ask Graph to include encrypted resource data in each notification.
+
+    With a ``lifecycle_url`` the receiver also serves that path. Lifecycle
+    notifications are handled there or on the main path alike:
+    ``reauthorizationRequired`` is answered here, while ``subscriptionRemoved``
+    and ``missed`` are queued to the subscription's handler so its owner can
+    re-subscribe and catch up.
+    """
+
+    def __init__(
+        self,
+        notification_url: str,
+        *,
+        client_state: Optional[str] = None,
+        host: str = "0.0.0.0",
+        port: int = 3978,
+        path: str = "/teams/notifications",
+        lifecycle_url: Optional[str] = None,
+        change_type: str = "created,updated",
+        subscription_lifetime: float = DEFAULT_SUBSCRIPTION_LIFETIME,
+        workers: int = 8,
+        queue_size: int = 1000,
+        graph_base: str = GRAPH_BASE,
+        http_pool: Optional[HttpClientPool] = None,
+        decryptor: Optional[NotificationDecryptor] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._notification_url = notification_url
+        self._client_state = client_state or secrets.token_urlsafe(32)
+        self._host = host
+        self._port = port
+        self._path = path
+        self._lifecycle_url = lifecycle_url
+        self._change_type = change_type
+        self._lifetime = max(60.0, float(subscription_lifetime))
+        self._worker_count = max(1, int(workers))
+        self._queue: "asyncio.Queue[Tuple[NotificationHandler, Mapping[str, object]]]" = asyncio.Queue(
+            maxsize=max(1, int(queue_size))
+        )
+        self._graph_base = graph_base.rstrip("/")
+        self._http_pool = http_pool
+        self._decryptor = decryptor
+        self._logger = logger or logging.getLogger(__name__)
+        self._handlers: Dict[str, NotificationHandler] = {}
+        self._tokens: Dict[str, "TeamsToken"] = {}
+        self._workers: List[asyncio.Task[None]] = []
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._runner: Optional["web.AppRunner"] = None
+        self._received = 0
+        self._rejected = 0
+        self._unrouted = 0
+        self._overloaded = 0
+        self._failures = 0
+        self._lifecycle_events = 0
+        self._acknowledged = 0
+
+    @property
+    def client_state(self) -> str:
+        return self._client_state
+
+    async def start(self) -> None:
+        if web is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to run the Graph notification receiver")
+        self._ensure_workers()
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_post(self._path, self._handle_http)
+        lifecycle_path = urlsplit(self._lifecycle_url).path if self._lifecycle_url else None
+        if lifecycle_path and lifecycle_path != self._path:
+            app.router.add_post(lifecycle_path, self._handle_http)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, self._host, self._port)
+        await site.start()
+        self._runner = runner
+        self._logger.info(
+            "Graph notification receiver listening",
+            extra={"host": self._host, "port": self._port, "path": self._path},
+        )
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        await self.drain()
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
+        tasks = list(self._tasks)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def drain(self) -> None:
+        """Wait until every queued notification has been handled."""
+
+        if self._workers:
+            await self._queue.join()
+
+    async def subscribe(
+        self,
+        tenant: "TeamsTenant",
+        token: "TeamsToken",
+        *,
+        resource: str,
+        expiration: Optional[int] = None,
+    ) -> Mapping[str, object]:
+        # Graph validates the notification URL while creating the subscription,
+        # so the endpoint has to be reachable first.
+        await self.start()
+        payload: Dict[str, object] = {
+            "changeType": self._change_type,
+            "notificationUrl": self._notification_url,
+            "resource": resource,
+            "expirationDateTime": self._expiration(expiration),
+            "clientState": self._client_state,
+        }
+        if self._lifecycle_url is not None:
+            payload["lifecycleNotificationUrl"] = self._lifecycle_url
+        if self._decryptor is not None:
+            payload.update(self._decryptor.subscription_fields())
+        response = await self._graph("POST", "/subscriptions", token, payload)
+        subscription_id = response.get("id")
+        if isinstance(subscription_id, str):
+            self._tokens[subscription_id] = token
+        return response
+
+    async def renew(
+        self,
+        subscription_id: str,
+        tenant: "TeamsTenant",
+        token: "TeamsToken",
+        *,
+        resource: str,
+        expiration: Optional[int] = None,
+    ) -> Mapping[str, object]:
+        self._tokens[subscription_id] = token
+        return await self._graph(
+            "PATCH",
+            f"/subscriptions/{subscription_id}",
+            token,
+            {"expirationDateTime": self._expiration(expiration)},
+        )
+
+    async def unsubscribe(self, subscription_id: str) -> None:
+        self._handlers.pop(subscription_id, None)
+        token = self._tokens.pop(subscription_id, None)
+        if token is None:
+            return
+        try:
+            await self._graph("DELETE", f"/subscriptions/{subscription_id}", token)
+        except Exception:  # pragma: no cover - expired subscriptions vanish on their own
+            self._logger.warning(
+                "Failed to delete Graph subscription",
+                extra={"subscription_id": subscription_id},
+                exc_info=True,
+            )
+
+    def register(self, subscription_id: str, handler: NotificationHandler) -> None:
+        self._handlers[subscription_id] = handler
+
+    def unregister(self, subscription_id: str) -> None:
+        self._handlers.pop(subscription_id, None)
+
+    async def acknowledge(self, subscription_id: str, event_id: str) -> None:
+        # Graph needs no acknowledgement beyond the 202 sent on receipt.
+        self._acknowledged += 1
+
+    async def handle_request(
+        self, query: Mapping[str, str], body: bytes
+    ) -> Tuple[int, Optional[str]]:
+        """Process one delivery, returning the HTTP status and plain-text body."""
+
+        validation_token = query.get("validationToken")
+        if validation_token is not None:
+            return 200, validation_token
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            self._rejected += 1
+            return 400, None
+        notifications = payload.get("value") if isinstance(payload, Mapping) else None
+        if not isinstance(notifications, list):
+            self._rejected += 1
+            return 400, None
+
+        accepted: List[Tuple[NotificationHandler, Mapping[str, object]]] = []
+        for notification in notifications:
+            if not isinstance(notification, Mapping):
+                continue
+            self._received += 1
+            if not self._verify(notification):
+                self._rejected += 1
+                continue
+            subscription_id = notification.get("subscriptionId")
+            if notification.get("lifecycleEvent") is not None and not self._handle_lifecycle(notification):
+                continue
+            handler = self._handlers.get(subscription_id) if isinstance(subscription_id, str) else None
+            if handler is None:
+                self._unrouted += 1
+                continue
+            accepted.append((handler, notification))
+
+        if self._queue.maxsize - self._queue.qsize() < len(accepted):
+            self._overloaded += 1
+            self._logger.warning(
+                "Graph notification queue full; asking Graph to redeliver",
+                extra={"queued": self._queue.qsize(), "incoming": len(accepted)},
+            )
+            return 503, None
+        self._ensure_workers()
+        for item in accepted:
+            self._queue.put_nowait(item)
+        return 202, None
+
+    def stats(self) -> Mapping[str, object]:
+        return {
+            "subscriptions": len(self._handlers),
+            "received": self._received,
+            "rejected": self._rejected,
+            "unrouted": self._unrouted,
+            "overloaded": self._overloaded,
+            "failures": self._failures,
+            "lifecycle_events": self._lifecycle_events,
+            "acknowledged": self._acknowledged,
+            "queued": self._queue.qsize(),
+            "workers": len(self._workers),
+        }
+
+    async def _handle_http(self, request: "web.Request") -> "web.Response":
+        body = await request.read()
+        status, text = await self.handle_request(request.query, body)
+        if text is None:
+            return web.Response(status=status)
+        return web.Response(status=status, text=text, content_type="text/plain")
+
+    def _verify(self, notification: Mapping[str, object]) -> bool:
+        client_state = notification.get("clientState")
+        if not isinstance(client_state, str):
+            return False
+        return hmac.compare_digest(client_state, self._client_state)
+
+    def _handle_lifecycle(self, notification: Mapping[str, object]) -> bool:
+        """Handle a lifecycle event, returning ``True`` if its handler must see it too."""
+
+        self._lifecycle_events += 1
+        event = notification.get("lifecycleEvent")
+        subscription_id = notification.get("subscriptionId")
+        self._logger.info(
+            "Graph subscription lifecycle event",
+            extra={"subscription_id": subscription_id, "event": event},
+        )
+        if event == "subscriptionRemoved" and isinstance(subscription_id, str):
+            # Graph already deleted it; there is nothing left to DELETE later.
+            self._tokens.pop(subscription_id, None)
+        if event in ("subscriptionRemoved", "missed"):
+            return True
+        if event == "reauthorizationRequired" and isinstance(subscription_id, str):
+            token = self._tokens.get(subscription_id)
+            if token is None:
+                return False
+            task = asyncio.create_task(
+                self._graph("POST", f"/subscriptions/{subscription_id}/reauthorize", token),
+                name="teams-subscription-reauthorize",
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._finish_task)
+        return False
+
+    def _finish_task(self, task: "asyncio.Task[object]") -> None:
+        self._tasks.discard(task)  # type: ignore[arg-type]
+        if not task.cancelled() and task.exception() is not None:
+            self._logger.warning("Graph subscription reauthorization failed", exc_info=task.exception())
+
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"teams-notification-worker-{index}")
+            for index in range(self._worker_count)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            handler, notification = await self._queue.get()
+            try:
+                await handler(notification)
+            except Exception:  # pragma: no cover - handler failures logged for ops
+                self._failures += 1
+                self._logger.exception(
+                    "Graph notification handler failed",
+                    extra={"subscription_id": notification.get("subscriptionId")},
+                )
+            finally:
+                self._queue.task_done()
+
+    def _expiration(self, expiration: Optional[int]) -> str:
+        lifetime = float(expiration) if expiration is not None else self._lifetime
+        expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=lifetime)
+        return expires.replace(microsecond=0).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    async def _graph(
+        self,
+        method: str,
+        path: str,
+        token: "TeamsToken",
+        payload: Optional[Mapping[str, object]] = None,
+    ) -> Mapping[str, object]:
+        if aiohttp is None:  # pragma: no cover - exercised in integration tests
+            raise RuntimeError("aiohttp is required to manage Graph subscriptions")
+        pool = self._http_pool or shared_http_pool()
+        session = await pool.session("graph.microsoft.com")
+        headers = {"Authorization": f"Bearer {token.access_token}"}
+        async with session.request(
+            method,
+            f"{self._graph_base}{path}",
+            json=payload,
+            headers=headers,
+            timeout=pool.request_timeout(),
+        ) as response:
+            response.raise_for_status()
+            if response.status == 204:
+                return {}
+            data = await response.json(content_type=None)
+        return data if isinstance(data, Mapping) else {}
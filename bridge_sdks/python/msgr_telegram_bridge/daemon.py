@@ -7,6 +7,7 @@ import inspect
 from typing import Awaitable, Callable, Dict, Mapping, Optional, Sequence
 
 from msgr_bridge_sdk import Envelope, StoneMQClient, build_envelope
+from msgr_bridge_sdk.acks import AckLedger
 
 from .client import (
     PasswordRequiredError,
@@ -39,21 +40,26 @@ class TelegramBridgeDaemon:
         sessions: SessionManager,
         *,
         default_user_id: Optional[str] = None,
+        ack_ledger: Optional[AckLedger] = None,
     ) -> None:
         self._client = mq_client
         self._sessions = sessions
         self._default_user_id = default_user_id
         self._update_handlers: Dict[str, Callable[[Mapping[str, object]], Awaitable[None]]] = {}
-        self._ack_state: Dict[int, Mapping[str, object]] = {}
+        self._ack_state = ack_ledger if ack_ledger is not None else AckLedger()
 
         self._client.register("outbound_message", self._handle_outbound_message)
         self._client.register("outbound_edit_message", self._handle_edit_message)
         self._client.register("outbound_delete_message", self._handle_delete_message)
         self._client.register("ack_update", self._handle_ack_update)
         self._client.register_request("link_account", self._handle_link_account)
+        self._sessions.set_handoff_listener(self._handle_session_handoff)
+        self._sessions.set_release_listener(self._handle_session_release)
 
     async def start(self) -> None:
         await self._client.start()
+        if self._sessions.ownership is not None:
+            await self._sessions.ownership.start()
 
     async def _handle_link_account(self, envelope: Envelope) -> Mapping[str, object]:
         payload = dict(envelope.payload)
@@ -186,7 +192,7 @@ class TelegramBridgeDaemon:
             return
 
         await client.acknowledge_update(int(update_id))
-        self._ack_state[int(update_id)] = dict(payload)
+        self._ack_state.record(int(update_id), payload)
 
     async def _register_update_handler(
         self, user_id: str, client: TelegramClientProtocol
@@ -207,7 +213,18 @@ class TelegramBridgeDaemon:
         client.add_update_handler(handler)
         self._update_handlers[user_id] = handler
 
+    async def _handle_session_release(self, user_id: str, client: TelegramClientProtocol) -> None:
+        handler = self._update_handlers.pop(user_id, None)
+        if handler is not None:
+            client.remove_update_handler(handler)
+
+    async def _handle_session_handoff(self, user_id: str, client: TelegramClientProtocol) -> None:
+        self._update_handlers.pop(user_id, None)
+        await self._register_update_handler(user_id, client)
+
     async def shutdown(self) -> None:
+        if self._sessions.ownership is not None:
+            await self._sessions.ownership.stop()
         for user_id, handler in list(self._update_handlers.items()):
             try:
                 client = self._sessions.get_client(user_id)
@@ -219,7 +236,7 @@ class TelegramBridgeDaemon:
 
     @property
     def acked_updates(self) -> Dict[int, Mapping[str, object]]:
-        return dict(self._ack_state)
+        return self._ack_state.as_dict()
 
     async def _build_linked_response(
         self, user_id: str, client: TelegramClientProtocol, profile
@@ -4,24 +4,50 @@ from __future__ import annotations
 
 import asyncio
 import re
+import tempfile
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Awaitable, Callable, Dict, Mapping, Optional
 
-from .client import TelegramClientProtocol, encode_session_blob
+from msgr_bridge_sdk.ownership import SessionOwnership
+from msgr_bridge_sdk.vault import SessionVault, SessionVaultError
 
+from .client import TelegramClientProtocol, decode_session_blob, encode_session_blob
+
+HandoffListener = Callable[[str, TelegramClientProtocol], Awaitable[None]]
 
-class SessionStore:
-    """Persists Telegram session files on disk."""
 
-    def __init__(self, base_path: Path) -> None:
+class SessionStore:
+    """Persists Telegram session files on disk.
+
+    With a vault the session is kept sealed in ``<user>.sealed``. The native
+    client never sees the ciphertext: :meth:`checkout` decrypts it into an
+    owner-only working copy under ``work_path`` (a private temp directory by
+    default) and :meth:`checkin` seals that copy back once the client is gone.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        *,
+        vault: Optional[SessionVault] = None,
+        work_path: Optional[Path] = None,
+    ) -> None:
         self._base = Path(base_path)
         self._base.mkdir(parents=True, exist_ok=True)
+        self._vault = vault
+        self._work_path = Path(work_path) if work_path is not None else None
+        self._checked_out: Dict[str, Path] = {}
 
     def path_for(self, user_id: str) -> Path:
         safe = _slugify(user_id)
         return self._base / f"{safe}.session"
 
+    def sealed_path_for(self, user_id: str) -> Path:
+        return self._base / f"{_slugify(user_id)}.sealed"
+
     async def persist(self, user_id: str, blob: bytes) -> Path:
+        if self._vault is not None:
+            return await self._vault.write(self.sealed_path_for(user_id), blob)
         path = self.path_for(user_id)
         tmp = path.with_suffix(".tmp")
         await asyncio.to_thread(tmp.write_bytes, blob)
@@ -29,6 +55,12 @@ class SessionStore:
         return path
 
     async def load(self, user_id: str) -> Optional[bytes]:
+        if self._vault is not None:
+            working = self._checked_out.get(user_id)
+            if working is not None and working.exists():
+                # The live client writes to its working copy; that is newest.
+                return await asyncio.to_thread(working.read_bytes)
+            return await self._vault.read(self._sealed_source(user_id))
         path = self.path_for(user_id)
         if not path.exists():
             return None
@@ -40,18 +72,107 @@ class SessionStore:
             return None
         return encode_session_blob(data)
 
+    async def export_sealed(self, user_id: str) -> Optional[str]:
+        """Return the session sealed for another replica, or ``None`` without a vault.
+
+        Handoffs travel over StoneMQ, so the auth blob is never put on the bus
+        in plaintext. Without a vault the adopting replica has to read the
+        session from a shared store instead.
+        """
+
+        if self._vault is None:
+            return None
+        data = await self.load(user_id)
+        if data is None:
+            return None
+        return encode_session_blob(self._vault.seal(data, associated=_handoff_context(user_id)))
+
+    def open_sealed(self, user_id: str, sealed: str) -> bytes:
+        """Decrypt a session produced by :meth:`export_sealed` on a peer replica."""
+
+        if self._vault is None:
+            raise SessionVaultError("a vault is required to adopt a sealed session handoff")
+        return self._vault.open(decode_session_blob(sealed), associated=_handoff_context(user_id))
+
+    async def checkout(self, user_id: str) -> Path:
+        """Return the session file path to hand to the platform client."""
+
+        if self._vault is None:
+            return self.path_for(user_id)
+        working = self._working_dir() / self.path_for(user_id).name
+        await self._vault.checkout(self._sealed_source(user_id), working)
+        self._checked_out[user_id] = working
+        return working
+
+    async def checkin(self, user_id: str) -> None:
+        """Seal the working copy of a released client back into the vault."""
+
+        working = self._checked_out.pop(user_id, None)
+        if self._vault is None or working is None:
+            return
+        if await self._vault.checkin(working, self.sealed_path_for(user_id)) is not None:
+            legacy = self.path_for(user_id)
+            if legacy.exists():
+                await asyncio.to_thread(legacy.unlink)
+
+    def _sealed_source(self, user_id: str) -> Path:
+        # Plaintext files from before the vault was enabled are read once and
+        # sealed on the next checkin.
+        sealed = self.sealed_path_for(user_id)
+        legacy = self.path_for(user_id)
+        return legacy if not sealed.exists() and legacy.exists() else sealed
+
+    def _working_dir(self) -> Path:
+        if self._work_path is None:
+            self._work_path = Path(tempfile.mkdtemp(prefix="msgr-telegram-"))
+        else:
+            self._work_path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return self._work_path
+
 
 class SessionManager:
     """Coordinates Telegram client instances and shared session state."""
 
-    def __init__(self, store: SessionStore, factory: Callable[[Path], TelegramClientProtocol]) -> None:
+    def __init__(
+        self,
+        store: SessionStore,
+        factory: Callable[[Path], TelegramClientProtocol],
+        *,
+        ownership: Optional[SessionOwnership] = None,
+    ) -> None:
         self._store = store
         self._factory = factory
         self._clients: Dict[str, TelegramClientProtocol] = {}
         self._locks: Dict[str, asyncio.Lock] = {}
+        self._ownership = ownership
+        self._handoff_listener: Optional[HandoffListener] = None
+        self._release_listener: Optional[HandoffListener] = None
+        if ownership is not None:
+            ownership.set_handlers(on_release=self._release_session, on_acquire=self._acquire_session)
+
+    @property
+    def ownership(self) -> Optional[SessionOwnership]:
+        return self._ownership
+
+    def set_handoff_listener(self, listener: HandoffListener) -> None:
+        """Register a callback invoked after a session is adopted from another replica."""
+
+        self._handoff_listener = listener
+
+    def set_release_listener(self, listener: HandoffListener) -> None:
+        """Register a callback invoked before a session is handed to another replica."""
+
+        self._release_listener = listener
 
     async def ensure_client(
         self, user_id: str, *, session_blob: Optional[bytes] = None
+    ) -> TelegramClientProtocol:
+        if self._ownership is not None and user_id not in self._clients:
+            self._ownership.ensure_owned(user_id)
+        return await self._connect_client(user_id, session_blob)
+
+    async def _connect_client(
+        self, user_id: str, session_blob: Optional[bytes]
     ) -> TelegramClientProtocol:
         lock = self._locks.setdefault(user_id, asyncio.Lock())
         async with lock:
@@ -62,10 +183,16 @@ class SessionManager:
             if session_blob is not None:
                 await self._store.persist(user_id, session_blob)
 
-            path = self._store.path_for(user_id)
+            path = await self._store.checkout(user_id)
             client = self._factory(path)
-            await client.connect()
+            try:
+                await client.connect()
+            except BaseException:
+                await self._store.checkin(user_id)
+                raise
             self._clients[user_id] = client
+            if self._ownership is not None:
+                self._ownership.claim(user_id)
             return client
 
     def get_client(self, user_id: str) -> TelegramClientProtocol:
@@ -76,8 +203,11 @@ class SessionManager:
 
     async def remove_client(self, user_id: str, *, disconnect: bool = True) -> None:
         client = self._clients.pop(user_id, None)
+        if self._ownership is not None:
+            self._ownership.forget(user_id)
         if client is not None and disconnect:
             await client.disconnect()
+        await self._store.checkin(user_id)
 
     async def export_session(self, user_id: str) -> Optional[str]:
         return await self._store.export_base64(user_id)
@@ -86,6 +216,29 @@ class SessionManager:
         for user_id in list(self._clients.keys()):
             await self.remove_client(user_id)
 
+    async def _release_session(self, user_id: str, owner: str) -> Optional[Mapping[str, object]]:
+        client = self._clients.get(user_id)
+        if client is not None and self._release_listener is not None:
+            await self._release_listener(user_id, client)
+        # Disconnect first so the client's final writes are part of the handoff.
+        await self.remove_client(user_id)
+        sealed = await self._store.export_sealed(user_id)
+        if sealed is None:
+            return None
+        return {"sealed_blob": sealed}
+
+    async def _acquire_session(self, user_id: str, state: Mapping[str, object]) -> None:
+        sealed = state.get("sealed_blob")
+        session_blob = self._store.open_sealed(user_id, sealed) if isinstance(sealed, str) and sealed else None
+        client = await self._connect_client(user_id, session_blob)
+        if self._handoff_listener is not None:
+            await self._handoff_listener(user_id, client)
+
+
+def _handoff_context(user_id: str) -> str:
+    # Binds a sealed handoff to its user so it cannot be replayed for another.
+    return f"handoff:{user_id}"
+
 
 def _slugify(value: str) -> str:
     cleaned = re.sub(r"[^A-Za-z0-9_.-]+", "_", value)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from typing import Awaitable, Callable, Dict, Mapping, Optional
 
 from msgr_bridge_sdk import Envelope, StoneMQClient, build_envelope
+from msgr_bridge_sdk.acks import AckLedger
 
 from .client import WhatsAppClientProtocol, decode_session_blob
 from .session import SessionManager
@@ -19,19 +20,24 @@ class WhatsAppBridgeDaemon:
         sessions: SessionManager,
         *,
         default_user_id: Optional[str] = None,
+        ack_ledger: Optional[AckLedger] = None,
     ) -> None:
         self._client = mq_client
         self._sessions = sessions
         self._default_user_id = default_user_id
         self._event_handlers: Dict[str, Callable[[Mapping[str, object]], Awaitable[None]]] = {}
-        self._ack_state: Dict[str, Mapping[str, object]] = {}
+        self._ack_state = ack_ledger if ack_ledger is not None else AckLedger()
 
         self._client.register("outbound_message", self._handle_outbound_message)
         self._client.register("ack_event", self._handle_ack_event)
         self._client.register_request("link_account", self._handle_link_account)
+        self._sessions.set_handoff_listener(self._handle_session_handoff)
+        self._sessions.set_release_listener(self._handle_session_release)
 
     async def start(self) -> None:
         await self._client.start()
+        if self._sessions.ownership is not None:
+            await self._sessions.ownership.start()
 
     async def _handle_link_account(self, envelope: Envelope) -> Mapping[str, object]:
         payload = dict(envelope.payload)
@@ -103,7 +109,7 @@ class WhatsAppBridgeDaemon:
 
         event_key = str(event_id)
         await client.acknowledge_event(event_key)
-        self._ack_state[event_key] = dict(payload)
+        self._ack_state.record(event_key, payload)
 
     async def _register_event_handler(
         self, user_id: str, client: WhatsAppClientProtocol
@@ -124,7 +130,18 @@ class WhatsAppBridgeDaemon:
         client.add_event_handler(handler)
         self._event_handlers[user_id] = handler
 
+    async def _handle_session_release(self, user_id: str, client: WhatsAppClientProtocol) -> None:
+        handler = self._event_handlers.pop(user_id, None)
+        if handler is not None:
+            client.remove_event_handler(handler)
+
+    async def _handle_session_handoff(self, user_id: str, client: WhatsAppClientProtocol) -> None:
+        self._event_handlers.pop(user_id, None)
+        await self._register_event_handler(user_id, client)
+
     async def shutdown(self) -> None:
+        if self._sessions.ownership is not None:
+            await self._sessions.ownership.stop()
         for user_id, handler in list(self._event_handlers.items()):
             try:
                 client = self._sessions.get_client(user_id)
@@ -136,4 +153,4 @@ class WhatsAppBridgeDaemon:
 
     @property
     def acked_events(self) -> Dict[str, Mapping[str, object]]:
-        return dict(self._ack_state)
+        return self._ack_state.as_dict()
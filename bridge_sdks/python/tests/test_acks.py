@@ -0,0 +1,59 @@
+from msgr_bridge_sdk.acks import AckLedger
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ack_ledger_keeps_compact_records():
+    ledger = AckLedger(clock=FakeClock())
+
+    ledger.record(
+        "evt-1",
+        {"event_id": "evt-1", "status": "accepted", "message": {"text": "x" * 4096}, "attachments": [1, 2]},
+    )
+    ledger.record("evt-1", {"event_id": "evt-1", "status": "stored"})
+
+    assert ledger.get("evt-1") == {"event_id": "evt-1", "status": "stored"}
+    summary = ledger.summary()
+    assert summary["total"] == 2
+    assert summary["retained"] == 1
+    assert summary["duplicates"] == 1
+    assert summary["by_status"] == {"accepted": 1, "stored": 1}
+
+
+def test_ack_ledger_compacts_by_count_and_age():
+    clock = FakeClock()
+    ledger = AckLedger(max_entries=2, ttl=60.0, clock=clock)
+
+    for index in range(3):
+        ledger.record(f"evt-{index}", {"event_id": f"evt-{index}"})
+        clock.now += 10
+
+    assert "evt-0" not in ledger
+    assert len(ledger) == 2
+
+    clock.now += 60
+    summary = ledger.summary()
+    assert summary["retained"] == 0
+    assert summary["evicted"] == 1
+    assert summary["expired"] == 2
+    assert summary["total"] == 3
+
+
+def test_ack_ledger_pages_in_ack_order():
+    ledger = AckLedger(clock=FakeClock())
+    for index in range(5):
+        ledger.record(index, {"update_id": index})
+
+    first, cursor = ledger.page(limit=2)
+    assert [item["update_id"] for item in first] == [0, 1]
+    second, cursor = ledger.page(cursor=cursor, limit=2)
+    assert [item["update_id"] for item in second] == [2, 3]
+    last, cursor = ledger.page(cursor=cursor, limit=2)
+    assert [item["update_id"] for item in last] == [4]
+    assert cursor is None
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Mapping
+
+from msgr_bridge_sdk.health import HealthCounters, HealthQuery, collect_health
+
+
+def test_collect_health_pages_with_bounded_concurrency():
+    async def _run() -> None:
+        active = 0
+        peak = 0
+
+        async def probe(index: int) -> Mapping[str, object]:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return {"id": index, "connected": index % 2 == 0, "pending_events": index}
+
+        candidates = [(f"user-{index:02d}", index) for index in range(10)]
+        query = HealthQuery.from_payload({"limit": 4})
+        first, cursor = await collect_health(candidates, probe, query, concurrency=2)
+        assert [entry["id"] for entry in first] == [0, 1, 2, 3]
+        assert cursor == "user-03"
+        assert peak <= 2
+
+        rest, cursor = await collect_health(
+            candidates, probe, HealthQuery.from_payload({"cursor": cursor}), concurrency=2
+        )
+        assert [entry["id"] for entry in rest] == [4, 5, 6, 7, 8, 9]
+        assert cursor is None
+
+    asyncio.run(_run())
+
+
+def test_collect_health_filters_fill_the_page():
+    async def _run() -> None:
+        async def probe(index: int) -> Mapping[str, object]:
+            return {"id": index, "connected": index % 3 != 0, "pending_events": index}
+
+        candidates = [(f"user-{index:02d}", index) for index in range(12)]
+        query = HealthQuery.from_payload({"limit": 2, "disconnected_only": True})
+        entries, cursor = await collect_health(candidates, probe, query, concurrency=2)
+        assert [entry["id"] for entry in entries] == [0, 3]
+        assert cursor == "user-03"
+
+        query = HealthQuery.from_payload({"min_pending_events": 9})
+        entries, cursor = await collect_health(candidates, probe, query)
+        assert [entry["id"] for entry in entries] == [10, 11]
+        assert cursor is None
+
+    asyncio.run(_run())
+
+
+def test_health_counters_update_incrementally():
+    counters = HealthCounters(clock=lambda: 5.0)
+    counters.observe("a", connected=True, pending_events=3)
+    counters.observe("b", connected=False, pending_events=1)
+    counters.observe("a", connected=False, pending_events=0)
+
+    summary = counters.summary()
+    assert summary["connected_clients"] == 0
+    assert summary["pending_events"] == 1
+    assert summary["observed_at"] == 5.0
+
+    counters.retain(["a"])
+    assert counters.summary(total_clients=4) == {
+        "total_clients": 4,
+        "observed_clients": 1,
+        "connected_clients": 0,
+        "pending_events": 0,
+        "observed_at": 5.0,
+    }
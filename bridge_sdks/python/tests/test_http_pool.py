@@ -0,0 +1,92 @@
+"""Tests for the shared aiohttp session pool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from msgr_bridge_sdk.http import HttpClientPool, HttpPoolConfig  # noqa: E402
+from msgr_slack_bridge.client import SlackRTMClient  # noqa: E402
+
+
+def test_pool_shares_one_session_per_host():
+    async def _run() -> None:
+        pool = HttpClientPool(HttpPoolConfig(limit_per_host=8, host_limits={"files.slack.com": 2}))
+        first = await pool.session("slack.com")
+        second = await pool.session("slack.com")
+        uploads = await pool.session_for("https://files.slack.com/upload/v1/abc")
+
+        assert first is second
+        assert uploads is not first
+        assert uploads.connector.limit_per_host == 2
+        assert pool.stats()["created"] == 2
+
+        await pool.close()
+        assert first.closed
+
+    asyncio.run(_run())
+
+
+def test_websockets_do_not_hold_request_slots():
+    from aiohttp import WSMsgType, web
+
+    async def _run() -> None:
+        async def socket(request: web.Request) -> web.WebSocketResponse:
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            async for message in ws:
+                if message.type == WSMsgType.CLOSE:
+                    break
+            return ws
+
+        async def api(request: web.Request) -> web.Response:
+            return web.json_response({"ok": True})
+
+        app = web.Application()
+        app.router.add_get("/ws", socket)
+        app.router.add_get("/api", api)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+        pool = HttpClientPool(HttpPoolConfig(limit=2, limit_per_host=2, request_timeout=5.0))
+        sockets = await pool.websocket_session()
+        assert sockets.connector.limit == 0 and sockets.connector.limit_per_host == 0
+        opened = [await sockets.ws_connect(f"http://127.0.0.1:{port}/ws") for _ in range(4)]
+
+        session = await pool.session_for(f"http://127.0.0.1:{port}/api")
+        assert session.timeout.total is None
+        async with session.get(f"http://127.0.0.1:{port}/api", timeout=pool.request_timeout()) as response:
+            assert (await response.json())["ok"] is True
+        assert pool.request_timeout().total == 5.0
+
+        for ws in opened:
+            await ws.close()
+        await pool.close()
+        assert sockets.closed
+        await runner.cleanup()
+
+    asyncio.run(asyncio.wait_for(_run(), timeout=10))
+
+
+def test_clients_borrow_pooled_sessions_without_closing_them():
+    async def _run() -> None:
+        pool = HttpClientPool()
+        clients = [SlackRTMClient(http_pool=pool) for _ in range(3)]
+        for client in clients:
+            await client._ensure_session()  # type: ignore[attr-defined]
+
+        sessions = {id(client._session) for client in clients}  # type: ignore[attr-defined]
+        assert len(sessions) == 1
+
+        await clients[0].disconnect()
+        assert not clients[1]._session.closed  # type: ignore[attr-defined]
+
+        await pool.close()
+
+    asyncio.run(_run())
@@ -0,0 +1,67 @@
+from msgr_bridge_sdk.inflight import InflightLedger, LatencyHistogram
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ledger_tracks_oldest_and_ack_latency():
+    clock = FakeClock()
+    ledger = InflightLedger(clock=clock)
+
+    ledger.record("evt-1")
+    clock.now += 2
+    ledger.record("evt-2")
+    ledger.record("evt-1")  # redelivery keeps the original dispatch time
+
+    assert len(ledger) == 2
+    assert ledger.oldest() == 1000.0
+
+    clock.now += 1
+    assert ledger.ack("evt-1") == 3.0
+    assert ledger.ack("evt-1") is None
+    assert ledger.oldest() == 1002.0
+    assert ledger.last_latency == 3.0
+
+    snapshot = ledger.snapshot()
+    assert snapshot["pending"] == 1
+    assert snapshot["oldest_age"] == 1.0
+    assert snapshot["ack_latency"]["count"] == 1
+
+
+def test_ledger_expires_and_evicts_from_the_front():
+    clock = FakeClock()
+    ledger = InflightLedger(max_entries=3, max_age=10.0, clock=clock)
+
+    for index in range(4):
+        ledger.record(f"evt-{index}")
+        clock.now += 1
+
+    assert "evt-0" not in ledger
+    assert len(ledger) == 3
+
+    clock.now += 20
+    ledger.record("evt-new")
+
+    snapshot = ledger.snapshot()
+    assert snapshot["pending"] == 1
+    assert snapshot["expired"] == 3
+    assert snapshot["evicted"] == 1
+    assert ledger.oldest() == clock.now
+
+
+def test_latency_histogram_quantiles():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0, 10.0))
+    for value in (0.05, 0.2, 0.5, 0.7, 30.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 5
+    assert snapshot["buckets"] == {"le_0.1": 1, "le_1": 3, "le_10": 0, "le_inf": 1}
+    assert snapshot["p50"] == 1.0
+    assert snapshot["p99"] == 30.0
+    assert LatencyHistogram().quantile(0.5) is None
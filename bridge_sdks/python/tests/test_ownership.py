@@ -0,0 +1,126 @@
+"""Tests for consistent-hash session ownership."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import pytest
+
+from msgr_bridge_sdk import HashRing, LocalMembershipBus, SessionOwnership, SessionOwnershipError
+from msgr_whatsapp_bridge import SessionManager, SessionStore
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.connected = False
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+
+def _run(async_fn: Callable[[], Awaitable[None]]) -> None:
+    asyncio.run(async_fn())
+
+
+def test_hash_ring_moves_only_a_slice_of_keys() -> None:
+    ring = HashRing(["r1", "r2", "r3"], vnodes=64)
+    keys = [f"user-{index}" for index in range(2000)]
+    before = {key: ring.owner(key) for key in keys}
+
+    ring.add("r4")
+    after = {key: ring.owner(key) for key in keys}
+
+    moved = [key for key in keys if before[key] != after[key]]
+    assert all(after[key] == "r4" for key in moved)
+    assert 0 < len(moved) < len(keys) // 2
+
+    ring.remove("r4")
+    assert {key: ring.owner(key) for key in keys} == before
+
+
+def test_hash_ring_empty_has_no_owner() -> None:
+    assert HashRing().owner("user") is None
+
+
+def test_session_handoff_on_replica_join_and_leave(tmp_path: Path) -> None:
+    bus = LocalMembershipBus()
+
+    def _manager(name: str) -> tuple[SessionManager, SessionOwnership, list[FakeClient]]:
+        created: list[FakeClient] = []
+
+        def factory(_path: Path) -> FakeClient:
+            client = FakeClient()
+            created.append(client)
+            return client
+
+        ownership = SessionOwnership("whatsapp", name, bus, heartbeat_interval=60.0)
+        # Without a vault nothing secret rides the handoff; replicas share storage.
+        store = SessionStore(tmp_path / "shared")
+        return SessionManager(store, factory, ownership=ownership), ownership, created
+
+    async def scenario() -> None:
+        first, first_owner, first_clients = _manager("replica-a")
+        await first_owner.start()
+
+        users = [f"user-{index}" for index in range(40)]
+        for user_id in users:
+            await first.ensure_client(user_id, session_blob=user_id.encode("utf-8"))
+        assert first_owner.claimed == frozenset(users)
+
+        second, second_owner, _ = _manager("replica-b")
+        adopted: list[str] = []
+
+        async def listener(user_id: str, _client: FakeClient) -> None:
+            adopted.append(user_id)
+
+        second.set_handoff_listener(listener)
+        await second_owner.start()
+
+        assert first_owner.members == second_owner.members == frozenset({"replica-a", "replica-b"})
+        moved = sorted(second_owner.claimed)
+        assert moved and sorted(adopted) == moved
+        assert first_owner.claimed == frozenset(users) - set(moved)
+        for user_id in moved:
+            assert second_owner.owner_for(user_id) == "replica-b"
+            assert second.get_client(user_id).connected is True
+            with pytest.raises(RuntimeError):
+                first.get_client(user_id)
+        assert await second.export_session(moved[0]) is not None
+        assert sum(1 for client in first_clients if client.connected) == len(users) - len(moved)
+
+        with pytest.raises(SessionOwnershipError):
+            await first.ensure_client(moved[0])
+
+        await second_owner.stop()
+        assert first_owner.members == frozenset({"replica-a"})
+        assert first_owner.claimed == frozenset(users)
+        await first_owner.stop()
+
+    _run(scenario)
+
+
+def test_expired_members_are_removed_from_ring() -> None:
+    bus = LocalMembershipBus()
+    now = [0.0]
+
+    async def scenario() -> None:
+        first = SessionOwnership("telegram", "a", bus, heartbeat_interval=60.0, member_ttl=60.0, clock=lambda: now[0])
+        second = SessionOwnership("telegram", "b", bus, heartbeat_interval=60.0, member_ttl=60.0, clock=lambda: now[0])
+        await first.start()
+        await second.start()
+        assert first.members == frozenset({"a", "b"})
+
+        now[0] = 120.0
+        await first.expire_members()
+        assert first.members == frozenset({"a"})
+        assert first.snapshot()["members"] == ["a"]
+
+        await first.stop()
+        await second.stop()
+
+    _run(scenario)
@@ -0,0 +1,82 @@
+"""Tests for single-flight call coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from msgr_bridge_sdk import SingleFlight
+
+
+def test_concurrent_callers_share_one_call_and_cache_result() -> None:
+    now = [0.0]
+    flights = SingleFlight(ttl=5.0, clock=lambda: now[0])
+    calls: list[str] = []
+
+    async def fetch() -> list[str]:
+        calls.append("fetch")
+        await asyncio.sleep(0.01)
+        return ["U1", "U2"]
+
+    async def scenario() -> None:
+        results = await asyncio.gather(*(flights.do("members", fetch) for _ in range(10)))
+        assert all(result == ["U1", "U2"] for result in results)
+        assert calls == ["fetch"]
+        assert flights.stats()["shared"] == 9
+
+        assert await flights.do("members", fetch) == ["U1", "U2"]
+        assert calls == ["fetch"]
+
+        now[0] = 6.0
+        await flights.do("members", fetch)
+        assert calls == ["fetch", "fetch"]
+
+        flights.forget("members")
+        await flights.do("members", fetch)
+        assert len(calls) == 3
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_shared_but_not_cached() -> None:
+    flights = SingleFlight(ttl=30.0)
+    attempts = [0]
+
+    async def flaky() -> str:
+        attempts[0] += 1
+        await asyncio.sleep(0)
+        if attempts[0] == 1:
+            raise RuntimeError("ratelimited")
+        return "ok"
+
+    async def scenario() -> None:
+        results = await asyncio.gather(flights.do("auth", flaky), flights.do("auth", flaky), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await flights.do("auth", flaky) == "ok"
+        assert attempts[0] == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call() -> None:
+    flights = SingleFlight(ttl=0.0)
+
+    async def scenario() -> None:
+        gate = asyncio.Event()
+
+        async def slow() -> int:
+            await gate.wait()
+            return 42
+
+        first = asyncio.create_task(flights.do("key", slow))
+        second = asyncio.create_task(flights.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        gate.set()
+        assert await second == 42
+        assert flights.stats()["cached"] == 0
+
+    asyncio.run(scenario())
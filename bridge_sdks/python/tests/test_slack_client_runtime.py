@@ -1,6 +1,11 @@
 import asyncio
 import logging
+from pathlib import Path
+from typing import AsyncIterator, Mapping
 
+import pytest
+
+from msgr_bridge_sdk.streaming import DirectoryStreamer
 from msgr_slack_bridge.client import (
     SlackFileReference,
     SlackFileUpload,
@@ -8,11 +13,14 @@ from msgr_slack_bridge.client import (
     SlackToken,
     _normalise_event,
 )
+from msgr_slack_bridge.directory import SlackDirectoryCache
+from msgr_slack_bridge.ratelimit import PRIORITY_BULK, PRIORITY_INTERACTIVE, SlackRateLimiter
+from msgr_slack_bridge.session import SessionManager, SessionStore
 
 
 class DummySlackClient(SlackRTMClient):
-    def __init__(self) -> None:
-        super().__init__(logger=logging.getLogger("dummy-slack"))
+    def __init__(self, **kwargs: object) -> None:
+        super().__init__(logger=logging.getLogger("dummy-slack"), **kwargs)  # type: ignore[arg-type]
         self.responses: dict[str, list[dict[str, object]]] = {}
         self.calls: list[tuple[str, dict[str, object] | None, dict[str, object] | None]] = []
         self.upload_requests: list[tuple[str, SlackFileUpload]] = []
@@ -29,6 +37,7 @@ class DummySlackClient(SlackRTMClient):
         params: dict[str, object] | None = None,
         payload: dict[str, object] | None = None,
         http_method: str = "GET",
+        priority: int = 0,
     ) -> dict[str, object]:
         self.calls.append((method, params, payload))
         if method == "auth.test":
@@ -75,15 +84,15 @@ class DummySlackClient(SlackRTMClient):
             payload_dict = payload or {}
             self.completed_uploads.append(payload_dict)
             files_payload = payload_dict.get("files") if isinstance(payload_dict.get("files"), list) else []
-            file_id = files_payload[0]["id"] if files_payload else f"F{self.upload_counter}"
             return {
                 "ok": True,
                 "files": [
                     {
-                        "id": file_id,
-                        "permalink": f"https://files.slack.com/{file_id}",
-                        "title": files_payload[0].get("title") if files_payload else None,
+                        "id": entry["id"],
+                        "permalink": f"https://files.slack.com/{entry['id']}",
+                        "title": entry.get("title"),
                     }
+                    for entry in files_payload
                 ],
             }
         if method == "chat.postMessage":
@@ -127,6 +136,378 @@ def test_list_members_and_channels() -> None:
     asyncio.run(_run())
 
 
+def test_concurrent_directory_calls_are_coalesced() -> None:
+    async def _run() -> None:
+        client = DummySlackClient()
+        client._token = SlackToken(value="xoxp-test")  # type: ignore[protected-access]
+
+        await asyncio.gather(
+            client.fetch_identity(),
+            client.describe_capabilities(),
+            *(client.list_members() for _ in range(5)),
+            *(client.list_conversations() for _ in range(5)),
+        )
+        methods = [call[0] for call in client.calls]
+        assert methods.count("auth.test") == 1
+        assert methods.count("users.list") == 2
+        assert methods.count("conversations.list") == 1
+
+        members = await client.list_members()
+        assert [m["id"] for m in members] == ["U1", "U2", "U3"]
+        assert [call[0] for call in client.calls].count("users.list") == 2
+
+    asyncio.run(_run())
+
+
+def test_directory_cache_is_shared_per_workspace_and_persisted(tmp_path: Path) -> None:
+    async def _run() -> None:
+        directory = SlackDirectoryCache(tmp_path, flush_delay=0.0)
+        first = DummySlackClient(directory=directory)
+        second = DummySlackClient(directory=directory)
+        first._token = SlackToken(value="xoxp-a")  # type: ignore[protected-access]
+        second._token = SlackToken(value="xoxp-b")  # type: ignore[protected-access]
+
+        await asyncio.gather(first.list_members(), second.list_members())
+        crawled = [call[0] for call in first.calls + second.calls]
+        assert crawled.count("users.list") == 2  # two pages, one crawl
+
+        channels = await second.list_conversations()
+        list_params = [call[1] for call in second.calls if call[0] == "conversations.list"]
+        assert {params["types"] for params in list_params} == {"public_channel", "private_channel,mpim,im"}
+        assert [channel["id"] for channel in channels] == ["C1"]
+
+        await directory.apply_event({"type": "team_join", "user": {"id": "U9", "team_id": "T1", "name": "new"}})
+        await directory.apply_event({"type": "channel_rename", "channel": {"id": "C1", "name": "town-square"}}, team_id="T1")
+        assert await directory.apply_event({"type": "message", "text": "hi"}, team_id="T1") is False
+        await directory.close()
+
+        restarted = SlackDirectoryCache(tmp_path)
+        third = DummySlackClient(directory=restarted)
+        third._token = SlackToken(value="xoxp-c")  # type: ignore[protected-access]
+        members = await third.list_members()
+        assert [member["id"] for member in members] == ["U1", "U2", "U3", "U9"]
+        channels = await restarted.channels("T1", third._load_conversations)  # type: ignore[protected-access]
+        assert channels[0]["name"] == "town-square"
+        assert "users.list" not in [call[0] for call in third.calls]
+
+    asyncio.run(_run())
+
+
+def test_directory_counts_each_membership_change_once(tmp_path: Path) -> None:
+    async def _run() -> None:
+        directory = SlackDirectoryCache(tmp_path, flush_delay=0.0)
+
+        async def loader() -> list:
+            return [{"id": "C1", "name": "general", "num_members": 3}]
+
+        await directory.channels("T1", loader)
+        joined = {"type": "member_joined_channel", "channel": "C1", "user": "U9"}
+        # The same join arrives once per linked client in the workspace.
+        assert await directory.apply_event(joined, team_id="T1") is True
+        assert await directory.apply_event(joined, team_id="T1") is False
+        assert (await directory.channels("T1", loader))[0]["num_members"] == 4
+
+        left = {"type": "member_left_channel", "channel": "C1", "user": "U9"}
+        assert await directory.apply_event(left, team_id="T1") is True
+        assert await directory.apply_event(left, team_id="T1") is False
+        assert await directory.apply_event(joined, team_id="T1") is True
+        assert (await directory.channels("T1", loader))[0]["num_members"] == 4
+
+        # U1 was already counted by the crawl, so its first leave still counts.
+        crawled = {"type": "member_left_channel", "channel": "C1", "user": "U1"}
+        assert await directory.apply_event(crawled, team_id="T1") is True
+        assert await directory.apply_event(crawled, team_id="T1") is False
+        assert (await directory.channels("T1", loader))[0]["num_members"] == 3
+        await directory.close()
+
+    asyncio.run(_run())
+
+
+def test_cold_directory_streams_pages_before_the_crawl_finishes(tmp_path: Path) -> None:
+    class GatedClient(DummySlackClient):
+        def __init__(self, **kwargs: object) -> None:
+            super().__init__(**kwargs)
+            self.gate = asyncio.Event()
+
+        async def _api_call(self, method: str, **kwargs: object) -> dict[str, object]:  # type: ignore[override]
+            params = kwargs.get("params")
+            if method == "users.list" and isinstance(params, dict) and params.get("cursor") == "page2":
+                await self.gate.wait()
+            return await super()._api_call(method, **kwargs)  # type: ignore[arg-type]
+
+    class RecordingMQ:
+        def __init__(self) -> None:
+            self.chunks: list[Mapping[str, object]] = []
+
+        async def publish(self, action: str, envelope: object, *, instance: object = None) -> None:
+            self.chunks.append(envelope.payload)  # type: ignore[attr-defined]
+
+    async def _run() -> None:
+        directory = SlackDirectoryCache(tmp_path, flush_delay=0.0)
+        client = GatedClient(directory=directory)
+        client._token = SlackToken(value="xoxp-a")  # type: ignore[protected-access]
+        mq = RecordingMQ()
+        streams = DirectoryStreamer(mq, "slack")  # type: ignore[arg-type]
+        handle = streams.open({"members": client.stream_members, "conversations": client.stream_conversations})
+
+        for _ in range(100):
+            if mq.chunks:
+                break
+            await asyncio.sleep(0.001)
+        # The first page is out while the second is still being fetched.
+        assert [member["id"] for member in mq.chunks[0]["items"]] == ["U1", "U2"]
+        lookup = asyncio.create_task(client.list_members())
+        await asyncio.sleep(0.01)
+        assert not lookup.done()
+
+        client.gate.set()
+        await streams.wait(str(handle["stream_id"]))
+        assert [member["id"] for member in await lookup] == ["U1", "U2", "U3"]
+        assert [call[0] for call in client.calls].count("users.list") == 2  # one crawl
+
+        assert [(chunk["kind"], chunk["cursor"], chunk["final"]) for chunk in mq.chunks] == [
+            ("members", "page2", False),
+            ("members", None, True),
+            ("conversations", "", False),
+            ("conversations", None, True),
+        ]
+        assert [channel["id"] for channel in mq.chunks[2]["items"]] == ["C1"]
+        assert mq.chunks[3]["items"] == []  # C1 came back from the private listing too
+
+        cached = [page async for page in client.stream_members()]
+        assert [[member["id"] for member in page.items] for page in cached] == [["U1", "U2", "U3"]]
+        await directory.close()
+
+    asyncio.run(_run())
+
+
+def test_rate_limiter_releases_interactive_calls_first() -> None:
+    async def _run() -> None:
+        limiter = SlackRateLimiter(tiers={"tier2": (6000.0, 1)})
+        order: list[str] = []
+
+        async def call(name: str, priority: int) -> None:
+            await limiter.acquire("T1", "users.list", priority=priority)
+            order.append(name)
+
+        await limiter.acquire("T1", "users.list")
+        bulk = [asyncio.create_task(call(f"crawl-{index}", PRIORITY_BULK)) for index in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("send", PRIORITY_INTERACTIVE))
+        await asyncio.gather(*bulk, interactive)
+
+        assert order[0] == "send"
+        snapshot = limiter.snapshot()
+        assert snapshot["queue_wait"]["bulk"]["count"] == 3
+        assert snapshot["queue_wait"]["interactive"]["max_wait"] > 0
+
+        assert limiter.bucket_key("T1", "chat.postMessage", "C1") != limiter.bucket_key("T1", "chat.postMessage", "C2")
+
+    asyncio.run(_run())
+
+
+def test_api_call_retries_after_429() -> None:
+    class RateLimitedClient(SlackRTMClient):
+        def __init__(self) -> None:
+            super().__init__(logger=logging.getLogger("rate-limited"))
+            self._session = object()  # type: ignore[assignment]
+            self._token = SlackToken(value="xoxp-test")
+            self.responses = [(429, "0.05", None), (200, None, {"ok": True, "channel": "C1"})]
+
+        async def _request(self, method, params, payload, http_method):  # type: ignore[override]
+            return self.responses.pop(0)
+
+    async def _run() -> None:
+        client = RateLimitedClient()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await client.post_message("C1", "hei")
+        assert response["channel"] == "C1"
+        assert loop.time() - started >= 0.04
+        health = await client.health()
+        assert health["rate_limits"]["rate_limited"] == 1
+
+    asyncio.run(_run())
+
+
+def test_rtm_supervisor_reconnects_and_backfills_gap() -> None:
+    class FlakyRTMClient(DummySlackClient):
+        def __init__(self) -> None:
+            super().__init__(reconnect_backoff=0.001, max_reconnect_backoff=0.002)
+            self.opens = 0
+            self.sessions = 0
+            self.hold = asyncio.Event()
+
+        async def _open_rtm(self) -> None:  # type: ignore[override]
+            self.opens += 1
+            if self.opens == 2:
+                raise RuntimeError("network unreachable")
+
+        async def _consume_events(self) -> None:  # type: ignore[override]
+            self.sessions += 1
+            if self.sessions == 1:
+                event = _normalise_event({"type": "message", "channel": "C1", "ts": "100.000001", "text": "before"})
+                assert event is not None
+                await self._dispatch_event(event)
+                return
+            await self.hold.wait()
+
+        async def _api_call(self, method, *, params=None, payload=None, http_method="GET", priority=0):  # type: ignore[override]
+            if method == "conversations.history":
+                self.calls.append((method, params, payload))
+                return {
+                    "ok": True,
+                    "messages": [
+                        {"type": "message", "ts": "100.000300", "text": "third"},
+                        {"type": "message", "ts": "100.000200", "text": "second"},
+                    ],
+                    "has_more": False,
+                }
+            return await super()._api_call(method, params=params, payload=payload, http_method=http_method)
+
+    async def _run() -> None:
+        client = FlakyRTMClient()
+        received: list[Mapping[str, object]] = []
+
+        async def handler(event: Mapping[str, object]) -> None:
+            received.append(event)
+
+        client.add_event_handler(handler)
+        await client.connect(SlackToken(value="xoxp-test"))
+        for _ in range(200):
+            if len(received) == 3:
+                break
+            await asyncio.sleep(0.005)
+
+        assert client.opens == 3
+        history = [call for call in client.calls if call[0] == "conversations.history"]
+        assert history[0][1]["oldest"] == "100.000001"
+        assert [event["message"]["text"] for event in received] == ["before", "second", "third"]
+        assert received[1]["backfilled"] is True
+
+        health = await client.health()
+        assert health["reconnects"] == 1
+        assert health["backfilled_messages"] == 2
+        assert health["total_downtime"] >= 0
+
+        await client.disconnect()
+
+    asyncio.run(_run())
+
+
+def test_send_during_reconnect_keeps_client_and_resume_cursor(tmp_path: Path) -> None:
+    class StalledRTMClient(DummySlackClient):
+        def __init__(self) -> None:
+            super().__init__(reconnect_backoff=0.001, max_reconnect_backoff=0.002)
+            self.opens = 0
+            self.dropped = asyncio.Event()
+            self.network_back = asyncio.Event()
+            self.disconnects = 0
+
+        async def _open_rtm(self) -> None:  # type: ignore[override]
+            self.opens += 1
+            if self.opens > 1:
+                self.dropped.set()
+                await self.network_back.wait()
+
+        async def _consume_events(self) -> None:  # type: ignore[override]
+            if self.opens == 1:
+                event = _normalise_event({"type": "message", "channel": "C1", "ts": "100.000001", "text": "before"})
+                assert event is not None
+                await self._dispatch_event(event)
+                return
+            await asyncio.Event().wait()
+
+        async def disconnect(self) -> None:
+            self.disconnects += 1
+            await super().disconnect()
+
+    async def _run() -> None:
+        created: list[StalledRTMClient] = []
+
+        def factory(_instance: str | None) -> StalledRTMClient:
+            client = StalledRTMClient()
+            created.append(client)
+            return client
+
+        manager = SessionManager(SessionStore(tmp_path), factory)
+        token = SlackToken(value="xoxp-test")
+        client, _ = await manager.ensure_client("user-1", "T1", token=token)
+        await asyncio.wait_for(created[0].dropped.wait(), timeout=1)
+        assert created[0]._reconnecting is True  # type: ignore[attr-defined]
+
+        # An outbound send while the supervisor is reconnecting.
+        again, _ = await manager.ensure_client("user-1", "T1")
+        assert again is client
+        assert len(created) == 1
+        assert created[0].disconnects == 0
+        assert "C1" in created[0]._last_seen_ts  # type: ignore[attr-defined]
+
+        created[0].network_back.set()
+        for _ in range(200):
+            if any(call[0] == "conversations.history" for call in created[0].calls):
+                break
+            await asyncio.sleep(0.005)
+        history = [call for call in created[0].calls if call[0] == "conversations.history"]
+        assert history[0][1]["oldest"] == "100.000001"
+
+        await manager.shutdown()
+
+    asyncio.run(_run())
+
+
+def test_dispatch_queue_decouples_reader_and_applies_overflow_policy() -> None:
+    async def _run() -> None:
+        client = DummySlackClient(dispatch_workers=1, dispatch_queue_size=2, overflow_policy="drop_oldest")
+        gate = asyncio.Event()
+        received: list[str] = []
+
+        async def slow_handler(event: Mapping[str, object]) -> None:
+            await gate.wait()
+            received.append(str(event["event_id"]))
+
+        client.add_event_handler(slow_handler)
+        client._start_dispatchers()  # type: ignore[protected-access]
+        for index in range(5):
+            await client._enqueue_event({"event_id": f"e{index}", "channel_id": "C1"})  # type: ignore[protected-access]
+            await asyncio.sleep(0)
+
+        health = await client.health()
+        assert health["dispatch"]["dropped_events"] == 2
+        assert health["dispatch"]["queue_depth"] == 2
+
+        gate.set()
+        await client._dispatch_queues[0].join()  # type: ignore[protected-access]
+        assert received == ["e0", "e3", "e4"]
+        assert (await client.health())["dispatch"]["max_lag"] > 0
+        await client._stop_dispatchers()  # type: ignore[protected-access]
+
+    asyncio.run(_run())
+
+
+def test_dispatch_workers_preserve_per_channel_order() -> None:
+    async def _run() -> None:
+        client = DummySlackClient(dispatch_workers=4)
+        received: dict[str, list[int]] = {}
+
+        async def handler(event: Mapping[str, object]) -> None:
+            await asyncio.sleep(0)
+            received.setdefault(str(event["channel_id"]), []).append(int(event["seq"]))  # type: ignore[arg-type]
+
+        client.add_event_handler(handler)
+        client._start_dispatchers()  # type: ignore[protected-access]
+        for seq in range(20):
+            for channel in ("C1", "C2", "C3"):
+                await client._enqueue_event({"event_id": f"{channel}-{seq}", "channel_id": channel, "seq": seq})  # type: ignore[protected-access]
+        for queue in client._dispatch_queues:  # type: ignore[protected-access]
+            await queue.join()
+
+        assert received == {channel: list(range(20)) for channel in ("C1", "C2", "C3")}
+        await client._stop_dispatchers()  # type: ignore[protected-access]
+
+    asyncio.run(_run())
+
+
 def test_post_message_invokes_web_api() -> None:
     async def _run() -> None:
         client = DummySlackClient()
@@ -188,6 +569,138 @@ def test_post_message_uploads_files_and_references_blocks() -> None:
     asyncio.run(_run())
 
 
+def test_post_message_uploads_files_concurrently_with_one_completion(tmp_path: Path) -> None:
+    async def _run() -> None:
+        client = DummySlackClient(upload_concurrency=2)
+        client._token = SlackToken(value="xoxp-test")  # type: ignore[protected-access]
+        active = 0
+        peak = 0
+
+        async def slow_upload(upload_url: str, upload: SlackFileUpload) -> None:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            client.upload_requests.append((upload_url, upload))
+
+        client._upload_external_file = slow_upload  # type: ignore[assignment]
+
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"\x00" * 1024)
+        uploads = [
+            SlackFileUpload(filename=f"image-{index}.png", content=b"png", content_type="image/png")
+            for index in range(4)
+        ]
+        uploads.append(SlackFileUpload.from_path(video, content_type="video/mp4"))
+
+        response = await client.post_message("C1", "album", file_uploads=uploads)
+
+        assert peak == 2
+        assert len(client.completed_uploads) == 1
+        completed = client.completed_uploads[0]["files"]
+        assert [entry["id"] for entry in completed] == ["F0", "F1", "F2", "F3", "F4"]
+        assert [entry["id"] for entry in response["uploaded_files"]] == ["F0", "F1", "F2", "F3", "F4"]
+        length_params = [
+            params["length"] for method, params, _ in client.calls if method == "files.getUploadURLExternal"
+        ]
+        assert sorted(length_params) == [3, 3, 3, 3, 1024]
+
+    asyncio.run(_run())
+
+
+def test_file_upload_streams_path_and_iterator_chunks(tmp_path: Path) -> None:
+    async def _run() -> None:
+        source = tmp_path / "big.bin"
+        source.write_bytes(b"abcdefghij")
+        upload = SlackFileUpload.from_path(source)
+        assert upload.filename == "big.bin"
+        assert upload.content_length() == 10
+        assert [chunk async for chunk in upload.iter_chunks(chunk_size=4)] == [b"abcd", b"efgh", b"ij"]
+
+        async def produce() -> AsyncIterator[bytes]:
+            yield b"one"
+            yield b"two"
+
+        streamed = SlackFileUpload(filename="s.bin", content=produce(), length=6)
+        assert streamed.content_length() == 6
+        assert b"".join([chunk async for chunk in streamed.iter_chunks()]) == b"onetwo"
+
+    asyncio.run(_run())
+
+
+def test_streamed_upload_outlives_session_total_timeout() -> None:
+    pytest.importorskip("aiohttp")
+    import aiohttp
+    from aiohttp import web
+
+    async def _run() -> None:
+        received = bytearray()
+
+        async def upload(request: web.Request) -> web.Response:
+            async for chunk in request.content.iter_any():
+                received.extend(chunk)
+            return web.Response(text="OK")
+
+        app = web.Application()
+        app.router.add_put("/upload", upload)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+        async def produce() -> AsyncIterator[bytes]:
+            for _ in range(5):
+                await asyncio.sleep(0.1)
+                yield b"x" * 1024
+
+        # The session's 0.2s total deadline would cut this 0.5s upload off.
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.2)) as session:
+            client = SlackRTMClient(session=session, upload_read_timeout=5.0)
+            upload_file = SlackFileUpload(filename="slow.bin", content=produce(), length=5 * 1024)
+            await client._upload_external_file(f"http://127.0.0.1:{port}/upload", upload_file)  # type: ignore[attr-defined]
+
+        assert len(received) == 5 * 1024
+        await runner.cleanup()
+
+    asyncio.run(_run())
+
+
+def test_backfill_history_request_survives_query_encoding() -> None:
+    pytest.importorskip("aiohttp")
+    import aiohttp
+    from aiohttp import web
+
+    async def _run() -> None:
+        queries: list[dict[str, str]] = []
+
+        async def history(request: web.Request) -> web.Response:
+            queries.append(dict(request.query))
+            messages = [{"type": "message", "ts": "101.000002"}, {"type": "message", "ts": "100.5"}]
+            return web.json_response({"ok": True, "messages": messages, "has_more": False})
+
+        app = web.Application()
+        app.router.add_get("/api/conversations.history", history)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+        async with aiohttp.ClientSession() as session:
+            client = SlackRTMClient(session=session)
+            client._API_BASE = f"http://127.0.0.1:{port}/api"  # type: ignore[misc]
+            client._token = SlackToken(value="xoxp-test")  # type: ignore[protected-access]
+            messages = await client._history_since("C1", "100.000001")  # type: ignore[attr-defined]
+
+        assert [message["ts"] for message in messages] == ["100.5", "101.000002"]
+        assert queries == [{"channel": "C1", "oldest": "100.000001", "limit": "200"}]
+        await runner.cleanup()
+
+    asyncio.run(_run())
+
+
 def test_normalise_event_extracts_event_id() -> None:
     event = _normalise_event(
         {
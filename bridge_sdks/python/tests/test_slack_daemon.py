@@ -7,8 +7,9 @@ from pathlib import Path
 from typing import Awaitable, Callable, Dict, Mapping, Optional
 
 from msgr_bridge_sdk import StoneMQClient, build_envelope
+from msgr_bridge_sdk.streaming import DirectoryPage
 from msgr_slack_bridge import SessionManager, SessionStore, SlackBridgeDaemon
-from msgr_slack_bridge.client import SlackIdentity, SlackToken, SlackUser, SlackWorkspace
+from msgr_slack_bridge.client import SlackIdentity, SlackRTMClient, SlackToken, SlackUser, SlackWorkspace
 
 
 class MemoryTransport:
@@ -80,6 +81,13 @@ class FakeSlackClient:
     async def list_conversations(self) -> list[Mapping[str, object]]:
         return copy.deepcopy(self.channels)
 
+    async def stream_members(self):
+        yield DirectoryPage(items=copy.deepcopy(self.members[:1]), cursor="page2")
+        yield DirectoryPage(items=copy.deepcopy(self.members[1:]))
+
+    async def stream_conversations(self):
+        yield DirectoryPage(items=copy.deepcopy(self.channels))
+
     async def post_message(
         self,
         channel: str,
@@ -192,6 +200,114 @@ def test_link_account_returns_workspace_snapshot(tmp_path: Path) -> None:
     _run(scenario)
 
 
+def test_link_account_streams_directory_chunks(tmp_path: Path) -> None:
+    client = FakeSlackClient()
+    daemon, transport = _build_daemon(tmp_path, client)
+    chunks: list[Mapping[str, object]] = []
+
+    async def collect(body: bytes) -> None:
+        chunks.append(json.loads(body.decode("utf-8"))["payload"])
+
+    async def scenario() -> None:
+        await daemon.start()
+        await transport.subscribe("bridge/slack/T999/directory_chunk", collect)
+        envelope = build_envelope(
+            "slack",
+            "link_account",
+            {
+                "user_id": "acct-1",
+                "session": {"token": "xoxs-token"},
+                "workspace": {"id": "T999"},
+                "stream_directory": True,
+            },
+        )
+        raw = await transport.request("bridge/slack/T999/link_account", envelope.to_json().encode("utf-8"))
+        response = json.loads(raw.decode("utf-8"))
+        assert response["status"] == "linked"
+        assert "members" not in response and "conversations" not in response
+        handle = response["directory"]
+        assert handle["action"] == "directory_chunk"
+        assert handle["kinds"] == ["members", "conversations"]
+
+        await daemon._directory_streams.wait(handle["stream_id"])  # type: ignore[attr-defined]
+        assert [chunk["sequence"] for chunk in chunks] == [0, 1, 2]
+        assert [(chunk["kind"], chunk["cursor"], chunk["final"]) for chunk in chunks] == [
+            ("members", "page2", False),
+            ("members", None, True),
+            ("conversations", None, True),
+        ]
+        assert chunks[-1]["complete"] is True
+        assert all(chunk["stream_id"] == handle["stream_id"] for chunk in chunks)
+        assert chunks[1]["items"][0]["real_name"] == "Bob Builder"
+        assert chunks[0]["workspace_id"] == "T999"
+
+        await daemon.shutdown()
+
+    _run(scenario)
+
+
+class PagedSlackClient(SlackRTMClient):
+    """The concrete Slack client with only the network edges replaced."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[str] = []
+
+    async def connect(self, token: SlackToken) -> None:
+        self._token = token
+
+    async def _api_call(self, method: str, **kwargs: object) -> Mapping[str, object]:  # type: ignore[override]
+        params = kwargs.get("params")
+        cursor = params.get("cursor") if isinstance(params, Mapping) else None
+        self.calls.append(method)
+        if method == "auth.test":
+            return {"ok": True, "user_id": "U123", "team_id": "T999"}
+        if method == "users.info":
+            return {"ok": True, "user": {"id": "U123", "name": "alice"}}
+        if method == "team.info":
+            return {"ok": True, "team": {"id": "T999", "name": "Acme"}}
+        if method == "users.list":
+            if cursor == "next":
+                return {"ok": True, "members": [{"id": "U2"}], "response_metadata": {"next_cursor": ""}}
+            return {"ok": True, "members": [{"id": "U1"}], "response_metadata": {"next_cursor": "next"}}
+        if method == "conversations.list":
+            return {"ok": True, "channels": [{"id": "C1"}], "response_metadata": {"next_cursor": ""}}
+        return {"ok": True}
+
+
+def test_link_account_streams_directory_through_the_slack_client(tmp_path: Path) -> None:
+    client = PagedSlackClient()
+    daemon, transport = _build_daemon(tmp_path, client)  # type: ignore[arg-type]
+    chunks: list[Mapping[str, object]] = []
+
+    async def collect(body: bytes) -> None:
+        chunks.append(json.loads(body.decode("utf-8"))["payload"])
+
+    async def scenario() -> None:
+        await daemon.start()
+        await transport.subscribe("bridge/slack/T999/directory_chunk", collect)
+        envelope = build_envelope(
+            "slack",
+            "link_account",
+            {"user_id": "acct-1", "session": {"token": "xoxs-token"}, "stream_directory": True},
+        )
+        raw = await transport.request("bridge/slack/T999/link_account", envelope.to_json().encode("utf-8"))
+        handle = json.loads(raw.decode("utf-8"))["directory"]
+        await daemon._directory_streams.wait(handle["stream_id"])  # type: ignore[attr-defined]
+
+        assert [(chunk["kind"], chunk["cursor"], chunk["final"]) for chunk in chunks] == [
+            ("members", "next", False),
+            ("members", None, True),
+            ("conversations", None, True),
+        ]
+        assert [[item["id"] for item in chunk["items"]] for chunk in chunks] == [["U1"], ["U2"], ["C1"]]
+        assert chunks[-1]["complete"] is True
+        assert client.calls.count("users.list") == 2
+        await daemon.shutdown()
+
+    _run(scenario)
+
+
 def test_link_account_without_token_requests_browser_plan(tmp_path: Path) -> None:
     client = FakeSlackClient()
     daemon, transport = _build_daemon(tmp_path, client)
@@ -232,8 +348,12 @@ def test_outbound_message_dispatch(tmp_path: Path) -> None:
         )
         topic = "bridge/slack/T999/outbound_message"
         await transport.publish(topic, envelope.to_json().encode("utf-8"))
+        await daemon.drain_outbound()
 
         assert client.sent_messages[0]["text"] == "Hello"
+        result = json.loads(transport.published["bridge/slack/T999/outbound_result"].decode("utf-8"))
+        assert result["payload"]["status"] == "sent"
+        assert result["payload"]["message_ids"] == [envelope.trace_id]
         await daemon.shutdown()
 
     _run(scenario)
@@ -260,6 +380,69 @@ def test_ack_event_invokes_client(tmp_path: Path) -> None:
     _run(scenario)
 
 
+def test_health_snapshot_summary_only_skips_client_probes(tmp_path: Path) -> None:
+    client = FakeSlackClient()
+    daemon, transport = _build_daemon(tmp_path, client)
+
+    async def scenario() -> None:
+        await _link_account(daemon, transport)
+        calls_before = client.health_calls
+
+        health_envelope = build_envelope("slack", "health_snapshot", {"summary_only": True})
+        response_raw = await transport.request(
+            "bridge/slack/T999/health_snapshot",
+            health_envelope.to_json().encode("utf-8"),
+        )
+        snapshot = json.loads(response_raw.decode("utf-8"))
+
+        assert client.health_calls == calls_before
+        assert snapshot["clients"] == []
+        assert snapshot["summary"]["total_clients"] == 1
+        assert snapshot["summary"]["connected_clients"] == 1
+
+        filtered_envelope = build_envelope("slack", "health_snapshot", {"disconnected_only": True})
+        filtered_raw = await transport.request(
+            "bridge/slack/T999/health_snapshot",
+            filtered_envelope.to_json().encode("utf-8"),
+        )
+        filtered = json.loads(filtered_raw.decode("utf-8"))
+        assert filtered["clients"] == []
+        assert filtered["next_cursor"] is None
+
+        await daemon.shutdown()
+
+    _run(scenario)
+
+
+def test_health_summary_forgets_unlinked_clients(tmp_path: Path) -> None:
+    client = FakeSlackClient()
+    daemon, transport = _build_daemon(tmp_path, client)
+
+    async def summary(payload: Mapping[str, object]) -> Mapping[str, object]:
+        envelope = build_envelope("slack", "health_snapshot", payload)
+        raw = await transport.request("bridge/slack/T999/health_snapshot", envelope.to_json().encode("utf-8"))
+        return json.loads(raw.decode("utf-8"))["summary"]
+
+    async def scenario() -> None:
+        await _link_account(daemon, transport)
+        client.pending_events = 2
+        # A filtered probe observes the client but never prunes the counters.
+        assert (await summary({"instance": "T999"}))["pending_events"] == 2
+
+        await daemon._sessions.remove_client("acct-1", "T999")  # type: ignore[attr-defined]
+        after = await summary({"summary_only": True})
+        assert (after["total_clients"], after["observed_clients"]) == (0, 0)
+        assert (after["connected_clients"], after["pending_events"]) == (0, 0)
+
+        await _link_account(daemon, transport)
+        relinked = await summary({"summary_only": True})
+        assert (relinked["total_clients"], relinked["connected_clients"]) == (1, 1)
+
+        await daemon.shutdown()
+
+    _run(scenario)
+
+
 def test_health_snapshot_reports_runtime_state(tmp_path: Path) -> None:
     client = FakeSlackClient()
     daemon, transport = _build_daemon(tmp_path, client)
@@ -288,6 +471,17 @@ def test_health_snapshot_reports_runtime_state(tmp_path: Path) -> None:
         assert snapshot["summary"]["acked_events"] == 1
         assert snapshot["clients"][0]["instance"] == "T999"
         assert snapshot["clients"][0]["pending_events"] == 3
+        assert snapshot["acks"]["by_status"] == {"accepted": 1}
+        assert "acked_events" not in snapshot
+
+        paged_envelope = build_envelope("slack", "health_snapshot", {"instance": "T999", "ack_limit": 10})
+        paged_raw = await transport.request(
+            "bridge/slack/T999/health_snapshot",
+            paged_envelope.to_json().encode("utf-8"),
+        )
+        paged = json.loads(paged_raw.decode("utf-8"))
+        assert [item["event_id"] for item in paged["acked_events"]] == ["evt-2"]
+        assert paged["ack_cursor"] is None
 
         await daemon.shutdown()
 
@@ -0,0 +1,257 @@
+"""Tests for the Slack Events API receiver."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+from typing import Dict, List, Mapping
+
+import pytest
+
+from msgr_slack_bridge.client import SlackRTMClient, SlackToken
+from msgr_slack_bridge.events import SlackEventsReceiver
+
+SECRET = "signing-secret"
+NOW = 1_700_000_000.0
+
+
+def _signed(payload: Mapping[str, object], *, retry: int | None = None) -> tuple[Dict[str, str], bytes]:
+    body = json.dumps(payload).encode("utf-8")
+    timestamp = str(int(NOW))
+    digest = hmac.new(SECRET.encode("utf-8"), f"v0:{timestamp}:".encode("utf-8") + body, hashlib.sha256)
+    headers = {"X-Slack-Request-Timestamp": timestamp, "X-Slack-Signature": f"v0={digest.hexdigest()}"}
+    if retry is not None:
+        headers["X-Slack-Retry-Num"] = str(retry)
+    return headers, body
+
+
+def _event(event_id: str, *, team_id: str = "T1", user_id: str = "U1") -> Dict[str, object]:
+    return {
+        "type": "event_callback",
+        "team_id": team_id,
+        "event_id": event_id,
+        "authorizations": [{"team_id": team_id, "user_id": user_id}],
+        "event": {"type": "message", "channel": "C1", "user": "U9", "text": "hi", "ts": "1.0"},
+    }
+
+
+def test_receiver_verifies_signatures_and_answers_challenges() -> None:
+    async def _run() -> None:
+        receiver = SlackEventsReceiver(SECRET, clock=lambda: NOW)
+
+        headers, body = _signed({"type": "url_verification", "challenge": "abc"})
+        assert await receiver.handle_request(headers, body) == (200, {"challenge": "abc"})
+
+        headers["X-Slack-Signature"] = "v0=deadbeef"
+        status, _ = await receiver.handle_request(headers, body)
+        assert status == 401
+
+        stale = SlackEventsReceiver(SECRET, clock=lambda: NOW + 600)
+        headers, body = _signed({"type": "url_verification", "challenge": "abc"})
+        status, _ = await stale.handle_request(headers, body)
+        assert status == 401
+
+    asyncio.run(_run())
+
+
+def test_receiver_routes_by_authorization_and_drops_retries() -> None:
+    async def _run() -> None:
+        receiver = SlackEventsReceiver(SECRET, clock=lambda: NOW)
+        delivered: Dict[str, List[str]] = {"U1": [], "U2": []}
+
+        def handler_for(user: str):
+            async def handler(payload: Mapping[str, object]) -> None:
+                delivered[user].append(str(payload["event_id"]))
+
+            return handler
+
+        receiver.register("T1", handler_for("U1"), user_id="U1")
+        receiver.register("T1", handler_for("U2"), user_id="U2")
+
+        headers, body = _signed(_event("Ev1", user_id="U2"))
+        assert (await receiver.handle_request(headers, body))[0] == 200
+        headers, body = _signed(_event("Ev1", user_id="U2"), retry=1)
+        assert (await receiver.handle_request(headers, body))[0] == 200
+        await receiver.stop()
+
+        assert delivered == {"U1": [], "U2": ["Ev1"]}
+        stats = receiver.stats()
+        assert stats["duplicates"] == 1
+        assert stats["received"] == 2
+
+    asyncio.run(_run())
+
+
+def test_receiver_never_fans_out_events_to_other_linked_users() -> None:
+    async def _run() -> None:
+        receiver = SlackEventsReceiver(SECRET, clock=lambda: NOW)
+        delivered: Dict[str, List[str]] = {"U1": [], "U2": [], "workspace": []}
+
+        def handler_for(user: str):
+            async def handler(payload: Mapping[str, object]) -> None:
+                delivered[user].append(str(payload["event_id"]))
+
+            return handler
+
+        receiver.register("T1", handler_for("U1"), user_id="U1")
+        receiver.register("T1", handler_for("U2"), user_id="U2")
+
+        # A DM authorised for U1 only, and one for a user nobody linked.
+        for event_id, user_id in (("Ev1", "U1"), ("Ev2", "U3")):
+            headers, body = _signed(_event(event_id, user_id=user_id))
+            assert (await receiver.handle_request(headers, body))[0] == 200
+        await receiver.stop()
+
+        assert delivered == {"U1": ["Ev1"], "U2": [], "workspace": []}
+        assert receiver.stats()["unrouted"] == 1
+
+        receiver.register("T1", handler_for("workspace"))
+        headers, body = _signed(_event("Ev3", user_id="U3"))
+        await receiver.handle_request(headers, body)
+        payload = _event("Ev4")
+        del payload["authorizations"]
+        headers, body = _signed(payload)
+        await receiver.handle_request(headers, body)
+        await receiver.stop()
+
+        assert delivered == {"U1": ["Ev1"], "U2": [], "workspace": ["Ev3", "Ev4"]}
+
+    asyncio.run(_run())
+
+
+def test_receiver_resolves_other_linked_recipients_with_the_app_token() -> None:
+    class ResolvingReceiver(SlackEventsReceiver):
+        def __init__(self, **kwargs: object) -> None:
+            super().__init__(SECRET, clock=lambda: NOW, **kwargs)  # type: ignore[arg-type]
+            self.lookups: List[str] = []
+
+        async def _list_authorizations(self, event_context: str) -> List[Mapping[str, object]]:
+            self.lookups.append(event_context)
+            return [{"team_id": "T1", "user_id": "U1"}, {"team_id": "T1", "user_id": "U2"}]
+
+    async def _run() -> None:
+        receiver = ResolvingReceiver(app_token="xapp-1")
+        delivered: Dict[str, List[str]] = {"U1": [], "U2": [], "U3": []}
+
+        def handler_for(user: str):
+            async def handler(payload: Mapping[str, object]) -> None:
+                delivered[user].append(str(payload["event_id"]))
+
+            return handler
+
+        receiver.register("T1", handler_for("U1"), user_id="U1")
+        payload = {**_event("Ev1"), "event_context": "ctx-1"}
+        headers, body = _signed(payload)
+        await receiver.handle_request(headers, body)
+        await receiver.stop()
+        # Nobody else from T1 is linked, so there is nothing to look up.
+        assert receiver.lookups == []
+
+        receiver.register("T1", handler_for("U2"), user_id="U2")
+        receiver.register("T1", handler_for("U3"), user_id="U3")
+        payload = {**_event("Ev2"), "event_context": "ctx-2"}
+        headers, body = _signed(payload)
+        await receiver.handle_request(headers, body)
+        await receiver.stop()
+
+        assert receiver.lookups == ["ctx-2"]
+        # U3 cannot see the channel, so Slack does not list it and it gets nothing.
+        assert delivered == {"U1": ["Ev1", "Ev2"], "U2": ["Ev2"], "U3": []}
+        assert receiver.stats()["resolved"] == 1
+
+    asyncio.run(_run())
+
+
+def test_receiver_lists_authorizations_over_http() -> None:
+    pytest.importorskip("aiohttp")
+    from aiohttp import web
+
+    from msgr_bridge_sdk.http import HttpClientPool
+
+    async def _run() -> None:
+        requests: List[Dict[str, str]] = []
+
+        async def authorizations(request: web.Request) -> web.Response:
+            form = dict(await request.post())
+            requests.append({"auth": request.headers["Authorization"], **form})  # type: ignore[dict-item]
+            if form.get("cursor") == "next":
+                return web.json_response({"ok": True, "authorizations": [{"team_id": "T1", "user_id": "U2"}]})
+            return web.json_response(
+                {
+                    "ok": True,
+                    "authorizations": [{"team_id": "T1", "user_id": "U1"}],
+                    "response_metadata": {"next_cursor": "next"},
+                }
+            )
+
+        app = web.Application()
+        app.router.add_post("/api/apps.event.authorizations.list", authorizations)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+
+        pool = HttpClientPool()
+        receiver = SlackEventsReceiver(SECRET, app_token="xapp-1", http_pool=pool)
+        receiver._API_BASE = f"http://127.0.0.1:{port}/api"  # type: ignore[misc]
+        try:
+            listed = await receiver._list_authorizations("ctx-1")  # type: ignore[attr-defined]
+        finally:
+            await pool.close()
+            await runner.cleanup()
+
+        assert [item["user_id"] for item in listed] == ["U1", "U2"]
+        assert requests[0] == {"auth": "Bearer xapp-1", "event_context": "ctx-1", "limit": "200"}
+        assert requests[1]["cursor"] == "next"
+
+    asyncio.run(_run())
+
+
+class EventsModeClient(SlackRTMClient):
+    async def _ensure_session(self) -> None:  # type: ignore[override]
+        return None
+
+    async def _api_call(self, method: str, **_: object) -> Dict[str, object]:  # type: ignore[override]
+        if method == "auth.test":
+            return {"ok": True, "user_id": "U1", "team_id": "T1"}
+        if method == "users.info":
+            return {"ok": True, "user": {"id": "U1", "name": "alice"}}
+        if method == "team.info":
+            return {"ok": True, "team": {"id": "T1", "name": "Acme"}}
+        return {"ok": True}
+
+
+def test_client_in_events_mode_dispatches_pushed_events() -> None:
+    async def _run() -> None:
+        receiver = SlackEventsReceiver(SECRET, clock=lambda: NOW)
+        client = EventsModeClient(logger=logging.getLogger("events-mode"), events_receiver=receiver)
+        received: List[Mapping[str, object]] = []
+
+        async def handler(event: Mapping[str, object]) -> None:
+            received.append(event)
+
+        client.add_event_handler(handler)
+        await client.connect(SlackToken(value="xoxb-test"))
+        assert await client.is_connected()
+
+        headers, body = _signed(_event("Ev7"))
+        await receiver.handle_request(headers, body)
+        for _ in range(20):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+
+        assert received[0]["ts"] == "1.0"
+        assert received[0]["channel_id"] == "C1"
+        health = await client.health()
+        assert health["ingestion"] == "events_api"
+
+        await client.disconnect()
+        assert receiver.stats()["handlers"] == 0
+        await receiver.stop()
+
+    asyncio.run(_run())
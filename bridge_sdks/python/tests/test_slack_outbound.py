@@ -0,0 +1,119 @@
+"""Tests for the per-channel Slack outbound sender."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Mapping, Optional
+
+from msgr_slack_bridge.outbound import CoalescePolicy, OutboundMessage, OutboundResult, SlackOutboundSender
+
+
+class RecordingClient:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.posts: List[Dict[str, object]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def post_message(self, channel: str, text: str, **kwargs: object) -> Mapping[str, object]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        self.posts.append({"channel": channel, "text": text, **kwargs})
+        return {"ok": True, "ts": f"{len(self.posts)}.0"}
+
+
+def _sender(client: RecordingClient, results: List[OutboundResult], policy: Optional[CoalescePolicy] = None):
+    async def resolve() -> RecordingClient:
+        return client
+
+    async def report(result: OutboundResult) -> None:
+        results.append(result)
+
+    return SlackOutboundSender(resolve, report, policy=policy)  # type: ignore[arg-type]
+
+
+def test_channels_post_in_parallel_but_keep_order() -> None:
+    async def _run() -> None:
+        client = RecordingClient(delay=0.01)
+        results: List[OutboundResult] = []
+        sender = _sender(client, results)
+
+        for index in range(3):
+            for channel in ("C1", "C2", "C3"):
+                sender.submit(OutboundMessage(channel=channel, text=f"{channel}-{index}", message_id=f"{channel}-{index}"))
+        await sender.drain()
+
+        assert client.peak == 3
+        for channel in ("C1", "C2", "C3"):
+            texts = [post["text"] for post in client.posts if post["channel"] == channel]
+            assert texts == [f"{channel}-0", f"{channel}-1", f"{channel}-2"]
+        assert all(result.ok for result in results)
+        await sender.close()
+
+    asyncio.run(_run())
+
+
+def test_consecutive_plain_text_is_coalesced_per_thread() -> None:
+    async def _run() -> None:
+        client = RecordingClient()
+        results: List[OutboundResult] = []
+        sender = _sender(client, results, CoalescePolicy(enabled=True, window=0.05))
+
+        sender.submit(OutboundMessage(channel="C1", text="one", message_id="m1"))
+        sender.submit(OutboundMessage(channel="C1", text="two", message_id="m2"))
+        sender.submit(OutboundMessage(channel="C1", text="reply", message_id="m3", thread_ts="9.0"))
+        sender.submit(OutboundMessage(channel="C1", text="card", message_id="m4", blocks=[{"type": "divider"}]))
+        sender.submit(OutboundMessage(channel="C1", text="three", message_id="m5"))
+        await sender.drain()
+
+        assert [post["text"] for post in client.posts] == ["one\ntwo", "reply", "card", "three"]
+        assert [result.to_payload()["message_ids"] for result in results] == [["m1", "m2"], ["m3"], ["m4"], ["m5"]]
+        assert sender.stats()["coalesced"] == 1
+        await sender.close()
+
+    asyncio.run(_run())
+
+
+def test_stuck_channel_rejects_overflow_and_drain_times_out() -> None:
+    class PausedClient(RecordingClient):
+        def __init__(self) -> None:
+            super().__init__()
+            self.resume = asyncio.Event()
+
+        async def post_message(self, channel: str, text: str, **kwargs: object) -> Mapping[str, object]:
+            if channel == "C1":
+                await self.resume.wait()  # e.g. waiting out a long Retry-After
+            return await super().post_message(channel, text, **kwargs)
+
+    async def _run() -> None:
+        client = PausedClient()
+        results: List[OutboundResult] = []
+
+        async def resolve() -> PausedClient:
+            return client
+
+        async def report(result: OutboundResult) -> None:
+            results.append(result)
+
+        sender = SlackOutboundSender(resolve, report, max_lane_depth=2)  # type: ignore[arg-type]
+        accepted = [
+            sender.submit(OutboundMessage(channel="C1", text=f"m{index}", message_id=f"m{index}")) for index in range(4)
+        ]
+        assert accepted == [True, True, False, False]
+        assert sender.submit(OutboundMessage(channel="C2", text="other", message_id="o1"))
+
+        assert await sender.drain(timeout=0.05) is False
+        rejected = [result for result in results if not result.ok]
+        assert [result.message_ids for result in rejected] == [["m2"], ["m3"]]
+        assert {result.error for result in rejected} == {"channel_queue_full"}
+        assert [result.message_ids for result in results if result.ok] == [["o1"]]
+        assert sender.stats()["rejected"] == 2
+
+        client.resume.set()
+        assert await sender.drain(timeout=1.0) is True
+        assert [post["text"] for post in client.posts if post["channel"] == "C1"] == ["m0", "m1"]
+        await sender.close()
+
+    asyncio.run(_run())
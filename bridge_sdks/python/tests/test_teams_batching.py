@@ -0,0 +1,80 @@
+"""Tests for Microsoft Graph ``$batch`` coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Mapping, Optional, Sequence
+
+import pytest
+
+from msgr_teams_bridge.batching import (
+    GraphBatcher,
+    GraphRequest,
+    GraphRequestError,
+    GraphResponse,
+    batch_payload,
+    demultiplex,
+)
+
+
+class FakeGraph:
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+        self.singles: List[str] = []
+        self.throttle_once: set[str] = set()
+
+    async def send_batch(self, requests: Sequence[GraphRequest]) -> Sequence[GraphResponse]:
+        self.batches.append([request.url() for request in requests])
+        responses = []
+        for request in requests:
+            if request.path in self.throttle_once:
+                self.throttle_once.discard(request.path)
+                responses.append(GraphResponse(status=429, headers={"Retry-After": "0.05"}))
+            elif request.path.endswith("/missing"):
+                responses.append(GraphResponse(status=404, body={"error": {"message": "gone"}}))
+            else:
+                responses.append(GraphResponse(status=200, body={"path": request.path}))
+        return responses
+
+    async def send_single(self, path: str, params: Optional[Mapping[str, object]]) -> Mapping[str, object]:
+        self.singles.append(path)
+        return {"path": path, "single": True}
+
+
+def test_concurrent_gets_share_batches_and_retry_throttled_items() -> None:
+    async def _run() -> None:
+        graph = FakeGraph()
+        graph.throttle_once.add("/chats/c3/messages")
+        batcher = GraphBatcher(graph.send_batch, graph.send_single, linger=0.01, max_batch=20)
+
+        paths = [f"/chats/c{index}/messages" for index in range(25)]
+        results = await asyncio.gather(*(batcher.get(path, {"$top": 20}) for path in paths))
+
+        assert [result["path"] for result in results] == paths
+        assert [len(batch) for batch in graph.batches[:2]] == [20, 5]
+        assert graph.batches[0][0] == "/chats/c0/messages?$top=20"
+        # The throttled item was re-queued alone and sent directly.
+        assert graph.singles == ["/chats/c3/messages"]
+        stats = batcher.stats()
+        assert stats["throttled"] == 1
+        assert stats["batches"] == 2
+
+        failing = asyncio.gather(batcher.get("/chats/a/messages"), batcher.get("/chats/missing"))
+        with pytest.raises(GraphRequestError) as excinfo:
+            await failing
+        assert excinfo.value.status == 404
+
+    asyncio.run(_run())
+
+
+def test_batch_payload_round_trip() -> None:
+    requests = [GraphRequest("/me"), GraphRequest("/chats/1/messages", {"$filter": "lastModifiedDateTime gt 2024"})]
+
+    payload = batch_payload(requests)
+    responses = demultiplex(
+        requests,
+        {"responses": [{"id": "1", "status": 200, "body": {"value": []}}, {"id": "0", "status": 200, "body": {"id": "u"}}]},
+    )
+
+    assert payload["requests"][1]["url"] == "/chats/1/messages?$filter=lastModifiedDateTime%20gt%202024"
+    assert [response.body for response in responses] == [{"id": "u"}, {"value": []}]
@@ -18,6 +18,8 @@ from msgr_teams_bridge.notifications import (
     MemoryNotificationTransport,
     TeamsWebhookNotificationSource,
 )
+from msgr_teams_bridge.polling import CHAT_ACTIVITY_PATH, ChatPollState
+from msgr_teams_bridge.session import SessionStore
 
 
 class DummyTask:
@@ -41,8 +43,8 @@ class DummyTask:
 
 
 class DummyTeamsClient(TeamsGraphClient):
-    def __init__(self) -> None:
-        super().__init__(logger=logging.getLogger("dummy-teams"))
+    def __init__(self, **kwargs: object) -> None:
+        super().__init__(logger=logging.getLogger("dummy-teams"), **kwargs)  # type: ignore[arg-type]
         self._responses: Dict[Tuple[str, Optional[Tuple[Tuple[str, object], ...]]], Mapping[str, object]] = {}
         self.posts: list[Tuple[str, Mapping[str, object]]] = []
 
@@ -73,6 +75,7 @@ class DummyTeamsClient(TeamsGraphClient):
             mail=me.get("mail"),
         )
         self._identity = TeamsIdentity(tenant=tenant, user=user)
+        await self._restore_cursors()
         self._poll_task = DummyTask()
 
     async def _get(  # type: ignore[override]
@@ -202,6 +205,24 @@ def test_list_conversations_and_members() -> None:
     asyncio.run(_run())
 
 
+def test_stream_conversations_yields_pages_with_next_links() -> None:
+    async def _run() -> None:
+        client = DummyTeamsClient()
+        client._tenant = TeamsTenant(id="tenant")  # type: ignore[protected-access]
+        client._token = TeamsToken(access_token="token")  # type: ignore[protected-access]
+
+        next_link = "https://graph.microsoft.com/v1.0/me/chats?$skiptoken=abc"
+        client.queue_response("/me/chats", {"value": [{"id": "chat1"}], "@odata.nextLink": next_link})
+        client.queue_response("/me/chats?$skiptoken=abc", {"value": [{"id": "chat2"}]})
+
+        pages = [page async for page in client.stream_conversations()]
+
+        assert [[item["id"] for item in page.items] for page in pages] == [["chat1"], ["chat2"]]
+        assert [page.cursor for page in pages] == [next_link, None]
+
+    asyncio.run(_run())
+
+
 def test_send_message_and_poll_event(monkeypatch) -> None:
     async def _run() -> None:
         tenant = TeamsTenant(id="tenant")
@@ -297,6 +318,110 @@ def test_send_message_and_poll_event(monkeypatch) -> None:
         assert "join_url" not in events[0]["message"]["meeting"]["online_meeting"]
         assert events[0]["conversation"]["thread"]["parent_id"] == "parent1"
         assert client.posts[-1][0] == "/chats/chat1/messages"
+        assert client._scheduler.pop_due() == ["chat1"]
+
+    asyncio.run(_run())
+
+
+def test_delta_polling_only_syncs_chats_with_new_activity() -> None:
+    async def _run() -> None:
+        client = DummyTeamsClient()
+        client.queue_response("/me", {"id": "user1"})
+        await client.connect(TeamsTenant(id="tenant"), TeamsToken(access_token="token"))
+        client._poll_state = ChatPollState(clock=lambda: 1704067200.0)  # 2024-01-01T00:00:00Z
+
+        requested: list[str] = []
+        original_get = client._get
+
+        async def recording_get(path: str, params: Optional[Mapping[str, object]] = None) -> Mapping[str, object]:
+            requested.append(path)
+            return await original_get(path, params)
+
+        client._get = recording_get  # type: ignore[method-assign]
+
+        def listing(preview_id: str, created: str) -> Mapping[str, object]:
+            return {
+                "value": [
+                    {"id": "chat1", "lastMessagePreview": {"id": preview_id, "createdDateTime": created}},
+                    {"id": "chat2", "lastMessagePreview": {"id": "old", "createdDateTime": "2023-06-01T00:00:00Z"}},
+                ]
+            }
+
+        delta_link = "https://graph.microsoft.com/v1.0/chats/chat1/messages/delta?$deltatoken=abc"
+        client.queue_response(CHAT_ACTIVITY_PATH, listing("m2", "2024-01-01T00:01:00Z"))
+        client.queue_response(
+            "/chats/chat1/messages/delta",
+            {
+                "value": [
+                    {"id": "m1", "chatId": "chat1", "lastModifiedDateTime": "2023-12-31T23:00:00Z"},
+                    {"id": "m2", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:01:00Z"},
+                ],
+                "@odata.deltaLink": delta_link,
+            },
+            params={"$top": 50, "$filter": "lastModifiedDateTime gt 2024-01-01T00:00:00Z"},
+        )
+
+        events: list[Mapping[str, object]] = []
+
+        async def recorder(payload: Mapping[str, object]) -> None:
+            events.append(payload)
+
+        client.add_event_handler(recorder)
+
+        await client._poll_once()
+        assert [event["event_id"] for event in events] == ["m2"]
+        assert requested == [CHAT_ACTIVITY_PATH, "/chats/chat1/messages/delta"]
+
+        requested.clear()
+        await client._poll_once()
+        assert requested == [CHAT_ACTIVITY_PATH]
+
+        requested.clear()
+        client.queue_response(CHAT_ACTIVITY_PATH, listing("m3", "2024-01-01T00:02:00Z"))
+        client.queue_response(
+            "/chats/chat1/messages/delta?$deltatoken=abc",
+            {"value": [{"id": "m3", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:02:00Z"}]},
+        )
+        await client._poll_once()
+        assert requested == [CHAT_ACTIVITY_PATH, "/chats/chat1/messages/delta?$deltatoken=abc"]
+        assert [event["event_id"] for event in events] == ["m2", "m3"]
+
+        snapshot = await client.health()
+        assert snapshot["polling"]["chats"] == 2
+        assert snapshot["polling"]["delta_links"] == 1
+
+    asyncio.run(_run())
+
+
+def test_chat_cursors_survive_restart(tmp_path) -> None:
+    async def _run() -> None:
+        store = SessionStore(tmp_path)
+        messages = {
+            "value": [
+                {"id": "m1", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:00:01.5Z"},
+                {"id": "m2", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:00:02.25Z"},
+            ]
+        }
+        params = {"$top": 20, "$orderby": "lastModifiedDateTime asc"}
+        dispatched: list[str] = []
+
+        async def recorder(payload: Mapping[str, object]) -> None:
+            dispatched.append(str(payload["event_id"]))
+
+        for _ in range(2):
+            client = DummyTeamsClient(cursor_store=store, delta_polling=False)
+            client.queue_response("/me", {"id": "user1"})
+            client.queue_response("/chats/chat1/messages", messages, params=params)
+            client.add_event_handler(recorder)
+            await client.connect(TeamsTenant(id="tenant"), TeamsToken(access_token="token"))
+            await client._poll_chat("chat1")
+            await client.disconnect()
+
+        # The second client restored the cursor and skipped both messages.
+        assert dispatched == ["m1", "m2"]
+        stored = await store.load_cursors("tenant", "user1")
+        assert stored is not None
+        assert stored["chats"]["chat1"]["last_message_us"] == 1704067202250000
 
     asyncio.run(_run())
 
@@ -341,6 +466,7 @@ def test_change_notifications_dispatch_events() -> None:
         }
 
         await transport.dispatch(subscription_id, notification)
+        await client.drain_notifications()
 
         assert events and events[0]["event_id"] == "msg-99"
         assert events[0]["message"]["body"]["content_type"] == "html"
@@ -357,6 +483,70 @@ def test_change_notifications_dispatch_events() -> None:
     asyncio.run(_run())
 
 
+def test_missed_notifications_trigger_a_catch_up_poll() -> None:
+    async def _run() -> None:
+        transport = MemoryNotificationTransport()
+        source = TeamsWebhookNotificationSource(transport, renewal_window=3600.0)
+        client = NotificationEnabledClient(source)
+        client._poll_state = ChatPollState(clock=lambda: 1704067200.0)  # 2024-01-01T00:00:00Z
+        client.queue_response("/me", {"id": "user1"})
+        await client.connect(TeamsTenant(id="tenant"), TeamsToken(access_token="token"))
+
+        events: list[Mapping[str, object]] = []
+
+        async def handler(payload: Mapping[str, object]) -> None:
+            events.append(payload)
+
+        client.add_event_handler(handler)
+        subscription_id = source.subscription_id
+        assert subscription_id is not None
+
+        client.queue_response(
+            "/chats/chat1/messages/m1",
+            {"id": "m1", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:01:00Z"},
+        )
+        await transport.dispatch(
+            subscription_id,
+            {
+                "subscriptionId": subscription_id,
+                "resource": "/chats('chat1')/messages('m1')",
+                "resourceData": {"id": "m1", "chatId": "chat1"},
+            },
+        )
+        await client.drain_notifications()
+
+        client.queue_response(
+            CHAT_ACTIVITY_PATH,
+            {
+                "value": [
+                    {"id": "chat1", "lastMessagePreview": {"id": "m2", "createdDateTime": "2024-01-01T00:02:00Z"}},
+                    {"id": "chat2", "lastMessagePreview": {"id": "old", "createdDateTime": "2023-06-01T00:00:00Z"}},
+                ]
+            },
+        )
+        client.queue_response(
+            "/chats/chat1/messages/delta",
+            {
+                "value": [
+                    {"id": "m1", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:01:00Z"},
+                    {"id": "m2", "chatId": "chat1", "lastModifiedDateTime": "2024-01-01T00:02:00Z"},
+                ]
+            },
+            params={"$top": 50, "$filter": "lastModifiedDateTime gt 2024-01-01T00:01:00Z"},
+        )
+        await transport.dispatch(subscription_id, {"subscriptionId": subscription_id, "lifecycleEvent": "missed"})
+        assert client._catch_up_task is not None
+        await client._catch_up_task
+
+        # m1 came through the notification; the catch-up only adds what was missed.
+        assert [event["event_id"] for event in events] == ["m1", "m2"]
+        assert (await client.health())["notifications"]["catch_ups"] == 1
+
+        await client.disconnect()
+
+    asyncio.run(_run())
+
+
 def test_send_message_sanitises_cards_and_uploads() -> None:
     async def _run() -> None:
         client = DummyTeamsClient()
@@ -457,6 +647,7 @@ def test_token_refresh_invoked_when_expiring() -> None:
 
         client.configure_token_refresh(refresher, on_update, margin=30.0)
         await client._ensure_valid_token()  # type: ignore[attr-defined]
+        await client._refresh_task  # type: ignore[attr-defined,misc]
 
         assert client._token is not None  # type: ignore[truthy-bool]
         assert client._token.access_token == "new"  # type: ignore[union-attr]
@@ -492,6 +683,7 @@ def test_notification_source_receives_token_refresh() -> None:
 
         client.configure_token_refresh(refresher, on_update, margin=30.0)
         await client._ensure_valid_token()  # type: ignore[attr-defined]
+        await client._refresh_task  # type: ignore[attr-defined,misc]
 
         assert source.refreshed and source.refreshed[0] == "new"
 
@@ -526,6 +718,71 @@ def test_token_refresh_skipped_when_not_needed() -> None:
     asyncio.run(_run())
 
 
+def test_sends_do_not_wait_for_a_pending_token_refresh() -> None:
+    class PostResponse:
+        status = 201
+        headers: Dict[str, str] = {}
+
+        async def __aenter__(self) -> "PostResponse":
+            return self
+
+        async def __aexit__(self, *exc: object) -> None:
+            return None
+
+        def raise_for_status(self) -> None:
+            return None
+
+        async def json(self) -> Mapping[str, object]:
+            return {"id": "m1"}
+
+    class RecordingSession:
+        def __init__(self) -> None:
+            self.tokens: list[str] = []
+
+        def post(self, url: str, *, json: Mapping[str, object], headers: Mapping[str, str]) -> PostResponse:
+            self.tokens.append(headers["Authorization"])
+            return PostResponse()
+
+    async def _run() -> None:
+        client = TeamsGraphClient(logger=logging.getLogger("refresh-send"), batch_linger=None)
+        session = RecordingSession()
+        client._session = session  # type: ignore[assignment]
+        client._tenant = TeamsTenant(id="tenant")  # type: ignore[protected-access]
+        client._token = TeamsToken(  # type: ignore[protected-access]
+            access_token="old", refresh_token="refresh", expires_at=time.time() + 10
+        )
+        release = asyncio.Event()
+
+        async def refresher(current: TeamsToken) -> TeamsToken:
+            await release.wait()
+            return TeamsToken(access_token=current.access_token + "+1", refresh_token="refresh")
+
+        async def on_update(updated: TeamsToken) -> None:
+            return None
+
+        client.configure_token_refresh(refresher, on_update, margin=30.0)
+        # The token is inside the refresh margin but still valid: sends go
+        # out with it while the (stalled) refresh runs in the background.
+        for _ in range(2):
+            await asyncio.wait_for(client._request("POST", "/chats/c1/messages", payload={}), 1.0)
+        assert session.tokens == ["Bearer old", "Bearer old"]
+        assert not client._refresh_task.done()  # type: ignore[union-attr]
+
+        release.set()
+        await client._refresh_task  # type: ignore[misc]
+        await client._request("POST", "/chats/c1/messages", payload={})
+        assert session.tokens[-1] == "Bearer old+1"
+
+        # An expired token has to wait for the refresh before it is used.
+        client._token = TeamsToken(  # type: ignore[protected-access]
+            access_token="stale", refresh_token="refresh", expires_at=time.time() - 1
+        )
+        await client._request("POST", "/chats/c1/messages", payload={})
+        assert session.tokens[-1] == "Bearer stale+1"
+
+    asyncio.run(_run())
+
+
 def test_send_message_renders_plain_text_as_html() -> None:
     async def _run() -> None:
         client = DummyTeamsClient()
@@ -0,0 +1,118 @@
+"""Tests for coalescing bursts of Teams change notifications."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List, Mapping, Optional
+
+from msgr_teams_bridge.client import TeamsGraphClient, TeamsTenant
+from msgr_teams_bridge.coalescing import NotificationCoalescer
+from msgr_teams_bridge.notifications import MemoryNotificationTransport, TeamsWebhookNotificationSource
+
+
+def _notification(change_id: str, change_type: str, message_id: str = "m1") -> Mapping[str, object]:
+    return {
+        "id": change_id,
+        "changeType": change_type,
+        "resource": f"/chats('chat-1')/messages('{message_id}')",
+        "resourceData": {"id": message_id},
+    }
+
+
+def _key(payload: Mapping[str, object]) -> Optional[str]:
+    resource = payload.get("resource")
+    return resource if isinstance(resource, str) else None
+
+
+def test_coalescer_merges_bursts_and_drops_redeliveries() -> None:
+    async def _run() -> None:
+        flushed: List[Mapping[str, object]] = []
+
+        async def flush(payload: Mapping[str, object]) -> None:
+            flushed.append(payload)
+
+        coalescer = NotificationCoalescer(flush, _key, window=0.05, dedup_entries=2)
+        await coalescer.submit(_notification("n1", "created"))
+        await coalescer.submit(_notification("n2", "updated"))
+        await coalescer.submit(_notification("n2", "updated"))
+        await coalescer.submit(_notification("n3", "updated"))
+        await coalescer.submit(_notification("n4", "created", message_id="m2"))
+        await coalescer.submit({"id": "n5", "changeType": "created"})
+
+        # Notifications without a key are not held back.
+        assert [item["id"] for item in flushed] == ["n5"]
+        await asyncio.sleep(0.1)
+
+        assert [(item["id"], item["changeType"]) for item in flushed] == [
+            ("n5", "created"),
+            ("n3", "created,updated"),
+            ("n4", "created"),
+        ]
+        stats = coalescer.stats()
+        assert stats["duplicates"] == 1
+        assert stats["merged"] == 2
+        assert stats["pending"] == 0
+
+        # Only the last ``dedup_entries`` ids are remembered.
+        await coalescer.submit(_notification("n1", "updated"))
+        await coalescer.drain()
+        assert flushed[-1]["id"] == "n1"
+
+    asyncio.run(_run())
+
+
+class CountingClient(TeamsGraphClient):
+    def __init__(self) -> None:
+        super().__init__(
+            logger=logging.getLogger("teams-coalescing"),
+            notification_source=TeamsWebhookNotificationSource(MemoryNotificationTransport()),
+            notification_window=5.0,
+            batch_linger=None,
+        )
+        self._tenant = TeamsTenant(id="tenant")
+        self.gets: List[str] = []
+
+    async def _get(  # type: ignore[override]
+        self,
+        path: str,
+        params: Optional[Mapping[str, object]] = None,
+    ) -> Mapping[str, object]:
+        self.gets.append(path)
+        return {
+            "id": path.rsplit("/", 1)[-1],
+            "chatId": "chat-1",
+            "createdDateTime": "2024-01-01T00:00:00Z",
+            "body": {"content": "edited", "contentType": "text"},
+            "from": {"user": {"id": "user2"}},
+        }
+
+
+def test_client_fetches_each_message_once_per_burst() -> None:
+    async def _run() -> None:
+        client = CountingClient()
+        events: List[Mapping[str, object]] = []
+
+        async def handler(payload: Mapping[str, object]) -> None:
+            events.append(payload)
+
+        client.add_event_handler(handler)
+        for index, change_type in enumerate(["created", "updated", "updated"]):
+            await client._handle_change_notification(  # type: ignore[attr-defined]
+                _notification(f"n{index}", change_type)
+            )
+        await client._handle_change_notification(_notification("n0", "created"))  # type: ignore[attr-defined]
+        await client._handle_change_notification(  # type: ignore[attr-defined]
+            _notification("n9", "created", message_id="m2")
+        )
+        assert client.gets == []
+
+        await client.drain_notifications()
+
+        assert client.gets == ["/chats/chat-1/messages/m1", "/chats/chat-1/messages/m2"]
+        assert [event["event_id"] for event in events] == ["m1", "m2"]
+        coalescing = (await client.health())["notifications"]["coalescing"]
+        assert coalescing["merged"] == 2
+        assert coalescing["duplicates"] == 1
+
+    asyncio.run(_run())
@@ -387,6 +387,30 @@ def test_health_snapshot_reports_runtime_state(tmp_path: Path) -> None:
     _run(scenario)
 
 
+def test_health_summary_forgets_unlinked_clients(tmp_path: Path) -> None:
+    client = FakeTeamsClient()
+    daemon, transport, sessions = _build_daemon(tmp_path, client)
+
+    async def summary(payload: Mapping[str, object]) -> Mapping[str, object]:
+        envelope = build_envelope("teams", "health_snapshot", payload)
+        raw = await transport.request("bridge/teams/tenant-1/health_snapshot", envelope.to_json().encode("utf-8"))
+        return json.loads(raw.decode("utf-8"))["summary"]
+
+    async def scenario() -> None:
+        await _link_account(daemon, transport)
+        client.pending_events = 2
+        assert (await summary({"tenant_id": "tenant-1"}))["pending_events"] == 2
+
+        await sessions.remove_client("tenant-1", "acct-1")
+        after = await summary({"summary_only": True})
+        assert (after["total_clients"], after["observed_clients"]) == (0, 0)
+        assert (after["connected_clients"], after["pending_events"]) == (0, 0)
+
+        await daemon.shutdown()
+
+    _run(scenario)
+
+
 def test_token_refresh_updates_session(tmp_path: Path) -> None:
     client = FakeTeamsClient()
     oauth = FakeOAuthClient()
@@ -0,0 +1,163 @@
+"""Tests for decrypting Graph rich notifications."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import datetime as dt
+import hashlib
+import hmac
+import json
+import logging
+import os
+from typing import List, Mapping, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, padding, serialization
+from cryptography.hazmat.primitives.asymmetric import padding as asymmetric_padding
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.x509.oid import NameOID
+
+from msgr_teams_bridge.client import TeamsGraphClient, TeamsTenant
+from msgr_teams_bridge.encryption import NotificationDecryptionError, NotificationDecryptor
+from msgr_teams_bridge.notifications import MemoryNotificationTransport, TeamsWebhookNotificationSource
+
+
+def _key_pair() -> Tuple[rsa.RSAPrivateKey, bytes, bytes]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "msgr-teams-notifications")])
+    now = dt.datetime.now(dt.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + dt.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return key, key_pem, certificate.public_bytes(serialization.Encoding.PEM)
+
+
+KEY, KEY_PEM, CERT_PEM = _key_pair()
+
+
+def _encrypt(resource: Mapping[str, object], certificate_id: str = "primary") -> dict:
+    """Encrypt ``resource`` the way Graph does for rich notifications."""
+
+    symmetric_key = os.urandom(32)
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    padded = padder.update(json.dumps(resource).encode("utf-8")) + padder.finalize()
+    encryptor = Cipher(algorithms.AES(symmetric_key), modes.CBC(symmetric_key[:16])).encryptor()
+    data = encryptor.update(padded) + encryptor.finalize()
+    wrapped = KEY.public_key().encrypt(
+        symmetric_key,
+        asymmetric_padding.OAEP(
+            mgf=asymmetric_padding.MGF1(algorithm=hashes.SHA1()),
+            algorithm=hashes.SHA1(),
+            label=None,
+        ),
+    )
+    return {
+        "data": base64.b64encode(data).decode("ascii"),
+        "dataSignature": base64.b64encode(hmac.new(symmetric_key, data, hashlib.sha256).digest()).decode("ascii"),
+        "dataKey": base64.b64encode(wrapped).decode("ascii"),
+        "encryptionCertificateId": certificate_id,
+    }
+
+
+MESSAGE = {
+    "id": "msg-7",
+    "chatId": "chat-1",
+    "createdDateTime": "2024-01-01T00:00:00Z",
+    "body": {"content": "<p>Hi</p>", "contentType": "html"},
+    "from": {"user": {"id": "user2", "displayName": "Bob"}},
+}
+
+
+def test_decryptor_round_trip_and_tampering() -> None:
+    decryptor = NotificationDecryptor(KEY_PEM, CERT_PEM, certificate_id="cert-1")
+
+    fields = decryptor.subscription_fields()
+    assert fields["includeResourceData"] is True
+    assert fields["encryptionCertificateId"] == "cert-1"
+    assert base64.b64decode(fields["encryptionCertificate"])
+
+    assert decryptor.decrypt(_encrypt(MESSAGE, "cert-1")) == MESSAGE
+
+    tampered = _encrypt(MESSAGE, "cert-1")
+    tampered["dataSignature"] = base64.b64encode(b"\0" * 32).decode("ascii")
+    with pytest.raises(NotificationDecryptionError):
+        decryptor.decrypt(tampered)
+    with pytest.raises(NotificationDecryptionError):
+        decryptor.decrypt(_encrypt(MESSAGE, "unknown"))
+
+
+def test_retired_keys_decrypt_until_rotation_completes() -> None:
+    _, new_key_pem, new_cert_pem = _key_pair()
+    decryptor = NotificationDecryptor(
+        new_key_pem, new_cert_pem, certificate_id="cert-2", retired_keys={"cert-1": KEY_PEM}
+    )
+
+    assert decryptor.certificate_id == "cert-2"
+    assert decryptor.decrypt(_encrypt(MESSAGE, "cert-1"))["id"] == "msg-7"
+
+
+class RecordingClient(TeamsGraphClient):
+    def __init__(self, decryptor: NotificationDecryptor) -> None:
+        super().__init__(
+            logger=logging.getLogger("teams-encryption"),
+            notification_source=TeamsWebhookNotificationSource(MemoryNotificationTransport()),
+            notification_decryptor=decryptor,
+        )
+        self._tenant = TeamsTenant(id="tenant")
+        self.gets: List[str] = []
+
+    async def _get(  # type: ignore[override]
+        self,
+        path: str,
+        params: Optional[Mapping[str, object]] = None,
+    ) -> Mapping[str, object]:
+        self.gets.append(path)
+        return MESSAGE
+
+
+def test_encrypted_notifications_dispatch_without_fetching() -> None:
+    async def _run() -> None:
+        client = RecordingClient(NotificationDecryptor(KEY_PEM, CERT_PEM))
+        events: List[Mapping[str, object]] = []
+
+        async def handler(payload: Mapping[str, object]) -> None:
+            events.append(payload)
+
+        client.add_event_handler(handler)
+        notification = {
+            "resource": "/chats('chat-1')/messages('msg-7')",
+            "resourceData": {"id": "msg-7"},
+            "encryptedContent": _encrypt(MESSAGE),
+        }
+        await client._handle_change_notification(notification)  # type: ignore[attr-defined]
+        await client.drain_notifications()
+        assert client.gets == []
+
+        notification["encryptedContent"] = dict(notification["encryptedContent"], dataSignature="AAAA")
+        await client._handle_change_notification(notification)  # type: ignore[attr-defined]
+        await client.drain_notifications()
+        assert client.gets == ["/chats/chat-1/messages/msg-7"]
+
+        assert len(events) == 2
+        counts = (await client.health())["notifications"]
+        assert (counts["decrypted"], counts["decrypt_failures"], counts["fetched"]) == (1, 1, 1)
+
+    asyncio.run(_run())
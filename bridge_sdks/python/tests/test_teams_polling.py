@@ -0,0 +1,109 @@
+"""Tests for the adaptive Teams chat poll scheduler and durable chat cursors."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from msgr_teams_bridge.polling import (
+    ChatCursorWriter,
+    ChatPollScheduler,
+    ChatPollState,
+    isoformat_us,
+    timestamp_us,
+)
+from msgr_teams_bridge.session import SessionStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_idle_chats_back_off_and_active_chats_stay_hot() -> None:
+    clock = FakeClock()
+    scheduler = ChatPollScheduler(hot_interval=2.0, idle_interval=16.0, clock=clock)
+    scheduler.add("busy")
+    scheduler.add("quiet")
+
+    polled: dict[str, list[float]] = {"busy": [], "quiet": []}
+    start = clock.now
+    while clock.now - start <= 60:
+        for chat_id in scheduler.pop_due():
+            polled[chat_id].append(clock.now - start)
+            scheduler.record(chat_id, active=chat_id == "busy")
+        clock.now = scheduler.next_due()  # type: ignore[assignment]
+
+    assert polled["busy"] == [float(step) for step in range(0, 61, 2)]
+    assert polled["quiet"] == [0.0, 4.0, 12.0, 28.0, 44.0, 60.0]
+    assert scheduler.stats()["hot"] == 1
+
+    scheduler.wake("quiet")
+    assert scheduler.next_due() == clock.now
+
+
+def test_wake_during_poll_keeps_chat_hot_and_idle_chats_retire() -> None:
+    clock = FakeClock()
+    scheduler = ChatPollScheduler(hot_interval=1.0, idle_interval=4.0, retire_idle=True, clock=clock)
+    scheduler.add("chat")
+
+    assert scheduler.pop_due() == ["chat"]
+    scheduler.wake("chat")  # e.g. an outbound send while the poll is in flight
+    assert scheduler.pop_due() == []
+    scheduler.record("chat", active=False)
+    assert scheduler.next_due() == clock.now + 1.0
+
+    for expected in (2.0, 4.0, 4.0):
+        clock.now = scheduler.next_due()  # type: ignore[assignment]
+        assert scheduler.pop_due() == ["chat"]
+        scheduler.record("chat", active=False)
+        if "chat" in scheduler:
+            assert scheduler.next_due() == clock.now + expected
+
+    assert "chat" not in scheduler
+    assert scheduler.stats()["retired"] == 1
+
+
+def test_graph_timestamps_convert_to_epoch_microseconds() -> None:
+    assert timestamp_us("2024-01-01T00:00:00Z") == 1704067200000000
+    assert timestamp_us("2024-01-01T00:00:00.1234567Z") == 1704067200123456
+    assert timestamp_us("not a date") is None
+    assert isoformat_us(1704067200123456) == "2024-01-01T00:00:00.123456Z"
+    assert isoformat_us(1704067200000000) == "2024-01-01T00:00:00Z"
+
+
+def test_cursor_writer_persists_changes_behind_polling(tmp_path: Path) -> None:
+    async def _run() -> None:
+        store = SessionStore(tmp_path)
+        state = ChatPollState(clock=lambda: 1704067200.0)
+        writer = ChatCursorWriter(store, state, interval=60.0)
+        assert await writer.start("tenant", "user1") == 0
+
+        chat = {"id": "chat1", "lastMessagePreview": {"id": "m2", "createdDateTime": "2024-01-01T00:01:00Z"}}
+        assert state.observe(chat) is True
+        state.record_sync("chat1", "/chats/chat1/messages/delta?$deltatoken=abc")
+        state.record_message("chat1", timestamp_us("2024-01-01T00:01:00Z"))
+        state.record_message("chat1", timestamp_us("2024-01-01T00:00:30Z"))
+        assert writer.stats()["pending"] is True
+        assert await writer.flush() is True
+        assert await writer.flush() is False
+        await writer.close()
+
+        restored = ChatPollState(clock=lambda: 1704070800.0)
+        restored_writer = ChatCursorWriter(store, restored)
+        assert await restored_writer.start("tenant", "user1") == 1
+        await restored_writer.close()
+        cursor = restored.cursor("chat1")
+        assert cursor.delta_link == "/chats/chat1/messages/delta?$deltatoken=abc"
+        assert cursor.last_message_us == 1704067260000000
+        assert restored.since == "2024-01-01T00:00:00Z"
+        # Unchanged activity after the restart does not trigger a sync.
+        assert restored.observe(chat) is False
+
+        await store.delete("tenant", "user1")
+        assert await store.load_cursors("tenant", "user1") is None
+
+    asyncio.run(_run())
@@ -0,0 +1,130 @@
+"""Tests for background Teams token refresh."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional
+
+from msgr_teams_bridge.client import TeamsTenant, TeamsToken
+from msgr_teams_bridge.refresh import TokenRefreshScheduler
+from msgr_teams_bridge.session import SessionManager, SessionStore
+
+
+def test_scheduler_spreads_refreshes_and_retries_failures() -> None:
+    async def _run() -> None:
+        now = time.time()
+        refreshed: List[str] = []
+        running = 0
+        peak = 0
+        attempts = {"flaky": 0}
+
+        async def refresh(key: str) -> Optional[float]:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if key == "flaky":
+                attempts["flaky"] += 1
+                if attempts["flaky"] == 1:
+                    raise RuntimeError("token endpoint unavailable")
+            refreshed.append(key)
+            return None
+
+        scheduler = TokenRefreshScheduler(
+            refresh, lead=60.0, jitter=0.5, concurrency=2, retry_base=0.05, rng=random.Random(7)
+        )
+        for index in range(6):
+            scheduler.schedule(f"user-{index}", now + 60.0)
+        deadlines = [entry.deadline for entry in scheduler._entries.values()]  # type: ignore[attr-defined]
+        assert len(set(deadlines)) == 6
+        assert all(now - 30.0 <= deadline <= now for deadline in deadlines)
+
+        scheduler.schedule("flaky", now + 60.0)
+        scheduler.schedule("later", now + 3600.0)
+        scheduler.cancel("user-5")
+        scheduler.start()
+        for _ in range(100):
+            if len(refreshed) == 6:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert sorted(refreshed) == ["flaky"] + [f"user-{index}" for index in range(5)]
+        assert peak == 2
+        stats = scheduler.stats()
+        assert stats["refreshes"] == 6
+        assert stats["failures"] == 1
+        assert stats["lag_max"] >= stats["lag_last"] >= 0.0
+        assert stats["scheduled"] == 1  # only "later" remains
+        assert stats["next_refresh_in"] > 3000
+
+    asyncio.run(_run())
+
+
+class RefreshingClient:
+    def __init__(self) -> None:
+        self.token: Optional[TeamsToken] = None
+        self.connected = False
+        self.refresher: Optional[Callable[[TeamsToken], Awaitable[TeamsToken]]] = None
+        self.on_update: Optional[Callable[[TeamsToken], Awaitable[None]]] = None
+
+    async def connect(self, tenant: TeamsTenant, token: TeamsToken) -> None:
+        self.token = token
+        self.connected = True
+
+    async def disconnect(self) -> None:
+        self.connected = False
+
+    async def is_connected(self) -> bool:
+        return self.connected
+
+    def configure_token_refresh(self, refresher, on_update, *, margin: Optional[float] = None) -> None:  # type: ignore[no-untyped-def]
+        self.refresher = refresher
+        self.on_update = on_update
+
+    async def refresh_access_token(self) -> Optional[TeamsToken]:
+        assert self.refresher is not None and self.on_update is not None and self.token is not None
+        self.token = await self.refresher(self.token)
+        await self.on_update(self.token)
+        return self.token
+
+
+def test_session_manager_refreshes_tokens_in_background(tmp_path: Path) -> None:
+    async def _run() -> None:
+        store = SessionStore(tmp_path)
+        client = RefreshingClient()
+        manager = SessionManager(store, lambda tenant: client, refresh_lead=600.0)  # type: ignore[arg-type, return-value]
+        calls: List[str] = []
+
+        async def refresher(tenant: TeamsTenant, token: TeamsToken) -> TeamsToken:
+            calls.append(token.access_token)
+            return TeamsToken(access_token="fresh", refresh_token="refresh-2", expires_at=time.time() + 3600)
+
+        manager.set_token_refresher(refresher)
+        tenant = TeamsTenant(id="tenant")
+        # Expires inside the refresh lead, so the refresh is due right away.
+        stale = TeamsToken(access_token="stale", refresh_token="refresh", expires_at=time.time() + 300)
+        await manager.ensure_client(tenant, token=stale, user_id="alice")
+
+        for _ in range(100):
+            if calls:
+                break
+            await asyncio.sleep(0.01)
+        await manager.flush_sessions()
+
+        assert calls == ["stale"]
+        assert client.token is not None and client.token.access_token == "fresh"
+        stored = await store.load("tenant", "alice")
+        assert stored is not None and stored.token.access_token == "fresh"
+        stats = manager.refresh_stats()
+        assert stats["refreshes"] == 1
+        assert stats["scheduled"] == 1
+        assert stats["unsaved_sessions"] == 0
+
+        await manager.shutdown()
+
+    asyncio.run(_run())
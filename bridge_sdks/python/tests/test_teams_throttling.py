@@ -0,0 +1,116 @@
+"""Tests for tenant-scoped Graph throttling."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import List, Mapping, Optional
+
+from msgr_teams_bridge.client import TeamsGraphClient, TeamsTenant, TeamsToken
+from msgr_teams_bridge.throttling import (
+    GraphThrottleConfig,
+    GraphThrottleRegistry,
+    RequestPriority,
+    TenantThrottle,
+    graph_resource,
+)
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: Mapping[str, object], headers: Optional[Mapping[str, str]] = None) -> None:
+        self.status = status
+        self._body = body
+        self.headers = dict(headers or {})
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            error = RuntimeError(f"HTTP {self.status}")
+            error.status = self.status  # type: ignore[attr-defined]
+            raise error
+
+    async def text(self) -> str:
+        return json.dumps(self._body)
+
+    async def json(self) -> Mapping[str, object]:
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses: List[FakeResponse]) -> None:
+        self.responses = responses
+        self.calls: List[str] = []
+
+    def get(self, url: str, *, params: Optional[Mapping[str, object]] = None, headers: Mapping[str, str]) -> FakeResponse:
+        self.calls.append(url)
+        return self.responses.pop(0)
+
+
+def test_resource_classification() -> None:
+    assert graph_resource("/chats/1/messages/delta?$deltatoken=x") == "messages"
+    assert graph_resource("/me/chats?$top=50") == "chats"
+    assert graph_resource("/$batch") == "$batch"
+    assert graph_resource("/me") == "me"
+
+
+def test_interactive_requests_jump_the_queue() -> None:
+    async def _run() -> None:
+        throttle = TenantThrottle("tenant", GraphThrottleConfig(resource_limits={"messages": 1}))
+        order: List[str] = []
+
+        async def request(name: str, priority: RequestPriority) -> None:
+            async with throttle.slot("messages", priority):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async with throttle.slot("messages"):
+            tasks = [
+                asyncio.create_task(request("poll-1", RequestPriority.BACKGROUND)),
+                asyncio.create_task(request("poll-2", RequestPriority.BACKGROUND)),
+                asyncio.create_task(request("send", RequestPriority.INTERACTIVE)),
+            ]
+            await asyncio.sleep(0)
+            assert throttle.stats()["queued"] == {"interactive": 1, "background": 2}
+        await asyncio.gather(*tasks)
+
+        assert order == ["send", "poll-1", "poll-2"]
+
+    asyncio.run(_run())
+
+
+def test_retry_after_blocks_every_client_of_the_tenant() -> None:
+    async def _run() -> None:
+        registry = GraphThrottleRegistry()
+        first = TeamsGraphClient(logger=logging.getLogger("teams-a"), throttle=registry, batch_linger=None)
+        second = TeamsGraphClient(logger=logging.getLogger("teams-b"), throttle=registry, batch_linger=None)
+        for client in (first, second):
+            client._tenant = TeamsTenant(id="tenant")
+            client._token = TeamsToken(access_token="token")
+        first._session = FakeSession(
+            [FakeResponse(429, {}, {"Retry-After": "0.2"}), FakeResponse(200, {"id": "me"})]
+        )
+        second._session = FakeSession([FakeResponse(200, {"value": []})])
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        me = await first._get("/me")
+        assert me == {"id": "me"}
+        assert loop.time() - started >= 0.2
+
+        registry.tenant("tenant").penalise(0.1, "chats")
+        started = loop.time()
+        await second._get("/me/chats")
+        assert loop.time() - started >= 0.1
+
+        snapshot = await first.health()
+        assert snapshot["throttle"]["throttled"] == 2
+        assert snapshot["throttle"]["throttled_by_resource"] == {"chats": 1, "me": 1}
+        assert snapshot["throttle"]["blocked_waits"] == 2
+
+    asyncio.run(_run())
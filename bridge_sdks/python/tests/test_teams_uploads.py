@@ -0,0 +1,241 @@
+"""Tests for chunked Teams drive uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Mapping, Tuple
+
+import pytest
+
+from msgr_teams_bridge.client import TeamsFileUpload, TeamsGraphClient, TeamsTenant, TeamsToken
+from msgr_teams_bridge.uploads import UPLOAD_CHUNK_MULTIPLE, ChunkedUploader, UploadSessionError
+
+CHUNK = UPLOAD_CHUNK_MULTIPLE
+
+
+class FakeUploadService:
+    """Records ranges per upload URL the way a Graph upload session does."""
+
+    def __init__(self) -> None:
+        self.sessions: Dict[str, Tuple[str, bytearray]] = {}
+        self.ranges: List[Tuple[str, int, int]] = []
+        self.cancelled: List[str] = []
+        self.fail_at: Dict[Tuple[str, int], int] = {}
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, filename: str) -> Mapping[str, object]:
+        url = f"https://upload.example/{filename}"
+        self.sessions[url] = (filename, bytearray())
+        return {"uploadUrl": url}
+
+    async def put(self, url: str, data: bytes, start: int, total: int) -> Tuple[int, Mapping[str, object]]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        self.ranges.append((url, start, len(data)))
+        filename, received = self.sessions[url]
+        assert start == len(received)
+        assert len(data) <= 10 * CHUNK
+        failures = self.fail_at.get((url, start), 0)
+        if failures:
+            self.fail_at[(url, start)] = failures - 1
+            # Half the range arrived before the connection dropped.
+            received.extend(data[: len(data) // 2])
+            raise ConnectionResetError("connection reset by peer")
+        received.extend(data)
+        if len(received) < total:
+            return 202, {"nextExpectedRanges": [f"{len(received)}-"]}
+        return 201, {
+            "id": f"item-{filename}",
+            "name": filename,
+            "size": total,
+            "eTag": f'"{{GUID-{filename}}},1"',
+            "webUrl": f"https://contoso.sharepoint.com/{filename}",
+        }
+
+    async def status(self, url: str) -> Mapping[str, object]:
+        return {"nextExpectedRanges": [f"{len(self.sessions[url][1])}-"]}
+
+    async def cancel(self, url: str) -> None:
+        self.cancelled.append(url)
+
+    def content(self, filename: str) -> bytes:
+        return bytes(self.sessions[f"https://upload.example/{filename}"][1])
+
+
+async def _stream(data: bytes, piece: int) -> AsyncIterator[bytes]:
+    for offset in range(0, len(data), piece):
+        yield data[offset : offset + piece]
+
+
+def test_uploader_sends_fixed_ranges_and_resumes_mid_chunk() -> None:
+    async def _run() -> None:
+        service = FakeUploadService()
+        uploader = ChunkedUploader(
+            service.create, service.put, service.status, service.cancel, chunk_size=CHUNK + 1, retry_backoff=0.0
+        )
+        data = os.urandom(2 * CHUNK + 1000)
+        service.fail_at[("https://upload.example/big.bin", CHUNK)] = 1
+
+        item = await uploader.upload("big.bin", len(data), _stream(data, 100_000))
+
+        assert item["id"] == "item-big.bin"
+        assert service.content("big.bin") == data
+        # Ranges are 320 KiB-aligned; the retry resumes halfway into the chunk.
+        assert [(start, length) for _, start, length in service.ranges] == [
+            (0, CHUNK),
+            (CHUNK, CHUNK),
+            (CHUNK + CHUNK // 2, CHUNK // 2),
+            (2 * CHUNK, 1000),
+        ]
+        stats = uploader.stats()
+        assert stats["uploads"] == 1
+        assert stats["retries"] == 1
+        assert stats["resumes"] == 1
+        assert stats["chunk_size"] == CHUNK
+
+    asyncio.run(_run())
+
+
+def test_uploader_cancels_session_after_exhausting_retries() -> None:
+    async def _run() -> None:
+        service = FakeUploadService()
+        attempts: List[int] = []
+
+        async def unavailable(url: str, data: bytes, start: int, total: int) -> Tuple[int, Mapping[str, object]]:
+            attempts.append(start)
+            return 503, {}
+
+        uploader = ChunkedUploader(
+            service.create, unavailable, service.status, service.cancel, max_retries=1, retry_backoff=0.0
+        )
+
+        with pytest.raises(UploadSessionError):
+            await uploader.upload("lost.bin", 4096, _stream(b"x" * 4096, 1024))
+
+        assert attempts == [0, 0]
+        assert service.cancelled == ["https://upload.example/lost.bin"]
+        assert uploader.stats()["failures"] == 1
+
+    asyncio.run(_run())
+
+
+class UploadingClient(TeamsGraphClient):
+    def __init__(self, service: FakeUploadService, **kwargs: object) -> None:
+        super().__init__(logger=logging.getLogger("teams-uploads"), **kwargs)  # type: ignore[arg-type]
+        self._tenant = TeamsTenant(id="tenant")
+        self._token = TeamsToken(access_token="token")
+        self.service = service
+        self.posts: List[Tuple[str, Mapping[str, object]]] = []
+
+    async def _post(self, path: str, payload: Mapping[str, object]) -> Mapping[str, object]:  # type: ignore[override]
+        self.posts.append((path, payload))
+        if path.endswith(":/createUploadSession"):
+            filename = path[: -len(":/createUploadSession")].rsplit("/", 1)[-1]
+            return await self.service.create(filename)
+        return {"id": "message-1"}
+
+    async def _put_upload_range(  # type: ignore[override]
+        self, url: str, data: bytes, start: int, total: int
+    ) -> Tuple[int, Mapping[str, object]]:
+        return await self.service.put(url, data, start, total)
+
+    async def _get_upload_status(self, url: str) -> Mapping[str, object]:  # type: ignore[override]
+        return await self.service.status(url)
+
+    async def _cancel_upload_session(self, url: str) -> None:  # type: ignore[override]
+        await self.service.cancel(url)
+
+
+def test_send_message_references_large_uploads(tmp_path: Path) -> None:
+    async def _run() -> None:
+        service = FakeUploadService()
+        client = UploadingClient(service, inline_upload_limit=1024, upload_concurrency=2)
+        report = tmp_path / "report.pdf"
+        report_bytes = os.urandom(CHUNK + 10)
+        report.write_bytes(report_bytes)
+        video = os.urandom(3000)
+
+        result = await client.send_message(
+            "chat1",
+            {"body": {"contentType": "text", "content": "files"}},
+            file_uploads=[
+                TeamsFileUpload.from_path(report, content_type="application/pdf"),
+                {"filename": "video.mp4", "content": _stream(video, 512), "length": len(video)},
+                {"filename": "big.txt", "content": b"y" * 2048},
+                {"filename": "note.txt", "content": b"hello", "content_type": "text/plain"},
+            ],
+        )
+
+        assert service.content("report.pdf") == report_bytes
+        assert service.content("video.mp4") == video
+        assert service.content("big.txt") == b"y" * 2048
+        assert service.peak == 2
+        assert [path for path, _ in client.posts[:-1]] == [
+            f"/me/drive/root:/Microsoft%20Teams%20Chat%20Files/{name}:/createUploadSession"
+            for name in ("report.pdf", "video.mp4", "big.txt")
+        ]
+
+        path, payload = client.posts[-1]
+        assert path == "/chats/chat1/messages"
+        attachments = payload["attachments"]
+        assert attachments[0]["name"] == "note.txt" and "contentBytes" in attachments[0]
+        assert attachments[1] == {
+            "id": "GUID-report.pdf",
+            "contentType": "reference",
+            "contentUrl": "https://contoso.sharepoint.com/report.pdf",
+            "name": "report.pdf",
+        }
+        assert [attachment["id"] for attachment in attachments[2:]] == ["GUID-video.mp4", "GUID-big.txt"]
+        content = payload["body"]["content"]
+        assert content.startswith("<p>files")
+        assert content.endswith(
+            '<attachment id="GUID-report.pdf"></attachment>'
+            '<attachment id="GUID-video.mp4"></attachment>'
+            '<attachment id="GUID-big.txt"></attachment>'
+        )
+
+        uploaded = result["uploaded_files"]
+        assert [entry["name"] for entry in uploaded] == ["note.txt", "report.pdf", "video.mp4", "big.txt"]
+        assert uploaded[1]["item_id"] == "item-report.pdf"
+        assert uploaded[1]["size"] == len(report_bytes)
+        assert (await client.health())["uploads"]["uploads"] == 3
+
+    asyncio.run(_run())
+
+
+def test_failed_upload_cancels_siblings_and_skips_message() -> None:
+    async def _run() -> None:
+        service = FakeUploadService()
+        client = UploadingClient(service, inline_upload_limit=0, upload_retries=0)
+        service.fail_at[("https://upload.example/broken.bin", 0)] = 1
+
+        with pytest.raises(UploadSessionError):
+            await client.send_message(
+                "chat1",
+                {"body": {"content": "files"}},
+                file_uploads=[
+                    {"filename": "broken.bin", "content": b"z" * 100},
+                    {"filename": "fine.bin", "content": b"f" * 100},
+                ],
+            )
+
+        assert "https://upload.example/broken.bin" in service.cancelled
+        assert all(path.endswith(":/createUploadSession") for path, _ in client.posts)
+
+    asyncio.run(_run())
+
+
+def test_streamed_upload_requires_length() -> None:
+    upload = TeamsFileUpload(filename="stream.bin", content=_stream(b"data", 2))
+    with pytest.raises(ValueError):
+        upload.content_length()
+    with pytest.raises(ValueError):
+        upload.to_attachment()
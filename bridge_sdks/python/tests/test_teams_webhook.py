@@ -0,0 +1,291 @@
+"""Tests for the Graph change-notification webhook receiver."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import socket
+from typing import List, Mapping, Optional
+
+import pytest
+
+from msgr_teams_bridge.client import TeamsTenant, TeamsToken
+from msgr_teams_bridge.notifications import MemoryNotificationTransport, TeamsWebhookNotificationSource
+from msgr_teams_bridge.webhook import GraphWebhookTransport
+
+
+def _delivery(*notifications: Mapping[str, object]) -> bytes:
+    return json.dumps({"value": list(notifications)}).encode("utf-8")
+
+
+def test_receiver_validates_and_queues_notifications() -> None:
+    async def _run() -> None:
+        transport = GraphWebhookTransport("https://bridge.example/teams/notifications", client_state="secret")
+        received: List[Mapping[str, object]] = []
+
+        async def handler(notification: Mapping[str, object]) -> None:
+            received.append(notification)
+
+        transport.register("sub-1", handler)
+
+        assert await transport.handle_request({"validationToken": "abc"}, b"") == (200, "abc")
+        assert await transport.handle_request({}, b"not json") == (400, None)
+
+        status, _ = await transport.handle_request(
+            {},
+            _delivery(
+                {"subscriptionId": "sub-1", "clientState": "secret", "resource": "chats('1')/messages('m1')"},
+                {"subscriptionId": "sub-1", "clientState": "forged", "resource": "chats('1')/messages('m2')"},
+                {"subscriptionId": "sub-9", "clientState": "secret", "resource": "chats('2')/messages('m3')"},
+            ),
+        )
+        await transport.drain()
+
+        assert status == 202
+        assert [item["resource"] for item in received] == ["chats('1')/messages('m1')"]
+        stats = transport.stats()
+        assert stats["rejected"] == 2
+        assert stats["unrouted"] == 1
+        await transport.stop()
+
+    asyncio.run(_run())
+
+
+def test_receiver_sheds_load_when_queue_is_full() -> None:
+    async def _run() -> None:
+        transport = GraphWebhookTransport(
+            "https://bridge.example/teams/notifications", client_state="secret", queue_size=1
+        )
+        release = asyncio.Event()
+
+        async def handler(notification: Mapping[str, object]) -> None:
+            await release.wait()
+
+        transport.register("sub-1", handler)
+        notification = {"subscriptionId": "sub-1", "clientState": "secret"}
+
+        assert (await transport.handle_request({}, _delivery(notification)))[0] == 202
+        await asyncio.sleep(0)
+        assert (await transport.handle_request({}, _delivery(notification)))[0] == 202
+        assert (await transport.handle_request({}, _delivery(notification)))[0] == 503
+
+        release.set()
+        await transport.stop()
+        assert transport.stats()["overloaded"] == 1
+
+    asyncio.run(_run())
+
+
+def _expires_in(seconds: float) -> str:
+    return (dt.datetime.now(dt.timezone.utc) + dt.timedelta(seconds=seconds)).isoformat()
+
+
+class ShortLivedTransport(MemoryNotificationTransport):
+    """Hands out subscriptions that need renewing every ``lifetime`` seconds."""
+
+    def __init__(self, lifetime: float) -> None:
+        super().__init__()
+        self.lifetime = lifetime
+
+    async def subscribe(self, tenant, token, *, resource, expiration=None):  # type: ignore[override]
+        payload = dict(await super().subscribe(tenant, token, resource=resource, expiration=expiration))
+        payload["expirationDateTime"] = _expires_in(self.lifetime)
+        return payload
+
+    async def renew(self, subscription_id, tenant, token, *, resource, expiration=None):  # type: ignore[override]
+        payload = dict(await super().renew(subscription_id, tenant, token, resource=resource, expiration=expiration))
+        payload["expirationDateTime"] = _expires_in(self.lifetime)
+        return payload
+
+
+def test_renewal_loop_tracks_renewed_expiry_and_resubscribes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("msgr_teams_bridge.notifications.MIN_RENEWAL_DELAY", 0.001)
+
+    async def _run() -> None:
+        transport = ShortLivedTransport(lifetime=0.25)
+        source = TeamsWebhookNotificationSource(transport, renewal_window=0.05)
+        delivered: List[Mapping[str, object]] = []
+
+        async def dispatch(payload: Mapping[str, object]) -> None:
+            delivered.append(payload)
+
+        await source.start(TeamsTenant(id="tenant"), TeamsToken(access_token="token"), dispatch)
+        await asyncio.sleep(0.75)
+        # Each renewal pushes the expiry out again, so the loop renews about
+        # every 0.2s rather than hammering Graph at the minimum delay.
+        assert 2 <= len(transport.renewals) <= 5
+
+        await transport.dispatch("sub-1", {"subscriptionId": "sub-1", "lifecycleEvent": "subscriptionRemoved"})
+        assert source.subscription_id == "sub-2"
+        assert set(transport.handlers) == {"sub-2"}
+        assert delivered[-1]["lifecycleEvent"] == "subscriptionRemoved"
+
+        renewals = len(transport.renewals)
+        await asyncio.sleep(0.3)
+        assert transport.renewals[renewals:] and set(transport.renewals[renewals:]) == {"sub-2"}
+
+        await source.stop()
+        assert transport.unsubscribed == ["sub-2"]
+
+    asyncio.run(_run())
+
+
+def test_lapsed_subscription_is_recreated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("msgr_teams_bridge.notifications.MIN_RENEWAL_DELAY", 0.001)
+
+    class FailingRenewals(ShortLivedTransport):
+        async def renew(self, subscription_id, tenant, token, *, resource, expiration=None):  # type: ignore[override]
+            self.renewals.append(subscription_id)
+            raise RuntimeError("404 subscription not found")
+
+    async def _run() -> None:
+        transport = FailingRenewals(lifetime=0.1)
+        source = TeamsWebhookNotificationSource(transport, renewal_window=0.05)
+
+        async def dispatch(payload: Mapping[str, object]) -> None:
+            return None
+
+        await source.start(TeamsTenant(id="tenant"), TeamsToken(access_token="token"), dispatch)
+        for _ in range(200):
+            if source.subscription_id != "sub-1":
+                break
+            await asyncio.sleep(0.005)
+        assert source.subscription_id == "sub-2"
+        assert "sub-1" not in transport.handlers
+        await source.stop()
+
+    asyncio.run(_run())
+
+
+def test_lifecycle_events_reach_the_subscription_handler() -> None:
+    async def _run() -> None:
+        transport = GraphWebhookTransport("https://bridge.example/teams/notifications", client_state="secret")
+        received: List[Optional[object]] = []
+
+        async def handler(notification: Mapping[str, object]) -> None:
+            received.append(notification.get("lifecycleEvent"))
+
+        transport.register("sub-1", handler)
+        status, _ = await transport.handle_request(
+            {},
+            _delivery(
+                {"subscriptionId": "sub-1", "clientState": "secret", "lifecycleEvent": "missed"},
+                {"subscriptionId": "sub-1", "clientState": "secret", "lifecycleEvent": "subscriptionRemoved"},
+            ),
+        )
+        await transport.drain()
+        await transport.stop()
+
+        assert status == 202
+        assert received == ["missed", "subscriptionRemoved"]
+        assert transport.stats()["lifecycle_events"] == 2
+
+    asyncio.run(_run())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_subscription_lifecycle_against_local_graph(monkeypatch: pytest.MonkeyPatch) -> None:
+    aiohttp = pytest.importorskip("aiohttp")
+    from aiohttp import web
+
+    from msgr_bridge_sdk.http import HttpClientPool
+
+    monkeypatch.setattr("msgr_teams_bridge.notifications.MIN_RENEWAL_DELAY", 0.001)
+
+    async def _run() -> None:
+        receiver_port = _free_port()
+        notification_url = f"http://127.0.0.1:{receiver_port}/teams/notifications"
+        lifecycle_url = f"http://127.0.0.1:{receiver_port}/teams/lifecycle"
+        calls: List[str] = []
+        state = {"created": 0}
+
+        async def create(request: web.Request) -> web.Response:
+            body = await request.json()
+            # Graph validates the endpoint before creating the subscription.
+            async with aiohttp.ClientSession() as session:
+                async with session.post(body["notificationUrl"], params={"validationToken": "tok"}) as response:
+                    assert await response.text() == "tok"
+            assert body["lifecycleNotificationUrl"] == lifecycle_url
+            state["client_state"] = body["clientState"]
+            state["created"] += 1
+            calls.append(f"POST {body['resource']}")
+            # Expiries land just past the default renewal window, so the loop
+            # renews every ~0.3s for as long as it honours the latest expiry.
+            subscription = {"id": f"sub-{state['created']}", "expirationDateTime": _expires_in(300.3)}
+            return web.json_response(subscription, status=201)
+
+        async def renew(request: web.Request) -> web.Response:
+            calls.append(f"PATCH {request.match_info['id']}")
+            return web.json_response({"id": request.match_info["id"], "expirationDateTime": _expires_in(300.3)})
+
+        async def delete(request: web.Request) -> web.Response:
+            calls.append(f"DELETE {request.match_info['id']}")
+            return web.Response(status=204)
+
+        graph = web.Application()
+        graph.router.add_post("/subscriptions", create)
+        graph.router.add_patch("/subscriptions/{id}", renew)
+        graph.router.add_delete("/subscriptions/{id}", delete)
+        graph_runner = web.AppRunner(graph)
+        await graph_runner.setup()
+        graph_port = _free_port()
+        await web.TCPSite(graph_runner, "127.0.0.1", graph_port).start()
+
+        pool = HttpClientPool()
+        transport = GraphWebhookTransport(
+            notification_url,
+            host="127.0.0.1",
+            port=receiver_port,
+            lifecycle_url=lifecycle_url,
+            graph_base=f"http://127.0.0.1:{graph_port}",
+            http_pool=pool,
+        )
+        source = TeamsWebhookNotificationSource(transport)
+        delivered: List[Mapping[str, object]] = []
+
+        async def dispatch(payload: Mapping[str, object]) -> None:
+            delivered.append(payload)
+
+        tenant = TeamsTenant(id="tenant")
+        token = TeamsToken(access_token="token")
+        try:
+            await source.start(tenant, token, dispatch)
+            await asyncio.sleep(0.8)
+            renewals = calls.count("PATCH sub-1")
+            assert 1 <= renewals <= 4
+
+            async with aiohttp.ClientSession() as session:
+                removed = {"subscriptionId": "sub-1", "clientState": state["client_state"]}
+                removed["lifecycleEvent"] = "subscriptionRemoved"
+                async with session.post(lifecycle_url, json={"value": [removed]}) as response:
+                    assert response.status == 202
+                await transport.drain()
+                assert source.subscription_id == "sub-2"
+
+                change = {"subscriptionId": "sub-2", "clientState": state["client_state"], "resource": "r"}
+                async with session.post(notification_url, json={"value": [change]}) as response:
+                    assert response.status == 202
+            await transport.drain()
+
+            await source.stop()
+        finally:
+            await transport.stop()
+            await graph_runner.cleanup()
+            await pool.close()
+
+        assert calls[0] == "POST /chats/getAllMessages"
+        assert calls[1 : 1 + renewals] == ["PATCH sub-1"] * renewals
+        assert calls[1 + renewals] == "POST /chats/getAllMessages"
+        assert calls[-1] == "DELETE sub-2"
+        assert "DELETE sub-1" not in calls
+        assert [item.get("lifecycleEvent") for item in delivered] == ["subscriptionRemoved", None]
+        assert delivered[1]["resource"] == "r"
+        assert delivered[1]["tenant_id"] == "tenant"
+
+    asyncio.run(_run())
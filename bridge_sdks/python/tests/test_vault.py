@@ -0,0 +1,224 @@
+"""Tests for the encrypted session vault."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from msgr_bridge_sdk import (
+    EnvCredentialBootstrapper,
+    LocalMembershipBus,
+    SessionOwnership,
+    SessionVault,
+    SessionVaultError,
+)
+from msgr_slack_bridge.client import SlackToken
+from msgr_slack_bridge.session import SessionData, SessionStore as SlackSessionStore
+from msgr_telegram_bridge import SessionStore as TelegramSessionStore
+from msgr_telegram_bridge.session import SessionManager as TelegramSessionManager
+
+MASTER_KEY = bytes(range(32))
+
+
+def test_vault_encrypts_at_rest_and_caches_plaintext(tmp_path: Path) -> None:
+    vault = SessionVault(MASTER_KEY)
+    store = TelegramSessionStore(tmp_path, vault=vault)
+
+    async def scenario() -> None:
+        path = await store.persist("alice", b"telethon-session")
+        assert b"telethon-session" not in path.read_bytes()
+
+        assert await store.load("alice") == b"telethon-session"
+        assert await store.export_base64("alice") == base64.b64encode(b"telethon-session").decode("ascii")
+        stats = vault.stats()
+        assert stats["hits"] == 2 and stats["decrypts"] == 0
+
+        vault.invalidate()
+        assert await store.load("alice") == b"telethon-session"
+        assert vault.stats()["decrypts"] == 1
+        assert vault.stats()["avg_decrypt_us"] is not None
+
+        assert await store.load("missing") is None
+
+    asyncio.run(scenario())
+
+
+def test_vault_cache_is_bounded_and_detects_external_writes(tmp_path: Path) -> None:
+    vault = SessionVault(MASTER_KEY, cache_entries=2)
+    writer = SessionVault(MASTER_KEY, cache_entries=0)
+    store = TelegramSessionStore(tmp_path, vault=vault)
+
+    async def scenario() -> None:
+        for user_id in ("a", "b", "c"):
+            await store.persist(user_id, user_id.encode("utf-8"))
+        stats = vault.stats()
+        assert stats["cache_entries"] == 2 and stats["evictions"] == 1
+
+        await writer.write(store.sealed_path_for("c"), b"rewritten-by-peer")
+        assert await store.load("c") == b"rewritten-by-peer"
+
+    asyncio.run(scenario())
+
+
+class FileBackedClient:
+    """Opens its session file directly, like Telethon's SQLite session."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.seen: Optional[bytes] = None
+
+    async def connect(self) -> None:
+        self.seen = self.path.read_bytes()
+        self.path.write_bytes(self.seen + b"+auth-key")
+
+    async def disconnect(self) -> None:
+        self.path.write_bytes(self.path.read_bytes() + b"+flushed")
+
+
+def test_vault_hands_clients_a_decrypted_working_copy(tmp_path: Path) -> None:
+    vault = SessionVault(MASTER_KEY)
+    work = tmp_path / "work"
+    store = TelegramSessionStore(tmp_path / "sessions", vault=vault, work_path=work)
+    clients: List[FileBackedClient] = []
+
+    def factory(path: Path) -> FileBackedClient:
+        clients.append(FileBackedClient(path))
+        return clients[-1]
+
+    manager = TelegramSessionManager(store, factory)  # type: ignore[arg-type]
+
+    async def scenario() -> None:
+        await manager.ensure_client("alice", session_blob=b"telethon-session")
+        client = clients[0]
+        assert client.seen == b"telethon-session"
+        assert client.path.parent == work
+        assert client.path.stat().st_mode & 0o077 == 0
+        assert await store.load("alice") == b"telethon-session+auth-key"
+
+        await manager.remove_client("alice")
+        assert not client.path.exists()
+        sealed = store.sealed_path_for("alice").read_bytes()
+        assert b"auth-key" not in sealed and b"telethon-session" not in sealed
+        assert not any(path.suffix == ".session" for path in (tmp_path / "sessions").iterdir())
+
+        vault.invalidate()
+        assert await store.load("alice") == b"telethon-session+auth-key+flushed"
+
+        # Legacy plaintext sessions are sealed on their first release.
+        store.path_for("bob").write_bytes(b"legacy")
+        await manager.ensure_client("bob")
+        assert clients[1].seen == b"legacy"
+        await manager.shutdown()
+        assert not store.path_for("bob").exists()
+        assert await store.load("bob") == b"legacy+auth-key+flushed"
+
+    asyncio.run(scenario())
+
+
+def test_session_handoff_is_sealed_on_the_bus(tmp_path: Path) -> None:
+    bus = LocalMembershipBus()
+    released: List[str] = []
+
+    def _manager(name: str) -> Tuple[TelegramSessionManager, SessionOwnership]:
+        ownership = SessionOwnership("telegram", name, bus, heartbeat_interval=60.0)
+        vault = SessionVault(MASTER_KEY)
+        store = TelegramSessionStore(tmp_path / name, vault=vault, work_path=tmp_path / f"{name}-work")
+        manager = TelegramSessionManager(store, FileBackedClient, ownership=ownership)  # type: ignore[arg-type]
+        return manager, ownership
+
+    async def on_release(user_id: str, _client: object) -> None:
+        released.append(user_id)
+
+    async def scenario() -> None:
+        first, first_owner = _manager("a")
+        first.set_release_listener(on_release)  # type: ignore[arg-type]
+        await first_owner.start()
+        users = [f"user-{index}" for index in range(20)]
+        for user_id in users:
+            await first.ensure_client(user_id, session_blob=f"secret-{user_id}".encode("utf-8"))
+
+        second, second_owner = _manager("b")
+        await second_owner.start()
+        moved = sorted(second_owner.claimed)
+        assert moved and sorted(released) == moved
+
+        for _, body in bus.published:
+            assert b"secret-" not in body
+            payload = json.loads(body)
+            state = payload.get("payload", {}).get("state") or {}
+            if "sealed_blob" in state:
+                assert b"secret-" not in base64.b64decode(state["sealed_blob"])
+        assert await second.export_session(moved[0]) is not None
+        adopted = await second._store.load(moved[0])  # type: ignore[attr-defined]
+        assert adopted == f"secret-{moved[0]}+auth-key+flushed+auth-key".encode("utf-8")
+
+        await second_owner.stop()
+        await first_owner.stop()
+
+    asyncio.run(scenario())
+
+
+def test_vault_rejects_tampering_and_wrong_keys(tmp_path: Path) -> None:
+    vault = SessionVault(MASTER_KEY, cache_entries=0)
+
+    async def scenario() -> None:
+        path = await vault.write(tmp_path / "alice.session", b"secret")
+        other = SessionVault(bytes(32), cache_entries=0)
+        with pytest.raises(SessionVaultError):
+            await other.read(path)
+
+        moved = tmp_path / "mallory.session"
+        moved.write_bytes(path.read_bytes())
+        with pytest.raises(SessionVaultError):
+            await vault.read(moved)
+
+        legacy = tmp_path / "legacy.session"
+        legacy.write_bytes(b"plaintext")
+        assert await vault.read(legacy) == b"plaintext"
+        strict = SessionVault(MASTER_KEY, allow_plaintext=False)
+        with pytest.raises(SessionVaultError):
+            await strict.read(legacy)
+
+    asyncio.run(scenario())
+
+
+def test_vault_from_bootstrapper_supports_key_rotation(tmp_path: Path) -> None:
+    old_key = base64.b64encode(MASTER_KEY).decode("ascii")
+    new_key = base64.b64encode(bytes(reversed(MASTER_KEY))).decode("ascii")
+    environment = {
+        "MSGR_SLACK_CREDENTIALS": json.dumps({"session_master_key": old_key, "session_master_key_id": "k1"}),
+    }
+
+    async def scenario() -> None:
+        bootstrapper = EnvCredentialBootstrapper(loader=environment.get)
+        vault = await SessionVault.from_bootstrapper(bootstrapper, "slack")
+        store = SlackSessionStore(tmp_path, vault=vault)
+        await store.persist("u1", "T1", SessionData(token=SlackToken(value="xoxp-1"), workspace_id="T1"))
+        assert b"xoxp-1" not in store.path_for("u1", "T1").read_bytes()
+
+        environment["MSGR_SLACK_CREDENTIALS"] = json.dumps(
+            {
+                "session_master_key": new_key,
+                "session_master_key_id": "k2",
+                "session_retired_keys": {"k1": old_key},
+            }
+        )
+        rotated = await SessionVault.from_bootstrapper(bootstrapper, "slack")
+        reloaded = SlackSessionStore(tmp_path, vault=rotated)
+        data = await reloaded.load("u1", "T1")
+        assert data is not None and data.token.value == "xoxp-1"
+
+        await reloaded.delete("u1", "T1")
+        assert await reloaded.load("u1", "T1") is None
+
+        with pytest.raises(SessionVaultError):
+            await SessionVault.from_bootstrapper(bootstrapper, "teams")
+
+    asyncio.run(scenario())